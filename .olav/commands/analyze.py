@@ -8,6 +8,7 @@ import argparse
 import re
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
@@ -18,21 +19,25 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+if TYPE_CHECKING:
+    from olav.tools.path_trace import PathTrace
+
 
 def show_plan(source: str, destination: str, error_desc: str = None) -> str:
     """Show analysis plan for user confirmation."""
     plan = f"""## Analysis Plan: {source} → {destination}
 
-### Phase 1: Macro Analysis (macro-analyzer)
+### Phase 1: Macro Analysis
 Goal: Trace path and identify fault domain
 Steps:
-  1. Execute traceroute from {source} to {destination}
-  2. Check BGP/OSPF neighbor status on all path devices
-  3. Identify intermediate devices and their status
-  4. Determine fault domain
+  1. Offline path trace from {source} to {destination} over stored routes, ARP
+     and LLDP/CDP topology (devices without stored state are collected live)
+  2. If the trace has gaps: macro-analyzer continues live from the gaps
+     (traceroute, BGP/OSPF neighbor status on path devices)
+  3. Determine fault domain
 
 ### Phase 2: Micro Analysis (micro-analyzer)
-Goal: Layer-by-layer troubleshooting on problem device
+Goal: Layer-by-layer troubleshooting on each suspect device (run in parallel)
 Steps:
   1. Physical layer check (interface status, CRC errors)
   2. Data link layer check (VLAN, MAC table, STP)
@@ -49,20 +54,61 @@ Goal: Combine findings and provide recommendations
     return plan
 
 
-def extract_problem_device(macro_result: str) -> str:
-    """Extract problem device from macro analysis result."""
+def extract_problem_devices(macro_result: str, limit: int = 8) -> list[str]:
+    """Extract all suspect devices from macro analysis result (in order of mention)."""
+    devices: list[str] = []
     patterns = [
-        r"Problem device:\s*(\w+)",
-        r"Issue found on:\s*(\w+)",
+        r"(?:Problem|Suspect|Affected) devices?:\s*([\w\-, ]+)",
+        r"Issue found on:\s*([\w\-, ]+)",
         r"Fault domain:\s*(\w+)",
     ]
 
     for pattern in patterns:
-        match = re.search(pattern, macro_result, re.IGNORECASE)
-        if match:
-            return match.group(1)
+        for match in re.finditer(pattern, macro_result, re.IGNORECASE):
+            for name in re.split(r"[,\s]+(?:and\s+)?", match.group(1).strip()):
+                if name and name.lower() != "and" and name not in devices:
+                    devices.append(name)
+
+    return devices[:limit]
+
+
+def trace_suspects(trace: "PathTrace", limit: int = 8) -> list[str]:
+    """Suspect devices from an offline trace: where branches fail, else the path."""
+    failing = [
+        path[-1].device
+        for path in trace.paths
+        if path[-1].status in ("no_route", "loop", "unresolved", "no_state")
+    ]
+    devices = list(dict.fromkeys(failing)) or trace.devices()
+    return devices[:limit]
+
+
+def run_trace(source: str, destination: str) -> "PathTrace | None":
+    """Offline path trace; None if stored state can't answer (e.g. no snapshots)."""
+    try:
+        from olav.tools.path_trace import get_path_tracer
+
+        return get_path_tracer().trace(source, destination)
+    except Exception as e:
+        print(f"Offline trace unavailable: {e}\n")
+        return None
+
 
-    return None
+def build_micro_task(device: str, error_desc: str | None) -> str:
+    """Layer-by-layer troubleshooting task for one device."""
+    return f"""Perform TCP/IP layer-by-layer troubleshooting on {device}
+
+Error context: {error_desc if error_desc else "Not specified"}
+
+Please analyze:
+1. Physical layer: interface status, CRC errors, optical power
+2. Data link layer: VLAN, MAC table, STP
+3. Network layer: IP configuration, routing, ARP
+4. Transport layer: ACLs, NAT, port filtering
+5. Application layer: DNS, services
+
+Provide a structured report with findings for each layer.
+"""
 
 
 def synthesize_results(macro_result: str, micro_result: str) -> str:
@@ -113,7 +159,7 @@ def main():
         print("\n" + "=" * 60 + "\n")
 
     try:
-        from olav.tools.task_tools import delegate_task
+        from olav.tools.task_tools import delegate_task, delegate_tasks
 
         # Prepare task description
         base_task = f"Analyze network path from {args.source} to {args.destination}"
@@ -122,8 +168,15 @@ def main():
         else:
             task_desc = base_task
 
-        # Phase 1: Macro Analysis
+        # Phase 1: Macro Analysis - offline trace first, LLM only for the gaps
         print("=== Phase 1: Macro Analysis ===\n")
+        from olav.tools.path_trace import format_trace
+
+        trace = run_trace(args.source, args.destination)
+        trace_report = format_trace(trace) if trace else ""
+        if trace_report:
+            print(trace_report + "\n")
+
         macro_task = f"""{task_desc}
 
 Please perform macro analysis:
@@ -136,40 +189,61 @@ Provide a structured report with:
 - Path trace results
 - Device status
 - Identified fault domain
+- A line "Suspect devices: <comma-separated device names>"
 """
 
-        macro_result = delegate_task.invoke(
-            {"subagent_type": "macro-analyzer", "task_description": macro_task}
-        )
+        if trace and trace.complete:
+            # Stored state explains the whole path: no live hop-by-hop tracing
+            suspects = ", ".join(trace_suspects(trace))
+            macro_result = f"{trace_report}\n\nSuspect devices: {suspects}"
+        else:
+            if trace:
+                gaps = ", ".join(f"{hop.device} ({hop.status})" for hop in trace.gaps)
+                macro_task += f"""
+An offline trace from stored routing/ARP/topology data is below. Trust the
+hops it resolved and verify live only from its gaps: {gaps}
 
-        print(macro_result)
+{trace_report}
+"""
+            macro_result = delegate_task.invoke(
+                {"subagent_type": "macro-analyzer", "task_description": macro_task}
+            )
+            print(macro_result)
 
         if args.interactive:
             input("\n[Paused] Press Enter to continue to Phase 2...")
             print("\n" + "=" * 60 + "\n")
 
-        # Phase 2: Micro Analysis
+        # Phase 2: Micro Analysis (suspect devices analyzed in parallel)
         print("=== Phase 2: Micro Analysis ===\n")
-        problem_device = extract_problem_device(macro_result) or args.source
-
-        micro_task = f"""Perform TCP/IP layer-by-layer troubleshooting on {problem_device}
-
-Error context: {args.error if args.error else "Not specified"}
-
-Please analyze:
-1. Physical layer: interface status, CRC errors, optical power
-2. Data link layer: VLAN, MAC table, STP
-3. Network layer: IP configuration, routing, ARP
-4. Transport layer: ACLs, NAT, port filtering
-5. Application layer: DNS, services
-
-Provide a structured report with findings for each layer.
-"""
-
-        micro_result = delegate_task.invoke(
-            {"subagent_type": "micro-analyzer", "task_description": micro_task}
+        problem_devices = (
+            extract_problem_devices(macro_result)
+            or (trace_suspects(trace) if trace else [])
+            or [args.source]
         )
 
+        if len(problem_devices) == 1:
+            micro_result = delegate_task.invoke(
+                {
+                    "subagent_type": "micro-analyzer",
+                    "task_description": build_micro_task(problem_devices[0], args.error),
+                }
+            )
+        else:
+            devices_str = ", ".join(problem_devices)
+            print(f"Analyzing {len(problem_devices)} devices in parallel: {devices_str}\n")
+            micro_result = delegate_tasks.invoke(
+                {
+                    "tasks": [
+                        {
+                            "subagent_type": "micro-analyzer",
+                            "task_description": build_micro_task(device, args.error),
+                        }
+                        for device in problem_devices
+                    ]
+                }
+            )
+
         print(micro_result)
 
         if args.interactive:
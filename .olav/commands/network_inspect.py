@@ -233,6 +233,11 @@ def main():
             status = "✅" if errors == 0 else "⚠️" if errors < len(commands) // 2 else "❌"
             print(f"    {status} {len(commands) - errors}/{len(commands)} commands OK")
 
+        # Keep CPU/memory/error counters for metric_trend
+        from olav.tools.metrics_store import record_inspection_metrics
+
+        record_inspection_metrics(all_results)
+
         # Generate report if requested
         if args.report:
             from config.settings import settings
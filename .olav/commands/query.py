@@ -5,6 +5,7 @@ Usage: /query [device] [query]
 """
 
 import argparse
+import logging
 import sys
 from pathlib import Path
 
@@ -125,8 +126,17 @@ def execute_query(device: str, query: str) -> str:
     # Resolve alias
     actual_device = resolve_device_alias(device)
 
-    # Find matching command
-    command = find_matching_command(query)
+    # Platform-aware command from the intent index, then the static patterns
+    command = None
+    try:
+        from olav.core.fast_path import resolve_device_command
+
+        command = resolve_device_command(actual_device, query)
+    except Exception as e:
+        # Intent index unavailable: fall back to the static patterns
+        logging.getLogger(__name__).debug(f"Intent index lookup failed: {e}")
+    if not command:
+        command = find_matching_command(query)
 
     # Handle command with argument placeholder
     if "{arg}" in command:
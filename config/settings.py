@@ -194,6 +194,13 @@ class Settings(BaseSettings):
     llm_base_url: str = ""
     llm_temperature: float = 0.1
     llm_max_tokens: int = 16000
+    # Chat model client pool: one client per (model, temperature, json_mode),
+    # sharing a keep-alive connection pool whose size caps concurrent requests
+    llm_pool_enabled: bool = True
+    llm_max_connections: int = Field(default=20, ge=1)
+    llm_max_keepalive_connections: int = Field(default=10, ge=0)
+    llm_keepalive_expiry: float = 60.0
+    llm_request_timeout: float = 120.0
 
     # =========================================================================
     # Skill Configuration (Phase C-1)
@@ -215,6 +222,41 @@ class Settings(BaseSettings):
     embedding_model: str = "nomic-embed-text"  # Ollama model (768 dimensions)
     embedding_base_url: str = "http://localhost:11434"  # Ollama default URL
     embedding_api_key: str = ""  # Only needed for OpenAI embeddings
+    # Embeddings are stored per (model, dimension); switching embedding_model
+    # re-embeds the corpus in the background instead of breaking search
+    embedding_auto_reembed: bool = True
+    embedding_batch_size: int = 32
+    # Quantized first-pass search: candidates = limit * rescore_factor are
+    # re-scored against full-precision vectors; sign bits lose far more than
+    # int8 codes, so binary uses its own, larger factor
+    embedding_quantization: Literal["none", "int8", "binary"] = "none"
+    embedding_rescore_factor: int = Field(default=4, ge=1, le=50)
+    embedding_binary_rescore_factor: int = Field(default=20, ge=1, le=100)
+    # Vector search backend: DuckDB SQL, or a memory-mapped NumPy matrix
+    # (agent_dir/data/vectors/, shared zero-copy across processes; needs numpy)
+    vector_store_backend: Literal["duckdb", "numpy"] = "duckdb"
+
+    # =========================================================================
+    # Reranking (Phase 7: cross-encoder over fused search results)
+    # =========================================================================
+    reranker_model: Literal["none", "jina", "mxbai"] = "none"
+    # Only the first N fused candidates are scored; the rest keep fusion order
+    reranker_max_candidates: int = Field(default=20, ge=1, le=200)
+    reranker_batch_size: int = Field(default=16, ge=1, le=200)
+    # Reranking is skipped (fusion order kept) when it would exceed this budget
+    reranker_latency_budget_ms: int = Field(default=800, ge=0)
+    # LRU entries of (query, chunk) -> score kept across searches
+    reranker_cache_size: int = Field(default=2048, ge=0)
+    # Capability search: score multipliers per platform, e.g. {"netbox": 1.2}
+    capability_platform_boost: dict[str, float] = Field(default_factory=dict)
+    # Semantic capability search: rows embedded with embedding_model on load,
+    # fused with keyword results (vector_weight = share of the vector ranking)
+    capability_embeddings: bool = True
+    capability_vector_weight: float = Field(default=0.5, ge=0.0, le=1.0)
+    capability_min_similarity: float = Field(default=0.3, ge=-1.0, le=1.0)
+    # Knowledge search result cache (invalidated on re-index; 0 disables)
+    search_cache_ttl: int = Field(default=600, ge=0)  # seconds
+    search_cache_size: int = Field(default=256, ge=0)
 
     # =========================================================================
     # Nested Configuration Objects (Phase C-1)
@@ -248,6 +290,10 @@ class Settings(BaseSettings):
     # Knowledge database: Vendor docs, team wiki, learned solutions
     knowledge_db_path: str = str(OLAV_DIR / "data" / "knowledge.db")
 
+    # Seconds to wait for another OLAV process (CLI or scheduler) to release
+    # capabilities.db / snapshots.db before giving up
+    db_lock_timeout: int = Field(default=300, ge=0)
+
     # =========================================================================
     # Agent Configuration (Claude Code Compatibility)
     # =========================================================================
@@ -280,6 +326,74 @@ class Settings(BaseSettings):
     # Network Execution Configuration
     # =========================================================================
     nornir_ssh_port: int = 22
+    # Concurrent commands per device when tool calls run in parallel
+    # (a Netmiko session is a single CLI channel)
+    device_max_sessions: int = Field(default=1, ge=1)
+    # Tool outputs above these sizes are stored in agent_dir/data/artifacts/
+    # and replaced by a handle + excerpt (read back with artifact_* tools)
+    artifact_store_enabled: bool = True
+    artifact_threshold_chars: int = 4000
+    artifact_batch_threshold_chars: int = 800  # Per device in batch queries
+    artifact_summary_lines: int = 20
+    artifact_retention_hours: int = 24
+    # Network state snapshots (agent_dir/data/snapshots.db): data type ->
+    # intent (resolved per platform) or literal "show ..."/"display ..." command,
+    # or a {platform: intent or command} mapping (unlisted platforms are skipped)
+    snapshot_types: dict[str, str | dict[str, str]] = Field(
+        default_factory=lambda: {
+            "version": {"cisco_ios": "show version", "huawei_vrp": "display version"},
+            "interfaces": {
+                "cisco_ios": "show ip interface brief",
+                "huawei_vrp": "display ip interface brief",
+            },
+            "bgp": {"cisco_ios": "show ip bgp summary", "huawei_vrp": "display bgp peer"},
+            "routes": {"cisco_ios": "show ip route", "huawei_vrp": "display ip routing-table"},
+            "mac": {"cisco_ios": "show mac address-table", "huawei_vrp": "display mac-address"},
+            "arp": {"cisco_ios": "show ip arp", "huawei_vrp": "display arp"},
+            "lldp": {
+                "cisco_ios": "show lldp neighbors",
+                "huawei_vrp": "display lldp neighbor brief",
+            },
+            "cdp": {"cisco_ios": "show cdp neighbors detail"},
+            "counters": {
+                "cisco_ios": "show interfaces counters errors",
+                "huawei_vrp": "display interface brief",
+            },
+        }
+    )
+    snapshot_command_timeout: int = 60
+    # smart_query reuses snapshot outputs up to this age in seconds
+    # (0 = always live; the tool's max_age argument overrides)
+    snapshot_max_age: int = Field(default=0, ge=0)
+    snapshot_retention: int = Field(default=30, ge=1)  # Snapshots kept
+    # Record live smart_query outputs of snapshot commands (keeps route, MAC/ARP
+    # and topology indexes current between sweeps)
+    snapshot_record_queries: bool = True
+    # Metric samples extracted from inspection/snapshot outputs (metric_trend):
+    # raw samples older than metrics_raw_days are rolled up hourly
+    metrics_enabled: bool = True
+    metrics_raw_days: int = Field(default=7, ge=1)
+    metrics_retention_days: int = Field(default=90, ge=1)
+    # Windows for interface counter deltas/rates ("30s", "15m", "1h", "7d"),
+    # and the wait between two live samples when no earlier sample exists
+    counter_windows: list[str] = Field(default_factory=lambda: ["5m", "1h", "24h"])
+    counter_sample_interval: int = Field(default=30, ge=1, le=300)
+    # Scheduled jobs run by `olav scheduler`: name -> {"cron": "m h dom mon dow",
+    # "snapshot": "all" or "counters,bgp" | "skill": inspection skill id,
+    # optional "devices" (spec, default "all"), "params", "max_age" and
+    # "jitter" (seconds; max_age defaults to half the cron interval)
+    schedule_jobs: dict[str, dict[str, Any]] = Field(
+        default_factory=lambda: {
+            "fleet-snapshot": {"cron": "0 */4 * * *", "snapshot": "all"},
+            "error-counters": {"cron": "*/15 * * * *", "snapshot": "counters"},
+            "device-health": {"cron": "30 2 * * *", "skill": "device-health"},
+        }
+    )
+    # Spread of device start times within a run (capped at half the interval)
+    schedule_jitter: int = Field(default=300, ge=0)
+    # Devices worked on at once by the scheduler: across all jobs, per site
+    schedule_max_concurrency: int = Field(default=10, ge=1)
+    schedule_site_concurrency: int = Field(default=4, ge=1)
 
     # NETCONF support planned for Phase 2+
     # netconf_port: int = 830  # Uncomment when NETCONF is needed
@@ -313,6 +427,18 @@ class Settings(BaseSettings):
     # =========================================================================
     routing_confidence_threshold: float = 0.6
     routing_fallback_skill: str = "quick-query"
+    # Local first-stage router (keyword rules + k-NN over skill examples and
+    # past LLM decisions); the LLM is only asked below routing_local_threshold
+    routing_local_enabled: bool = True
+    routing_local_threshold: float = Field(default=0.8, ge=0.0, le=1.0)
+    routing_knn_k: int = Field(default=5, ge=1)
+    routing_knn_max_examples: int = 500
+    routing_cache_size: int = 512
+    # Append routing decisions to agent_dir/data/routing_log.jsonl for tuning
+    routing_log_enabled: bool = True
+    # Answer recognized "<device> <intent>" queries with smart_query directly,
+    # without an LLM round trip (ambiguous queries still go to the agent)
+    fast_path_enabled: bool = True
 
     # =========================================================================
     # Diagnosis Configuration (from .olav/settings.json)
@@ -320,6 +446,9 @@ class Settings(BaseSettings):
     diagnosis_macro_max_confidence: float = 0.7
     diagnosis_micro_target_confidence: float = 0.9
     diagnosis_max_iterations: int = 5
+    # delegate_tasks: parallel subagent runs and per-task timeout (seconds)
+    subagent_max_concurrency: int = Field(default=4, ge=1)
+    subagent_task_timeout: int = Field(default=300, ge=1)
 
     # =========================================================================
     # Security & Authentication
@@ -14,6 +14,22 @@ Usage:
     # Index learned solutions
     python scripts/index_knowledge.py --source learned --path .olav/knowledge/solutions/
 
+    # Embed the existing corpus with another model (kept alongside the current one)
+    python scripts/index_knowledge.py --reembed --model text-embedding-3-small
+
+    # Compare two embedding models on the same corpus
+    python scripts/index_knowledge.py --compare nomic-embed-text text-embedding-3-small \
+        --query "bgp flapping" --query "crc errors"
+
+    # Build int8 (or binary) quantized vectors and report memory/recall
+    python scripts/index_knowledge.py --quantize int8
+
+    # Build the NumPy vector index and benchmark it against DuckDB
+    python scripts/index_knowledge.py --benchmark-vector-stores
+
+    # Embed capabilities (commands/API endpoints) for semantic command discovery
+    python scripts/index_knowledge.py --capabilities
+
 Phase 4: Knowledge Base Integration
 """
 
@@ -79,6 +95,51 @@ def register_source(conn, source_name: str, source_path: Path, platform: str = N
     return source_id
 
 
+def quantize_vectors(db_path: str | None, model: str, scheme: str) -> None:
+    """Quantize stored vectors for a model and print memory/recall numbers.
+
+    Args:
+        db_path: Knowledge database path (None = default)
+        model: Embedding model whose vectors are quantized
+        scheme: "int8" or "binary"
+    """
+    from olav.core.database import connect_waiting, init_embedding_schema
+    from olav.tools.embedding_quantization import (
+        quantization_report,
+        quantize_missing,
+        rescore_factor,
+    )
+
+    conn = connect_waiting(db_path or str(Path(settings.agent_dir) / "data" / "knowledge.db"))
+    try:
+        init_embedding_schema(conn)
+        print(f"🗜️  Quantizing {model} vectors ({scheme})...")
+        count = quantize_missing(conn, model, scheme)  # type: ignore[arg-type]
+        print(f"   Quantized {count} new vectors")
+
+        report = quantization_report(
+            conn,
+            model,
+            scheme,  # type: ignore[arg-type]
+            rescore_factor=rescore_factor(scheme),  # type: ignore[arg-type]
+        )
+        print("\n📊 Quantization Report:")
+        print(f"   Vectors: {report['vectors']} x {report['dim']}d")
+        print(
+            f"   Memory: {report['float32_mb']} MB float32 -> "
+            f"{report['quantized_mb']} MB {scheme} ({report['compression']}x)"
+        )
+        print(f"   Recall@{report['k']}: {report['recall_at_k']:.1%}")
+        if "exact_latency_ms" in report:
+            print(
+                f"   Latency: {report['exact_latency_ms']} ms exact, "
+                f"{report['two_stage_latency_ms']} ms two-stage"
+            )
+        print(f"\n   Enable with EMBEDDING_QUANTIZATION={scheme}")
+    finally:
+        conn.close()
+
+
 def main() -> None:
     """Main entry point for knowledge indexing."""
     parser = argparse.ArgumentParser(
@@ -93,6 +154,21 @@ Examples:
 
   # Index learned solutions
   %(prog)s --source learned --path .olav/knowledge/solutions/
+
+  # Embed the existing corpus with another model
+  %(prog)s --reembed --model text-embedding-3-small
+
+  # Compare two embedding models
+  %(prog)s --compare nomic-embed-text text-embedding-3-small --query "bgp flapping"
+
+  # Build quantized vectors and report memory/recall
+  %(prog)s --quantize int8
+
+  # Benchmark DuckDB vs NumPy vector store
+  %(prog)s --benchmark-vector-stores
+
+  # Embed capabilities for semantic command discovery
+  %(prog)s --capabilities
         """,
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
@@ -104,12 +180,10 @@ Examples:
     )
     parser.add_argument(
         "--source",
-        required=True,
         help="Source name (e.g., team_wiki, cisco_ios_xe, learned)",
     )
     parser.add_argument(
         "--path",
-        required=True,
         help="Path to markdown files or directory",
     )
     parser.add_argument(
@@ -133,8 +207,103 @@ Examples:
         help="Test embedding connection before indexing",
     )
 
+    parser.add_argument(
+        "--model",
+        default=None,
+        help=f"Embedding model (default: {settings.embedding_model})",
+    )
+    parser.add_argument(
+        "--reembed",
+        action="store_true",
+        help="Embed all chunks that have no vector for --model yet",
+    )
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("MODEL_A", "MODEL_B"),
+        help="Compare two embedding models side by side (requires --query)",
+    )
+    parser.add_argument(
+        "--query",
+        action="append",
+        default=[],
+        help="Evaluation query for --compare (repeatable)",
+    )
+
+    parser.add_argument(
+        "--quantize",
+        choices=["int8", "binary"],
+        help="Build quantized vectors for --model and report memory and recall@10",
+    )
+
+    parser.add_argument(
+        "--benchmark-vector-stores",
+        action="store_true",
+        help="Build the NumPy vector index and compare its latency/results with DuckDB",
+    )
+
+    parser.add_argument(
+        "--capabilities",
+        action="store_true",
+        help="Embed capabilities missing a vector for --model (normally done in background)",
+    )
+
     args = parser.parse_args()
 
+    if args.capabilities:
+        from olav.core.database import get_database
+        from olav.tools.capability_embeddings import embed_missing_capabilities
+
+        model = args.model or settings.embedding_model
+        print(f"🤖 Embedding capabilities with {model}...")
+        count = embed_missing_capabilities(get_database().conn, model)
+        print(f"✅ Embedded {count} capabilities")
+        return
+
+    if args.benchmark_vector_stores:
+        from olav.tools.knowledge_search import benchmark_vector_stores
+
+        report = benchmark_vector_stores(model=args.model)
+        print(f"\n📊 Vector store benchmark ({report['model']}, {report['samples']} queries)")
+        for backend, latency in report["latency_ms"].items():
+            print(f"   {backend}: {latency} ms/query")
+        print(f"   Top-k overlap: {report['overlap']:.0%}")
+        return
+
+    if args.quantize:
+        quantize_vectors(args.db, args.model or settings.embedding_model, args.quantize)
+        return
+
+    if args.reembed:
+        model = args.model or settings.embedding_model
+        print(f"🤖 Re-embedding knowledge chunks with {model}...")
+        stats = KnowledgeEmbedder(db_path=args.db, model=model).reembed_missing()
+        print(f"✅ Embedded {stats['embedded']} chunks ({stats['remaining']} still missing)")
+        return
+
+    if args.compare:
+        if not args.query:
+            parser.error("--compare requires at least one --query")
+        from olav.tools.knowledge_search import compare_embedding_models
+
+        model_a, model_b = args.compare
+        report = compare_embedding_models(args.query, model_a, model_b)
+        print(f"\n📊 Embedding model comparison: {model_a} vs {model_b}")
+        for model, stats in report["models"].items():
+            print(
+                f"   {model}: coverage {stats['coverage']:.0%}, "
+                f"avg latency {stats['avg_latency_ms']:.0f} ms"
+            )
+        for entry in report["queries"]:
+            print(f"\n   Query: {entry['query']} (overlap {entry['overlap']:.0%})")
+            print(f"     {model_a}: {entry[model_a]}")
+            print(f"     {model_b}: {entry[model_b]}")
+        print(f"\n   Average top-k overlap: {report['avg_overlap']:.0%}")
+        return
+
+    if not args.source or not args.path:
+        parser.error("--source and --path are required for indexing")
+
     # Validate path
     source_path = Path(args.path)
     if not source_path.exists():
@@ -158,7 +327,7 @@ Examples:
 
     # Create embedder
     print("🤖 Initializing embedding model (this may take a moment on first run)...")
-    embedder = KnowledgeEmbedder(db_path=args.db)
+    embedder = KnowledgeEmbedder(db_path=args.db, model=args.model)
 
     # Test embedding connection if requested
     if args.test:
@@ -177,9 +346,9 @@ Examples:
         print()
 
     # Register source
-    import duckdb
+    from olav.core.database import connect_waiting
 
-    conn = duckdb.connect(args.db or str(Path(settings.agent_dir) / "data" / "knowledge.db"))
+    conn = connect_waiting(args.db or str(Path(settings.agent_dir) / "data" / "knowledge.db"))
     try:
         source_id = register_source(conn, args.source, source_path, args.platform)
     finally:
@@ -197,69 +197,29 @@ def init_capabilities(olav_dir: Path, reload: bool = False) -> bool:
 
     Args:
         olav_dir: Path to .olav directory
-        reload: If True, delete and reload all commands
+        reload: If True, re-sync all commands even if whitelist files are unchanged
 
     Returns:
         True if initialized successfully
     """
     from olav.core.database import get_database
+    from olav.tools.loader import CapabilitiesLoader
 
     db = get_database()
 
-    # Check if already initialized
+    print("  🔄 Syncing capabilities from whitelist files...")
     try:
-        result = db.conn.execute("SELECT COUNT(*) as count FROM capabilities").fetchall()
-        count = result[0][0]
-        if count > 0 and not reload:
-            print(f"  ⏭️  capabilities.db already has {count} entries")
-            return False
+        counts = CapabilitiesLoader(olav_dir / "imports", database=db).reload(force=reload)
     except Exception as e:
-        print(f"     Error accessing capabilities.db: {e}")
+        print(f"     Error loading capabilities: {e}")
+        return False
 
-    if reload:
-        print("  🔄 Reloading capabilities (deleting old entries)...")
-        try:
-            db.conn.execute("DELETE FROM capabilities WHERE cap_type = 'command'")
-            db.conn.commit()
-            print("     Cleared existing command capabilities")
-        except Exception as e:
-            print(f"     Warning: Could not clear capabilities: {e}")
-
-    print("  🔄 Loading capabilities from whitelist files...")
-
-    # Load whitelist files
-    whitelist_dir = olav_dir / "imports" / "commands"
-    total_loaded = 0
-
-    if whitelist_dir.exists():
-        for platform_file in whitelist_dir.glob("*.txt"):
-            platform = platform_file.stem
-
-            commands: list[str] = []
-            for line in platform_file.read_text().split("\n"):
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    commands.append(line)
-
-            # Load into database
-            count = 0
-            for cmd in commands:
-                try:
-                    db.insert_capability(
-                        cap_type="command",
-                        platform=platform,
-                        name=cmd,
-                        source_file=str(platform_file),
-                        is_write=False,
-                    )
-                    count += 1
-                except Exception as e:
-                    print(f"     Warning parsing {cmd}: {e}")
-
-            print(f"     Loaded {count} commands for {platform}")
-            total_loaded += count
-
-    print(f"  ✅ Loaded {total_loaded} total capabilities")
+    if counts["unchanged"]:
+        print(f"  ⏭️  capabilities.db up to date ({counts['total']} entries)")
+        return False
+
+    print(f"     +{counts['added']} / -{counts['removed']} rows")
+    print(f"  ✅ Loaded {counts['total']} total capabilities")
     return True
 
 
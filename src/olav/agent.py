@@ -15,13 +15,21 @@ from olav.core.llm import LLMFactory
 from olav.core.skill_loader import get_skill_loader
 from olav.core.storage import get_storage_permissions
 from olav.core.subagent_manager import format_subagent_descriptions, get_subagent_middleware
+from olav.tools.artifact_store import artifact_grep, artifact_page, artifact_slice
 from olav.tools.capabilities import api_call, search_capabilities
+from olav.tools.counter_rates import counter_rates
+from olav.tools.endpoint_store import locate_host
 from olav.tools.inspection_tools import generate_report
 from olav.tools.learning_tools import update_aliases_tool
 from olav.tools.loader import reload_capabilities
+from olav.tools.metrics_store import metric_trend
 from olav.tools.network import list_devices, nornir_execute
+from olav.tools.path_trace import trace_path
 from olav.tools.research_tool import research_problem_tool
+from olav.tools.route_store import route_lookup
 from olav.tools.smart_query import smart_query
+from olav.tools.snapshot import snapshot_query, take_snapshot
+from olav.tools.snapshot_diff import snapshot_diff
 from olav.tools.storage_tools import (
     list_saved_files,
     read_file,
@@ -29,7 +37,8 @@ from olav.tools.storage_tools import (
     save_tech_support,
     write_file,
 )
-from olav.tools.task_tools import delegate_task
+from olav.tools.task_tools import delegate_task, delegate_tasks
+from olav.tools.topology import topology_query
 
 if TYPE_CHECKING:
     from langgraph.graph.state import CompiledStateGraph
@@ -93,11 +102,22 @@ You are OLAV, an AI for network operations. Execute queries efficiently.
 - `batch_query(devices, intent)` - Query multiple devices. Use "all" for all devices.
   Examples: batch_query("R1,R2", "bgp"), batch_query("all", "version")
 - `list_devices()` - Show all available devices
+- `snapshot_query(data_type, where=...)` - Fleet questions from stored snapshots
+  (e.g. snapshot_query("version", where="version~^15\\.2")); no device commands
+- `snapshot_diff(base, target)` - What changed between snapshots (target="live" for now)
+- `route_lookup(target)` - Which devices route an IP/prefix and via what next hop (stored tables)
+- `locate_host(target)` - Which switch port an IP/MAC is on (stored MAC/ARP/LLDP tables)
+- `topology_query(mode, device)` - Neighbors, paths and blast radius from stored LLDP/CDP data
+- `trace_path(source, destination)` - Forwarding path with per-hop evidence from stored state
+- `metric_trend(device, metric, days)` - CPU/memory/error/BGP trends from past inspections
+- `counter_rates(device, counters)` - Are interface error counters (CRC, drops...) increasing
 
 ## Secondary Tools (Only if needed)
 - `search_capabilities(query, platform)` - Find specific commands
 - `nornir_execute(device, command)` - Run a specific command
 - `api_call(system, method, endpoint)` - Call external APIs
+- `artifact_grep(handle, pattern)` / `artifact_page(handle, page)` /
+  `artifact_slice(handle, start, end)` - Read large outputs returned as "[Artifact art-...]"
 
 ## Quick Reference
 | Intent | Example Query | Auto Command |
@@ -159,8 +179,23 @@ You are OLAV, an AI for network operations. Execute queries efficiently.
         save_device_config,  # Save device configs (requires HITL)
         save_tech_support,  # Save tech-support output (requires HITL)
         list_saved_files,  # List saved files
+        # Network state snapshots: fleet sweep + offline lookups
+        take_snapshot,
+        snapshot_query,
+        snapshot_diff,
+        route_lookup,
+        locate_host,
+        topology_query,
+        trace_path,
+        metric_trend,
+        counter_rates,
+        # Large outputs are stored out-of-band and read back by handle
+        artifact_page,
+        artifact_grep,
+        artifact_slice,
         # Workflow commands support
         delegate_task,  # Subagent delegation for /analyze workflow
+        delegate_tasks,  # Parallel subagent fan-out (e.g. per suspect device)
         # Note: Batch backup by group/role/site is skill-driven, not tool-driven
         # Agent uses list_devices + nornir_execute + save_device_config combo
     ]
@@ -183,6 +218,18 @@ You are OLAV, an AI for network operations. Execute queries efficiently.
             "save_device_config": True,  # Config backup requires approval
             "save_tech_support": True,  # Tech-support save requires approval
             "list_saved_files": False,  # Listing is read-only
+            "artifact_page": False,  # Read-only: stored tool outputs
+            "artifact_grep": False,
+            "artifact_slice": False,
+            "take_snapshot": False,  # Read-only: whitelisted show commands
+            "snapshot_query": False,  # Read-only: local snapshot store
+            "snapshot_diff": False,  # Read-only (target="live" runs take_snapshot)
+            "route_lookup": False,  # Read-only: local route index
+            "locate_host": False,  # Read-only: local MAC/ARP index
+            "topology_query": False,  # Read-only: local topology graph
+            "trace_path": False,  # Read-only (collects show output only for missing state)
+            "metric_trend": False,  # Read-only: local metrics store
+            "counter_rates": False,  # Read-only: one show command per sample
         }
     else:
         # HITL disabled - all operations proceed without approval (for testing)
@@ -280,13 +327,16 @@ Your responsibilities:
 4. Identify failure domains (which area/device has issues)
 
 Working method: Start from a global view, progressively narrow down the scope.
+Use topology_query and trace_path before running neighbor commands hop by hop.
 
 Available tools:
+- topology_query: Neighbors, shortest paths and blast radius from collected LLDP/CDP data
+- trace_path: Hop-by-hop forwarding path from stored routes/ARP/topology
 - nornir_execute: Execute commands on network devices
 - list_devices: List available devices
 - search_capabilities: Find available commands
 """,
-        tools=[nornir_execute, list_devices, search_capabilities],
+        tools=[topology_query, trace_path, nornir_execute, list_devices, search_capabilities],
     )
 
 
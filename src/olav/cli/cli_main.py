@@ -5,6 +5,7 @@ Supports:
   - uv run olav              # Interactive mode (default)
   - uv run olav query "..."  # Single query
   - uv run olav devices      # List devices
+  - uv run olav scheduler    # Run scheduled inspections/snapshots
   - uv run olav --help       # Show help
 """
 
@@ -231,11 +232,16 @@ def run_interactive_loop(
     from config.settings import settings
     from olav.cli.commands import execute_command
     from olav.cli.input_parser import parse_input
+    from olav.core.database import release_databases
+    from olav.core.fast_path import try_fast_path
 
     print("Type /help for available commands or just ask a question.\n")
 
     while True:
         try:
+            # Let `olav scheduler` write to capabilities.db/snapshots.db while idle
+            release_databases()
+
             # Get user input (synchronous - prompt-toolkit handles its own event loop)
             user_input = session.prompt_sync("OLAV> ")
 
@@ -290,6 +296,16 @@ def run_interactive_loop(
                     print(f"❌ Error executing command: {e}")
                 continue
 
+            # Simple "<device> <intent>" lookups skip the agent entirely
+            fast = try_fast_path(processed_text)
+            if fast:
+                match, output = fast
+                print(f"⚡ {match.target}: {', '.join(sorted(set(match.commands.values())))}")
+                print(output)
+                memory.add("user", processed_text)
+                memory.add("assistant", output)
+                continue
+
             # Handle normal queries
             # Store in memory
             memory.add("user", processed_text)
@@ -344,10 +360,19 @@ def query(
         olav query "Check R2 BGP" --verbose
     """
     from olav.agent import create_olav_agent
+    from olav.core.fast_path import try_fast_path
 
     console.print(Panel(f"[bold cyan]Query[/bold cyan]: {query_text}", border_style="cyan"))
 
     try:
+        fast = try_fast_path(query_text)
+        if fast:
+            match, output = fast
+            commands = ", ".join(sorted(set(match.commands.values())))
+            console.print(f"[dim]⚡ {match.target}: {commands}[/dim]")
+            print(output)
+            return
+
         agent = create_olav_agent(debug=debug)
         messages = [{"role": "user", "content": query_text}]
 
@@ -382,6 +407,70 @@ def devices() -> None:
         raise typer.Exit(1) from None
 
 
+@app.command()
+def scheduler(
+    run: str = typer.Option("", "--run", help="Run one job now and exit"),
+    status: bool = typer.Option(False, "--status", help="Show jobs and their last run"),
+) -> None:
+    """Run scheduled inspections and snapshot collections until interrupted.
+
+    Jobs come from the SCHEDULE_JOBS setting (cron schedule plus snapshot
+    data types or an inspection skill).
+
+    Examples:
+        olav scheduler
+        olav scheduler --status
+        olav scheduler --run error-counters
+    """
+    import signal
+
+    from olav.core.database import use_short_lived_connections
+    from olav.tools.scheduler import Scheduler, format_status, load_jobs
+
+    try:
+        jobs = load_jobs()
+    except ValueError as e:
+        console.print(f"[bold red]❌ {e}[/bold red]")
+        raise typer.Exit(1) from None
+    service = Scheduler(jobs)
+    # Runs alongside interactive CLI sessions (see olav.tools.scheduler)
+    use_short_lived_connections()
+
+    if status:
+        console.print(
+            Panel(
+                format_status(service),
+                title="[bold cyan]Scheduled Jobs[/bold cyan]",
+                border_style="cyan",
+            )
+        )
+        return
+
+    if run:
+        if run not in service.jobs:
+            console.print(
+                f"[bold red]❌ Unknown job '{run}' (known: {', '.join(service.jobs)})[/bold red]"
+            )
+            raise typer.Exit(1)
+        result = service.run_job(service.jobs[run])
+        console.print(result.summary())
+        if result.error:
+            raise typer.Exit(1)
+        return
+
+    if not jobs:
+        console.print("[yellow]No scheduled jobs (set SCHEDULE_JOBS)[/yellow]")
+        return
+    console.print(f"[bold cyan]⏱ Scheduler started[/bold cyan]: {', '.join(service.jobs)}")
+    signal.signal(signal.SIGTERM, lambda *_: service.stop())
+    try:
+        service.run_forever()
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Stopping: waiting for running devices...[/yellow]")
+        service.stop()
+        service.wait()
+
+
 @app.command()
 def version() -> None:
     """Show OLAV version and information."""
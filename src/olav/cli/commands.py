@@ -266,11 +266,95 @@ async def cmd_reload(args: str) -> str:
 
         loader = get_skill_loader()
         loader.load_all()  # Reload skills by re-running load_all
-        return "✅ Skills and capabilities reloaded successfully"
+
+        # Diff-based: a no-op unless files under imports/ changed
+        from olav.tools.loader import reload_capabilities
+
+        counts = reload_capabilities()
+
+        # Pick up whitelist and audit-history changes in the intent index
+        from olav.core.fast_path import clear_fast_path_cache
+        from olav.tools.command_index import rebuild_command_index
+        from olav.tools.snapshot import clear_snapshot_command_cache
+
+        rebuild_command_index()
+        clear_fast_path_cache()
+        clear_snapshot_command_cache()
+        return (
+            f"✅ Skills and capabilities reloaded successfully "
+            f"({counts['total']} capabilities, +{counts['added']}/-{counts['removed']})"
+        )
     except Exception as e:
         return f"Error reloading: {str(e)}"
 
 
+@register_command("snapshot")
+async def cmd_snapshot(args: str) -> str:
+    """Collect or list network state snapshots.
+
+    Usage:
+        /snapshot [devices] [--types version,routes,...]
+        /snapshot list
+        /snapshot diff [base] [target|live] [--types version,routes,...]
+        /snapshot export <snapshot_id> [directory]
+
+    Examples:
+        /snapshot
+        /snapshot role:core --types version,bgp
+        /snapshot diff                       (previous vs newest snapshot)
+        /snapshot diff snap-20250101-020000-ab12 live
+        /snapshot export snap-20250101-020000-ab12 exports/
+
+    Collected data answers snapshot_query and, within SNAPSHOT_MAX_AGE,
+    smart_query without touching the devices.
+    """
+    import asyncio
+    from pathlib import Path
+
+    parts = args.split()
+    try:
+        from olav.tools.snapshot import get_snapshot_store, snapshot_query, take_snapshot
+
+        if parts and parts[0] == "list":
+            return str(snapshot_query.invoke({}))
+
+        types = ""
+        if "--types" in parts:
+            index = parts.index("--types")
+            types = parts[index + 1] if index + 1 < len(parts) else ""
+            parts = parts[:index] + parts[index + 2 :]
+
+        if parts and parts[0] == "diff":
+            from olav.tools.snapshot_diff import snapshot_diff
+
+            diff_args = {"data_types": types, "limit": 200}
+            if len(parts) > 1:
+                diff_args["base"] = parts[1]
+            if len(parts) > 2:
+                diff_args["target"] = parts[2]
+            return str(await asyncio.to_thread(snapshot_diff.invoke, diff_args))
+
+        if parts and parts[0] == "export":
+            if len(parts) < 2:
+                return "Usage: /snapshot export <snapshot_id> [directory]"
+            from config.settings import settings
+
+            target = (
+                Path(parts[2])
+                if len(parts) > 2
+                else Path(settings.agent_dir) / "data" / "snapshots" / parts[1]
+            )
+            files = get_snapshot_store().export_parquet(parts[1], target)
+            return f"✅ Exported {len(files)} Parquet files to {target}"
+
+        devices = ",".join(parts) or "all"
+        return str(
+            await asyncio.to_thread(take_snapshot.invoke, {"devices": devices, "data_types": types})
+        )
+    except Exception as e:
+        return f"Error running snapshot: {str(e)}"
+
+
 @register_command("clear")
 async def cmd_clear(args: str) -> str:
     """Clear session memory.
@@ -297,15 +381,26 @@ async def cmd_history(args: str) -> str:
     """
     try:
         from olav.cli.memory import AgentMemory
+        from olav.core.llm import LLMFactory
 
         memory = AgentMemory()
         stats = memory.get_stats()
-        return f"""Session History Stats:
+        output = f"""Session History Stats:
   Total Messages: {stats["total_messages"]}
   User Messages: {stats["user_messages"]}
   Assistant Messages: {stats["assistant_messages"]}
   Tool Messages: {stats["tool_messages"]}
   Memory File: {stats["memory_file"]}"""
+
+        llm_stats = LLMFactory.get_pool_stats()
+        if llm_stats:
+            output += "\n\nLLM Clients:"
+            for label, m in llm_stats.items():
+                output += (
+                    f"\n  {label}: {m['calls']} calls, avg {m['avg_latency_ms']}ms, "
+                    f"{m['input_tokens']} in / {m['output_tokens']} out tokens"
+                )
+        return output
     except Exception as e:
         return f"Error showing history: {str(e)}"
 
@@ -335,6 +430,7 @@ async def cmd_help(args: str) -> str:
     /analyze [src] [dst] [options]     - Analyze network path
     /inspect [scope] [--layer] [--report] - Device inspection
     /query [device] [query]            - Quick device query
+    /snapshot [devices] [--types]      - Collect network state snapshot
     /search <query>                    - Web search for troubleshooting
 
   Device Commands:
@@ -4,11 +4,177 @@ This module provides the core database functionality for storing and querying
 network capabilities, audit logs, and command caches.
 """
 
+import hashlib
+import threading
+import time
+import weakref
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager
 from pathlib import Path
 from typing import Any
 
 import duckdb
 
+# Columns that define a capability row (content_hash is derived from these)
+CAPABILITY_COLUMNS = (
+    "type",
+    "platform",
+    "name",
+    "method",
+    "description",
+    "parameters",
+    "is_write",
+    "source_file",
+)
+
+
+def capability_hash(row: dict[str, Any]) -> str:
+    """Content hash of a capability row, used to diff reloads.
+
+    Args:
+        row: Capability fields keyed by CAPABILITY_COLUMNS
+
+    Returns:
+        Hex digest identifying the row content
+    """
+    payload = "\x1f".join(
+        "" if row.get(column) is None else str(row.get(column)) for column in CAPABILITY_COLUMNS
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# =============================================================================
+# Shared database files
+# =============================================================================
+
+# Only one process can have a DuckDB file open read-write. The interactive CLI
+# and `olav scheduler` share capabilities.db and snapshots.db, so both close
+# the files when idle and wait for each other when opening them.
+_open_files: "weakref.WeakSet[DuckDBFile]" = weakref.WeakSet()
+_short_lived = False
+
+
+def connect_waiting(path: str | Path, read_only: bool = False) -> duckdb.DuckDBPyConnection:
+    """Connect to a DuckDB file, waiting while another process holds its lock.
+
+    Args:
+        path: Database file
+        read_only: Open read-only (other processes may read at the same time)
+
+    Returns:
+        New connection
+
+    Raises:
+        duckdb.IOException: If the file is still locked after ``db_lock_timeout`` seconds
+    """
+    from config.settings import settings
+
+    deadline = time.monotonic() + settings.db_lock_timeout
+    delay = 0.05
+    while True:
+        try:
+            return duckdb.connect(str(path), read_only=read_only)
+        except duckdb.IOException as e:
+            # "Could not set lock on file ...": another process has it open
+            if "lock" not in str(e).lower() or time.monotonic() >= deadline:
+                raise
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+
+
+class DuckDBFile:
+    """A DuckDB file opened on first use and closed again by release().
+
+    Opening waits up to ``db_lock_timeout`` seconds while another process
+    holds the file. Threads other than the one that opened it get their own
+    cursor. Work that must not lose its connection to a release from another
+    thread runs inside hold(); the release then happens when the last hold
+    ends. With use_short_lived_connections(), every last hold closes the file.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn: duckdb.DuckDBPyConnection | None = None
+        self._owner_thread = 0
+        self._generation = 0
+        self._local = threading.local()
+        self._holds = 0
+        self._release_pending = False
+        _open_files.add(self)
+
+    @property
+    def conn(self) -> duckdb.DuckDBPyConnection:
+        """Connection for the calling thread, opening the file if needed."""
+        with self._lock:
+            conn = self._conn or self._open()
+            if threading.get_ident() == self._owner_thread:
+                return conn
+            cursor = getattr(self._local, "cursor", None)
+            if cursor is None or self._local.generation != self._generation:
+                cursor = conn.cursor()
+                self._local.cursor = cursor
+                self._local.generation = self._generation
+            return cursor
+
+    @property
+    def generation(self) -> int:
+        """Number of times the file has been opened (changes on every reopen)."""
+        return self._generation
+
+    def _open(self) -> duckdb.DuckDBPyConnection:
+        conn = connect_waiting(self.path)
+        self._conn = conn
+        self._owner_thread = threading.get_ident()
+        self._generation += 1
+        return conn
+
+    @contextmanager
+    def hold(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Keep the file open for a unit of work.
+
+        Yields:
+            Connection for the calling thread
+        """
+        with self._lock:
+            self._holds += 1
+        try:
+            yield self.conn
+        finally:
+            with self._lock:
+                self._holds -= 1
+                if not self._holds and (self._release_pending or _short_lived):
+                    self.close()
+
+    def release(self) -> None:
+        """Close the file so another process can open it (deferred while held)."""
+        with self._lock:
+            if self._holds:
+                self._release_pending = True
+            else:
+                self.close()
+
+    def close(self) -> None:
+        """Close the connection (and the cursors of other threads) now."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._release_pending = False
+
+
+def release_databases() -> None:
+    """Release every shared database file (the CLI calls this between queries)."""
+    for db_file in list(_open_files):
+        db_file.release()
+
+
+def use_short_lived_connections() -> None:
+    """Close shared database files whenever no work holds them (``olav scheduler``)."""
+    global _short_lived
+    _short_lived = True
+    release_databases()
+
 
 class OlavDatabase:
     """OLAV database manager using DuckDB.
@@ -33,11 +199,29 @@ class OlavDatabase:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Connect to DuckDB
-        self.conn = duckdb.connect(str(self.db_path))
+        # Connect to DuckDB (opened on use, see DuckDBFile)
+        self._file = DuckDBFile(self.db_path)
 
         # Initialize schema
-        self._init_schema()
+        with self.hold():
+            self._init_schema()
+
+    @property
+    def conn(self) -> duckdb.DuckDBPyConnection:
+        """Connection for the calling thread.
+
+        DuckDB connections are not thread-safe. Threads other than the one that
+        opened the database (concurrent tool calls) get their own cursor.
+        """
+        return self._file.conn
+
+    def hold(self) -> AbstractContextManager[duckdb.DuckDBPyConnection]:
+        """Keep the database open for a unit of work (see DuckDBFile.hold)."""
+        return self._file.hold()
+
+    def release(self) -> None:
+        """Close the database file until its next use."""
+        self._file.release()
 
     def _init_schema(self) -> None:
         """Create database tables if they don't exist."""
@@ -55,7 +239,32 @@ class OlavDatabase:
                 description TEXT,
                 parameters TEXT,
                 is_write BOOLEAN DEFAULT FALSE,
-                source_file TEXT NOT NULL
+                source_file TEXT NOT NULL,
+                content_hash TEXT
+            )
+        """)
+
+        # Databases created before diff-based reloads lack content_hash.
+        # DuckDB refuses ALTER TABLE while indexes depend on the table, so the
+        # indexes are dropped here and recreated below.
+        existing_columns = {
+            row[0]
+            for row in self.conn.execute(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_name = 'capabilities'"
+            ).fetchall()
+        }
+        if "content_hash" not in existing_columns:
+            for index in ("idx_cap_type", "idx_cap_platform", "idx_cap_name"):
+                self.conn.execute(f"DROP INDEX IF EXISTS {index}")
+            self.conn.execute("ALTER TABLE capabilities ADD COLUMN content_hash TEXT")
+
+        # Hash of each imports/ file at the last reload
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS capability_sources (
+                source_file TEXT PRIMARY KEY,
+                file_hash TEXT NOT NULL,
+                loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
 
@@ -117,54 +326,48 @@ class OlavDatabase:
             )
         """)
 
+        # Capability vectors for semantic search, keyed by row content so
+        # unchanged rows keep their vectors across reloads
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS capability_embeddings (
+                content_hash TEXT NOT NULL,
+                model TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                embedding FLOAT[] NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (content_hash, model)
+            )
+        """)
+
         # Auto-load command whitelist if capabilities table is empty or has few commands
         self._ensure_command_whitelist_loaded()
 
     def _ensure_command_whitelist_loaded(self) -> None:
-        """Ensure command whitelist is loaded into capabilities table."""
-        # Check if we have enough commands loaded
+        """Ensure command whitelist is loaded into capabilities table.
+
+        Only an empty (or nearly empty) table triggers the diff-based
+        CapabilitiesLoader; later changes to imports/ are picked up by an
+        explicit reload, so opening the database stays cheap.
+        """
         result = self.conn.execute(
             "SELECT COUNT(*) FROM capabilities WHERE type = 'command'"
         ).fetchone()
-        command_count = result[0] if result else 0
-
-        if command_count >= 10:
+        if result and result[0] >= 10:
             # Already have commands loaded
             return
 
-        # Load from whitelist files
         from config.settings import settings
+        from olav.tools.loader import CapabilitiesLoader
 
-        whitelist_dir = Path(settings.agent_dir) / "imports" / "commands"
-        if not whitelist_dir.exists():
+        imports_dir = Path(settings.agent_dir) / "imports"
+        if not imports_dir.exists():
             return
 
-        for platform_file in whitelist_dir.glob("*.txt"):
-            if platform_file.name == "blacklist.txt":
-                continue
-
-            platform = platform_file.stem
-
-            for line in platform_file.read_text(encoding="utf-8").split("\n"):
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
-
-                # Skip HITL commands (those starting with !)
-                is_write = line.startswith("!")
-                cmd = line[1:] if is_write else line
-
-                try:
-                    self.insert_capability(
-                        cap_type="command",
-                        platform=platform,
-                        name=cmd,
-                        source_file=str(platform_file),
-                        is_write=is_write,
-                    )
-                except Exception:  # noqa: S110
-                    # Ignore duplicates
-                    pass
+        try:
+            CapabilitiesLoader(imports_dir, database=self).reload()
+        except Exception:  # noqa: S110
+            # Broken import files must not prevent opening the database
+            pass
 
     def search_capabilities(
         self,
@@ -173,7 +376,12 @@ class OlavDatabase:
         platform: str | None = None,
         limit: int = 20,
     ) -> list[dict[str, Any]]:
-        """Search capabilities by keyword.
+        """Search capabilities by keyword, ranked by relevance.
+
+        Uses the in-memory BM25 index (names, descriptions, API parameters,
+        with typo tolerance and platform boosting), fused with vector
+        similarity over capability embeddings when available. Falls back to a
+        substring match for queries neither can use (e.g. partial API paths).
 
         Args:
             query: Search keyword
@@ -182,8 +390,39 @@ class OlavDatabase:
             limit: Maximum results to return
 
         Returns:
-            List of matching capabilities
+            List of matching capabilities with a relevance "score", best first
         """
+        from config.settings import settings
+        from olav.tools.capability_embeddings import (
+            fuse_capability_results,
+            semantic_enabled,
+            vector_search_capabilities,
+        )
+        from olav.tools.capability_search import get_capability_search_index
+
+        ranked = get_capability_search_index().search(
+            self.conn,
+            query,
+            cap_type=cap_type,
+            platform=platform,
+            limit=limit,
+            platform_boost=settings.capability_platform_boost,
+        )
+
+        if semantic_enabled():
+            try:
+                semantic = vector_search_capabilities(self.conn, query, cap_type, platform, limit)
+            except Exception:
+                # Embedding service unavailable - keyword results only
+                semantic = []
+            if semantic:
+                return fuse_capability_results(
+                    ranked, semantic, limit, vector_weight=settings.capability_vector_weight
+                )
+
+        if ranked:
+            return ranked
+
         # Build base query
         sql = """
             SELECT type, platform, name, method, description, parameters, is_write
@@ -191,7 +430,7 @@ class OlavDatabase:
             WHERE (name ILIKE ? OR description ILIKE ?)
         """
         pattern = f"%{query}%"
-        params = [pattern, pattern]
+        params: list[Any] = [pattern, pattern]
 
         # Add platform filter
         if platform:
@@ -203,12 +442,13 @@ class OlavDatabase:
             sql += " AND type = ?"
             params.append(cap_type)
 
-        sql += f" LIMIT {limit}"
+        sql += " ORDER BY length(name) LIMIT ?"
+        params.append(limit)
 
         results = self.conn.execute(sql, params).fetchall()
         columns = ["type", "platform", "name", "method", "description", "parameters", "is_write"]
 
-        return [dict(zip(columns, row, strict=False)) for row in results]
+        return [{**dict(zip(columns, row, strict=False)), "score": 0.0} for row in results]
 
     def is_command_allowed(self, command: str, platform: str) -> bool:
         """Check if a command is in the whitelist.
@@ -223,13 +463,14 @@ class OlavDatabase:
         cmd_lower = command.lower().strip()
 
         # Get all command patterns for this platform
-        patterns = self.conn.execute(
-            """
-            SELECT name FROM capabilities
-            WHERE type = 'command' AND platform = ?
-        """,
-            [platform],
-        ).fetchall()
+        with self.hold() as conn:
+            patterns = conn.execute(
+                """
+                SELECT name FROM capabilities
+                WHERE type = 'command' AND platform = ?
+            """,
+                [platform],
+            ).fetchall()
 
         for (pattern,) in patterns:
             pattern = pattern.lower().strip()
@@ -268,21 +509,128 @@ class OlavDatabase:
             parameters: JSON string of parameters (for APIs)
             is_write: Whether this requires HITL approval
         """
+        row = {
+            "type": cap_type,
+            "platform": platform,
+            "name": name,
+            "method": method,
+            "description": description,
+            "parameters": parameters,
+            "is_write": is_write,
+            "source_file": source_file,
+        }
         self.conn.execute(
             """
             INSERT INTO capabilities
-            (type, platform, name, method, description, parameters, is_write, source_file)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            (type, platform, name, method, description, parameters, is_write, source_file,
+             content_hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
-            [cap_type, platform, name, method, description, parameters, is_write, source_file],
+            [*row.values(), capability_hash(row)],
         )
 
     def clear_capabilities(self) -> None:
         """Clear all capabilities from the database.
 
-        Used during 'olav reload' operations.
+        Also forgets source file hashes so the next reload re-imports everything.
         """
         self.conn.execute("DELETE FROM capabilities")
+        self.conn.execute("DELETE FROM capability_sources")
+
+    def get_capability_source_hashes(self) -> dict[str, str]:
+        """Get the imports/ file hashes recorded at the last reload.
+
+        Returns:
+            Mapping of source file (relative to imports/) -> content hash
+        """
+        rows = self.conn.execute("SELECT source_file, file_hash FROM capability_sources").fetchall()
+        return dict(rows)
+
+    def count_capabilities(self) -> dict[str, int]:
+        """Count capabilities per type.
+
+        Returns:
+            Mapping of type ("command", "api") -> count
+        """
+        rows = self.conn.execute("SELECT type, COUNT(*) FROM capabilities GROUP BY type").fetchall()
+        return dict(rows)
+
+    def sync_capabilities(
+        self, rows: list[dict[str, Any]], source_hashes: dict[str, str]
+    ) -> dict[str, int]:
+        """Make the capabilities table match ``rows`` in one bulk transaction.
+
+        Rows are loaded into a temporary table with a single statement, then
+        stored rows whose content hash is no longer present are deleted and
+        new hashes inserted; unchanged rows (and their ids) are left alone.
+
+        Args:
+            rows: Parsed capability rows keyed by CAPABILITY_COLUMNS
+            source_hashes: Source file -> content hash, recorded for the next reload
+
+        Returns:
+            Dictionary with counts: {"added": N, "removed": M}
+        """
+        columns = {column: [row.get(column) for row in rows] for column in CAPABILITY_COLUMNS}
+        columns["is_write"] = [bool(value) for value in columns["is_write"]]
+        hashes = [capability_hash(row) for row in rows]
+
+        self.conn.execute("BEGIN TRANSACTION")
+        try:
+            self.conn.execute("""
+                CREATE OR REPLACE TEMP TABLE incoming_capabilities (
+                    type TEXT, platform TEXT, name TEXT, method TEXT, description TEXT,
+                    parameters TEXT, is_write BOOLEAN, source_file TEXT, content_hash TEXT
+                )
+            """)
+            if rows:
+                self.conn.execute(
+                    """
+                    INSERT INTO incoming_capabilities
+                    SELECT unnest(?::TEXT[]), unnest(?::TEXT[]), unnest(?::TEXT[]),
+                           unnest(?::TEXT[]), unnest(?::TEXT[]), unnest(?::TEXT[]),
+                           unnest(?::BOOLEAN[]), unnest(?::TEXT[]), unnest(?::TEXT[])
+                """,
+                    [*columns.values(), hashes],
+                )
+
+            removed_row = self.conn.execute("""
+                DELETE FROM capabilities
+                WHERE content_hash IS NULL
+                   OR content_hash NOT IN (SELECT content_hash FROM incoming_capabilities)
+            """).fetchone()
+            added_row = self.conn.execute("""
+                INSERT INTO capabilities
+                (type, platform, name, method, description, parameters, is_write, source_file,
+                 content_hash)
+                SELECT type, platform, name, method, description, parameters, is_write,
+                       source_file, content_hash
+                FROM (SELECT DISTINCT ON (content_hash) * FROM incoming_capabilities)
+                WHERE content_hash NOT IN (
+                    SELECT content_hash FROM capabilities WHERE content_hash IS NOT NULL
+                )
+            """).fetchone()
+
+            self.conn.execute("DELETE FROM capability_sources")
+            if source_hashes:
+                self.conn.execute(
+                    """
+                    INSERT INTO capability_sources (source_file, file_hash)
+                    SELECT unnest(?::TEXT[]), unnest(?::TEXT[])
+                """,
+                    [list(source_hashes.keys()), list(source_hashes.values())],
+                )
+
+            self.conn.execute("DROP TABLE incoming_capabilities")
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        return {
+            "added": added_row[0] if added_row else 0,
+            "removed": removed_row[0] if removed_row else 0,
+        }
 
     def log_execution(
         self,
@@ -305,14 +653,15 @@ class OlavDatabase:
             duration_ms: Execution time in milliseconds
             user: Optional user identifier
         """
-        self.conn.execute(
-            """
-            INSERT INTO audit_logs
-            (thread_id, device, command, output, success, duration_ms, user)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """,
-            [thread_id, device, command, output, success, duration_ms, user],
-        )
+        with self.hold() as conn:
+            conn.execute(
+                """
+                INSERT INTO audit_logs
+                (thread_id, device, command, output, success, duration_ms, user)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+                [thread_id, device, command, output, success, duration_ms, user],
+            )
 
     def get_command_cache(self, device: str, command: str) -> str | None:
         """Get cached command output if available and not expired.
@@ -366,7 +715,7 @@ class OlavDatabase:
 
     def close(self) -> None:
         """Close the database connection."""
-        self.conn.close()
+        self._file.close()
 
     def __enter__(self) -> "OlavDatabase":
         """Context manager entry."""
@@ -551,4 +900,82 @@ def init_knowledge_db(db_path: str | None = None) -> duckdb.DuckDBPyConnection:
         ON knowledge_chunks(platform)
     """)
 
+    init_embedding_schema(conn)
+
     return conn
+
+
+# Model that produced the legacy knowledge_chunks.embedding FLOAT[768] column
+LEGACY_EMBEDDING_MODEL = "nomic-embed-text"
+
+
+def vector_literal(vector: list[float]) -> str:
+    """Vector as a "[x, y, ...]" string parameter, cast in SQL (``?::FLOAT[768]``).
+
+    Binding a Python list parameter converts it value by value (~100 ms for
+    768 dimensions); parsing the string is ~3 ms.
+    """
+    return "[" + ",".join(repr(float(x)) for x in vector) + "]"
+
+
+def init_embedding_schema(conn: duckdb.DuckDBPyConnection) -> None:
+    """Create the per-model embedding table and migrate legacy vectors.
+
+    Embeddings are stored per (chunk, model) with their dimension, so several
+    models can coexist on the same corpus and the active one is selected at
+    query time. Vectors from the legacy fixed-width ``knowledge_chunks.embedding``
+    column are copied over once under LEGACY_EMBEDDING_MODEL; the old column is
+    left in place (non-destructive).
+
+    Args:
+        conn: Writable DuckDB connection to the knowledge database
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS knowledge_embeddings (
+            chunk_id INTEGER NOT NULL,
+            model TEXT NOT NULL,
+            dim INTEGER NOT NULL,
+            embedding FLOAT[] NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (chunk_id, model)
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_embeddings_model
+        ON knowledge_embeddings(model, dim)
+    """)
+
+    # Optional quantized copies (int8 codes or sign bits) for first-pass search
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS knowledge_embeddings_q (
+            chunk_id INTEGER NOT NULL,
+            model TEXT NOT NULL,
+            scheme TEXT NOT NULL,
+            dim INTEGER NOT NULL,
+            codes TINYINT[],
+            bits BIT,
+            scale FLOAT,
+            PRIMARY KEY (chunk_id, model, scheme)
+        )
+    """)
+
+    # One-time migration of the legacy FLOAT[768] column
+    try:
+        conn.execute(
+            """
+            INSERT INTO knowledge_embeddings (chunk_id, model, dim, embedding)
+            SELECT c.id, ?, 768, c.embedding::FLOAT[]
+            FROM knowledge_chunks c
+            WHERE c.embedding IS NOT NULL
+              AND NOT EXISTS (
+                  SELECT 1 FROM knowledge_embeddings e
+                  WHERE e.chunk_id = c.id AND e.model = ?
+              )
+        """,
+            [LEGACY_EMBEDDING_MODEL, LEGACY_EMBEDDING_MODEL],
+        )
+    except (duckdb.CatalogException, duckdb.BinderException):
+        # knowledge_chunks is missing or predates the embedding column - nothing to migrate
+        pass
+
+    conn.commit()
@@ -0,0 +1,291 @@
+"""LLM-free fast path for simple device queries.
+
+Recognizes "<device(s)> <intent>" queries such as "show R1 interfaces",
+"R1 的 BGP 邻居" or "all devices version" and runs smart_query directly,
+skipping agent construction and every LLM round trip. Anything that is not
+an unambiguous read-only lookup returns None and goes to the agent:
+
+- no known device (inventory names, hostnames, aliases.md) is mentioned
+- analysis/write wording ("why", "configure", "排查", "修改", ...)
+- words left over that are neither fillers nor known intent vocabulary
+- no command in the intent index covers every concept of the intent on
+  each target platform (CommandIndex.resolve)
+"""
+
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Words that carry no device or intent information
+_FILLER_WORDS = frozenset(
+    {
+        "show", "me", "display", "get", "check", "list", "view", "see", "what", "whats",
+        "is", "are", "the", "a", "an", "on", "of", "for", "in", "at", "from", "please",
+        "pls", "device", "devices", "router", "routers", "switch", "switches", "host",
+        "hosts", "and", "current", "now", "info", "information", "output",
+    }
+)  # fmt: skip
+_CJK_FILLERS = (
+    "帮我", "请", "查看", "看看", "看一下", "查一下", "显示", "查询", "检查", "获取",
+    "一下", "的", "上", "在", "和", "设备", "路由器", "交换机", "信息", "情况", "当前",
+    "所有", "全部", "是什么", "有哪些", "多少",
+)  # fmt: skip
+
+# Wording that needs reasoning or changes state - always handled by the agent
+_ESCALATE_WORDS = frozenset(
+    {
+        "why", "how", "troubleshoot", "diagnose", "analyze", "analyse", "compare", "explain",
+        "fix", "configure", "change", "set", "enable", "disable", "shutdown", "no", "reload",
+        "clear", "delete", "remove", "add", "create", "update", "reboot", "restart", "debug",
+        "if", "should", "can", "report", "inspect", "audit",
+    }
+)  # fmt: skip
+_ESCALATE_CJK = (
+    "为什么", "原因", "排查", "分析", "诊断", "比较", "对比", "解释", "修复", "修改",
+    "更改", "设置", "启用", "禁用", "关闭", "删除", "添加", "重启", "清除", "巡检",
+    "报告", "如何", "怎么",
+)  # fmt: skip
+
+_ALL_WORDS = ("all", "所有", "全部")
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9_./-]*")
+_CJK_RE = re.compile(r"[一-鿿]")
+
+
+@dataclass
+class FastPathMatch:
+    """A query the fast path can answer deterministically."""
+
+    devices: list[str]
+    intent: str
+    commands: dict[str, str]  # platform -> command
+
+    @property
+    def target(self) -> str:
+        """smart_query device argument ("R1", "R1,R2" or "all")."""
+        return ",".join(self.devices)
+
+
+class _DeviceIndex:
+    """Case-insensitive matcher for inventory names, hostnames and aliases."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._names: dict[str, str] = {}
+        self._pattern: re.Pattern[str] | None = None
+        self._aliases_mtime: float | None = None
+        self._built = False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._built = False
+
+    def _aliases_file(self) -> Path:
+        from config.settings import settings
+
+        return Path(settings.agent_dir) / "knowledge" / "aliases.md"
+
+    def _build(self) -> None:
+        from olav.tools.network import get_nornir
+
+        hosts = get_nornir().inventory.hosts
+        names: dict[str, str] = {}
+        for name, host in hosts.items():
+            names[name.lower()] = name
+            if host.hostname:
+                names.setdefault(str(host.hostname).lower(), name)
+
+        aliases_file = self._aliases_file()
+        mtime = aliases_file.stat().st_mtime if aliases_file.exists() else None
+        if mtime is not None:
+            # Table rows: | Alias | Actual Value | Type | Platform | Notes |
+            for line in aliases_file.read_text(encoding="utf-8").splitlines():
+                cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+                if len(cells) < 3 or cells[2].lower() != "device":
+                    continue
+                alias, value = cells[0], cells[1]
+                target = names.get(value.lower()) or names.get(alias.lower())
+                if alias and target:
+                    names.setdefault(alias.lower(), target)
+
+        alternatives = sorted(names, key=len, reverse=True)
+        pattern = None
+        if alternatives:
+            names_re = "|".join(re.escape(alias) for alias in alternatives)
+            pattern = re.compile(rf"(?<![a-z0-9_.-])({names_re})(?![a-z0-9_-])")
+
+        with self._lock:
+            self._names = names
+            self._pattern = pattern
+            self._aliases_mtime = mtime
+            self._built = True
+
+    def find(self, text: str) -> tuple[list[str], str]:
+        """Find devices mentioned in lowercase text.
+
+        Returns:
+            Tuple of (device names in order of mention, text with mentions removed)
+        """
+        aliases_file = self._aliases_file()
+        mtime = aliases_file.stat().st_mtime if aliases_file.exists() else None
+        if not self._built or mtime != self._aliases_mtime:
+            self._build()
+
+        if self._pattern is None:
+            return [], text
+
+        devices: list[str] = []
+        for match in self._pattern.finditer(text):
+            device = self._names[match.group(1)]
+            if device not in devices:
+                devices.append(device)
+        return devices, self._pattern.sub(" ", text)
+
+
+_device_index = _DeviceIndex()
+
+
+def clear_fast_path_cache() -> None:
+    """Forget the device/alias index (rebuilt on next use)."""
+    _device_index.clear()
+
+
+def _strip_cjk(text: str, phrases: tuple[str, ...]) -> str:
+    for phrase in sorted(phrases, key=len, reverse=True):
+        text = text.replace(phrase, " ")
+    return text
+
+
+def match_fast_path(query: str) -> FastPathMatch | None:
+    """Decide whether a query can be answered without the agent.
+
+    Args:
+        query: Raw user query
+
+    Returns:
+        FastPathMatch, or None when the agent should handle the query
+    """
+    from olav.tools.command_index import _CJK_ALIASES, get_command_index
+    from olav.tools.smart_query import get_device_info
+
+    text = " ".join(query.lower().replace("？", " ").replace("?", " ").split())
+    if not text:
+        return None
+
+    words = set(_WORD_RE.findall(text))
+    if words & _ESCALATE_WORDS or any(phrase in text for phrase in _ESCALATE_CJK):
+        return None
+
+    try:
+        devices, rest = _device_index.find(text)
+    except Exception as e:
+        logger.debug(f"Fast path disabled, inventory unavailable: {e}")
+        return None
+
+    if not devices:
+        if not any(word in (words if word.isascii() else text) for word in _ALL_WORDS):
+            return None
+        devices = ["all"]
+    rest = re.sub(r"\ball\b", " ", rest)
+
+    # Keep only intent vocabulary; any other leftover word makes the query ambiguous
+    intent_words = [w for w in _WORD_RE.findall(rest) if w not in _FILLER_WORDS]
+    cjk_rest = _strip_cjk(rest, _CJK_FILLERS)
+    cjk_intent = []
+    for alias in _CJK_ALIASES:  # longest first
+        if alias in cjk_rest:
+            cjk_intent.append(alias)
+            cjk_rest = cjk_rest.replace(alias, " ")
+    if _CJK_RE.search(cjk_rest):
+        return None
+    intent = " ".join(intent_words + cjk_intent)
+    if not intent:
+        return None
+
+    index = get_command_index()
+    if devices == ["all"]:
+        from olav.tools.network import get_nornir
+
+        platforms = {host.platform or "unknown" for host in get_nornir().inventory.hosts.values()}
+    else:
+        platforms = set()
+        for device in devices:
+            info = get_device_info(device)
+            if not info:
+                return None
+            platforms.add(info["platform"])
+
+    commands: dict[str, str] = {}
+    for platform in platforms:
+        command = index.resolve(platform, intent)
+        if not command:
+            return None
+        commands[platform] = command
+
+    if not commands:
+        return None
+    return FastPathMatch(devices=devices, intent=intent, commands=commands)
+
+
+def run_fast_path(match: FastPathMatch) -> str:
+    """Execute a fast-path match with smart_query.
+
+    Args:
+        match: Result of match_fast_path()
+
+    Returns:
+        smart_query output
+    """
+    from olav.tools.smart_query import smart_query
+
+    args: dict[str, str | None] = {"device": match.target, "intent": match.intent}
+    if len(match.commands) == 1 and match.devices != ["all"]:
+        args["command"] = next(iter(match.commands.values()))
+    return str(smart_query.invoke(args))
+
+
+def try_fast_path(query: str) -> tuple[FastPathMatch, str] | None:
+    """Answer a query on the fast path if possible.
+
+    Args:
+        query: Raw user query
+
+    Returns:
+        (match, output) if handled, None if the agent should handle the query
+    """
+    from config.settings import settings
+
+    if not settings.fast_path_enabled:
+        return None
+
+    try:
+        match = match_fast_path(query)
+    except Exception as e:
+        logger.debug(f"Fast path matching failed: {e}")
+        return None
+    if match is None:
+        return None
+
+    return match, run_fast_path(match)
+
+
+def resolve_device_command(device: str, intent: str) -> str | None:
+    """Platform-aware command for an explicit device and intent (used by /query).
+
+    Args:
+        device: Inventory device name
+        intent: Intent text (e.g. "interface status", "bgp neighbors")
+
+    Returns:
+        Command, or None if the intent index has no unambiguous match
+    """
+    from olav.tools.command_index import get_command_index
+    from olav.tools.smart_query import get_device_info
+
+    info = get_device_info(device)
+    if not info:
+        return None
+    return get_command_index().resolve(info["platform"], intent)
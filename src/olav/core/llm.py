@@ -2,13 +2,25 @@
 
 Uses LangChain's init_chat_model() for unified provider support including
 OpenAI, Azure, and Ollama.
+
+Chat models are pooled per (provider, model, temperature, json_mode, extra
+kwargs): the main agent, SkillRouter, subagents and analyzers asking for the
+same configuration share one client. OpenAI/Azure clients share a single
+keep-alive HTTP connection pool (sync and async) per endpoint, whose size
+caps concurrent requests, so subagent fan-out reuses warm TLS connections.
+Every pooled client records latency and token usage (get_pool_stats()).
 """
 
 import logging
+import threading
+import time
 from typing import Any
+from uuid import UUID
 
 from langchain.chat_models import init_chat_model
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.language_models import BaseChatModel
+from langchain_core.outputs import LLMResult
 from langchain_openai import OpenAIEmbeddings
 
 from config.settings import settings
@@ -16,6 +28,110 @@ from config.settings import settings
 logger = logging.getLogger(__name__)
 
 
+class ClientMetrics(BaseCallbackHandler):
+    """Latency and token counters for one pooled chat model."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._started: dict[UUID, float] = {}
+        self.calls = 0
+        self.errors = 0
+        self.total_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list[list[Any]],
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ) -> None:
+        with self._lock:
+            self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(
+        self, serialized: dict[str, Any], prompts: list[str], *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        with self._lock:
+            self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        input_tokens, output_tokens = _token_usage(response)
+        with self._lock:
+            started = self._started.pop(run_id, None)
+            latency_ms = (time.perf_counter() - started) * 1000 if started else 0.0
+            self.calls += 1
+            self.total_latency_ms += latency_ms
+            self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._started.pop(run_id, None)
+            self.errors += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Counters as a dict (average latency derived)."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "in_flight": len(self._started),
+                "avg_latency_ms": round(self.total_latency_ms / self.calls, 1)
+                if self.calls
+                else 0.0,
+                "max_latency_ms": round(self.max_latency_ms, 1),
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+            }
+
+
+def _token_usage(response: LLMResult) -> tuple[int, int]:
+    """(input, output) tokens from message usage metadata or provider llm_output."""
+    input_tokens = output_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                input_tokens += usage.get("input_tokens", 0)
+                output_tokens += usage.get("output_tokens", 0)
+    if not input_tokens and not output_tokens and response.llm_output:
+        usage = response.llm_output.get("token_usage") or {}
+        input_tokens = usage.get("prompt_tokens", 0)
+        output_tokens = usage.get("completion_tokens", 0)
+    return input_tokens, output_tokens
+
+
+# (provider, model, temperature, json_mode, extra kwargs) -> (client, metrics)
+_chat_pool: dict[tuple, tuple[BaseChatModel, ClientMetrics]] = {}
+# (provider, base_url) -> httpx.Client. Only the sync client is shared: an
+# httpx.AsyncClient stays bound to the event loop that first used it, and the
+# CLI and task delegation run a fresh asyncio.run() per query
+_http_clients: dict[tuple[str, str], Any] = {}
+_pool_lock = threading.Lock()
+
+
+def _shared_http_client(provider: str, base_url: str) -> Any:  # noqa: ANN401
+    """Keep-alive HTTP client shared by every pooled model of an endpoint."""
+    key = (provider, base_url)
+    with _pool_lock:
+        if key not in _http_clients:
+            import httpx
+
+            limits = httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_keepalive_connections,
+                keepalive_expiry=settings.llm_keepalive_expiry,
+            )
+            timeout = httpx.Timeout(settings.llm_request_timeout, connect=10.0)
+            _http_clients[key] = httpx.Client(limits=limits, timeout=timeout)
+        return _http_clients[key]
+
+
 class LLMFactory:
     """Factory for creating LLM instances using init_chat_model()."""
 
@@ -25,7 +141,7 @@ class LLMFactory:
         temperature: float | None = None,
         **kwargs: Any,
     ) -> BaseChatModel:
-        """Create a chat model instance using LangChain init_chat_model.
+        """Get a pooled chat model instance (created on first use).
 
         Args:
             json_mode: Whether to enable JSON output mode
@@ -36,6 +152,62 @@ class LLMFactory:
             Configured chat model instance
         """
         temp = temperature if temperature is not None else settings.llm_temperature
+        if not settings.llm_pool_enabled:
+            return LLMFactory._create_chat_model(json_mode, temp, **kwargs)
+
+        key = (
+            settings.llm_provider,
+            settings.llm_model_name,
+            temp,
+            json_mode,
+            repr(sorted(kwargs.items())),
+        )
+        with _pool_lock:
+            pooled = _chat_pool.get(key)
+        if pooled is not None:
+            return pooled[0]
+
+        metrics = ClientMetrics()
+        callbacks = [*(kwargs.pop("callbacks", None) or []), metrics]
+        model = LLMFactory._create_chat_model(json_mode, temp, callbacks=callbacks, **kwargs)
+        with _pool_lock:
+            # Another thread may have created the same client meanwhile
+            pooled = _chat_pool.setdefault(key, (model, metrics))
+        return pooled[0]
+
+    @staticmethod
+    def get_pool_stats() -> dict[str, dict[str, Any]]:
+        """Per-client latency/token metrics of the chat model pool.
+
+        Returns:
+            Mapping of "provider/model (temperature=..., json)" -> counters
+        """
+        with _pool_lock:
+            pooled = list(_chat_pool.items())
+        stats = {}
+        for (provider, model_name, temp, json_mode, extra), (_, metrics) in pooled:
+            label = f"{provider}/{model_name} (temperature={temp}{', json' if json_mode else ''})"
+            if extra != "[]":
+                label += f" {extra}"
+            stats[label] = metrics.snapshot()
+        return stats
+
+    @staticmethod
+    def clear_pool() -> None:
+        """Drop pooled clients and close shared HTTP connections (e.g. after a config change)."""
+        with _pool_lock:
+            http_clients = list(_http_clients.values())
+            _chat_pool.clear()
+            _http_clients.clear()
+        for client in http_clients:
+            try:
+                client.close()
+            except Exception:  # noqa: S110
+                pass
+
+    @staticmethod
+    def _create_chat_model(json_mode: bool, temp: float, **kwargs: Any) -> BaseChatModel:
+        """Build a new chat model with init_chat_model."""
         provider = settings.llm_provider
         model_name = settings.llm_model_name
 
@@ -50,6 +222,18 @@ class LLMFactory:
             config["base_url"] = settings.llm_base_url or "http://localhost:11434"
             if json_mode:
                 config["format"] = "json"
+            if settings.llm_pool_enabled:
+                import httpx
+
+                # ollama.Client passes these to its own httpx client
+                config["client_kwargs"] = {
+                    "limits": httpx.Limits(
+                        max_connections=settings.llm_max_connections,
+                        max_keepalive_connections=settings.llm_max_keepalive_connections,
+                        keepalive_expiry=settings.llm_keepalive_expiry,
+                    ),
+                    "timeout": settings.llm_request_timeout,
+                }
             logger.debug(
                 f"Creating Ollama chat model: model={model_name}, base_url={config['base_url']}"
             )
@@ -59,9 +243,13 @@ class LLMFactory:
                 config["base_url"] = settings.llm_base_url
             if json_mode:
                 config["model_kwargs"] = {"response_format": {"type": "json_object"}}
+            if settings.llm_pool_enabled:
+                config["http_client"] = _shared_http_client(provider, settings.llm_base_url)
             logger.debug(f"Creating OpenAI chat model: {model_name}")
         elif provider == "azure":
             config["api_key"] = settings.llm_api_key
+            if settings.llm_pool_enabled:
+                config["http_client"] = _shared_http_client(provider, settings.llm_base_url)
             logger.debug(f"Creating Azure chat model: {model_name}")
 
         return init_chat_model(model_name, model_provider=provider, **config, **kwargs)
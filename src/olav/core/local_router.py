@@ -0,0 +1,367 @@
+"""Local first-stage skill router (no LLM call).
+
+Decides the easy routing cases in front of SkillRouter's unified LLM call:
+
+- Keyword rules: off-topic wording (weather, jokes, ...) and per-intent
+  wording ("为什么"/"why" -> diagnose, "巡检"/"health check" -> inspect, ...)
+- k-NN over embeddings of skill descriptions/examples and of past queries
+  the LLM routed with high confidence (read back from the routing log)
+
+Rules and neighbours vote per skill; only decisions at or above
+``routing_local_threshold`` skip the LLM. A keyword rule alone scores below
+the threshold, so it needs an agreeing k-NN vote to skip the LLM. Every routing decision is appended
+to ``agent_dir/data/routing_log.jsonl`` together with the local prediction,
+so thresholds and rules can be tuned against what the LLM decided.
+"""
+
+import json
+import logging
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from config.settings import settings
+from olav.core.skill_loader import Skill
+
+logger = logging.getLogger(__name__)
+
+OFF_TOPIC = "__off_topic__"
+
+# Intent wording, most specific first. Asking for a diagnosis beats query
+# wording ("查看为什么不通"), query wording beats symptoms ("show interfaces
+# that are down" is a lookup).
+_INTENT_RULES: list[tuple[str, re.Pattern[str]]] = [
+    (
+        "diagnose",
+        re.compile(
+            r"为什么|原因|排查|诊断|\bwhy\b|troubleshoot|diagnos|root cause",
+            re.IGNORECASE,
+        ),
+    ),
+    (
+        "inspect",
+        re.compile(r"巡检|健康检查|体检|\binspect|health[ -]?check|\baudit\b", re.IGNORECASE),
+    ),
+    ("backup", re.compile(r"备份|\bbackup|\bback up\b|export config", re.IGNORECASE)),
+    (
+        "query",
+        re.compile(
+            r"查看|看看|显示|查询|状态|多少|\bshow\b|\bdisplay\b|\bstatus\b|\blist\b|what is",
+            re.IGNORECASE,
+        ),
+    ),
+    (
+        "diagnose",
+        re.compile(
+            r"不通|丢包|故障|异常|中断|抖动|not working|unreachable|packet loss|"
+            r"\bflap|\bdown\b|\bfail",
+            re.IGNORECASE,
+        ),
+    ),
+]
+
+_NETWORK_RE = re.compile(
+    r"接口|端口|路由|交换机|设备|邻居|网络|拓扑|配置|链路|带宽|光模块|地址|"
+    r"\b(?:interfaces?|ports?|bgp|ospf|isis|vlan|vrf|routes?|routing|mac|arp|lldp|cdp|stp|"
+    r"devices?|routers?|switch(?:es)?|ping|traceroute|acl|nat|ip|ipv6|mtu|latency|"
+    r"netbox|config(?:uration)?|firewall|uplink|neighbou?rs?|peers?)\b|"
+    r"\b[a-z]{1,4}\d+\b",  # device names such as R1, SW2, core01
+    re.IGNORECASE,
+)
+_OFF_TOPIC_RE = re.compile(
+    r"天气|笑话|写一首|翻译|菜谱|股票|电影|\bweather\b|\bjoke\b|\bpoem\b|\brecipe\b|"
+    r"\btranslate\b|\bstock price\b|\bmovie\b",
+    re.IGNORECASE,
+)
+
+_PUNCTUATION_RE = re.compile(r"[\s,.;:!?，。；：！？、\"'“”‘’()（）]+")
+
+# Weight of a single rule vote relative to the k-NN vote share. Kept below the
+# default routing_local_threshold (0.8): a keyword hit alone never skips the
+# LLM, it takes an agreeing k-NN vote (plus _AGREEMENT_BONUS) to get there.
+_RULE_WEIGHT = 0.6
+_AGREEMENT_BONUS = 0.15
+
+
+def normalize_query(text: str) -> str:
+    """Cache key for a query: lowercase, punctuation and spacing collapsed."""
+    return _PUNCTUATION_RE.sub(" ", text.lower()).strip()
+
+
+@dataclass
+class LocalDecision:
+    """Routing decision made without the LLM (same fields as _unified_route)."""
+
+    is_network_related: bool
+    skill_id: str | None
+    confidence: float
+    reason: str
+
+    def as_route_result(self) -> dict[str, Any]:
+        return {
+            "is_network_related": self.is_network_related,
+            "skill_id": self.skill_id,
+            "confidence": self.confidence,
+            "reason": self.reason,
+        }
+
+
+def _unit(vector: list[float]) -> list[float]:
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+class LocalRouter:
+    """Keyword rules plus k-NN over skill exemplars and past LLM decisions."""
+
+    def __init__(self, log_path: Path | None = None) -> None:
+        """Create a router (exemplars are embedded lazily on first use).
+
+        Args:
+            log_path: Routing log (default: agent_dir/data/routing_log.jsonl)
+        """
+        self.log_path = log_path or Path(settings.agent_dir) / "data" / "routing_log.jsonl"
+        self._lock = threading.Lock()
+        self._exemplars: list[tuple[str, list[float]]] = []  # (label, unit vector)
+        self._known: set[tuple[str, str]] = set()  # (label, normalized text)
+        self._skill_ids: frozenset[str] = frozenset()
+        self._embeddings_failed = False
+
+    # ------------------------------------------------------------------
+    # Embeddings
+    # ------------------------------------------------------------------
+
+    def _embeddings(self) -> Any | None:  # noqa: ANN401
+        if (
+            self._embeddings_failed
+            or not settings.enable_embedding
+            or settings.embedding_provider == "none"
+        ):
+            return None
+        from olav.tools.knowledge_embedder import get_embeddings
+
+        return get_embeddings(settings.embedding_model)
+
+    def _ensure_exemplars(self, skill_index: dict[str, Skill]) -> None:
+        """Embed skill descriptions/examples and logged LLM decisions once."""
+        if self._skill_ids == frozenset(skill_index):
+            return
+
+        texts: list[tuple[str, str]] = []
+        for skill_id, skill in skill_index.items():
+            texts.append((skill_id, skill.description))
+            texts.extend((skill_id, example) for example in skill.examples or [])
+        texts.extend(self._load_logged_examples(set(skill_index)))
+
+        known: set[tuple[str, str]] = set()
+        unique: list[tuple[str, str]] = []
+        for label, text in texts:
+            key = (label, normalize_query(text))
+            if key[1] and key not in known:
+                known.add(key)
+                unique.append((label, text))
+
+        exemplars: list[tuple[str, list[float]]] = []
+        embeddings = self._embeddings()
+        if embeddings is not None and unique:
+            try:
+                vectors = embeddings.embed_documents([text for _, text in unique])
+                labels = [label for label, _ in unique]
+                exemplars = [
+                    (label, _unit(vector)) for label, vector in zip(labels, vectors, strict=True)
+                ]
+            except Exception as e:
+                logger.warning(f"Local router: embeddings unavailable, keyword rules only ({e})")
+                self._embeddings_failed = True
+
+        with self._lock:
+            self._exemplars = exemplars
+            self._known = known
+            self._skill_ids = frozenset(skill_index)
+
+    def _load_logged_examples(self, skill_ids: set[str]) -> list[tuple[str, str]]:
+        """Past queries the LLM routed confidently, most recent first."""
+        if not self.log_path.exists():
+            return []
+
+        examples: list[tuple[str, str]] = []
+        try:
+            lines = self.log_path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return []
+        for line in reversed(lines):
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("source") != "llm":
+                continue
+            if entry.get("confidence", 0.0) < settings.routing_confidence_threshold:
+                continue
+            if not entry.get("is_network_related", True):
+                examples.append((OFF_TOPIC, entry["query"]))
+            elif entry.get("skill_id") in skill_ids:
+                examples.append((entry["skill_id"], entry["query"]))
+            if len(examples) >= settings.routing_knn_max_examples:
+                break
+        return examples
+
+    def _knn_votes(self, query: str) -> tuple[dict[str, float], float]:
+        """Similarity-weighted votes of the k nearest exemplars.
+
+        Returns:
+            (label -> vote share, similarity of the nearest exemplar)
+        """
+        with self._lock:
+            exemplars = self._exemplars
+        embeddings = self._embeddings()
+        if not exemplars or embeddings is None:
+            return {}, 0.0
+
+        try:
+            query_vec = _unit(embeddings.embed_query(query))
+        except Exception as e:
+            logger.debug(f"Local router: query embedding failed: {e}")
+            return {}, 0.0
+
+        similarities = sorted(
+            ((sum(a * b for a, b in zip(query_vec, vec, strict=False)), label)
+             for label, vec in exemplars),
+            reverse=True,
+        )[: settings.routing_knn_k]  # fmt: skip
+
+        votes: dict[str, float] = {}
+        for similarity, label in similarities:
+            if similarity > 0:
+                votes[label] = votes.get(label, 0.0) + similarity
+        total = sum(votes.values()) or 1.0
+        best = similarities[0][0] if similarities else 0.0
+        return {label: score / total for label, score in votes.items()}, best
+
+    # ------------------------------------------------------------------
+    # Classification
+    # ------------------------------------------------------------------
+
+    def classify(self, query: str, skill_index: dict[str, Skill]) -> LocalDecision:
+        """Route a query locally.
+
+        Args:
+            query: User query
+            skill_index: Loaded skills
+
+        Returns:
+            Best local decision; its confidence decides whether the LLM is skipped
+        """
+        self._ensure_exemplars(skill_index)
+
+        network = bool(_NETWORK_RE.search(query))
+        if _OFF_TOPIC_RE.search(query) and not network:
+            return LocalDecision(False, None, 0.9, "Local rules: off-topic wording")
+
+        # Rule vote: first matching intent, spread over the skills with that intent
+        scores: dict[str, float] = {}
+        rule_intent = next((intent for intent, rx in _INTENT_RULES if rx.search(query)), None)
+        if rule_intent:
+            matching = [sid for sid, skill in skill_index.items() if skill.intent == rule_intent]
+            for skill_id in matching:
+                scores[skill_id] = _RULE_WEIGHT / len(matching)
+
+        votes, best_similarity = self._knn_votes(query)
+        # Neighbour votes count in proportion to how close the nearest one is
+        for label, share in votes.items():
+            scores[label] = scores.get(label, 0.0) + share * best_similarity
+
+        if not scores:
+            return LocalDecision(True, None, 0.0, "Local: no rule or neighbour match")
+
+        label = max(scores, key=lambda key: scores[key])
+        confidence = scores[label]
+        if rule_intent and votes and max(votes, key=lambda key: votes[key]) == label:
+            confidence += _AGREEMENT_BONUS
+        if not network and label != OFF_TOPIC:
+            confidence *= 0.7  # Intent wording without any network vocabulary
+        confidence = round(min(confidence, 0.99), 3)
+
+        sources = [s for s, used in (("rules", rule_intent), ("k-NN", votes)) if used]
+        reason = f"Local {'+'.join(sources)}: {rule_intent or label}"
+        if label == OFF_TOPIC:
+            return LocalDecision(False, None, confidence, reason)
+        return LocalDecision(True, label, confidence, reason)
+
+    # ------------------------------------------------------------------
+    # Feedback and logging
+    # ------------------------------------------------------------------
+
+    def learn(self, query: str, result: dict[str, Any]) -> None:
+        """Add a confident LLM decision to the k-NN exemplars.
+
+        Args:
+            query: User query
+            result: _unified_route() result
+        """
+        if result.get("confidence", 0.0) < settings.routing_confidence_threshold:
+            return
+        label = result.get("skill_id") if result.get("is_network_related", True) else OFF_TOPIC
+        if not label or (label != OFF_TOPIC and label not in self._skill_ids):
+            return
+
+        key = (label, normalize_query(query))
+        embeddings = self._embeddings()
+        if key in self._known or embeddings is None:
+            return
+        try:
+            vector = _unit(embeddings.embed_query(query))
+        except Exception:
+            return
+        with self._lock:
+            self._known.add(key)
+            self._exemplars.append((label, vector))
+            if len(self._exemplars) > settings.routing_knn_max_examples + len(self._skill_ids) * 8:
+                self._exemplars.pop(0)
+
+    def log(
+        self,
+        query: str,
+        source: str,
+        result: dict[str, Any],
+        local: LocalDecision | None,
+        latency_ms: float,
+    ) -> None:
+        """Append a routing decision to the routing log.
+
+        Args:
+            query: User query
+            source: "cache", "local" or "llm"
+            result: Final routing result (_unified_route format)
+            local: Local prediction (kept for LLM decisions to measure agreement)
+            latency_ms: Routing latency
+        """
+        logger.info(
+            f"Routed via {source} in {latency_ms:.0f}ms: "
+            f"{result.get('skill_id')} ({result.get('confidence', 0.0):.2f})"
+        )
+        if not settings.routing_log_enabled:
+            return
+
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "query": query,
+            "source": source,
+            "is_network_related": result.get("is_network_related", True),
+            "skill_id": result.get("skill_id"),
+            "confidence": result.get("confidence", 0.0),
+            "latency_ms": round(latency_ms, 1),
+        }
+        if local is not None:
+            entry["local_skill_id"] = local.skill_id
+            entry["local_confidence"] = local.confidence
+        try:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.log_path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.debug(f"Could not write routing log: {e}")
@@ -1,14 +1,21 @@
 """Skill Router - LLM驱动的技能路由和意图过滤.
 
 P3优化: 合并Guard过滤和Skill选择为单次LLM调用，减少50%延迟。
+
+本地优先: 规范化查询缓存 → 本地分类器 (关键词规则 + k-NN, 见 local_router)
+→ 仅在本地置信度低于 routing_local_threshold 时调用 LLM (_unified_route)。
 """
 
 import json
 import logging
+import time
+from collections import OrderedDict
 from typing import Any
 
 from langchain_core.language_models import BaseLanguageModel
 
+from config.settings import settings
+from olav.core.local_router import LocalDecision, LocalRouter, normalize_query
 from olav.core.skill_loader import Skill, SkillLoader
 
 logger = logging.getLogger(__name__)
@@ -17,9 +24,18 @@ logger = logging.getLogger(__name__)
 class SkillRouter:
     """技能路由器 - P3优化: 单次LLM调用完成Guard+Skill选择."""
 
-    def __init__(self, llm: BaseLanguageModel, skill_loader: SkillLoader) -> None:
+    def __init__(
+        self,
+        llm: BaseLanguageModel,
+        skill_loader: SkillLoader,
+        local_router: LocalRouter | None = None,
+    ) -> None:
         self.llm = llm
         self.skill_loader = skill_loader
+        self.local_router = local_router or LocalRouter()
+        # 规范化查询文本 -> _unified_route 格式的路由结果
+        self._cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self.stats: dict[str, int] = {"cache": 0, "local": 0, "llm": 0}
 
     def route(self, user_query: str) -> dict[str, Any]:
         """路由用户查询到合适的技能 (P3优化: 单次LLM调用).
@@ -45,8 +61,7 @@ class SkillRouter:
                 "fallback": False,
             }
 
-        # P3优化: 单次LLM调用同时完成Guard过滤和Skill选择
-        result = self._unified_route(user_query, skill_index)
+        result = self._decide(user_query, skill_index)
 
         if not result["is_network_related"]:
             return {
@@ -69,7 +84,7 @@ class SkillRouter:
             }
         else:
             # 无匹配或置信度低 → 降级到 quick-query
-            fallback_skill = self.skill_loader.get_skill("quick-query")
+            fallback_skill = self.skill_loader.get_skill(settings.routing_fallback_skill)
             return {
                 "selected_skill": fallback_skill,
                 "reason": f"Fallback: {result.get('reason', 'Low confidence')}",
@@ -78,6 +93,50 @@ class SkillRouter:
                 "fallback": True,
             }
 
+    def _decide(self, user_query: str, skill_index: dict[str, Skill]) -> dict[str, Any]:
+        """缓存 → 本地分类器 → LLM, 返回 _unified_route 格式的结果并记录日志."""
+        started = time.perf_counter()
+        key = normalize_query(user_query)
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.stats["cache"] += 1
+            self.local_router.log(user_query, "cache", cached, None, self._elapsed_ms(started))
+            return cached
+
+        local: LocalDecision | None = None
+        if settings.routing_local_enabled:
+            try:
+                local = self.local_router.classify(user_query, skill_index)
+            except Exception as e:
+                logger.warning(f"Local routing failed: {e}")
+
+        if local is not None and local.confidence >= settings.routing_local_threshold:
+            source = "local"
+            result = local.as_route_result()
+        else:
+            # P3优化: 单次LLM调用同时完成Guard过滤和Skill选择
+            source = "llm"
+            result = self._unified_route(user_query, skill_index)
+            if not result["reason"].startswith("Fallback due to error"):
+                self.local_router.learn(user_query, result)
+
+        self.stats[source] += 1
+        self.local_router.log(user_query, source, result, local, self._elapsed_ms(started))
+
+        if settings.routing_cache_size > 0 and not result["reason"].startswith(
+            "Fallback due to error"
+        ):
+            self._cache[key] = result
+            while len(self._cache) > settings.routing_cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _elapsed_ms(started: float) -> float:
+        return (time.perf_counter() - started) * 1000
+
     def _unified_route(self, user_query: str, skill_index: dict[str, Skill]) -> dict[str, Any]:
         """P3优化: 统一路由 - 单次LLM调用完成Guard+Skill选择.
 
@@ -7,11 +7,16 @@ def __getattr__(name: str) -> object:  # noqa: ANN401
         from olav.tools.task_tools import delegate_task
 
         return delegate_task
+    if name == "delegate_tasks":
+        from olav.tools.task_tools import delegate_tasks
+
+        return delegate_tasks
 
     raise AttributeError(f"module 'olav.tools' has no attribute {name!r}")
 
 
 __all__ = [
     "delegate_task",  # pyright: ignore [reportUnsupportedDunderAll]
+    "delegate_tasks",  # pyright: ignore [reportUnsupportedDunderAll]
 ]
 # All items above are provided via __getattr__ lazy loading
@@ -5,12 +5,15 @@ This module provides HTTP client functionality for calling external APIs
 Separated from capabilities.py for better maintainability (per DESIGN_V0.81.md optimization).
 """
 
+import asyncio
 import os
 from typing import Any
 
 import httpx
 from langchain_core.tools import tool
 
+from olav.tools.tool_concurrency import read_access, write_access
+
 
 @tool
 def api_call(
@@ -72,16 +75,19 @@ def api_call(
     username = os.getenv(user_var)
     password = os.getenv(password_var)
 
+    # Reads run alongside other tool calls; writes (HITL-approved) run alone
+    access = read_access() if method.upper() == "GET" else write_access()
     try:
-        return _execute_request(
-            method=method,
-            url=url,
-            params=params,
-            body=body,
-            headers=headers,
-            username=username if not token else None,
-            password=password if not token else None,
-        )
+        with access:
+            return _execute_request(
+                method=method,
+                url=url,
+                params=params,
+                body=body,
+                headers=headers,
+                username=username if not token else None,
+                password=password if not token else None,
+            )
     except httpx.HTTPStatusError as e:
         return f"Error: HTTP {e.response.status_code} - {e.response.text}"
     except httpx.RequestError as e:
@@ -90,6 +96,21 @@ def api_call(
         return f"Error: {e}"
 
 
+async def aapi_call(
+    system: str,
+    method: str,
+    endpoint: str,
+    params: dict[str, Any] | None = None,
+    body: dict[str, Any] | None = None,
+) -> str:
+    """Async api_call (runs on a worker thread; lets parallel tool calls overlap)."""
+    func = api_call.func
+    return await asyncio.to_thread(func, system, method, endpoint, params, body)  # type: ignore[arg-type]
+
+
+api_call.coroutine = aapi_call
+
+
 def _execute_request(
     method: str,
     url: str,
@@ -0,0 +1,291 @@
+"""Out-of-band artifact store for large tool outputs.
+
+Full running-configs, route tables and tech-supports don't belong in the LLM
+context. Outputs larger than ``artifact_threshold_chars`` are written to
+``agent_dir/data/artifacts/`` and the agent receives a handle plus a compact
+summary (size, head and tail lines). The artifact tools then page, grep or
+slice the stored text by handle, so the relevant lines are reachable without
+truncation and without re-running the command.
+
+Artifacts older than ``artifact_retention_hours`` are pruned on write.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from langchain_core.tools import tool
+
+from config.settings import settings
+
+_HANDLE_RE = re.compile(r"^art-[0-9a-f]{12}$")
+_prune_lock = threading.Lock()
+_last_prune = 0.0
+
+
+def _artifact_dir() -> Path:
+    return Path(settings.agent_dir) / "data" / "artifacts"
+
+
+def _prune(directory: Path) -> None:
+    """Delete expired artifacts (at most once a minute)."""
+    global _last_prune
+
+    with _prune_lock:
+        now = time.time()
+        if now - _last_prune < 60:
+            return
+        _last_prune = now
+
+    cutoff = now - settings.artifact_retention_hours * 3600
+    for path in directory.glob("art-*.txt"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                path.with_suffix(".json").unlink(missing_ok=True)
+        except OSError:
+            continue
+
+
+def store_artifact(content: str, source: dict[str, Any] | None = None) -> str:
+    """Store text and return its handle.
+
+    Identical content from the same source maps to the same handle, so
+    re-running a command does not duplicate storage.
+
+    Args:
+        content: Full output text
+        source: Provenance (e.g. {"tool": "smart_query", "device": "R1", "command": "..."})
+
+    Returns:
+        Artifact handle ("art-" + 12 hex digits)
+    """
+    source = source or {}
+    digest = hashlib.sha256(
+        json.dumps(source, sort_keys=True).encode("utf-8") + b"\0" + content.encode("utf-8")
+    ).hexdigest()
+    handle = f"art-{digest[:12]}"
+
+    directory = _artifact_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    text_path = directory / f"{handle}.txt"
+    meta = {
+        **source,
+        "handle": handle,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "lines": content.count("\n") + 1,
+        "chars": len(content),
+    }
+    text_path.write_text(content, encoding="utf-8")
+    text_path.with_suffix(".json").write_text(json.dumps(meta, ensure_ascii=False), "utf-8")
+
+    _prune(directory)
+    return handle
+
+
+def load_artifact(handle: str) -> tuple[list[str], dict[str, Any]]:
+    """Load an artifact's lines and metadata.
+
+    Args:
+        handle: Artifact handle
+
+    Returns:
+        (lines, metadata)
+
+    Raises:
+        FileNotFoundError: If the handle is unknown or expired
+    """
+    if not _HANDLE_RE.match(handle):
+        raise FileNotFoundError(f"Invalid artifact handle: {handle}")
+
+    text_path = _artifact_dir() / f"{handle}.txt"
+    if not text_path.exists():
+        raise FileNotFoundError(f"Artifact {handle} not found (expired or never stored)")
+
+    meta_path = text_path.with_suffix(".json")
+    meta = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else {}
+    return text_path.read_text(encoding="utf-8").splitlines(), meta
+
+
+def summarize_artifact(handle: str, content: str, head: int | None = None, tail: int = 5) -> str:
+    """Compact stand-in for a stored output: size, head and tail lines, usage hint.
+
+    Args:
+        handle: Artifact handle
+        content: Full output text
+        head: Leading lines to include (default: settings.artifact_summary_lines)
+        tail: Trailing lines to include
+
+    Returns:
+        Summary text for the LLM
+    """
+    head = settings.artifact_summary_lines if head is None else head
+    lines = content.splitlines()
+    parts = [
+        f"[Artifact {handle}: {len(lines)} lines, {len(content)} chars - showing excerpt]",
+        *lines[:head],
+    ]
+    if len(lines) > head + tail:
+        parts.append(f"... ({len(lines) - head - tail} lines omitted) ...")
+        parts.extend(lines[-tail:])
+    elif len(lines) > head:
+        parts.extend(lines[head:])
+    parts.append(
+        f"[Use artifact_grep('{handle}', pattern), artifact_page('{handle}', page) or "
+        f"artifact_slice('{handle}', start, end) to read the rest]"
+    )
+    return "\n".join(parts)
+
+
+def offload_if_large(
+    content: str,
+    source: dict[str, Any] | None = None,
+    threshold: int | None = None,
+    head: int | None = None,
+) -> str:
+    """Return content unchanged if small, else store it and return a summary.
+
+    Args:
+        content: Tool output
+        source: Provenance stored with the artifact
+        threshold: Size limit in chars (default: settings.artifact_threshold_chars)
+        head: Leading lines in the summary (default: settings.artifact_summary_lines)
+
+    Returns:
+        The content itself or its artifact summary
+    """
+    threshold = settings.artifact_threshold_chars if threshold is None else threshold
+    if not settings.artifact_store_enabled or len(content) <= threshold:
+        return content
+    try:
+        handle = store_artifact(content, source)
+    except OSError:
+        return content
+    return summarize_artifact(handle, content, head=head)
+
+
+def _numbered(lines: list[str], start: int) -> str:
+    """Lines prefixed with 1-based line numbers."""
+    width = len(str(start + len(lines)))
+    return "\n".join(f"{start + i:>{width}}: {line}" for i, line in enumerate(lines))
+
+
+def _header(handle: str, meta: dict[str, Any], total: int) -> str:
+    source = " ".join(str(meta[key]) for key in ("device", "command", "filepath") if meta.get(key))
+    return f"## Artifact {handle}" + (f" ({source})" if source else "") + f" - {total} lines"
+
+
+@tool
+def artifact_page(handle: str, page: int = 1, page_size: int = 100) -> str:
+    """Read a stored tool output page by page.
+
+    Large outputs (configs, route tables) are returned as an artifact handle
+    with a summary; use this to read them sequentially.
+
+    Args:
+        handle: Artifact handle (e.g. "art-1a2b3c4d5e6f")
+        page: Page number, starting at 1
+        page_size: Lines per page (max 500)
+
+    Returns:
+        Numbered lines of the requested page
+    """
+    try:
+        lines, meta = load_artifact(handle)
+    except FileNotFoundError as e:
+        return f"Error: {e}"
+
+    page_size = max(1, min(page_size, 500))
+    pages = max(1, -(-len(lines) // page_size))
+    page = max(1, min(page, pages))
+    start = (page - 1) * page_size
+    return (
+        f"{_header(handle, meta, len(lines))}, page {page}/{pages}\n"
+        f"```\n{_numbered(lines[start : start + page_size], start + 1)}\n```"
+    )
+
+
+@tool
+def artifact_grep(
+    handle: str,
+    pattern: str,
+    context: int = 0,
+    ignore_case: bool = True,
+    max_matches: int = 50,
+) -> str:
+    """Search a stored tool output for lines matching a regex.
+
+    Args:
+        handle: Artifact handle
+        pattern: Regular expression (e.g. "GigabitEthernet0/1", "^router bgp", "10\\.1\\.")
+        context: Lines of context before and after each match
+        ignore_case: Case-insensitive matching
+        max_matches: Maximum matching lines to return
+
+    Returns:
+        Numbered matching lines (with context), or a no-match message
+    """
+    try:
+        lines, meta = load_artifact(handle)
+    except FileNotFoundError as e:
+        return f"Error: {e}"
+    try:
+        regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+    except re.error as e:
+        return f"Error: Invalid pattern '{pattern}': {e}"
+
+    matches = [i for i, line in enumerate(lines) if regex.search(line)]
+    if not matches:
+        return f"{_header(handle, meta, len(lines))}\nNo lines match '{pattern}'"
+
+    shown = matches[:max_matches]
+    context = max(0, min(context, 20))
+    blocks: list[str] = []
+    last_end = -1
+    for i in shown:
+        start, end = max(0, i - context), min(len(lines), i + context + 1)
+        if start <= last_end and blocks:
+            # Merge overlapping context windows
+            blocks[-1] += "\n" + _numbered(lines[last_end:end], last_end + 1)
+        else:
+            if blocks and context:
+                blocks.append("--")
+            blocks.append(_numbered(lines[start:end], start + 1))
+        last_end = max(last_end, end)
+
+    more = f" (showing first {max_matches})" if len(matches) > max_matches else ""
+    return (
+        f"{_header(handle, meta, len(lines))}, {len(matches)} matches{more}\n"
+        "```\n" + "\n".join(blocks) + "\n```"
+    )
+
+
+@tool
+def artifact_slice(handle: str, start_line: int, end_line: int) -> str:
+    """Read a line range of a stored tool output.
+
+    Args:
+        handle: Artifact handle
+        start_line: First line (1-based, inclusive)
+        end_line: Last line (inclusive; at most 500 lines per call)
+
+    Returns:
+        Numbered lines of the range
+    """
+    try:
+        lines, meta = load_artifact(handle)
+    except FileNotFoundError as e:
+        return f"Error: {e}"
+
+    start = max(1, start_line)
+    end = min(len(lines), end_line, start + 499)
+    if start > end:
+        return f"{_header(handle, meta, len(lines))}\nEmpty range {start_line}-{end_line}"
+    return (
+        f"{_header(handle, meta, len(lines))}, lines {start}-{end}\n"
+        f"```\n{_numbered(lines[start - 1 : end], start)}\n```"
+    )
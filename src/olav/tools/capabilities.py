@@ -7,6 +7,8 @@ and making API calls to external systems.
 Refactored: API client moved to api_client.py, knowledge search to knowledge_search.py
 """
 
+import asyncio
+from collections.abc import Callable
 from typing import Literal
 
 from langchain_core.tools import tool
@@ -16,12 +18,14 @@ from olav.core.database import get_database
 # Re-export from refactored modules for backward compatibility
 from olav.tools.api_client import api_call
 from olav.tools.knowledge_search import rrf_fusion, search_knowledge
+from olav.tools.tool_concurrency import read_access
 
 # Make exports available at module level
 __all__ = [
     "search_capabilities",
     "api_call",
     "search",
+    "asearch",
     "rrf_fusion",
     "search_knowledge",
 ]
@@ -38,6 +42,8 @@ def search_capabilities(
 
     This tool searches the capability database for matching CLI commands or API endpoints.
     Use this to discover what commands are available before executing them.
+    Results are ranked by relevance (BM25 over names, descriptions and API
+    parameters); minor typos and partial words are tolerated.
 
     Args:
         query: Search keyword (e.g., "interface", "bgp", "device", "route")
@@ -145,24 +151,64 @@ def search(
         Common BGP errors include...
         ..."
     """
+    with read_access():
+        cap_results = (
+            _search_capabilities_scope(query, platform, limit)
+            if scope in ("capabilities", "all")
+            else None
+        )
+        know_results = (
+            search_knowledge(query, platform, limit) if scope in ("knowledge", "all") else None
+        )
+    return _merge_search_results(query, cap_results, know_results)
+
+
+async def asearch(
+    query: str,
+    scope: Literal["capabilities", "knowledge", "all"] = "all",
+    platform: str | None = None,
+    limit: int = 10,
+) -> str:
+    """Async search: capability and knowledge scopes are searched concurrently."""
+
+    def _guarded(func: Callable[..., str], *args: object) -> str:
+        with read_access():
+            return func(*args)
+
+    cap_task = (
+        asyncio.to_thread(_guarded, _search_capabilities_scope, query, platform, limit)
+        if scope in ("capabilities", "all")
+        else asyncio.sleep(0, result=None)
+    )
+    know_task = (
+        asyncio.to_thread(_guarded, search_knowledge, query, platform, limit)
+        if scope in ("knowledge", "all")
+        else asyncio.sleep(0, result=None)
+    )
+    cap_results, know_results = await asyncio.gather(cap_task, know_task)
+    return _merge_search_results(query, cap_results, know_results)
+
+
+search.coroutine = asearch
+
+
+def _search_capabilities_scope(query: str, platform: str | None, limit: int) -> str:
+    return search_capabilities.invoke(
+        {"query": query, "type": "all", "platform": platform, "limit": limit}
+    )
+
+
+def _merge_search_results(query: str, cap_results: str | None, know_results: str | None) -> str:
+    """Combine per-scope results with source headers."""
     results = []
 
     # Search capabilities
-    if scope in ("capabilities", "all"):
-        cap_results = search_capabilities(  # type: ignore[misc]
-            query=query,
-            type="all",
-            platform=platform,
-            limit=limit,
-        )
-        if "No capabilities found" not in cap_results:
-            results.append("## CLI Commands & APIs\n" + cap_results)
+    if cap_results and "No capabilities found" not in cap_results:
+        results.append("## CLI Commands & APIs\n" + cap_results)
 
     # Search knowledge base
-    if scope in ("knowledge", "all"):
-        know_results = search_knowledge(query, platform, limit)
-        if know_results:
-            results.append("## Documentation\n" + know_results)
+    if know_results:
+        results.append("## Documentation\n" + know_results)
 
     if not results:
         return f"No results found for: {query}"
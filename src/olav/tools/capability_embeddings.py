@@ -0,0 +1,278 @@
+"""Semantic search over capabilities (CLI commands and API endpoints).
+
+Capability rows are embedded with the same provider/model as the knowledge
+base and stored in ``capability_embeddings`` keyed by the row's content hash,
+so a reload only embeds rows that are new or changed. Vector hits are fused
+with the BM25 keyword results (weighted reciprocal rank fusion), letting
+natural-language intents such as "who is connected to port 3" reach
+``show lldp neighbors`` / ``show mac address-table`` in one lookup.
+
+Embedding runs in a background thread after capabilities are (re)loaded;
+until it finishes, search is keyword-only.
+"""
+
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import Any
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_embed_lock = threading.Lock()
+_embed_running: set[str] = set()
+
+
+def semantic_enabled() -> bool:
+    """Whether capability embeddings are configured."""
+    return (
+        settings.capability_embeddings
+        and settings.enable_embedding
+        and settings.embedding_provider != "none"
+    )
+
+
+def capability_text(row: dict[str, Any]) -> str:
+    """Text embedded for a capability row."""
+    parts = [row.get("method") or "", row["name"]]
+    if row.get("description"):
+        parts.append(f"- {row['description']}")
+    if row.get("parameters"):
+        parts.append(f"(parameters: {row['parameters']})")
+    parts.append(f"[{row['platform']}]")
+    return " ".join(part for part in parts if part)
+
+
+def embed_missing_capabilities(
+    conn: Any,  # noqa: ANN401
+    model: str | None = None,
+    batch_size: int | None = None,
+) -> int:
+    """Embed capability rows that have no vector for the model; drop orphans.
+
+    Args:
+        conn: DuckDB connection to the capabilities database (a cursor when
+            called from a background thread)
+        model: Embedding model (defaults to settings.embedding_model)
+        batch_size: Rows per embedding request (default: settings.embedding_batch_size)
+
+    Returns:
+        Number of rows embedded
+    """
+    from olav.tools.knowledge_embedder import get_embeddings
+
+    model = model or settings.embedding_model
+    batch_size = batch_size or settings.embedding_batch_size
+    embeddings = get_embeddings(model)
+
+    # Vectors of rows removed by a reload
+    conn.execute(
+        """
+        DELETE FROM capability_embeddings
+        WHERE content_hash NOT IN (
+            SELECT content_hash FROM capabilities WHERE content_hash IS NOT NULL
+        )
+    """
+    )
+
+    embedded = 0
+    while True:
+        rows = conn.execute(
+            """
+            SELECT DISTINCT content_hash, type, platform, name, method, description, parameters
+            FROM capabilities c
+            WHERE content_hash IS NOT NULL AND NOT EXISTS (
+                SELECT 1 FROM capability_embeddings e
+                WHERE e.content_hash = c.content_hash AND e.model = ?
+            )
+            LIMIT ?
+        """,
+            [model, batch_size],
+        ).fetchall()
+        if not rows:
+            return embedded
+
+        columns = [
+            "content_hash",
+            "type",
+            "platform",
+            "name",
+            "method",
+            "description",
+            "parameters",
+        ]
+        docs = [dict(zip(columns, row, strict=True)) for row in rows]
+        texts = [capability_text(doc) for doc in docs]
+        vectors = embeddings.embed_documents(texts)  # type: ignore[attr-defined]
+
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            for doc, vector in zip(docs, vectors, strict=True):
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO capability_embeddings
+                        (content_hash, model, dim, embedding)
+                    VALUES (?, ?, ?, ?)
+                """,
+                    [doc["content_hash"], model, len(vector), vector],
+                )
+            conn.execute("COMMIT")
+        except Exception as e:
+            # Leave the cursor usable for the next attempt
+            conn.execute("ROLLBACK")
+            logger.warning(f"Storing {len(docs)} capability vectors for {model} failed: {e}")
+            raise
+        embedded += len(docs)
+
+
+def start_capability_embedding(db: Any) -> bool:  # noqa: ANN401
+    """Embed missing capability vectors in a daemon thread.
+
+    Args:
+        db: OlavDatabase whose capabilities should be embedded
+
+    Returns:
+        True if a job was started, False if disabled, up to date or already running
+    """
+    if not semantic_enabled():
+        return False
+
+    model = settings.embedding_model
+    row = db.conn.execute(
+        """
+        SELECT COUNT(*) FROM capabilities c
+        WHERE content_hash IS NOT NULL AND NOT EXISTS (
+            SELECT 1 FROM capability_embeddings e
+            WHERE e.content_hash = c.content_hash AND e.model = ?
+        )
+    """,
+        [model],
+    ).fetchone()
+    if not row or row[0] == 0:
+        return False
+
+    key = f"{db.db_path}:{model}"
+    with _embed_lock:
+        if key in _embed_running:
+            return False
+        _embed_running.add(key)
+
+    def _run() -> None:
+        started = time.monotonic()
+        try:
+            # Keeps the database open until done (the CLI releases it between
+            # queries); the thread gets its own cursor
+            with db.hold() as conn:
+                count = embed_missing_capabilities(conn, model)
+            logger.info(
+                f"Embedded {count} capabilities for {model} in {time.monotonic() - started:.1f}s"
+            )
+        except Exception as e:
+            logger.warning(f"Capability embedding for {model} failed: {e}")
+        finally:
+            with _embed_lock:
+                _embed_running.discard(key)
+
+    threading.Thread(target=_run, name="olav-capability-embed", daemon=True).start()
+    return True
+
+
+@lru_cache(maxsize=256)
+def _embed_query(model: str, query: str) -> tuple[float, ...]:
+    """Embed a search query (cached; planning loops repeat queries)."""
+    from olav.tools.knowledge_embedder import get_embeddings
+
+    return tuple(get_embeddings(model).embed_query(query))  # type: ignore[attr-defined]
+
+
+def vector_search_capabilities(
+    conn: Any,  # noqa: ANN401
+    query: str,
+    cap_type: str = "all",
+    platform: str | None = None,
+    limit: int = 20,
+) -> list[dict[str, Any]]:
+    """Capabilities most similar to a natural-language query.
+
+    Args:
+        conn: DuckDB connection to the capabilities database
+        query: Natural-language query
+        cap_type: Filter by type ("command", "api", or "all")
+        platform: Filter by platform
+        limit: Maximum results
+
+    Returns:
+        Capability dicts with cosine "score", best first (empty if no vectors)
+    """
+    model = settings.embedding_model
+
+    # Don't call the embedding service before any capability has a vector
+    if not conn.execute(
+        "SELECT 1 FROM capability_embeddings WHERE model = ? LIMIT 1", [model]
+    ).fetchone():
+        return []
+
+    query_vec = list(_embed_query(model, query))
+
+    sql = """
+        SELECT c.type, c.platform, c.name, c.method, c.description, c.parameters, c.is_write,
+               list_cosine_similarity(e.embedding, ?::FLOAT[]) AS score
+        FROM capability_embeddings e
+        JOIN capabilities c ON c.content_hash = e.content_hash
+        WHERE e.model = ? AND e.dim = ?
+          AND list_cosine_similarity(e.embedding, ?::FLOAT[]) >= ?
+    """
+    params: list[Any] = [
+        query_vec,
+        model,
+        len(query_vec),
+        query_vec,
+        settings.capability_min_similarity,
+    ]
+    if platform:
+        sql += " AND c.platform = ?"
+        params.append(platform)
+    if cap_type != "all":
+        sql += " AND c.type = ?"
+        params.append(cap_type)
+    sql += " ORDER BY score DESC LIMIT ?"
+    params.append(limit)
+
+    columns = ["type", "platform", "name", "method", "description", "parameters", "is_write"]
+    return [
+        {**dict(zip(columns, row[:7], strict=True)), "score": round(float(row[7]), 3)}
+        for row in conn.execute(sql, params).fetchall()
+    ]
+
+
+def fuse_capability_results(
+    keyword: list[dict[str, Any]],
+    semantic: list[dict[str, Any]],
+    limit: int,
+    vector_weight: float = 0.5,
+    k: int = 60,
+) -> list[dict[str, Any]]:
+    """Weighted reciprocal rank fusion of keyword and vector results.
+
+    Args:
+        keyword: BM25-ranked capabilities
+        semantic: Vector-ranked capabilities
+        limit: Maximum results
+        vector_weight: Share of the vector ranking (0-1)
+        k: RRF constant
+
+    Returns:
+        Fused capabilities with the fused "score", best first
+    """
+    scores: dict[tuple, float] = {}
+    rows: dict[tuple, dict[str, Any]] = {}
+    for results, weight in ((keyword, 1.0 - vector_weight), (semantic, vector_weight)):
+        for rank, row in enumerate(results):
+            key = (row["type"], row["platform"], row["name"], row["method"])
+            scores[key] = scores.get(key, 0.0) + weight / (k + rank)
+            rows.setdefault(key, row)
+
+    ranked = sorted(scores, key=lambda key: scores[key], reverse=True)[:limit]
+    return [{**rows[key], "score": round(scores[key] * 1000, 3)} for key in ranked]
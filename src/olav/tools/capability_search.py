@@ -0,0 +1,241 @@
+"""Ranked full-text search over capabilities (CLI commands and API endpoints).
+
+BM25 over capability names, descriptions and API parameter names, replacing
+the unranked ``ILIKE`` scan:
+
+- Field weighting: name terms count double, so "GET /dcim/devices/" beats an
+  endpoint that merely mentions devices in its summary
+- Fuzzy matching: unknown query terms are expanded to vocabulary terms they
+  prefix ("interf") or closely resemble (typos such as "interfcae"), at a
+  reduced weight
+- Platform boosting: platforms named in the query ("netbox devices") and
+  ``capability_platform_boost`` weights scale the score
+
+The index lives in memory (a few thousand rows index in milliseconds) and is
+rebuilt whenever the capabilities table changes.
+"""
+
+import difflib
+import json
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Field weights for BM25F-style term frequency
+_NAME_WEIGHT = 2.0
+_DESCRIPTION_WEIGHT = 1.0
+_PARAMETER_WEIGHT = 1.0
+
+# Reduced weight for query terms matched via typo/prefix expansion
+_FUZZY_WEIGHT = 0.7
+_PREFIX_WEIGHT = 0.8
+# Boost for rows whose platform is mentioned in the query
+_MENTIONED_PLATFORM_BOOST = 1.5
+
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Lowercase word tokens with naive plural folding.
+
+    Args:
+        text: Text to tokenize (command, path, description, parameters)
+
+    Returns:
+        List of tokens
+    """
+    if not text:
+        return []
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def _parameter_text(parameters: str | None) -> str:
+    """Flatten the stored parameters JSON into searchable text."""
+    if not parameters:
+        return ""
+    try:
+        value = json.loads(parameters)
+    except (TypeError, ValueError):
+        return parameters
+    if isinstance(value, list):
+        return " ".join(str(item) for item in value)
+    if isinstance(value, dict):
+        return " ".join(str(key) for key in value)
+    return str(value)
+
+
+class CapabilitySearchIndex:
+    """In-memory BM25 index over the capabilities table."""
+
+    def __init__(self) -> None:
+        """Create an empty index (populated on first search)."""
+        self._rows: list[dict[str, Any]] = []
+        self._term_freqs: list[dict[str, float]] = []
+        self._lengths: list[float] = []
+        self._postings: dict[str, list[int]] = {}
+        self._vocabulary: list[str] = []
+        self._avg_length = 0.0
+        self._signature: tuple | None = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _table_signature(conn: Any) -> tuple:  # noqa: ANN401
+        """Cheap change detector for the capabilities table."""
+        row = conn.execute("SELECT COUNT(*), MAX(id) FROM capabilities").fetchone()
+        return tuple(row) if row else (0, None)
+
+    def invalidate(self) -> None:
+        """Force a rebuild on the next search."""
+        with self._lock:
+            self._signature = None
+
+    def _ensure_built(self, conn: Any) -> None:  # noqa: ANN401
+        signature = self._table_signature(conn)
+        with self._lock:
+            if signature == self._signature:
+                return
+
+        rows = conn.execute(
+            """
+            SELECT type, platform, name, method, description, parameters, is_write
+            FROM capabilities
+            ORDER BY id
+        """
+        ).fetchall()
+        columns = ["type", "platform", "name", "method", "description", "parameters", "is_write"]
+
+        docs: list[dict[str, Any]] = []
+        term_freqs: list[dict[str, float]] = []
+        lengths: list[float] = []
+        postings: dict[str, list[int]] = {}
+
+        for doc_id, values in enumerate(rows):
+            doc = dict(zip(columns, values, strict=True))
+            freqs: Counter[str] = Counter()
+            for token in tokenize(doc["name"]):
+                freqs[token] += _NAME_WEIGHT
+            for token in tokenize(doc["description"]):
+                freqs[token] += _DESCRIPTION_WEIGHT
+            for token in tokenize(_parameter_text(doc["parameters"])):
+                freqs[token] += _PARAMETER_WEIGHT
+
+            docs.append(doc)
+            term_freqs.append(dict(freqs))
+            lengths.append(sum(freqs.values()))
+            for token in freqs:
+                postings.setdefault(token, []).append(doc_id)
+
+        with self._lock:
+            self._rows = docs
+            self._term_freqs = term_freqs
+            self._lengths = lengths
+            self._postings = postings
+            self._vocabulary = sorted(postings)
+            self._avg_length = sum(lengths) / len(lengths) if lengths else 0.0
+            self._signature = signature
+
+    def _expand_terms(self, tokens: list[str]) -> dict[str, float]:
+        """Map query tokens to indexed terms with weights (exact, prefix, fuzzy)."""
+        terms: dict[str, float] = {}
+        for token in tokens:
+            if token in self._postings:
+                terms[token] = max(terms.get(token, 0.0), 1.0)
+                continue
+
+            if len(token) >= 3:
+                prefixed = [term for term in self._vocabulary if term.startswith(token)][:3]
+                for term in prefixed:
+                    terms[term] = max(terms.get(term, 0.0), _PREFIX_WEIGHT)
+                if prefixed:
+                    continue
+
+            if len(token) >= 4:
+                for term in difflib.get_close_matches(token, self._vocabulary, n=2, cutoff=0.8):
+                    terms[term] = max(terms.get(term, 0.0), _FUZZY_WEIGHT)
+        return terms
+
+    def search(
+        self,
+        conn: Any,  # noqa: ANN401
+        query: str,
+        cap_type: str = "all",
+        platform: str | None = None,
+        limit: int = 20,
+        platform_boost: dict[str, float] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Ranked capability search.
+
+        Args:
+            conn: DuckDB connection to the capabilities database
+            query: Search keywords (names, paths, descriptions; typos tolerated)
+            cap_type: Filter by type ("command", "api", or "all")
+            platform: Filter by platform
+            limit: Maximum results
+            platform_boost: Optional per-platform score multipliers
+
+        Returns:
+            Capability dicts (type, platform, name, method, description,
+            parameters, is_write, score), best first
+        """
+        self._ensure_built(conn)
+
+        tokens = tokenize(query)
+        with self._lock:
+            rows = self._rows
+            term_freqs = self._term_freqs
+            lengths = self._lengths
+            avg_length = self._avg_length or 1.0
+            postings = self._postings
+            terms = self._expand_terms(tokens)
+
+        if not terms:
+            return []
+
+        platforms = {row["platform"] for row in rows}
+        query_tokens = set(tokens)
+        mentioned = {p for p in platforms if p in query_tokens or p.split("_")[0] in query_tokens}
+        boosts = platform_boost or {}
+
+        total_docs = len(rows)
+        scores: dict[int, float] = {}
+        for term, weight in terms.items():
+            doc_ids = postings.get(term, [])
+            idf = math.log(1 + (total_docs - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+            for doc_id in doc_ids:
+                row = rows[doc_id]
+                if cap_type != "all" and row["type"] != cap_type:
+                    continue
+                if platform and row["platform"] != platform:
+                    continue
+                tf = term_freqs[doc_id][term]
+                norm = tf * (_K1 + 1) / (tf + _K1 * (1 - _B + _B * lengths[doc_id] / avg_length))
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * idf * norm
+
+        results = []
+        for doc_id, score in scores.items():
+            row_platform = rows[doc_id]["platform"]
+            score *= boosts.get(row_platform, 1.0)
+            if row_platform in mentioned:
+                score *= _MENTIONED_PLATFORM_BOOST
+            results.append((score, doc_id))
+
+        results.sort(key=lambda item: (-item[0], item[1]))
+        return [{**rows[doc_id], "score": round(score, 3)} for score, doc_id in results[:limit]]
+
+
+_capability_index = CapabilitySearchIndex()
+
+
+def get_capability_search_index() -> CapabilitySearchIndex:
+    """Get the process-wide capability search index."""
+    return _capability_index
@@ -0,0 +1,336 @@
+"""Ranked intent-to-command index for smart_query command selection.
+
+Built once from the capabilities table (at capability load time, rebuilt on
+reload) instead of running an unranked ``ILIKE`` query per intent:
+
+- Command names/descriptions are tokenized and mapped to canonical concepts
+  through a synonym table (English abbreviations, Huawei/Cisco wording and
+  Chinese terms), so "邻居", "peer" and "neighbors" all match the same commands
+- Candidates are ranked by concept coverage, specificity (unrelated extra
+  tokens are penalized) and expected output size, learned from audit_logs
+  where available and otherwise estimated from "brief"/"summary"/"detail"
+- Wildcard whitelist entries ("show ip bgp*") are reduced to runnable commands
+  and only used when no exact entry exists
+"""
+
+import math
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+# Canonical concept -> aliases (command wording, abbreviations, Chinese terms)
+SYNONYMS: dict[str, tuple[str, ...]] = {
+    "interface": ("interfaces", "int", "intf", "port", "ports", "接口", "端口"),
+    "route": ("routes", "routing", "rib", "fib", "路由", "路由表"),
+    "neighbor": ("neighbors", "neighbour", "peer", "peers", "adjacency", "邻居", "对等体"),
+    "bgp": ("边界网关",),
+    "ospf": (),
+    "version": ("ver", "software", "版本", "软件版本"),
+    "config": (
+        "configuration",
+        "conf",
+        "cfg",
+        "running-config",
+        "current-configuration",
+        "配置",
+    ),
+    "startup": ("saved", "startup-config", "saved-configuration", "启动配置", "保存配置"),
+    "mac": ("mac-address", "mac地址", "mac表"),
+    "arp": ("arp表",),
+    "vlan": (),
+    "stp": ("spanning-tree", "spanning", "生成树"),
+    "lldp": ("拓扑",),
+    "cdp": (),
+    "cpu": ("cpu-usage", "cpu利用率", "处理器"),
+    "memory": ("mem", "memory-usage", "内存"),
+    "environment": ("env", "temperature", "power", "fan", "环境", "温度", "电源", "风扇"),
+    "inventory": ("hardware", "device", "module", "硬件", "板卡"),
+    "log": ("logs", "logging", "logbuffer", "日志"),
+    "transceiver": ("optic", "optics", "sfp", "光模块"),
+    "brief": ("status", "state", "简要", "状态"),
+    "summary": ("overview", "摘要", "概要", "汇总"),
+    "detail": ("details", "verbose", "详细"),
+    "ipv6": ("v6",),
+}
+
+# Verbs and wording that carry no intent
+_STOP_TOKENS = frozenset({"show", "display", "dis", "get", "the", "of"})
+# Concepts that narrow output rather than change topic: never penalized as extra
+_NEUTRAL_CONCEPTS = frozenset({"brief", "summary", "running", "current", "table"})
+
+# Estimated output sizes (bytes) used until audit history is available
+_DEFAULT_OUTPUT_BYTES = 8192
+_BRIEF_OUTPUT_BYTES = 2048
+_DETAIL_OUTPUT_BYTES = 65536
+
+_MEMO_MAX_ENTRIES = 1024
+
+_ALIAS_TO_CONCEPT: dict[str, str] = {}
+for _concept, _aliases in SYNONYMS.items():
+    _ALIAS_TO_CONCEPT[_concept] = _concept
+    for _alias in _aliases:
+        _ALIAS_TO_CONCEPT[_alias] = _concept
+
+# Aliases without ASCII letters can't be split on spaces ("查看接口状态")
+_CJK_ALIASES = sorted(
+    (alias for alias in _ALIAS_TO_CONCEPT if not alias.isascii()), key=len, reverse=True
+)
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+
+def _normalize_token(token: str) -> str:
+    """Map a token to its canonical concept (with naive plural folding)."""
+    if token in _ALIAS_TO_CONCEPT:
+        return _ALIAS_TO_CONCEPT[token]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        singular = token[:-1]
+        return _ALIAS_TO_CONCEPT.get(singular, singular)
+    return token
+
+
+def extract_concepts(text: str) -> set[str]:
+    """Extract canonical concepts from an intent or command string.
+
+    Hyphenated words are matched whole first ("running-config") and then by
+    parts, and Chinese aliases are matched as substrings.
+
+    Args:
+        text: Intent or command text
+
+    Returns:
+        Set of canonical concepts
+    """
+    lowered = text.lower()
+    concepts: set[str] = set()
+
+    for word in _TOKEN_RE.findall(lowered):
+        if word in _ALIAS_TO_CONCEPT:
+            concepts.add(_ALIAS_TO_CONCEPT[word])
+            continue
+        for part in word.split("-"):
+            if part and part not in _STOP_TOKENS:
+                concepts.add(_normalize_token(part))
+
+    remaining = lowered
+    for alias in _CJK_ALIASES:
+        if alias in remaining:
+            concepts.add(_ALIAS_TO_CONCEPT[alias])
+            remaining = remaining.replace(alias, " ")
+
+    return concepts - _STOP_TOKENS
+
+
+@dataclass
+class IndexedCommand:
+    """A runnable read-only command with its match features."""
+
+    command: str
+    concepts: set[str]
+    description_concepts: set[str] = field(default_factory=set)
+    wildcard: bool = False
+    avg_output_bytes: float | None = None
+
+    def estimated_bytes(self) -> float:
+        """Learned average output size, or a prior from the command wording."""
+        if self.avg_output_bytes is not None:
+            return self.avg_output_bytes
+        if self.concepts & {"brief", "summary"}:
+            return _BRIEF_OUTPUT_BYTES
+        if "detail" in self.concepts:
+            return _DETAIL_OUTPUT_BYTES
+        return _DEFAULT_OUTPUT_BYTES
+
+    def score(self, intent_concepts: set[str]) -> float:
+        """Rank this command for an intent (higher is better, <= 0 means no match)."""
+        matched = len(intent_concepts & self.concepts)
+        matched_desc = len((intent_concepts & self.description_concepts) - self.concepts)
+        if not matched and not matched_desc:
+            return 0.0
+
+        extra = len(self.concepts - intent_concepts - _NEUTRAL_CONCEPTS)
+        size_penalty = max(0.0, math.log2(self.estimated_bytes() / 1024))
+        return (
+            10.0 * matched
+            + 4.0 * matched_desc
+            - 1.5 * extra
+            - size_penalty
+            - (0.5 if self.wildcard else 0.0)
+        )
+
+
+class CommandIndex:
+    """Per-platform ranked intent -> command index."""
+
+    def __init__(self) -> None:
+        """Create an empty index (populated by build())."""
+        self._platforms: dict[str, list[IndexedCommand]] = {}
+        self._memo: dict[tuple[str, str], list[str]] = {}
+        self._lock = threading.Lock()
+        self.built = False
+        self.stats: dict[str, int] = {"lookups": 0, "memo_hits": 0}
+
+    def build(self, db: Any = None) -> int:  # noqa: ANN401
+        """(Re)build the index from the capabilities table.
+
+        Args:
+            db: OlavDatabase instance (defaults to the global database)
+
+        Returns:
+            Number of indexed commands
+        """
+        if db is None:
+            from olav.core.database import get_database
+
+            db = get_database()
+
+        rows = db.conn.execute(
+            """
+            SELECT platform, name, description FROM capabilities
+            WHERE type = 'command' AND NOT is_write
+            ORDER BY id
+        """
+        ).fetchall()
+        output_sizes = self._load_output_sizes(db)
+
+        platforms: dict[str, dict[str, IndexedCommand]] = {}
+        for platform, name, description in rows:
+            wildcard = name.rstrip().endswith("*")
+            command = name.rstrip().rstrip("*").strip()
+            if not command:
+                continue
+
+            entries = platforms.setdefault(platform, {})
+            key = command.lower()
+            existing = entries.get(key)
+            if existing and not existing.wildcard:
+                continue  # Exact entry already indexed
+
+            entries[key] = IndexedCommand(
+                command=command,
+                concepts=extract_concepts(command),
+                description_concepts=extract_concepts(description or ""),
+                wildcard=wildcard,
+                avg_output_bytes=output_sizes.get(key),
+            )
+
+        with self._lock:
+            self._platforms = {p: list(entries.values()) for p, entries in platforms.items()}
+            self._memo = {}
+            self.built = True
+
+        return sum(len(entries) for entries in self._platforms.values())
+
+    @staticmethod
+    def _load_output_sizes(db: Any) -> dict[str, float]:  # noqa: ANN401
+        """Average successful output size per command from the audit trail."""
+        try:
+            rows = db.conn.execute(
+                """
+                SELECT lower(trim(command)), AVG(length(output))
+                FROM audit_logs
+                WHERE success AND output IS NOT NULL
+                GROUP BY 1
+            """
+            ).fetchall()
+        except Exception:
+            return {}
+        return {command: float(size) for command, size in rows if size is not None}
+
+    def lookup(self, platform: str, intent: str, limit: int = 10) -> list[str]:
+        """Return commands for an intent, best first.
+
+        Args:
+            platform: Device platform (e.g., "cisco_ios", "huawei_vrp")
+            intent: Intent keyword(s), English or Chinese (e.g., "bgp peer", "接口状态")
+            limit: Maximum commands to return
+
+        Returns:
+            Ranked list of runnable read-only commands (may be empty)
+        """
+        self.stats["lookups"] += 1
+        memo_key = (platform, " ".join(intent.lower().split()))
+        with self._lock:
+            cached = self._memo.get(memo_key)
+            entries = self._platforms.get(platform, [])
+        if cached is not None:
+            self.stats["memo_hits"] += 1
+            return cached[:limit]
+
+        intent_concepts = extract_concepts(intent)
+        scored = [(entry.score(intent_concepts), entry) for entry in entries]
+        scored.sort(key=lambda item: -item[0])
+        ranked = [entry.command for score, entry in scored if score > 0]
+
+        if not ranked:
+            # Unknown vocabulary: plain substring match, smallest output first
+            needle = memo_key[1]
+            matches = [e for e in entries if needle and needle in e.command.lower()]
+            ranked = [e.command for e in sorted(matches, key=lambda e: e.estimated_bytes())]
+
+        with self._lock:
+            if len(self._memo) >= _MEMO_MAX_ENTRIES:
+                self._memo.clear()
+            self._memo[memo_key] = ranked
+        return ranked[:limit]
+
+    def resolve(self, platform: str, intent: str) -> str | None:
+        """Return the best command only if it unambiguously covers the intent.
+
+        Unlike lookup(), which always returns the closest candidates, this
+        requires every topical concept of the intent (anything but
+        brief/summary-style qualifiers) to appear in the command name or
+        description. Used by the LLM-free fast path to decide whether a query
+        can be answered without the agent.
+
+        Args:
+            platform: Device platform
+            intent: Intent text with device names removed
+
+        Returns:
+            Command, or None if the intent has unknown words or no full match
+        """
+        required = extract_concepts(intent) - _NEUTRAL_CONCEPTS
+        if not required:
+            return None
+
+        ranked = self.lookup(platform, intent, limit=1)
+        if not ranked:
+            return None
+
+        with self._lock:
+            entry = next(
+                (e for e in self._platforms.get(platform, []) if e.command == ranked[0]), None
+            )
+        if entry is None or not required <= (entry.concepts | entry.description_concepts):
+            return None
+        return entry.command
+
+    def get_stats(self) -> dict[str, Any]:
+        """Index size and lookup counters."""
+        with self._lock:
+            sizes = {platform: len(entries) for platform, entries in self._platforms.items()}
+            memo_size = len(self._memo)
+        return {**self.stats, "platforms": sizes, "memo_size": memo_size, "built": self.built}
+
+
+_command_index = CommandIndex()
+
+
+def get_command_index() -> CommandIndex:
+    """Get the global command index, building it on first use."""
+    if not _command_index.built:
+        _command_index.build()
+    return _command_index
+
+
+def rebuild_command_index(db: Any = None) -> int:  # noqa: ANN401
+    """Rebuild the global command index (called after capabilities reload).
+
+    Args:
+        db: OlavDatabase instance (defaults to the global database)
+
+    Returns:
+        Number of indexed commands
+    """
+    return _command_index.build(db)
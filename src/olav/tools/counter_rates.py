@@ -0,0 +1,344 @@
+"""Interface counter deltas and rates from stored counter samples.
+
+Error counters (CRC, input/output errors, drops, runts, giants, packets) are
+metric samples per (device, metric, interface) - recorded by snapshot sweeps
+(the ``counters`` type), inspections and live sampling here. "Is the CRC count
+increasing" becomes one query: every increment between consecutive samples
+is computed with a window function over all interfaces of the device, then
+summed per configured window (``counter_windows``).
+
+A sample lower than its predecessor is either a 32-bit wrap (the predecessor
+was in the top half of the 32-bit range: the delta wraps around 2**32) or a
+counter reset (clear counters, reload: the new value is counted from zero).
+"""
+
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from langchain_core.tools import tool
+
+from config.settings import settings
+from olav.tools.metrics_store import MetricsStore, get_metrics_store, record_outputs
+
+# Short names accepted by counter_rates -> metric names
+COUNTERS: dict[str, str] = {
+    "crc": "if_crc_errors",
+    "input_errors": "if_input_errors",
+    "output_errors": "if_output_errors",
+    "input_drops": "if_input_drops",
+    "output_drops": "if_output_drops",
+    "runts": "if_runts",
+    "giants": "if_giants",
+    "input_packets": "if_input_packets",
+    "output_packets": "if_output_packets",
+}
+# Counters reported when none are named (packet counters only on request)
+ERROR_COUNTERS = ("crc", "input_errors", "output_errors", "input_drops", "output_drops")
+
+_WRAP = 2**32
+_WINDOW_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_MAX_ROWS = 50
+
+
+def window_seconds(window: str) -> int:
+    """Seconds in a window spec ("30s", "15m", "1h", "7d"; bare numbers are seconds).
+
+    Raises:
+        ValueError: Malformed spec
+    """
+    match = re.fullmatch(r"\s*(\d+)\s*([smhd]?)\s*", window.lower())
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"Invalid window '{window}' (use e.g. 30s, 15m, 1h, 7d)")
+    return int(match.group(1)) * _WINDOW_UNITS[match.group(2) or "s"]
+
+
+@dataclass
+class CounterDelta:
+    """Change of one interface counter over one window."""
+
+    interface: str
+    counter: str
+    window: str
+    value: float  # Latest sample
+    delta: float | None = None  # None: fewer than two samples in the window
+    seconds: float = 0.0  # Time between the first and last sample used
+    wraps: int = 0
+    resets: int = 0
+
+    @property
+    def rate_per_min(self) -> float | None:
+        if self.delta is None or self.seconds <= 0:
+            return None
+        return self.delta * 60 / self.seconds
+
+
+@dataclass
+class CounterReport:
+    """Counter deltas of one device over several windows."""
+
+    device: str
+    windows: list[str]
+    deltas: list[CounterDelta] = field(default_factory=list)
+    sampled_live: int = 0
+
+    def increasing(self) -> list[CounterDelta]:
+        """Deltas > 0, largest rate first."""
+        rising = [d for d in self.deltas if d.delta]
+        return sorted(rising, key=lambda d: -(d.rate_per_min or 0))
+
+
+def counter_deltas(
+    store: MetricsStore,
+    device: str,
+    metrics: list[str],
+    windows: list[str],
+    now: datetime | None = None,
+) -> list[CounterDelta]:
+    """Deltas of counters on all interfaces of a device, for each window.
+
+    One window-function pass computes each sample's increment over its
+    predecessor (wrap/reset aware); increments are then summed per window.
+    A window's first increment may be against a sample just before it, so a
+    sample before and one inside the window are enough for a delta.
+
+    Args:
+        store: Metrics store
+        device: Device name
+        metrics: Metric names (e.g. "if_crc_errors")
+        windows: Window specs ("5m", "1h", ...)
+        now: Window end (default: now)
+
+    Returns:
+        One CounterDelta per (interface, counter, window) with samples
+    """
+    now = now or datetime.now()
+    seconds = [window_seconds(w) for w in windows]
+    # Include one window's worth of history before the longest window so its
+    # first sample has a predecessor
+    since = now - timedelta(seconds=2 * max(seconds))
+    names = {metric: short for short, metric in COUNTERS.items()}
+    rows = store.store.conn.execute(
+        """
+        WITH s AS (
+            SELECT metric, labels, ts, value,
+                lag(value) OVER w AS prev, lag(ts) OVER w AS prev_ts
+            FROM metric_samples
+            WHERE device = ? AND list_contains(?::VARCHAR[], metric) AND ts >= ? AND ts <= ?
+            WINDOW w AS (PARTITION BY metric, labels ORDER BY ts)
+        ), d AS (
+            SELECT *,
+                CASE
+                    WHEN prev IS NULL THEN NULL
+                    WHEN value >= prev THEN 'ok'
+                    WHEN prev >= ? / 2 AND prev < ? THEN 'wrap'
+                    ELSE 'reset'
+                END AS kind
+            FROM s
+        )
+        SELECT w.idx, metric, labels,
+            arg_max(value, ts) AS value,
+            sum(CASE kind
+                WHEN 'ok' THEN value - prev
+                WHEN 'wrap' THEN value + ? - prev
+                WHEN 'reset' THEN value
+            END) FILTER (kind IS NOT NULL) AS delta,
+            epoch(max(ts) - min(prev_ts)) AS seconds,
+            count(*) FILTER (kind = 'wrap') AS wraps,
+            count(*) FILTER (kind = 'reset') AS resets
+        FROM d, (SELECT i AS idx, list_extract(?::BIGINT[], i) AS secs FROM range(1, ?) r(i)) w
+        WHERE ts >= ?::TIMESTAMP - to_seconds(w.secs)
+        GROUP BY ALL
+        ORDER BY labels, metric, w.idx
+        """,
+        [device, metrics, since, now, _WRAP, _WRAP, _WRAP, seconds, len(seconds) + 1, now],
+    ).fetchall()
+    deltas = []
+    for idx, metric, labels, value, delta, span, wraps, resets in rows:
+        interface = labels.removeprefix("interface=")
+        deltas.append(
+            CounterDelta(
+                interface,
+                names.get(metric, metric),
+                windows[idx - 1],
+                value,
+                delta,
+                span or 0.0,
+                wraps,
+                resets,
+            )
+        )
+    return deltas
+
+
+def _sample_live(device: str) -> bool:
+    """Read the device's counters now and store them as samples."""
+    from olav.tools.network import get_executor
+    from olav.tools.smart_query import get_device_info
+    from olav.tools.snapshot import CollectedOutput, parse_output, snapshot_command_for
+    from olav.tools.tool_concurrency import read_access
+
+    info = get_device_info(device)
+    platform = info["platform"] if info else "unknown"
+    command = snapshot_command_for(platform, "counters")
+    if not command:
+        return False
+    with read_access():
+        result = get_executor().execute(device=device, command=command, timeout=60)
+    if not result.success:
+        return False
+    output = result.output or ""
+    collected = CollectedOutput(
+        device,
+        platform,
+        "counters",
+        command,
+        datetime.now(),
+        True,
+        output=output,
+        records=parse_output(output, platform, command),
+    )
+    return record_outputs([collected]) > 0
+
+
+def interface_counter_report(
+    device: str,
+    counters: list[str] | None = None,
+    windows: list[str] | None = None,
+    live: bool = True,
+) -> CounterReport:
+    """Counter deltas for a device, sampling live when needed.
+
+    With ``live``, the counters are read once now; if the shortest window
+    then still has no earlier sample to compare with, they are read again
+    after ``counter_sample_interval`` seconds (the manual "check again 30
+    seconds later" step).
+
+    Args:
+        device: Device name
+        counters: Short counter names or metric names (default: ERROR_COUNTERS)
+        windows: Window specs (default: settings.counter_windows)
+        live: Read the device's counters now
+
+    Raises:
+        ValueError: Unknown counter or malformed window
+    """
+    names = counters or list(ERROR_COUNTERS)
+    unknown = [c for c in names if c not in COUNTERS and c not in COUNTERS.values()]
+    if unknown:
+        raise ValueError(f"Unknown counters: {', '.join(unknown)} (known: {', '.join(COUNTERS)})")
+    metrics = [COUNTERS.get(c, c) for c in names]
+    windows = windows or list(settings.counter_windows)
+    shortest = min(windows, key=window_seconds)
+
+    store = get_metrics_store()
+    report = CounterReport(device, windows)
+    if live and _sample_live(device):
+        report.sampled_live += 1
+        first = counter_deltas(store, device, metrics, [shortest])
+        if first and all(d.delta is None for d in first):
+            time.sleep(settings.counter_sample_interval)
+            report.sampled_live += _sample_live(device)
+    report.deltas = counter_deltas(store, device, metrics, windows)
+    return report
+
+
+def _format_delta(delta: CounterDelta | None) -> str:
+    if delta is None or delta.delta is None:
+        return "-"
+    text = f"+{delta.delta:g}" if delta.delta else "0"
+    if delta.resets:
+        text += " (reset)"
+    elif delta.wraps:
+        text += " (wrap)"
+    return text
+
+
+def format_counter_report(report: CounterReport) -> str:
+    """Markdown table of increasing counters (all counters if none increase)."""
+    if not report.deltas:
+        return (
+            f"No counter samples for {report.device}. Take a snapshot (counters) or run "
+            "counter_rates with live=True."
+        )
+    by_key: dict[tuple[str, str], dict[str, CounterDelta]] = {}
+    for delta in report.deltas:
+        by_key.setdefault((delta.interface, delta.counter), {})[delta.window] = delta
+    rising = {(d.interface, d.counter) for d in report.increasing()}
+    keys = [k for k in by_key if k in rising] or list(by_key)
+
+    interfaces = len({k[0] for k in by_key})
+    if rising:
+        head = (
+            f"## {len(rising)} counter(s) increasing on {report.device} "
+            f"({interfaces} interfaces checked)"
+        )
+    else:
+        head = f"## No counters increasing on {report.device} ({interfaces} interfaces checked)"
+    lines = [head]
+    if report.sampled_live:
+        lines.append(f"Sampled live {report.sampled_live}x.")
+    lines.append(
+        "| interface | counter | value | "
+        + " | ".join(f"Δ {w}" for w in report.windows)
+        + " | rate/min |"
+    )
+    lines.append("|---" * (len(report.windows) + 4) + "|")
+
+    def rate(key: tuple[str, str]) -> float:
+        return max((d.rate_per_min or 0 for d in by_key[key].values()), default=0)
+
+    for key in sorted(keys, key=lambda k: (-rate(k), k))[:_MAX_ROWS]:
+        per_window = by_key[key]
+        # Rate from the shortest window that has a delta
+        rated = [per_window[w] for w in report.windows if w in per_window]
+        current = next((d for d in rated if d.rate_per_min is not None), None)
+        value = next(iter(per_window.values())).value
+        lines.append(
+            f"| {key[0]} | {key[1]} | {value:g} | "
+            + " | ".join(_format_delta(per_window.get(w)) for w in report.windows)
+            + f" | {f'{current.rate_per_min:.2f}' if current else '-'} |"
+        )
+    if len(keys) > _MAX_ROWS:
+        lines.append(f"\n{len(keys) - _MAX_ROWS} more rows not shown")
+    return "\n".join(lines)
+
+
+@tool
+def counter_rates(
+    device: str,
+    counters: str = "",
+    windows: str = "",
+    live: bool = True,
+) -> str:
+    """Check whether interface error counters are increasing, on all interfaces at once.
+
+    Answers "is the CRC count increasing on R1" in one call: reads the
+    counters now (and once more after a short wait if there is no earlier
+    sample), then reports deltas and rates per window. Counter wraps and
+    resets (clear counters, reload) are detected.
+
+    Args:
+        device: Device name
+        counters: Comma-separated counters: crc, input_errors, output_errors,
+                  input_drops, output_drops, runts, giants, input_packets,
+                  output_packets (default: error and drop counters)
+        windows: Comma-separated windows such as "5m,1h,24h" (default: configured)
+        live: Read the device's counters now; False answers from stored samples only
+
+    Returns:
+        Markdown table of increasing counters with per-window deltas and rate/min
+    """
+    try:
+        report = interface_counter_report(
+            device,
+            [c.strip() for c in counters.split(",") if c.strip()] or None,
+            [w.strip() for w in windows.split(",") if w.strip()] or None,
+            live,
+        )
+    except ValueError as e:
+        return f"Error: {e}"
+    except Exception as e:
+        return f"Error: counter check failed on {device}: {e}"
+    return format_counter_report(report)
@@ -0,0 +1,350 @@
+"""Quantized embedding storage for fast first-pass vector search.
+
+Full-precision vectors stay in knowledge_embeddings; this module maintains a
+compact copy in knowledge_embeddings_q used to pick candidates, which are then
+re-scored exactly against the float32 vectors:
+
+- int8: symmetric per-vector scaling to [-127, 127] (4x smaller, cosine-preserving)
+- binary: one sign bit per dimension, ranked by Hamming distance (32x smaller)
+
+Also reports memory footprint and recall@k of the two-stage search versus
+exact search, so the trade-off can be checked before enabling it.
+"""
+
+import random
+import time
+from typing import Any, Literal
+
+import duckdb
+
+from config.settings import settings
+from olav.core.database import vector_literal
+
+QuantizationScheme = Literal["int8", "binary"]
+
+
+def quantize_int8(vector: list[float]) -> tuple[list[int], float]:
+    """Quantize a vector to int8 codes with a per-vector scale.
+
+    Args:
+        vector: Float vector
+
+    Returns:
+        Tuple of (codes in [-127, 127], scale) where vector ≈ codes * scale
+    """
+    max_abs = max((abs(x) for x in vector), default=0.0)
+    if max_abs == 0.0:
+        return [0] * len(vector), 0.0
+    scale = max_abs / 127.0
+    return [int(round(x / scale)) for x in vector], scale
+
+
+def quantize_binary(vector: list[float]) -> str:
+    """Quantize a vector to sign bits (DuckDB BIT literal).
+
+    Args:
+        vector: Float vector
+
+    Returns:
+        Bit string with '1' for positive components, '0' otherwise
+    """
+    return "".join("1" if x > 0 else "0" for x in vector)
+
+
+def rescore_factor(scheme: QuantizationScheme) -> int:
+    """Candidates re-scored per result for a scheme (from settings)."""
+    if scheme == "binary":
+        return settings.embedding_binary_rescore_factor
+    return settings.embedding_rescore_factor
+
+
+def bytes_per_vector(dim: int, scheme: QuantizationScheme | Literal["float32"]) -> int:
+    """Storage size of one vector payload (excluding row overhead).
+
+    Args:
+        dim: Vector dimension
+        scheme: "float32", "int8" or "binary"
+
+    Returns:
+        Size in bytes
+    """
+    if scheme == "float32":
+        return dim * 4
+    if scheme == "int8":
+        return dim + 4  # codes + float32 scale
+    return (dim + 7) // 8
+
+
+# Quantized columns computed in SQL from e.embedding (same codes as
+# quantize_int8 / quantize_binary, apart from rounding of exact halves)
+_QUANTIZE_SQL = {
+    "int8": """
+        CASE WHEN scale = 0 THEN list_transform(embedding, x -> 0::TINYINT)
+             ELSE list_transform(embedding, x -> round(x / scale)::TINYINT) END,
+        NULL::BIT,
+        scale
+    """,
+    "binary": """
+        NULL::TINYINT[],
+        list_aggregate(list_transform(embedding, x -> if(x > 0, '1', '0')), 'string_agg', '')::BIT,
+        0.0
+    """,
+}
+
+
+def _insert_quantized(
+    conn: duckdb.DuckDBPyConnection,
+    model: str,
+    scheme: QuantizationScheme,
+    where: str,
+    params: list[object],
+) -> int:
+    """Quantize stored knowledge_embeddings rows of a model in one INSERT ... SELECT.
+
+    The vectors never leave DuckDB, so nothing is bound as a list parameter
+    (see vector_literal).
+
+    Returns:
+        Number of rows written
+    """
+    row = conn.execute(
+        f"""
+        INSERT OR REPLACE INTO knowledge_embeddings_q
+        (chunk_id, model, scheme, dim, codes, bits, scale)
+        SELECT chunk_id, model, ?, dim, {_QUANTIZE_SQL[scheme]}
+        FROM (
+            SELECT e.chunk_id, e.model, e.dim, e.embedding,
+                   list_max(list_transform(e.embedding, x -> abs(x))) / 127.0 AS scale
+            FROM knowledge_embeddings e
+            WHERE e.model = ? AND {where}
+        )
+    """,  # noqa: S608
+        [scheme, model, *params],
+    ).fetchone()
+    return int(row[0]) if row else 0
+
+
+def store_quantized(
+    conn: duckdb.DuckDBPyConnection,
+    chunk_id: int,
+    model: str,
+    scheme: QuantizationScheme,
+) -> None:
+    """Store the quantized form of a chunk's stored full-precision vector.
+
+    Args:
+        conn: Writable DuckDB connection
+        chunk_id: knowledge_chunks.id
+        model: Embedding model that produced the vector
+        scheme: Quantization scheme
+    """
+    _insert_quantized(conn, model, scheme, "e.chunk_id = ?", [chunk_id])
+
+
+def quantize_missing(
+    conn: duckdb.DuckDBPyConnection,
+    model: str,
+    scheme: QuantizationScheme,
+) -> int:
+    """Quantize every full-precision vector of a model that has no quantized copy.
+
+    Args:
+        conn: Writable DuckDB connection
+        model: Embedding model
+        scheme: Quantization scheme
+
+    Returns:
+        Number of vectors quantized
+    """
+    count = _insert_quantized(
+        conn,
+        model,
+        scheme,
+        """NOT EXISTS (
+            SELECT 1 FROM knowledge_embeddings_q q
+            WHERE q.chunk_id = e.chunk_id AND q.model = e.model AND q.scheme = ?
+        )""",
+        [scheme],
+    )
+    conn.commit()
+    return count
+
+
+def has_quantized(
+    conn: duckdb.DuckDBPyConnection, model: str, dim: int, scheme: QuantizationScheme
+) -> bool:
+    """Check whether every (model, dim) vector has a quantized copy for ``scheme``.
+
+    A partially quantized model would hide the chunks without a copy, so
+    search stays exact until quantize_missing has caught up.
+    """
+    try:
+        row = conn.execute(
+            """
+            SELECT
+                (SELECT COUNT(*) FROM knowledge_embeddings WHERE model = ? AND dim = ?),
+                (SELECT COUNT(*) FROM knowledge_embeddings_q
+                 WHERE model = ? AND dim = ? AND scheme = ?)
+        """,
+            [model, dim, model, dim, scheme],
+        ).fetchone()
+    except duckdb.CatalogException:
+        return False
+    return bool(row and row[0] and row[1] >= row[0])
+
+
+def two_stage_search(
+    conn: duckdb.DuckDBPyConnection,
+    query_vec: list[float],
+    model: str,
+    scheme: QuantizationScheme,
+    limit: int,
+    candidates: int,
+    platform: str | None = None,
+) -> list:
+    """Quantized candidate search followed by exact re-scoring.
+
+    Args:
+        conn: DuckDB connection
+        query_vec: Full-precision query vector
+        model: Embedding model
+        scheme: Quantization scheme used for the first pass
+        limit: Results to return
+        candidates: Candidates taken from the first pass (top-N to re-score)
+        platform: Optional platform filter
+
+    Returns:
+        List of (id, title, content, platform, score) tuples, score = exact cosine
+    """
+    dim = len(query_vec)
+    query_param = vector_literal(query_vec)
+
+    if scheme == "int8":
+        # Cosine is scale-invariant, so the float query is compared to raw codes
+        first_order = "list_cosine_similarity(q.codes::FLOAT[], ?::FLOAT[]) DESC"
+        first_param: object = query_param
+    else:
+        first_order = "bit_count(xor(q.bits, ?::BIT)) ASC"
+        first_param = quantize_binary(query_vec)
+
+    platform_join = "JOIN knowledge_chunks pc ON pc.id = q.chunk_id AND pc.platform = ?"
+    # dim is len() of the query vector; the first-pass expression is one of two constants
+    sql = f"""
+        WITH candidates AS (
+            SELECT q.chunk_id FROM knowledge_embeddings_q q
+            {platform_join if platform else ""}
+            WHERE q.model = ? AND q.scheme = ? AND q.dim = ?
+            ORDER BY {first_order}
+            LIMIT ?
+        )
+        SELECT c.id, c.title, c.content, c.platform,
+               array_cosine_similarity(e.embedding::FLOAT[{dim}], ?::FLOAT[{dim}]) AS score
+        FROM candidates
+        JOIN knowledge_embeddings e ON e.chunk_id = candidates.chunk_id AND e.model = ?
+        JOIN knowledge_chunks c ON c.id = e.chunk_id
+        ORDER BY score DESC
+        LIMIT ?
+    """  # noqa: S608
+    params: list[object] = [platform] if platform else []
+    params += [model, scheme, dim, first_param, candidates, query_param, model, limit]
+    return conn.execute(sql, params).fetchall()
+
+
+def _exact_search(
+    conn: duckdb.DuckDBPyConnection, query_vec: list[float], model: str, limit: int
+) -> list:
+    """Exact top-k over full-precision vectors (recall baseline)."""
+    dim = len(query_vec)
+    return conn.execute(
+        f"""
+        SELECT chunk_id FROM knowledge_embeddings
+        WHERE model = ? AND dim = ?
+        ORDER BY array_cosine_similarity(embedding::FLOAT[{dim}], ?::FLOAT[{dim}]) DESC
+        LIMIT ?
+    """,  # noqa: S608
+        [model, dim, vector_literal(query_vec), limit],
+    ).fetchall()
+
+
+def quantization_report(
+    conn: duckdb.DuckDBPyConnection,
+    model: str,
+    scheme: QuantizationScheme,
+    k: int = 10,
+    rescore_factor: int = 4,
+    samples: int = 50,
+) -> dict[str, Any]:
+    """Measure memory savings and recall@k of quantized two-stage search.
+
+    Stored chunk vectors are used as sample queries, so no embedding service
+    is needed to evaluate the index.
+
+    Args:
+        conn: DuckDB connection
+        model: Embedding model
+        scheme: Quantization scheme
+        k: Top-k for recall
+        rescore_factor: Candidates re-scored = k * rescore_factor
+        samples: Number of sample queries
+
+    Returns:
+        Dictionary with vectors, dim, float32/quantized sizes (MB), compression,
+        recall@k, and average exact/two-stage latency in ms
+    """
+    row = conn.execute(
+        "SELECT COUNT(*), MAX(dim) FROM knowledge_embeddings WHERE model = ?", [model]
+    ).fetchone()
+    vectors, dim = (row[0], row[1] or 0) if row else (0, 0)
+
+    float_mb = vectors * bytes_per_vector(dim, "float32") / 1_048_576
+    quant_mb = vectors * bytes_per_vector(dim, scheme) / 1_048_576
+    report: dict[str, Any] = {
+        "model": model,
+        "scheme": scheme,
+        "vectors": vectors,
+        "dim": dim,
+        "float32_mb": round(float_mb, 2),
+        "quantized_mb": round(quant_mb, 2),
+        "compression": round(float_mb / quant_mb, 1) if quant_mb else 0.0,
+        "recall_at_k": 0.0,
+        "k": k,
+    }
+    if vectors == 0:
+        return report
+
+    rows = conn.execute(
+        "SELECT chunk_id FROM knowledge_embeddings WHERE model = ?", [model]
+    ).fetchall()
+    ids = [r[0] for r in rows]
+    sample_ids = random.sample(ids, min(samples, len(ids)))  # noqa: S311
+
+    hits = 0
+    total = 0
+    exact_ms = 0.0
+    quant_ms = 0.0
+    for chunk_id in sample_ids:
+        vec_row = conn.execute(
+            "SELECT embedding FROM knowledge_embeddings WHERE chunk_id = ? AND model = ?",
+            [chunk_id, model],
+        ).fetchone()
+        if not vec_row:
+            continue
+        query_vec = list(vec_row[0])
+
+        started = time.perf_counter()
+        exact = {r[0] for r in _exact_search(conn, query_vec, model, k)}
+        exact_ms += (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        approx_rows = two_stage_search(conn, query_vec, model, scheme, k, k * rescore_factor)
+        approx = {r[0] for r in approx_rows}
+        quant_ms += (time.perf_counter() - started) * 1000
+
+        hits += len(exact & approx)
+        total += len(exact)
+
+    n = len(sample_ids) or 1
+    report["recall_at_k"] = round(hits / total, 3) if total else 0.0
+    report["exact_latency_ms"] = round(exact_ms / n, 2)
+    report["two_stage_latency_ms"] = round(quant_ms / n, 2)
+    return report
@@ -0,0 +1,428 @@
+"""MAC and ARP location index ("where is this host").
+
+MAC address tables, ARP tables and LLDP neighbors collected by snapshots (or
+recorded smart_query runs) are normalized into two indexed tables in the
+snapshot database:
+
+- ``endpoint_mac``: one row per (device, MAC, VLAN, port). MACs are stored
+  in one canonical form (``aabb.ccdd.eeff``, ``AA-BB-CC-DD-EE-FF`` and
+  ``aa:bb:cc:dd:ee:ff`` all match), and every port is classified as
+  ``access`` or ``uplink``: ports with a switch/router LLDP neighbor, port
+  channels and ports carrying many MACs are uplinks.
+- ``endpoint_arp``: IP to MAC bindings per device/VRF.
+
+A host lookup resolves IP -> MAC through ARP, then MAC -> access port in one
+query across the fleet instead of walking switches one by one. Like the route
+index, devices are re-indexed only when their newest collection changed.
+"""
+
+import re
+import threading
+from typing import Any
+
+from langchain_core.tools import tool
+
+from olav.tools.snapshot import SnapshotStore, first_field, get_snapshot_store
+
+MAC_TYPE = "mac"
+ARP_TYPE = "arp"
+LLDP_TYPE = "lldp"
+
+# TextFSM field names per attribute (templates differ by platform)
+MAC_FIELDS: dict[str, tuple[str, ...]] = {
+    "mac": ("destination_address", "mac_address", "mac"),
+    "vlan": ("vlan_id", "vlan", "vsi"),
+    "port": ("destination_port", "ports", "interface", "port", "outgoing_interface"),
+    "type": ("type", "mac_type"),
+}
+ARP_FIELDS: dict[str, tuple[str, ...]] = {
+    "ip": ("ip_address", "address", "ip"),
+    "mac": ("mac_address", "mac", "hardware_addr"),
+    "interface": ("interface", "port"),
+    "vrf": ("vrf", "vpn_instance"),
+}
+NEIGHBOR_FIELDS: dict[str, tuple[str, ...]] = {
+    "local_interface": ("local_interface", "local_port", "local_intf"),
+    "neighbor": ("neighbor_name", "neighbor", "neighbor_device", "system_name", "neighbor_id"),
+    "neighbor_interface": ("neighbor_interface", "neighbor_port_id", "port_id"),
+    "capabilities": ("capabilities", "capability"),
+}
+
+# A port learning more MACs than this without an LLDP neighbor is treated as
+# an uplink (unmanaged switch, hypervisor or un-collected neighbor)
+UPLINK_MAC_THRESHOLD = 20
+
+# Long interface names -> the short form used for matching (lowercase prefix)
+_INTERFACE_PREFIXES = {
+    "gigabitethernet": "gi",
+    "ge": "gi",
+    "fastethernet": "fa",
+    "tengigabitethernet": "te",
+    "tengige": "te",
+    "xgigabitethernet": "xge",
+    "twentyfivegige": "twe",
+    "twentyfivegigabitethernet": "twe",
+    "fortygigabitethernet": "fo",
+    "fortygige": "fo",
+    "hundredgigabitethernet": "hu",
+    "hundredgige": "hu",
+    "hundredge": "hu",
+    "ethernet": "eth",
+    "port-channel": "po",
+    "portchannel": "po",
+    "eth-trunk": "eth-trunk",
+    "management": "mgmt",
+}
+_INTERFACE_RE = re.compile(r"^([A-Za-z][A-Za-z-]*?)\s*([\d/:.]+)$")
+_AGGREGATE_PREFIXES = ("po", "eth-trunk", "bundle-ether", "ae")
+# MAC table "ports" that aren't physical ports
+_PSEUDO_PORTS = {"cpu", "router", "switch", "drop", "sup-eth1(r)", "self", "-"}
+
+# Uplink sightings listed by locate_host (a host is seen on every uplink toward it)
+_MAX_UPLINKS_SHOWN = 10
+
+_MAC_COLUMNS = {
+    "device": "VARCHAR",
+    "mac": "VARCHAR",
+    "vlan": "VARCHAR",
+    "port": "VARCHAR",
+    "port_key": "VARCHAR",
+    "entry_type": "VARCHAR",
+    "role": "VARCHAR",
+    "port_macs": "INTEGER",
+    "neighbor": "VARCHAR",
+    "snapshot_id": "VARCHAR",
+    "collected_at": "TIMESTAMP",
+}
+_ARP_COLUMNS = {
+    "device": "VARCHAR",
+    "vrf": "VARCHAR",
+    "ip": "VARCHAR",
+    "mac": "VARCHAR",
+    "interface": "VARCHAR",
+    "snapshot_id": "VARCHAR",
+    "collected_at": "TIMESTAMP",
+}
+
+
+def normalize_mac(value: str) -> str | None:
+    """Canonical "aabb.ccdd.eeff" form of a MAC in any common notation.
+
+    Returns:
+        Normalized MAC, or None if the value isn't a 48-bit MAC
+    """
+    digits = re.sub(r"[^0-9a-f]", "", str(value).lower())
+    if len(digits) != 12:
+        return None
+    return f"{digits[0:4]}.{digits[4:8]}.{digits[8:12]}"
+
+
+def normalize_interface(name: str) -> str:
+    """Short lowercase interface name for matching across commands/vendors.
+
+    "GigabitEthernet1/0/1", "Gi1/0/1" and "GE1/0/1" all become "gi1/0/1".
+    """
+    name = str(name).strip()
+    match = _INTERFACE_RE.match(name)
+    if not match:
+        return name.lower()
+    prefix = match.group(1).lower()
+    for long_name, short in _INTERFACE_PREFIXES.items():
+        if prefix == long_name or (len(prefix) >= 2 and long_name.startswith(prefix)):
+            prefix = short
+            break
+    return f"{prefix}{match.group(2)}"
+
+
+def is_network_neighbor(capabilities: Any) -> bool:  # noqa: ANN401
+    """Whether an LLDP neighbor is a switch/router (phones and APs are endpoints)."""
+    if not capabilities:
+        return True
+    codes = {c.strip().upper() for c in re.split(r"[\s,]+", str(capabilities)) if c.strip()}
+    return bool(codes & {"B", "R", "BRIDGE", "ROUTER"})
+
+
+class EndpointStore:
+    """Normalized MAC/ARP index over the snapshot database."""
+
+    def __init__(self, store: SnapshotStore) -> None:
+        self.store = store
+        self._lock = threading.Lock()
+        for table, columns in (("endpoint_mac", _MAC_COLUMNS), ("endpoint_arp", _ARP_COLUMNS)):
+            spec = ", ".join(f"{name} {kind}" for name, kind in columns.items())
+            store.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({spec})")
+        store.conn.execute("""
+            CREATE TABLE IF NOT EXISTS endpoint_index_sources (
+                device TEXT,
+                data_type TEXT,
+                snapshot_id TEXT,
+                PRIMARY KEY (device, data_type)
+            )
+        """)
+
+    def refresh(self) -> int:
+        """Re-index devices whose newest MAC, ARP or LLDP collection changed.
+
+        A changed LLDP collection re-classifies the device's MAC ports.
+
+        Returns:
+            Number of devices re-indexed
+        """
+        conn = self.store.conn
+        with self._lock:
+            latest = self.store.latest_sources([MAC_TYPE, ARP_TYPE, LLDP_TYPE])
+            indexed = {
+                (device, data_type): sid
+                for device, data_type, sid in conn.execute(
+                    "SELECT device, data_type, snapshot_id FROM endpoint_index_sources"
+                ).fetchall()
+            }
+            stale = {key for key, sid in latest.items() if indexed.get(key) != sid}
+            if not stale:
+                return 0
+
+            mac_devices = sorted({d for d, t in stale if t in (MAC_TYPE, LLDP_TYPE)})
+            arp_devices = sorted({d for d, t in stale if t == ARP_TYPE})
+            if mac_devices:
+                self._index_macs(mac_devices, latest)
+            if arp_devices:
+                self._index_arp(arp_devices, latest)
+
+            conn.executemany(
+                "INSERT OR REPLACE INTO endpoint_index_sources VALUES (?, ?, ?)",
+                [(device, data_type, latest[(device, data_type)]) for device, data_type in stale],
+            )
+            return len({d for d, _ in stale})
+
+    def _sources(
+        self, data_type: str, devices: list[str], latest: dict[tuple[str, str], str]
+    ) -> list[tuple[str, str]]:
+        return [(d, latest[(d, data_type)]) for d in devices if (d, data_type) in latest]
+
+    def _replace(
+        self, table: str, columns: dict[str, str], devices: list[str], rows: list[dict]
+    ) -> None:
+        placeholders = ", ".join("?" for _ in devices)
+        self.store.conn.execute(
+            f"DELETE FROM {table} WHERE device IN ({placeholders})",  # noqa: S608
+            devices,
+        )
+        self.store.bulk_insert(table, columns, rows)
+
+    def _index_macs(self, devices: list[str], latest: dict[tuple[str, str], str]) -> None:
+        # Local ports with a switch/router neighbor, per device
+        neighbors: dict[tuple[str, str], str] = {}
+        for row in self.store.rows_for(LLDP_TYPE, self._sources(LLDP_TYPE, devices, latest)):
+            local = first_field(row, NEIGHBOR_FIELDS["local_interface"])
+            if local and is_network_neighbor(first_field(row, NEIGHBOR_FIELDS["capabilities"])):
+                name = first_field(row, NEIGHBOR_FIELDS["neighbor"]) or "?"
+                neighbors[(row["device"], normalize_interface(local))] = str(name)
+
+        entries: list[dict[str, Any]] = []
+        for row in self.store.rows_for(MAC_TYPE, self._sources(MAC_TYPE, devices, latest)):
+            mac = normalize_mac(first_field(row, MAC_FIELDS["mac"]) or "")
+            if not mac:
+                continue
+            ports = str(first_field(row, MAC_FIELDS["port"]) or "").split(",")
+            for port in (p.strip() for p in ports):
+                if not port or port.lower() in _PSEUDO_PORTS:
+                    continue
+                entries.append(
+                    {
+                        "device": row["device"],
+                        "mac": mac,
+                        "vlan": first_field(row, MAC_FIELDS["vlan"]),
+                        "port": port,
+                        "port_key": normalize_interface(port),
+                        "entry_type": first_field(row, MAC_FIELDS["type"]),
+                        "snapshot_id": row["snapshot_id"],
+                        "collected_at": row["collected_at"].isoformat(sep=" "),
+                    }
+                )
+
+        port_macs: dict[tuple[str, str], set[str]] = {}
+        for entry in entries:
+            port_macs.setdefault((entry["device"], entry["port_key"]), set()).add(entry["mac"])
+        for entry in entries:
+            key = (entry["device"], entry["port_key"])
+            entry["port_macs"] = len(port_macs[key])
+            entry["neighbor"] = neighbors.get(key)
+            uplink = (
+                entry["neighbor"] is not None
+                or entry["port_key"].startswith(_AGGREGATE_PREFIXES)
+                or entry["port_macs"] > UPLINK_MAC_THRESHOLD
+            )
+            entry["role"] = "uplink" if uplink else "access"
+
+        self._replace("endpoint_mac", _MAC_COLUMNS, devices, entries)
+
+    def _index_arp(self, devices: list[str], latest: dict[tuple[str, str], str]) -> None:
+        entries: list[dict[str, Any]] = []
+        for row in self.store.rows_for(ARP_TYPE, self._sources(ARP_TYPE, devices, latest)):
+            ip = first_field(row, ARP_FIELDS["ip"])
+            mac = normalize_mac(first_field(row, ARP_FIELDS["mac"]) or "")
+            if not ip or not mac:
+                continue  # Incomplete entries
+            entries.append(
+                {
+                    "device": row["device"],
+                    "vrf": first_field(row, ARP_FIELDS["vrf"]) or "",
+                    "ip": str(ip).strip(),
+                    "mac": mac,
+                    "interface": first_field(row, ARP_FIELDS["interface"]),
+                    "snapshot_id": row["snapshot_id"],
+                    "collected_at": row["collected_at"].isoformat(sep=" "),
+                }
+            )
+        self._replace("endpoint_arp", _ARP_COLUMNS, devices, entries)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def _select(self, table: str, column: str, values: list[str]) -> list[dict[str, Any]]:
+        cursor = self.store.conn.execute(
+            f"SELECT * FROM {table} WHERE list_contains(?::VARCHAR[], {column}) "  # noqa: S608
+            "ORDER BY collected_at DESC, device",
+            [values],
+        )
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, r, strict=True)) for r in cursor.fetchall()]
+
+    def arp_by_ip(self, ips: list[str]) -> list[dict[str, Any]]:
+        """ARP bindings for IP addresses (all devices and VRFs)."""
+        self.refresh()
+        return self._select("endpoint_arp", "ip", ips)
+
+    def arp_by_mac(self, macs: list[str]) -> list[dict[str, Any]]:
+        """ARP bindings for normalized MACs."""
+        self.refresh()
+        return self._select("endpoint_arp", "mac", macs)
+
+    def mac_entries(self, macs: list[str]) -> list[dict[str, Any]]:
+        """MAC table entries for normalized MACs, access ports first."""
+        self.refresh()
+        rows = self._select("endpoint_mac", "mac", macs)
+        return sorted(rows, key=lambda r: (r["role"] != "access", r["port_macs"]))
+
+    def locate(self, target: str) -> dict[str, Any]:
+        """Find where an IP or MAC address is attached.
+
+        Args:
+            target: IP address or MAC in any notation
+
+        Returns:
+            Dict with macs, arp (bindings), access (edge port entries) and
+            uplinks (entries on uplink ports)
+        """
+        mac = normalize_mac(target)
+        if mac:
+            macs = [mac]
+            arp = self.arp_by_mac(macs)
+        else:
+            arp = self.arp_by_ip([target.strip()])
+            macs = sorted({r["mac"] for r in arp})
+
+        entries = self.mac_entries(macs) if macs else []
+        return {
+            "macs": macs,
+            "arp": arp,
+            "access": [e for e in entries if e["role"] == "access"],
+            "uplinks": [e for e in entries if e["role"] == "uplink"],
+        }
+
+    def indexed_devices(self) -> dict[str, list[str]]:
+        """Indexed devices and the data types they contributed."""
+        self.refresh()
+        rows = self.store.conn.execute(
+            "SELECT device, data_type FROM endpoint_index_sources ORDER BY device, data_type"
+        ).fetchall()
+        devices: dict[str, list[str]] = {}
+        for device, data_type in rows:
+            devices.setdefault(device, []).append(data_type)
+        return devices
+
+
+_endpoint_store: EndpointStore | None = None
+_endpoint_store_lock = threading.Lock()
+
+
+def get_endpoint_store() -> EndpointStore:
+    """Get the global endpoint store (bound to the global snapshot store)."""
+    global _endpoint_store
+    with _endpoint_store_lock:
+        store = get_snapshot_store()
+        if _endpoint_store is None or _endpoint_store.store is not store:
+            _endpoint_store = EndpointStore(store)
+        return _endpoint_store
+
+
+@tool
+def locate_host(target: str) -> str:
+    """Find which switch port an IP or MAC address is connected to.
+
+    One lookup over the stored MAC, ARP and LLDP tables of all devices
+    (IP -> MAC via ARP, MAC -> access port), instead of running show mac
+    address-table / show arp switch by switch. Refresh the data with
+    take_snapshot(data_types="mac,arp,lldp").
+
+    Args:
+        target: IP address ("10.1.20.33") or MAC in any notation
+                ("0011.2233.4455", "00-11-22-33-44-55", "00:11:22:33:44:55")
+
+    Returns:
+        Access port(s) where the host is learned, its IP/MAC bindings, and the
+        uplinks it is seen through
+    """
+    store = get_endpoint_store()
+    if not store.indexed_devices():
+        return (
+            "No MAC/ARP tables stored. Collect them with take_snapshot(data_types='mac,arp,lldp')."
+        )
+    result = store.locate(target)
+
+    lines = [f"## Location of {target}"]
+    if not result["macs"]:
+        lines.append("No ARP entry for this IP on any device, so its MAC is unknown.")
+        return "\n".join(lines)
+
+    if result["arp"]:
+        lines.append("\n### IP/MAC bindings (ARP)")
+        lines.append("| ip | mac | device | vrf | interface | collected |")
+        lines.append("|---|---|---|---|---|---|")
+        lines.extend(
+            f"| {r['ip']} | {r['mac']} | {r['device']} | {r['vrf'] or '-'} | "
+            f"{r['interface'] or ''} | {r['collected_at']:%Y-%m-%d %H:%M} |"
+            for r in result["arp"]
+        )
+
+    if result["access"]:
+        lines.append("\n### Access port")
+        lines.append("| device | port | vlan | mac | macs on port | collected |")
+        lines.append("|---|---|---|---|---|---|")
+        lines.extend(
+            f"| {e['device']} | {e['port']} | {e['vlan'] or ''} | {e['mac']} | "
+            f"{e['port_macs']} | {e['collected_at']:%Y-%m-%d %H:%M} |"
+            for e in result["access"]
+        )
+    else:
+        lines.append(
+            f"\n{', '.join(result['macs'])} is not learned on any access port "
+            "(host may be behind an unmanaged switch or on a device without MAC data)."
+        )
+
+    uplinks = result["uplinks"]
+    if uplinks:
+        seen = ", ".join(
+            f"{e['device']} {e['port']}" + (f" (to {e['neighbor']})" if e["neighbor"] else "")
+            for e in uplinks[:_MAX_UPLINKS_SHOWN]
+        )
+        more = len(uplinks) - _MAX_UPLINKS_SHOWN
+        lines.append(
+            f"\nAlso seen via {len(uplinks)} uplinks: {seen}"
+            + (f", +{more} more" if more > 0 else "")
+        )
+
+    from olav.tools.artifact_store import offload_if_large
+
+    return offload_if_large("\n".join(lines), {"tool": "locate_host", "command": target})
@@ -0,0 +1,335 @@
+"""Acceptance-criteria evaluation for inspection skills.
+
+Skill markdown lists PASS/WARNING/FAIL conditions as prose bullets
+(``InspectionSkillLoader._extract_acceptance_criteria``). Bullets that name a
+measurable subject (CPU, memory, error counters, interface admin/oper state,
+BGP session state, received prefixes) and a comparison, range or state are
+compiled into predicates; thresholds written as `parameter` names resolve
+from the run's parameters, then the skill's parameter defaults:
+
+    "CPU 使用率 > `cpu_critical_threshold`"     -> cpu > 90
+    "某接口 operational down 但 admin up"        -> if_oper_up = 0 AND if_admin_up = 1
+    "多个接口 operational down"                  -> >= 2 interfaces with if_oper_up = 0
+
+Facts are the metric samples extracted from the run's outputs (see
+metrics_store.METRIC_RULES), pivoted to one row per (device, interface/peer);
+all checks are evaluated over all rows in one DuckDB query. Bullets that
+don't compile (fan state, "no fatal errors", ...) are reported as manual.
+
+Device verdict: FAIL if any FAIL condition holds; WARNING if any WARNING
+condition holds or a PASS condition is violated; PASS if any check had data;
+N/A otherwise.
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import duckdb
+
+from olav.tools.metrics_store import extract_metrics, inspection_outputs
+
+if TYPE_CHECKING:
+    from olav.tools.inspection_skill_loader import SkillDefinition
+
+logger = logging.getLogger(__name__)
+
+LEVELS = ("fail", "warning", "pass")
+_FACT_COLUMNS = ("device", "labels", "metric", "value")
+
+
+@dataclass(frozen=True)
+class Subject:
+    """A measurable thing criteria talk about."""
+
+    name: str
+    keywords: str  # Regex (case-insensitive) over the bullet text
+    metrics: tuple[str, ...]
+    combine: str = "coalesce"  # coalesce: first present metric; greatest: worst of them
+    boolean: bool = False  # 1/0 state (up/down, established)
+
+
+SUBJECTS: tuple[Subject, ...] = (
+    Subject("cpu", r"\bcpu\b", ("cpu_5min", "cpu_usage", "cpu_1min", "cpu_5sec")),
+    Subject("memory", r"内存|\bmemory\b", ("memory_used_pct",)),
+    Subject(
+        "errors",
+        r"错误计数|error count|\berrors\b",
+        ("if_crc_errors", "if_input_errors", "if_output_errors"),
+        combine="greatest",
+    ),
+    Subject("prefixes", r"前缀|\bprefix", ("bgp_prefixes_received",)),
+    Subject(
+        "bgp_state", r"邻居状态|neighbou?r state|\bsession\b", ("bgp_session_up",), boolean=True
+    ),
+    Subject("admin", r"\badmin\b", ("if_admin_up",), boolean=True),
+    Subject("oper", r"\boper(ational)?\b", ("if_oper_up",), boolean=True),
+)
+
+_OPERATORS = {"<": "<", ">": ">", "<=": "<=", ">=": ">=", "≤": "<=", "≥": ">=", "=": "="}
+_COMPARISON = re.compile(r"(<=|>=|≤|≥|<|>|=)\s*(`\w+`|-?\d+(?:\.\d+)?)")
+_RANGE = re.compile(r"(`\w+`|\d+(?:\.\d+)?)\s*(?:到|至|~|-|to)\s*(`\w+`|\d+(?:\.\d+)?)")
+_NEGATION = re.compile(r"不是|不为|\bnot\b|非")
+_UP = re.compile(r"\bup\b|established", re.IGNORECASE)
+_DOWN = re.compile(r"\bdown\b|\bidle\b|\bactive\b|\bconnect\b", re.IGNORECASE)
+_NONE = re.compile(r"未接收|没有|\bno\b|\bzero\b", re.IGNORECASE)
+_MULTIPLE = re.compile(r"多个|multiple|several", re.IGNORECASE)
+_CLAUSE_SPLIT = re.compile(r"\s*(?:但|且|并且|\band\b|\bbut\b)\s*", re.IGNORECASE)
+_PARENTHETICAL = re.compile(r"\s*[(（][^)）]*[)）]")
+
+
+@dataclass(frozen=True)
+class Clause:
+    """One comparison of a subject's value."""
+
+    subject: Subject
+    op: str  # <, <=, >, >=, =, between
+    value: float
+    high: float = 0.0  # Upper bound for "between"
+
+    def expression(self, columns: set[str]) -> str | None:
+        """SQL value expression over the pivoted columns, None if no data."""
+        present = [f'"{m}"' for m in self.subject.metrics if m in columns]
+        if not present:
+            return None
+        return present[0] if len(present) == 1 else f"{self.subject.combine}({', '.join(present)})"
+
+    def condition(self, expression: str) -> str:
+        if self.op == "between":
+            return f"({expression} BETWEEN {self.value} AND {self.high})"
+        return f"({expression} {self.op} {self.value})"
+
+
+@dataclass(frozen=True)
+class Check:
+    """A compiled acceptance-criteria bullet."""
+
+    level: str  # pass, warning, fail
+    text: str
+    clauses: tuple[Clause, ...]
+    multiple: bool = False  # Holds for a device only if >= 2 of its rows match
+
+
+def _threshold(token: str, params: dict[str, Any]) -> float | None:
+    """Numeric value of a literal or `parameter` token."""
+    if token.startswith("`"):
+        raw = params.get(token.strip("`"))
+        if raw is None:
+            return None
+        match = re.match(r"\s*(-?\d+(?:\.\d+)?)", str(raw))
+        return float(match.group(1)) if match else None
+    return float(token)
+
+
+def _compile_clause(text: str, params: dict[str, Any]) -> Clause | None:
+    subject = next((s for s in SUBJECTS if re.search(s.keywords, text, re.IGNORECASE)), None)
+    if subject is None:
+        return None
+    if not subject.boolean:
+        if match := _RANGE.search(text):
+            low, high = (_threshold(t, params) for t in match.groups())
+            if low is not None and high is not None:
+                return Clause(subject, "between", low, high)
+            return None
+        if match := _COMPARISON.search(text):
+            value = _threshold(match.group(2), params)
+            return Clause(subject, _OPERATORS[match.group(1)], value) if value is not None else None
+        if _NONE.search(text):
+            return Clause(subject, "=", 0.0)
+        return None
+    negated = bool(_NEGATION.search(text))
+    if _UP.search(text):
+        return Clause(subject, "=", 0.0 if negated else 1.0)
+    if _DOWN.search(text):
+        return Clause(subject, "=", 1.0 if negated else 0.0)
+    return None
+
+
+def compile_criteria(
+    criteria: dict[str, list[str]], params: dict[str, Any]
+) -> tuple[list[Check], list[tuple[str, str]]]:
+    """Compile acceptance-criteria bullets into checks.
+
+    Args:
+        criteria: {"pass"|"warning"|"fail": [bullet, ...]}
+        params: Parameter values for `parameter` thresholds
+
+    Returns:
+        (checks, manual) where manual lists (level, bullet) that didn't compile
+    """
+    checks: list[Check] = []
+    manual: list[tuple[str, str]] = []
+    for level in LEVELS:
+        for bullet in criteria.get(level, []):
+            text = _PARENTHETICAL.sub("", bullet.replace("**", "")).strip()
+            clauses = [_compile_clause(part, params) for part in _CLAUSE_SPLIT.split(text)]
+            if clauses and all(clauses):
+                checks.append(Check(level, bullet, tuple(clauses), bool(_MULTIPLE.search(text))))
+            else:
+                manual.append((level, bullet))
+    return checks, manual
+
+
+@dataclass
+class CheckOutcome:
+    """Result of one check across a run."""
+
+    check: Check
+    evaluated: set[str] = field(default_factory=set)  # Devices with data for the check
+    # device -> matching (labels, value) rows; for PASS checks, the violations
+    hits: dict[str, list[tuple[str, float | None]]] = field(default_factory=dict)
+
+    @property
+    def status(self) -> str:
+        if not self.evaluated:
+            return "N/A"
+        if not self.hits:
+            return "PASS"
+        return "WARNING" if self.check.level == "pass" else self.check.level.upper()
+
+
+@dataclass
+class Verdict:
+    """Acceptance-criteria verdict of an inspection run."""
+
+    outcomes: list[CheckOutcome]
+    manual: list[tuple[str, str]]
+    devices: dict[str, str]  # device -> PASS | WARNING | FAIL | N/A
+    reasons: dict[str, list[str]] = field(default_factory=dict)
+
+    def counts(self) -> dict[str, int]:
+        counts = dict.fromkeys(("PASS", "WARNING", "FAIL", "N/A"), 0)
+        for status in self.devices.values():
+            counts[status] += 1
+        return counts
+
+
+def evaluate_checks(
+    results: dict[str, list[dict[str, Any]]],
+    checks: list[Check],
+    manual: list[tuple[str, str]] | None = None,
+) -> Verdict:
+    """Evaluate compiled checks over inspection results.
+
+    Args:
+        results: {device: [{command, output, success}, ...]}
+        checks: Compiled checks
+        manual: Bullets that didn't compile (carried into the verdict)
+
+    Returns:
+        Verdict
+    """
+    facts = [
+        (o.device, labels, metric, value)
+        for o in inspection_outputs(results)
+        for metric, labels, value in extract_metrics(o.command, o.output, o.records)
+    ]
+    outcomes = [CheckOutcome(check) for check in checks]
+    if facts and checks:
+        _evaluate(facts, outcomes)
+
+    devices: dict[str, str] = {}
+    reasons: dict[str, list[str]] = {}
+    for device in results:
+        matched = [o.check for o in outcomes if device in o.hits]
+        # Explicit FAIL/WARNING conditions explain a verdict better than the
+        # PASS conditions they imply are violated
+        explicit = [c for c in matched if c.level != "pass"]
+        if matched:
+            reasons[device] = [c.text for c in explicit or matched]
+        if any(c.level == "fail" for c in matched):
+            devices[device] = "FAIL"
+        elif matched:
+            devices[device] = "WARNING"
+        elif any(device in o.evaluated for o in outcomes):
+            devices[device] = "PASS"
+        else:
+            devices[device] = "N/A"
+    return Verdict(outcomes, manual or [], devices, reasons)
+
+
+def _evaluate(facts: list[tuple[str, str, str, float]], outcomes: list[CheckOutcome]) -> None:
+    """Evaluate all checks in one query over the pivoted facts."""
+    conn = duckdb.connect()
+    try:
+        conn.execute(
+            "CREATE TABLE facts (device VARCHAR, labels VARCHAR, metric VARCHAR, value DOUBLE)"
+        )
+        # One JSON parameter: binding Python lists converts them element by element
+        conn.execute(
+            'INSERT INTO facts SELECT unnest(from_json(?, \'[{"device": "VARCHAR", '
+            '"labels": "VARCHAR", "metric": "VARCHAR", "value": "DOUBLE"}]\'), '
+            "recursive := true)",
+            [json.dumps([dict(zip(_FACT_COLUMNS, f, strict=True)) for f in facts])],
+        )
+        conn.execute(
+            "CREATE TABLE wide AS PIVOT facts ON metric USING first(value) GROUP BY device, labels"
+        )
+        columns = {row[0] for row in conn.execute("DESCRIBE wide").fetchall()}
+
+        selects = []
+        for index, outcome in enumerate(outcomes):
+            expressions = [c.expression(columns) for c in outcome.check.clauses]
+            if not all(expressions):
+                continue
+            applies = " AND ".join(f"{e} IS NOT NULL" for e in expressions)
+            condition = " AND ".join(
+                c.condition(e) for c, e in zip(outcome.check.clauses, expressions, strict=True)
+            )
+            hit = f"NOT ({condition})" if outcome.check.level == "pass" else condition
+            selects.append(
+                f"SELECT {index} AS idx, device, labels, {hit} AS hit, "  # noqa: S608
+                f"{expressions[0]} AS value FROM wide WHERE {applies}"
+            )
+        if not selects:
+            return
+        rows = conn.execute(
+            "SELECT idx, device, count(*) FILTER (hit) AS hits, "  # noqa: S608
+            "list({'labels': labels, 'value': value}) FILTER (hit) AS matched "
+            f"FROM ({' UNION ALL '.join(selects)}) GROUP BY idx, device"
+        ).fetchall()
+    finally:
+        conn.close()
+
+    for index, device, hits, matched in rows:
+        outcome = outcomes[index]
+        outcome.evaluated.add(device)
+        if hits >= (2 if outcome.check.multiple else 1):
+            outcome.hits[device] = [(m["labels"], m["value"]) for m in matched]
+
+
+def evaluate_skill(
+    skill: "SkillDefinition",
+    results: dict[str, list[dict[str, Any]]],
+    params: dict[str, Any] | None = None,
+) -> Verdict:
+    """Compile a skill's acceptance criteria and evaluate them over a run.
+
+    Args:
+        skill: Inspection skill
+        results: {device: [{command, output, success}, ...]}
+        params: Run parameters (override the skill's parameter defaults)
+
+    Returns:
+        Verdict
+    """
+    values = {p.name: p.default for p in skill.parameters if p.default is not None}
+    values.update(params or {})
+    checks, manual = compile_criteria(skill.acceptance_criteria, values)
+    return evaluate_checks(results, checks, manual)
+
+
+def evaluate_skill_id(skill_id: str, results: dict[str, list[dict[str, Any]]]) -> Verdict | None:
+    """Evaluate the acceptance criteria of an inspection skill by id, if it exists."""
+    from olav.tools.inspection_skill_loader import InspectionSkillLoader
+
+    try:
+        loader = InspectionSkillLoader()
+        path = loader.skills_dir / f"{skill_id}.md"
+        skill = loader.load_skill(path) if path.exists() else None
+        return evaluate_skill(skill, results) if skill else None
+    except Exception as e:
+        logger.warning(f"Acceptance criteria not evaluated for {skill_id}: {e}")
+        return None
@@ -17,6 +17,7 @@ from pydantic import BaseModel, Field
 
 from config.settings import settings
 from olav.core.skill_loader import get_skill_loader
+from olav.tools.inspection_criteria import evaluate_skill_id
 from olav.tools.report_formatter import format_report
 
 # =============================================================================
@@ -268,6 +269,8 @@ def generate_report(
     The output format (markdown/json/table) and language are controlled
     by the skill's frontmatter configuration. This replaces the previous
     Jinja2 HTML template approach with Skill-controlled Markdown output.
+    If an inspection skill with the same ID exists, its acceptance criteria
+    are evaluated and the report carries a PASS/WARNING/FAIL verdict per device.
 
     Args:
         results: Raw inspection results from nornir_bulk_execute
@@ -309,9 +312,12 @@ def generate_report(
     else:
         skill_config = skill.frontmatter if hasattr(skill, "frontmatter") else {}
 
+    # Verdict from the inspection skill's acceptance criteria, if any
+    verdict = evaluate_skill_id(skill_id, results)
+
     # Generate report based on skill config
     report_content = format_report(
-        results, skill_config if isinstance(skill_config, dict) else {}, inspection_type
+        results, skill_config if isinstance(skill_config, dict) else {}, inspection_type, verdict
     )
 
     # Save to file if path specified
@@ -10,7 +10,7 @@ This module implements the InspectorAgent - a specialized subagent that:
 
 import logging
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from langchain_core.tools import BaseTool, tool
 
@@ -19,6 +19,9 @@ from olav.tools.network import nornir_execute
 from olav.tools.report_formatter import format_inspection_report
 from olav.tools.storage_tools import write_file
 
+if TYPE_CHECKING:
+    from olav.tools.inspection_criteria import Verdict
+
 logger = logging.getLogger(__name__)
 
 
@@ -149,6 +152,23 @@ class InspectorAgent:
                 if isinstance(params.get("timeout"), (int, str))
                 else 30,
             )
+            verdict = None
+            if isinstance(result, str) and commands:
+                from olav.tools.inspection_criteria import evaluate_skill
+                from olav.tools.metrics_store import record_inspection_metrics
+
+                run_results = {
+                    device_group: [
+                        {
+                            "command": commands[0],
+                            "success": "Error:" not in result,
+                            "output": result,
+                        }
+                    ]
+                }
+                record_inspection_metrics(run_results)
+                # Verdict from the skill's acceptance criteria
+                verdict = evaluate_skill(skill, run_results, params)
 
             # Format and return results
             return {
@@ -157,8 +177,11 @@ class InspectorAgent:
                 "skill_name": skill.name,
                 "device_group": device_group,
                 "result": result if isinstance(result, dict) else {"output": str(result)},
+                "verdict": verdict.devices if verdict else {},
                 "report_path": self._generate_report(
-                    skill, result if isinstance(result, dict) else {"output": str(result)}
+                    skill,
+                    result if isinstance(result, dict) else {"output": str(result)},
+                    verdict,
                 ),
             }
         except Exception as e:
@@ -174,53 +197,21 @@ class InspectorAgent:
         skill: SkillDefinition,
         params: dict[str, Any],
     ) -> list[str]:
-        """Build command list for a skill based on parameters.
-
-        Args:
-            skill: Skill definition
-            params: Skill parameters
-
-        Returns:
-            List of commands to execute
-        """
-        commands = []
-
-        # Extract commands from skill execution steps
-        # This is a simplified implementation - actual commands come from skill steps
-        if "interface" in skill.filename.lower():
-            commands = [
-                "show interfaces brief",
-                "show interfaces counters errors",
-            ]
-            if "Eth" in params.get("interface_filter", "*"):
-                commands[0] += f" | include {params['interface_filter']}"
-
-        elif "bgp" in skill.filename.lower():
-            commands = [
-                "show ip bgp summary",
-                "show ip bgp neighbors",
-            ]
-
-        elif "health" in skill.filename.lower():
-            commands = [
-                "show processes cpu sorted",
-                "show memory",
-                "show flash:",
-                "show environment",
-            ]
-
-        return commands
+        """Build command list for a skill based on parameters (see skill_commands)."""
+        return skill_commands(skill, params)
 
     def _generate_report(
         self,
         skill: SkillDefinition,
         result: dict[str, Any],
+        verdict: "Verdict | None" = None,
     ) -> str:
         """Generate and save inspection report.
 
         Args:
             skill: Skill that was executed
             result: Execution results from Nornir
+            verdict: Acceptance-criteria verdict, if evaluated
 
         Returns:
             Path to saved report
@@ -246,6 +237,7 @@ class InspectorAgent:
             results=formatted_results,
             skill_config=skill_config,
             inspection_type=skill.name,
+            verdict=verdict,
         )
 
         # Save report to data/reports/inspection/
@@ -264,6 +256,45 @@ class InspectorAgent:
         return str(report_path)
 
 
+def skill_commands(skill: SkillDefinition, params: dict[str, Any]) -> list[str]:
+    """Build command list for a skill based on parameters.
+
+    Args:
+        skill: Skill definition
+        params: Skill parameters
+
+    Returns:
+        List of commands to execute
+    """
+    commands = []
+
+    # Extract commands from skill execution steps
+    # This is a simplified implementation - actual commands come from skill steps
+    if "interface" in skill.filename.lower():
+        commands = [
+            "show interfaces brief",
+            "show interfaces counters errors",
+        ]
+        if "Eth" in params.get("interface_filter", "*"):
+            commands[0] += f" | include {params['interface_filter']}"
+
+    elif "bgp" in skill.filename.lower():
+        commands = [
+            "show ip bgp summary",
+            "show ip bgp neighbors",
+        ]
+
+    elif "health" in skill.filename.lower():
+        commands = [
+            "show processes cpu sorted",
+            "show memory",
+            "show flash:",
+            "show environment",
+        ]
+
+    return commands
+
+
 # Tool wrappers for integration with DeepAgent
 def get_inspector_tools() -> list[BaseTool]:
     """Get list of InspectorAgent tools for DeepAgent integration.
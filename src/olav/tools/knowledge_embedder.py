@@ -5,17 +5,73 @@ This module provides the KnowledgeEmbedder class for:
 - Chunking markdown files into smaller pieces
 - Indexing embeddings into the knowledge database
 - Incremental updates (only re-index changed files)
+- Per-model vector storage with background re-embedding on model switch
 
 Phase 4: Knowledge Base Integration
 """
 
 import hashlib
+import logging
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
 
 import duckdb
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from config.settings import settings
+from olav.core.database import init_embedding_schema
+from olav.tools.knowledge_search import (
+    bump_knowledge_generation,
+    knowledge_reader,
+    knowledge_writer,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=8)
+def get_embeddings(model: str | None = None, provider: str | None = None) -> object:  # noqa: ANN401
+    """Get a (cached) LangChain embeddings client for a model.
+
+    Clients are cached per (model, provider) so search does not rebuild the
+    HTTP client on every query, and several models can be used side by side.
+
+    Args:
+        model: Embedding model name (defaults to settings.embedding_model)
+        provider: Embedding provider (defaults to settings.embedding_provider)
+
+    Returns:
+        LangChain embeddings instance (OllamaEmbeddings or OpenAIEmbeddings)
+
+    Raises:
+        ValueError: If embedding provider is not supported
+    """
+    model = model or settings.embedding_model
+    provider = provider or settings.embedding_provider
+
+    if provider == "ollama":
+        from langchain_ollama import OllamaEmbeddings
+
+        return OllamaEmbeddings(
+            model=model,  # nomic-embed-text
+            base_url=settings.embedding_base_url or "http://localhost:11434",
+        )
+    elif provider == "openai":
+        from langchain_openai import OpenAIEmbeddings
+        from pydantic import SecretStr
+
+        api_key = settings.embedding_api_key
+        return OpenAIEmbeddings(
+            model=model,  # text-embedding-3-small
+            api_key=SecretStr(api_key) if api_key else None,  # type: ignore[arg-type]
+        )
+    else:
+        raise ValueError(
+            f"Unsupported embedding provider: {provider}. "
+            f"Use 'ollama' (free local) or 'openai' (paid cloud)."
+        )
 
 
 class KnowledgeEmbedder:
@@ -31,13 +87,15 @@ class KnowledgeEmbedder:
         >>> embedder.embed_directory(Path("docs/"), source_id=2)
     """
 
-    def __init__(self, db_path: str | None = None) -> None:
+    def __init__(self, db_path: str | None = None, model: str | None = None) -> None:
         """Initialize the embedder.
 
         Args:
             db_path: Optional path to knowledge database (uses default if not provided)
+            model: Optional embedding model (defaults to settings.embedding_model)
         """
         self.db_path = db_path or str(Path(settings.agent_dir) / "data" / "knowledge.db")
+        self.model = model or settings.embedding_model
         self.embeddings = self._get_embeddings()
         self.splitter = RecursiveCharacterTextSplitter(
             chunk_size=1000,
@@ -54,29 +112,53 @@ class KnowledgeEmbedder:
         Raises:
             ValueError: If embedding provider is not supported
         """
-        provider = settings.embedding_provider
+        return get_embeddings(self.model)
 
-        if provider == "ollama":
-            from langchain_ollama import OllamaEmbeddings
+    def _embed_batch(self, texts: list[str]) -> list[list[float] | None]:
+        """Embed a batch of texts, falling back to one-by-one on batch failure.
 
-            return OllamaEmbeddings(
-                model=settings.embedding_model,  # nomic-embed-text
-                base_url=settings.embedding_base_url or "http://localhost:11434",
-            )
-        elif provider == "openai":
-            from langchain_openai import OpenAIEmbeddings
-            from pydantic import SecretStr
-
-            api_key = settings.embedding_api_key
-            return OpenAIEmbeddings(
-                model=settings.embedding_model,  # text-embedding-3-small
-                api_key=SecretStr(api_key) if api_key else None,  # type: ignore[arg-type]
-            )
-        else:
-            raise ValueError(
-                f"Unsupported embedding provider: {provider}. "
-                f"Use 'ollama' (free local) or 'openai' (paid cloud)."
-            )
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One vector per text (None where embedding failed)
+        """
+        try:
+            return list(self.embeddings.embed_documents(texts))  # type: ignore[attr-defined]
+        except Exception as e:
+            logger.debug(f"Batch embedding failed, retrying per text: {e}")
+
+        vectors: list[list[float] | None] = []
+        for text in texts:
+            try:
+                vectors.append(self.embeddings.embed_query(text))  # type: ignore[attr-defined]
+            except Exception as e:
+                print(f"Warning: Could not generate embedding: {e}")
+                vectors.append(None)
+        return vectors
+
+    def _store_embedding(
+        self, conn: duckdb.DuckDBPyConnection, chunk_id: int, vector: list[float]
+    ) -> None:
+        """Store a chunk vector for this embedder's model.
+
+        Args:
+            conn: Writable DuckDB connection
+            chunk_id: knowledge_chunks.id
+            vector: Embedding vector
+        """
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO knowledge_embeddings (chunk_id, model, dim, embedding)
+            VALUES (?, ?, ?, ?)
+        """,
+            [chunk_id, self.model, len(vector), vector],
+        )
+
+        if settings.embedding_quantization != "none":
+            from olav.tools.embedding_quantization import store_quantized
+
+            store_quantized(conn, chunk_id, self.model, settings.embedding_quantization)
 
     def embed_file(
         self,
@@ -117,61 +199,70 @@ class KnowledgeEmbedder:
         file_hash = hashlib.md5(content.encode()).hexdigest()  # noqa: S324
 
         # Check if already indexed and unchanged
-        conn = duckdb.connect(self.db_path)
-        try:
-            existing = conn.execute(
-                "SELECT id FROM knowledge_chunks WHERE file_path = ? AND file_hash = ?",
-                [str(file_path), file_hash],
-            ).fetchone()
-
-            if existing:
-                # Already indexed, skip
-                return 0
-
-            # Remove old chunks if file was modified
-            conn.execute("DELETE FROM knowledge_chunks WHERE file_path = ?", [str(file_path)])
-
-            # Split into chunks
-            chunks = self.splitter.split_text(content)
-
-            if not chunks:
-                print(f"Warning: No chunks generated from {file_path}")
-                return 0
-
-            # Generate embeddings for each chunk
-            for i, chunk in enumerate(chunks):
-                # Extract title (first line, remove # markers)
-                title = chunk.split("\n")[0].lstrip("#").strip()[:100]
-                if not title:
-                    title = file_path.stem
-
-                # Generate embedding
-                try:
-                    embedding = self.embeddings.embed_query(chunk)  # type: ignore[attr-defined]
-                except Exception as e:
-                    print(
-                        f"Warning: Could not generate embedding for chunk {i} in {file_path}: {e}"
+        with knowledge_writer(self.db_path) as conn:
+            try:
+                init_embedding_schema(conn)
+
+                existing = conn.execute(
+                    "SELECT id FROM knowledge_chunks WHERE file_path = ? AND file_hash = ?",
+                    [str(file_path), file_hash],
+                ).fetchone()
+
+                if existing:
+                    # Already indexed - only backfill vectors missing for the active model
+                    return self._embed_missing(conn, file_path=str(file_path))
+
+                # Remove old chunks (and their vectors for every model) if file was modified
+                for table in ("knowledge_embeddings", "knowledge_embeddings_q"):
+                    conn.execute(
+                        f"""
+                        DELETE FROM {table} WHERE chunk_id IN (
+                            SELECT id FROM knowledge_chunks WHERE file_path = ?
+                        )
+                    """,  # noqa: S608
+                        [str(file_path)],
                     )
-                    continue
+                conn.execute("DELETE FROM knowledge_chunks WHERE file_path = ?", [str(file_path)])
+
+                # Split into chunks
+                chunks = self.splitter.split_text(content)
+
+                if not chunks:
+                    print(f"Warning: No chunks generated from {file_path}")
+                    return 0
+
+                vectors = self._embed_batch(chunks)
+
+                for i, (chunk, vector) in enumerate(zip(chunks, vectors, strict=True)):
+                    # Extract title (first line, remove # markers)
+                    title = chunk.split("\n")[0].lstrip("#").strip()[:100]
+                    if not title:
+                        title = file_path.stem
+
+                    # Store chunk even without a vector: FTS still finds it and
+                    # reembed_missing() backfills the embedding later
+                    row = conn.execute(
+                        """
+                        INSERT INTO knowledge_chunks
+                        (source_id, file_path, chunk_index, title, content, platform, file_hash)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        RETURNING id
+                    """,
+                        [source_id, str(file_path), i, title, chunk, platform, file_hash],
+                    ).fetchone()
+
+                    if vector is None:
+                        print(f"Warning: Could not generate embedding for chunk {i} in {file_path}")
+                    elif row:
+                        self._store_embedding(conn, row[0], vector)
+
+                conn.commit()
+                bump_knowledge_generation()
+                return len(chunks)
 
-                # Store in database
-                conn.execute(
-                    """
-                    INSERT INTO knowledge_chunks
-                    (source_id, file_path, chunk_index, title, content, platform, embedding, file_hash)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    [source_id, str(file_path), i, title, chunk, platform, embedding, file_hash],
-                )
-
-            conn.commit()
-            return len(chunks)
-
-        except Exception as e:
-            print(f"Error embedding {file_path}: {e}")
-            return 0
-        finally:
-            conn.close()
+            except Exception as e:
+                print(f"Error embedding {file_path}: {e}")
+                return 0
 
     def embed_directory(
         self,
@@ -225,6 +316,124 @@ class KnowledgeEmbedder:
 
         return stats
 
+    def _embed_missing(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        file_path: str | None = None,
+        limit: int | None = None,
+    ) -> int:
+        """Embed chunks that have no vector for this embedder's model.
+
+        Args:
+            conn: Writable DuckDB connection
+            file_path: Restrict to chunks of one file (None = whole corpus)
+            limit: Maximum chunks to embed in this call
+
+        Returns:
+            Number of chunks embedded
+        """
+        rows = self._missing_chunks(conn, file_path, limit)
+        if not rows:
+            return 0
+
+        vectors = self._embed_batch([content for _, content in rows])
+        return self._store_batch(conn, rows, vectors)
+
+    def _missing_chunks(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        file_path: str | None = None,
+        limit: int | None = None,
+    ) -> list[tuple[int, str]]:
+        """(id, content) of chunks that have no vector for this embedder's model."""
+        sql = """
+            SELECT c.id, c.content FROM knowledge_chunks c
+            WHERE NOT EXISTS (
+                SELECT 1 FROM knowledge_embeddings e
+                WHERE e.chunk_id = c.id AND e.model = ?
+            )
+        """
+        params: list[str | int] = [self.model]
+        if file_path:
+            sql += " AND c.file_path = ?"
+            params.append(file_path)
+        sql += " ORDER BY c.id"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return conn.execute(sql, params).fetchall()
+
+    def _store_batch(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        rows: list[tuple[int, str]],
+        vectors: list[list[float] | None],
+    ) -> int:
+        """Store the vectors of a batch of chunks and commit.
+
+        Returns:
+            Number of chunks embedded
+        """
+        embedded = 0
+        for (chunk_id, _), vector in zip(rows, vectors, strict=True):
+            if vector is not None:
+                self._store_embedding(conn, chunk_id, vector)
+                embedded += 1
+
+        conn.commit()
+        bump_knowledge_generation()
+        return embedded
+
+    def reembed_missing(self, batch_size: int | None = None) -> dict[str, int]:
+        """Embed every chunk that lacks a vector for this embedder's model.
+
+        Used after switching ``embedding_model``: existing vectors for other
+        models are kept, so the switch is non-destructive and reversible.
+        Batches are read and written through short-lived connections and
+        embedded with none open, so searches (in this process or another)
+        only wait while a batch is being written.
+
+        Args:
+            batch_size: Chunks per embedding batch (default: settings.embedding_batch_size)
+
+        Returns:
+            Dictionary with stats: {"embedded": count, "remaining": count}
+
+        Example:
+            >>> stats = KnowledgeEmbedder(model="text-embedding-3-small").reembed_missing()
+            >>> print(f"Embedded {stats['embedded']} chunks")
+        """
+        batch_size = batch_size or settings.embedding_batch_size
+        stats = {"embedded": 0, "remaining": 0}
+
+        with knowledge_writer(self.db_path) as conn:
+            init_embedding_schema(conn)
+
+        while True:
+            with knowledge_reader(self.db_path) as conn:
+                rows = self._missing_chunks(conn, limit=batch_size)
+            count = 0
+            if rows:
+                vectors = self._embed_batch([content for _, content in rows])
+                with knowledge_writer(self.db_path) as conn:
+                    count = self._store_batch(conn, rows, vectors)
+            if count == 0:
+                with knowledge_reader(self.db_path) as conn:
+                    row = conn.execute(
+                        """
+                        SELECT COUNT(*) FROM knowledge_chunks c
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM knowledge_embeddings e
+                            WHERE e.chunk_id = c.id AND e.model = ?
+                        )
+                    """,
+                        [self.model],
+                    ).fetchone()
+                stats["remaining"] = row[0] if row else 0
+                return stats
+            stats["embedded"] += count
+
     def get_embedding_dimension(self) -> int:
         """Get the dimension of the embedding vectors.
 
@@ -257,3 +466,52 @@ class KnowledgeEmbedder:
         except Exception as e:
             print(f"Embedding connection test failed: {e}")
             return False
+
+
+# =============================================================================
+# Background re-embedding (model switch)
+# =============================================================================
+
+_reembed_lock = threading.Lock()
+_reembed_running: set[tuple[str, str]] = set()
+
+
+def start_background_reembed(model: str | None = None, db_path: str | None = None) -> bool:
+    """Re-embed the corpus for a model in a daemon thread.
+
+    Called when search finds no vectors for the active model (e.g. right after
+    ``embedding_model`` was changed). Search falls back to FTS until the
+    thread has backfilled the vectors.
+
+    Args:
+        model: Embedding model (defaults to settings.embedding_model)
+        db_path: Knowledge database path (defaults to agent_dir/data/knowledge.db)
+
+    Returns:
+        True if a new re-embedding job was started, False if one is already running
+    """
+    model = model or settings.embedding_model
+    db_path = db_path or str(Path(settings.agent_dir) / "data" / "knowledge.db")
+    key = (model, db_path)
+
+    with _reembed_lock:
+        if key in _reembed_running:
+            return False
+        _reembed_running.add(key)
+
+    def _run() -> None:
+        started = time.monotonic()
+        try:
+            stats = KnowledgeEmbedder(db_path=db_path, model=model).reembed_missing()
+            logger.info(
+                f"Re-embedded {stats['embedded']} chunks for {model} "
+                f"in {time.monotonic() - started:.1f}s ({stats['remaining']} remaining)"
+            )
+        except Exception as e:
+            logger.warning(f"Background re-embedding for {model} failed: {e}")
+        finally:
+            with _reembed_lock:
+                _reembed_running.discard(key)
+
+    threading.Thread(target=_run, name=f"olav-reembed-{model}", daemon=True).start()
+    return True
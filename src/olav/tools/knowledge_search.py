@@ -2,13 +2,28 @@
 
 This module provides hybrid search (BM25 + vector) functionality for the knowledge base.
 Separated from capabilities.py for better maintainability (per DESIGN_V0.81.md optimization).
+
+Vector similarity goes through a pluggable VectorStore: DuckDB SQL (default)
+or a memory-mapped NumPy matrix (``vector_store_backend = "numpy"``).
+Formatted results are cached per knowledge index generation.
 """
 
+import json
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any
 
 import duckdb
 
 from config.settings import settings
+from olav.core.database import connect_waiting, vector_literal
 
 
 def rrf_fusion(
@@ -77,6 +92,79 @@ def rrf_fusion(
     return [id_to_data[cid] for cid in sorted_ids]
 
 
+# =============================================================================
+# Search result cache
+# =============================================================================
+
+# Bumped by in-process writers (KnowledgeEmbedder) right after they commit;
+# writes from other processes are picked up through the database file stats
+_local_generation = 0
+_result_cache: OrderedDict[tuple, tuple[tuple, float, str]] = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+
+def bump_knowledge_generation() -> None:
+    """Mark the knowledge index as changed, invalidating cached search results."""
+    global _local_generation
+    with _result_cache_lock:
+        _local_generation += 1
+        _result_cache.clear()
+
+
+def knowledge_generation(db_path: Path | None = None) -> tuple:
+    """Current generation of the knowledge index.
+
+    Combines the in-process write counter with the size/mtime of the DuckDB
+    file and its WAL, so re-indexing from another process (e.g.
+    ``scripts/index_knowledge.py``) also produces a new generation.
+
+    Args:
+        db_path: Knowledge database path (defaults to agent_dir/data/knowledge.db)
+
+    Returns:
+        Opaque, comparable generation tuple
+    """
+    db_path = db_path or Path(settings.agent_dir) / "data" / "knowledge.db"
+    signature: list[int] = [_local_generation]
+    for path in (db_path, db_path.with_name(db_path.name + ".wal")):
+        try:
+            stat = path.stat()
+            signature += [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            signature += [0, 0]
+    return tuple(signature)
+
+
+def _cache_lookup(key: tuple, generation: tuple) -> str | None:
+    """Return a cached result for key if it belongs to this generation and is fresh."""
+    with _result_cache_lock:
+        entry = _result_cache.get(key)
+        if entry is None:
+            return None
+        entry_generation, stored_at, result = entry
+        if entry_generation != generation or (
+            time.monotonic() - stored_at > settings.search_cache_ttl
+        ):
+            del _result_cache[key]
+            return None
+        _result_cache.move_to_end(key)
+        return result
+
+
+def _cache_store(key: tuple, generation: tuple, result: str) -> None:
+    with _result_cache_lock:
+        _result_cache[key] = (generation, time.monotonic(), result)
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > settings.search_cache_size:
+            _result_cache.popitem(last=False)
+
+
+def clear_search_cache() -> None:
+    """Drop all cached search results."""
+    with _result_cache_lock:
+        _result_cache.clear()
+
+
 def search_knowledge(
     query: str,
     platform: str | None,
@@ -103,41 +191,147 @@ def search_knowledge(
 
     Returns:
         Formatted search results with content snippets
+
+    Results are cached per (normalized query, parameters, embedding model) for
+    ``search_cache_ttl`` seconds and dropped as soon as the knowledge index
+    generation changes (re-indexing, auto-embedded reports).
     """
     db_path = Path(settings.agent_dir) / "data" / "knowledge.db"
 
     if not db_path.exists():
         return ""  # Knowledge base not initialized
 
-    conn = duckdb.connect(str(db_path), read_only=True)
+    use_cache = settings.search_cache_ttl > 0 and settings.search_cache_size > 0
+    if use_cache:
+        cache_key = (
+            " ".join(query.split()),
+            platform,
+            limit,
+            vector_weight,
+            text_weight,
+            rerank,
+            settings.embedding_provider,
+            settings.embedding_model,
+            settings.reranker_model if rerank else None,
+        )
+        generation = knowledge_generation(db_path)
+        cached = _cache_lookup(cache_key, generation)
+        if cached is not None:
+            return cached
+
+    result = _search_knowledge_uncached(
+        db_path, query, platform, limit, vector_weight, text_weight, rerank
+    )
+    if use_cache:
+        _cache_store(cache_key, generation, result)
+    return result
+
+
+# =============================================================================
+# Knowledge database access
+# =============================================================================
+
+# Searches open knowledge.db read-only, so a second CLI session or
+# scripts/index_knowledge.py can use the file at the same time. Within one
+# process DuckDB refuses a read-write connection next to read-only ones, so
+# in-process writers (background re-embedding, auto-embedded reports) go
+# through knowledge_writer(): it waits until no search has the file open and
+# keeps new searches out until its short-lived connection is closed again.
+_access = threading.Condition()
+_readers = 0
+_writers = 0  # waiting or writing
+
+
+@contextmanager
+def knowledge_reader(db_path: str | Path) -> Iterator[duckdb.DuckDBPyConnection]:
+    """Read-only connection to the knowledge database, closed on exit.
+
+    Args:
+        db_path: Knowledge database path
 
+    Yields:
+        Read-only DuckDB connection
+    """
+    global _readers
+    with _access:
+        _access.wait_for(lambda: not _writers)
+        _readers += 1
     try:
+        conn = connect_waiting(db_path, read_only=True)
+        try:
+            yield conn
+        finally:
+            conn.close()
+    finally:
+        with _access:
+            _readers -= 1
+            _access.notify_all()
+
+
+@contextmanager
+def knowledge_writer(db_path: str | Path) -> Iterator[duckdb.DuckDBPyConnection]:
+    """Short-lived read-write connection, opened once no search holds the file.
+
+    Args:
+        db_path: Knowledge database path
+
+    Yields:
+        Writable DuckDB connection
+    """
+    global _writers
+    with _access:
+        _writers += 1
+        _access.wait_for(lambda: not _readers)
+    try:
+        conn = connect_waiting(db_path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+    finally:
+        with _access:
+            _writers -= 1
+            _access.notify_all()
+
+
+def _search_knowledge_uncached(
+    db_path: Path,
+    query: str,
+    platform: str | None,
+    limit: int,
+    vector_weight: float,
+    text_weight: float,
+    rerank: bool,
+) -> str:
+    """Run hybrid search + reranking against the knowledge database."""
+    # The reranker sees up to reranker_max_candidates results, cut to limit afterwards
+    reranking = rerank and settings.reranker_model != "none"
+    pool = max(limit, settings.reranker_max_candidates) if reranking else limit
+
+    with knowledge_reader(db_path) as conn:
         # Split query into terms for better matching
         query_terms = query.lower().split()
 
         # 1. BM25-like text search (using ILIKE with term matching)
-        fts_results = _execute_fts_search(conn, query_terms, query, platform, limit)
+        fts_results = _execute_fts_search(conn, query_terms, query, platform, pool)
 
         # 2. Vector semantic search (if embeddings enabled and available)
-        vec_results = _execute_vector_search(conn, query, platform, limit)
+        vec_results = _execute_vector_search(conn, query, platform, pool)
 
-        # 3. Weighted fusion with configurable weights
-        combined = rrf_fusion(
-            fts_results, vec_results, limit, vector_weight=vector_weight, text_weight=text_weight
-        )
+    # 3. Weighted fusion with configurable weights
+    combined = rrf_fusion(
+        fts_results, vec_results, pool, vector_weight=vector_weight, text_weight=text_weight
+    )
 
-        if not combined:
-            return ""
+    if not combined:
+        return ""
 
-        # 4. Optional cross-encoder reranking (Phase 7)
-        if rerank:
-            combined = _apply_reranking(query, combined, limit)
+    # 4. Optional cross-encoder reranking (Phase 7)
+    if rerank:
+        combined = _apply_reranking(query, combined, limit)
 
-        # Format results
-        return _format_results(combined, limit)
-
-    finally:
-        conn.close()
+    # Format results
+    return _format_results(combined, limit)
 
 
 def _execute_fts_search(
@@ -194,14 +388,24 @@ def _execute_vector_search(
     query: str,
     platform: str | None,
     limit: int,
+    model: str | None = None,
 ) -> list:
     """Execute vector similarity search on knowledge base.
 
+    Only vectors produced by the active embedding model (and matching the
+    query vector's dimension) are compared, so several models can coexist in
+    knowledge_embeddings. If the active model has no vectors yet, a background
+    re-embedding job is started and FTS results are used meanwhile.
+
+    The similarity search itself is delegated to the configured VectorStore
+    backend (``vector_store_backend``: DuckDB SQL or memory-mapped NumPy).
+
     Args:
         conn: DuckDB connection
         query: Search query
         platform: Optional platform filter
         limit: Maximum results
+        model: Embedding model to search with (defaults to settings.embedding_model)
 
     Returns:
         List of (id, title, content, platform, score) tuples
@@ -209,48 +413,536 @@ def _execute_vector_search(
     if settings.embedding_provider == "none":
         return []
 
+    model = model or settings.embedding_model
+
     try:
-        # Import embeddings
-        if settings.embedding_provider == "ollama":
-            from langchain_ollama import OllamaEmbeddings
+        from olav.tools.knowledge_embedder import get_embeddings
 
-            embeddings = OllamaEmbeddings(
-                model=settings.embedding_model, base_url=settings.embedding_base_url
-            )
-        else:
-            from langchain_openai import OpenAIEmbeddings
-            from pydantic import SecretStr
+        query_vec = get_embeddings(model).embed_query(query)  # type: ignore[attr-defined]
+        dim = len(query_vec)
+
+        if not _has_model_vectors(conn, model, dim):
+            _schedule_reembed(conn, model)
+            return []
+
+        return get_vector_store().search(conn, query_vec, model, platform, limit)
+    except Exception:  # noqa: S110
+        # Silently fall back to FTS-only if vector search fails
+        return []
 
-            api_key = settings.embedding_api_key
-            embeddings = OpenAIEmbeddings(
-                model=settings.embedding_model,
-                api_key=SecretStr(api_key) if api_key else None,  # type: ignore[arg-type]
-            )
 
-        query_vec = embeddings.embed_query(query)
+def _has_model_vectors(conn: duckdb.DuckDBPyConnection, model: str, dim: int) -> bool:
+    """Check whether any chunk has a vector for (model, dim)."""
+    try:
+        row = conn.execute(
+            "SELECT 1 FROM knowledge_embeddings WHERE model = ? AND dim = ? LIMIT 1",
+            [model, dim],
+        ).fetchone()
+    except duckdb.CatalogException:
+        # Database predates per-model embeddings; re-embedding creates the table
+        return False
+    return row is not None
 
-        # Convert to string representation for SQL
-        vec_str = f"[{','.join(map(str, query_vec))}]"
 
-        vec_sql = """
-            SELECT id, title, content, platform,
-                   array_cosine_similarity(embedding, ?::FLOAT[768]) as score
-            FROM knowledge_chunks
-            WHERE embedding IS NOT NULL
-        """
-        vec_params: list[str | int] = [vec_str]
+def _schedule_reembed(conn: duckdb.DuckDBPyConnection, model: str) -> None:
+    """Start background re-embedding if the corpus has chunks but no vectors for model."""
+    if not settings.embedding_auto_reembed:
+        return
+
+    row = conn.execute("SELECT COUNT(*) FROM knowledge_chunks").fetchone()
+    if not row or row[0] == 0:
+        return
+
+    from olav.tools.knowledge_embedder import start_background_reembed
+
+    start_background_reembed(model=model)
+
+
+# =============================================================================
+# Vector Store Backends
+# =============================================================================
+
+
+class VectorStore(ABC):
+    """Pluggable vector similarity backend for knowledge search.
+
+    Backends receive a full-precision query vector and return rows in the
+    same shape as the FTS path: (id, title, content, platform, score).
+    """
+
+    name: str = "base"
+
+    @abstractmethod
+    def search(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        query_vec: list[float],
+        model: str,
+        platform: str | None,
+        limit: int,
+    ) -> list:
+        """Return the top-``limit`` chunks most similar to ``query_vec``."""
+
+
+class DuckDBVectorStore(VectorStore):
+    """Vector search in DuckDB SQL (array_cosine_similarity).
+
+    Uses the quantized two-stage search when ``embedding_quantization`` is
+    enabled and quantized vectors exist, exact SQL scoring otherwise.
+    """
+
+    name = "duckdb"
+
+    def search(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        query_vec: list[float],
+        model: str,
+        platform: str | None,
+        limit: int,
+    ) -> list:
+        """Return the top-``limit`` chunks most similar to ``query_vec``."""
+        dim = len(query_vec)
+
+        scheme = settings.embedding_quantization
+        if scheme != "none":
+            from olav.tools.embedding_quantization import (
+                has_quantized,
+                rescore_factor,
+                two_stage_search,
+            )
+
+            if has_quantized(conn, model, dim, scheme):
+                return two_stage_search(
+                    conn,
+                    query_vec,
+                    model,
+                    scheme,
+                    limit=limit,
+                    candidates=limit * rescore_factor(scheme),
+                    platform=platform,
+                )
+
+        # dim comes from len() of the query vector, so formatting it into the cast is safe
+        vec_sql = f"""
+            SELECT c.id, c.title, c.content, c.platform,
+                   array_cosine_similarity(e.embedding::FLOAT[{dim}], ?::FLOAT[{dim}]) as score
+            FROM knowledge_embeddings e
+            JOIN knowledge_chunks c ON c.id = e.chunk_id
+            WHERE e.model = ? AND e.dim = ?
+        """  # noqa: S608
+        vec_params: list[object] = [vector_literal(query_vec), model, dim]
 
         if platform:
-            vec_sql += " AND platform = ?"
+            vec_sql += " AND c.platform = ?"
             vec_params.append(platform)
 
         vec_sql += " ORDER BY score DESC LIMIT ?"
         vec_params.append(limit)
 
         return conn.execute(vec_sql, vec_params).fetchall()
-    except Exception:  # noqa: S110
-        # Silently fall back to FTS-only if vector search fails
-        return []
+
+
+class NumpyVectorStore(VectorStore):
+    """Memory-mapped NumPy vector index.
+
+    Per model, the index directory holds:
+    - ``<model>.vectors.npy``: float32 matrix of L2-normalized vectors
+    - ``<model>.ids.npy``: chunk id per row
+    - ``<model>.platforms.npy``: platform code per row
+    - ``<model>.meta.json``: dim, row count and platform code table
+
+    Files are opened with ``mmap_mode="r"``, so the OS page cache is shared by
+    every process searching the same index (zero-copy). The index is built from
+    knowledge_embeddings on first use and rebuilt when the model's vectors
+    change (row count, newest insert or set of chunk ids).
+    Files are written to a temp name and renamed, so readers never see a
+    partial index.
+    """
+
+    name = "numpy"
+
+    # Rows scored per matrix-vector block (bounds temporary memory)
+    BLOCK_ROWS = 65536
+
+    def __init__(self, index_dir: Path | None = None) -> None:
+        """Initialize the store.
+
+        Args:
+            index_dir: Directory for index files (default: agent_dir/data/vectors)
+        """
+        self.index_dir = Path(index_dir or Path(settings.agent_dir) / "data" / "vectors")
+        self._loaded: dict[str, tuple[float, Any, Any, Any, dict[str, Any]]] = {}
+
+    def _paths(self, model: str) -> dict[str, Path]:
+        slug = re.sub(r"[^A-Za-z0-9_.-]", "_", model)
+        return {
+            kind: self.index_dir / f"{slug}.{kind}.{'json' if kind == 'meta' else 'npy'}"
+            for kind in ("vectors", "ids", "platforms", "meta")
+        }
+
+    def build(self, conn: duckdb.DuckDBPyConnection, model: str) -> int:
+        """(Re)build the index for a model from knowledge_embeddings.
+
+        Args:
+            conn: DuckDB connection (read-only is fine)
+            model: Embedding model
+
+        Returns:
+            Number of vectors written
+        """
+        import numpy as np
+
+        source = self._source_marker(conn, model)
+        rows = conn.execute(
+            """
+            SELECT e.chunk_id, e.embedding, COALESCE(c.platform, '')
+            FROM knowledge_embeddings e
+            JOIN knowledge_chunks c ON c.id = e.chunk_id
+            WHERE e.model = ?
+            ORDER BY e.chunk_id
+        """,
+            [model],
+        ).fetchall()
+        if not rows:
+            return 0
+
+        dim = len(rows[0][1])
+        rows = [r for r in rows if len(r[1]) == dim]
+
+        matrix = np.asarray([r[1] for r in rows], dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1.0, norms)
+
+        platform_names = sorted({r[2] for r in rows})
+        codes = {name: i for i, name in enumerate(platform_names)}
+
+        paths = self._paths(model)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            "vectors": matrix,
+            "ids": np.asarray([r[0] for r in rows], dtype=np.int64),
+            "platforms": np.asarray([codes[r[2]] for r in rows], dtype=np.int32),
+        }
+        for kind, array in arrays.items():
+            tmp = paths[kind].with_suffix(".tmp.npy")
+            np.save(tmp, array)
+            os.replace(tmp, paths[kind])
+
+        meta = {
+            "model": model,
+            "dim": dim,
+            "count": len(rows),
+            "source": source,
+            "platforms": platform_names,
+        }
+        tmp_meta = paths["meta"].with_suffix(".tmp")
+        tmp_meta.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp_meta, paths["meta"])
+
+        self._loaded.pop(model, None)
+        return len(rows)
+
+    @staticmethod
+    def _source_marker(conn: duckdb.DuckDBPyConnection, model: str) -> str:
+        """Change marker of a model's vectors: row count, newest insert, chunk id checksum.
+
+        A re-index that keeps the row count still changes the insert time and
+        usually the ids, so the index is rebuilt.
+        """
+        row = conn.execute(
+            "SELECT COUNT(*), max(created_at), bit_xor(hash(chunk_id)) "
+            "FROM knowledge_embeddings WHERE model = ?",
+            [model],
+        ).fetchone()
+        return ":".join(str(v) for v in row) if row else ""
+
+    def _load(self, conn: duckdb.DuckDBPyConnection, model: str) -> tuple[Any, Any, Any, dict]:
+        """Memory-map the index for a model, building or rebuilding it if stale.
+
+        Raises:
+            FileNotFoundError: If there are no vectors to build an index from
+        """
+        import numpy as np
+
+        paths = self._paths(model)
+        expected = self._source_marker(conn, model)
+
+        meta: dict[str, Any] = {}
+        if paths["meta"].exists():
+            meta = json.loads(paths["meta"].read_text(encoding="utf-8"))
+        if meta.get("source") != expected:
+            if self.build(conn, model) == 0:
+                raise FileNotFoundError(f"No vectors to index for model {model}")
+            meta = json.loads(paths["meta"].read_text(encoding="utf-8"))
+
+        mtime = paths["meta"].stat().st_mtime
+        cached = self._loaded.get(model)
+        if cached and cached[0] == mtime:
+            return cached[1], cached[2], cached[3], cached[4]
+
+        vectors = np.load(paths["vectors"], mmap_mode="r")
+        ids = np.load(paths["ids"], mmap_mode="r")
+        platforms = np.load(paths["platforms"], mmap_mode="r")
+        self._loaded[model] = (mtime, vectors, ids, platforms, meta)
+        return vectors, ids, platforms, meta
+
+    def top_k(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        query_vecs: list[list[float]],
+        model: str,
+        limit: int,
+        platform: str | None = None,
+    ) -> list[list[tuple[int, float]]]:
+        """Batched top-k: score several queries against the index in one pass.
+
+        The matrix is scored block by block (``BLOCK_ROWS`` rows at a time) as a
+        matrix-matrix product against all queries, keeping a running top-k.
+
+        Args:
+            conn: DuckDB connection (used for staleness check / build)
+            query_vecs: Query vectors (same dimension as the index)
+            model: Embedding model
+            limit: Top-k per query
+            platform: Optional platform filter
+
+        Returns:
+            Per query, a list of (chunk_id, cosine score) sorted by score
+        """
+        import numpy as np
+
+        if limit <= 0:
+            return [[] for _ in query_vecs]
+
+        vectors, ids, platforms, meta = self._load(conn, model)
+
+        queries = np.asarray(query_vecs, dtype=np.float32)
+        if queries.shape[1] != meta["dim"]:
+            return [[] for _ in query_vecs]
+        q_norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries /= np.where(q_norms == 0, 1.0, q_norms)
+
+        platform_code = None
+        if platform:
+            if platform not in meta["platforms"]:
+                return [[] for _ in query_vecs]
+            platform_code = meta["platforms"].index(platform)
+
+        n_queries = queries.shape[0]
+        best_scores = np.full((n_queries, 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((n_queries, 0), dtype=np.int64)
+
+        for start in range(0, vectors.shape[0], self.BLOCK_ROWS):
+            block = vectors[start : start + self.BLOCK_ROWS]
+            scores = queries @ block.T  # (n_queries, block_rows)
+            if platform_code is not None:
+                mask = platforms[start : start + self.BLOCK_ROWS] != platform_code
+                scores[:, mask] = -np.inf
+
+            k = min(limit, scores.shape[1])
+            part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            best_scores = np.concatenate(
+                [best_scores, np.take_along_axis(scores, part, axis=1)], axis=1
+            )
+            best_rows = np.concatenate([best_rows, part + start], axis=1)
+
+            if best_scores.shape[1] > limit:
+                keep = np.argpartition(-best_scores, limit - 1, axis=1)[:, :limit]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+
+        results = []
+        for qi in range(n_queries):
+            order = np.argsort(-best_scores[qi])
+            results.append(
+                [
+                    (int(ids[best_rows[qi, j]]), float(best_scores[qi, j]))
+                    for j in order
+                    if np.isfinite(best_scores[qi, j])
+                ]
+            )
+        return results
+
+    def search(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        query_vec: list[float],
+        model: str,
+        platform: str | None,
+        limit: int,
+    ) -> list:
+        """Return the top-``limit`` chunks most similar to ``query_vec``.
+
+        Falls back to the DuckDB backend if the index cannot be built or mapped
+        (e.g. read-only data directory).
+        """
+        try:
+            hits = self.top_k(conn, [query_vec], model, limit, platform)[0]
+        except Exception:
+            return DuckDBVectorStore().search(conn, query_vec, model, platform, limit)
+        if not hits:
+            return []
+
+        scores = dict(hits)
+        placeholders = ", ".join("?" for _ in hits)
+        rows = conn.execute(
+            f"""
+            SELECT id, title, content, platform FROM knowledge_chunks
+            WHERE id IN ({placeholders})
+        """,  # noqa: S608
+            [chunk_id for chunk_id, _ in hits],
+        ).fetchall()
+        results = [(*row, scores[row[0]]) for row in rows]
+        results.sort(key=lambda r: r[4], reverse=True)
+        return results
+
+
+_vector_stores: dict[str, VectorStore] = {}
+
+
+def get_vector_store(backend: str | None = None) -> VectorStore:
+    """Get the (cached) vector store for a backend.
+
+    Falls back to DuckDB when the NumPy backend is selected but numpy is not
+    installed.
+
+    Args:
+        backend: "duckdb" or "numpy" (defaults to settings.vector_store_backend)
+
+    Returns:
+        VectorStore instance
+    """
+    backend = backend or settings.vector_store_backend
+
+    if backend == "numpy":
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            backend = "duckdb"
+
+    if backend not in _vector_stores:
+        _vector_stores[backend] = NumpyVectorStore() if backend == "numpy" else DuckDBVectorStore()
+    return _vector_stores[backend]
+
+
+def benchmark_vector_stores(
+    model: str | None = None, samples: int = 50, limit: int = 10
+) -> dict[str, Any]:
+    """Compare DuckDB and NumPy backends on the same vectors.
+
+    Stored chunk vectors are used as sample queries, so no embedding service
+    is needed.
+
+    Args:
+        model: Embedding model (defaults to settings.embedding_model)
+        samples: Number of sample queries
+        limit: Top-k per query
+
+    Returns:
+        Dictionary with avg latency per backend (ms) and mean top-k overlap
+    """
+    import random
+
+    model = model or settings.embedding_model
+    db_path = Path(settings.agent_dir) / "data" / "knowledge.db"
+    report: dict[str, Any] = {"model": model, "samples": 0, "latency_ms": {}, "overlap": 0.0}
+    if not db_path.exists():
+        return report
+
+    with knowledge_reader(db_path) as conn:
+        rows = conn.execute(
+            "SELECT embedding FROM knowledge_embeddings WHERE model = ?", [model]
+        ).fetchall()
+        queries = [list(r[0]) for r in random.sample(rows, min(samples, len(rows)))]  # noqa: S311
+        report["samples"] = len(queries)
+        if not queries:
+            return report
+
+        ids: dict[str, list[set[int]]] = {}
+        for backend in ("duckdb", "numpy"):
+            store = get_vector_store(backend)
+            if backend == "numpy" and isinstance(store, NumpyVectorStore):
+                store._load(conn, model)  # build/map outside the timed loop
+            started = time.perf_counter()
+            ids[store.name] = [
+                {r[0] for r in store.search(conn, q, model, None, limit)} for q in queries
+            ]
+            report["latency_ms"][store.name] = round(
+                (time.perf_counter() - started) * 1000 / len(queries), 2
+            )
+
+        if "numpy" in ids:
+            overlaps = [
+                len(a & b) / len(a | b) if a | b else 1.0
+                for a, b in zip(ids["duckdb"], ids["numpy"], strict=True)
+            ]
+            report["overlap"] = round(sum(overlaps) / len(overlaps), 3)
+        return report
+
+
+def compare_embedding_models(
+    queries: list[str],
+    model_a: str,
+    model_b: str,
+    limit: int = 5,
+    platform: str | None = None,
+) -> dict[str, Any]:
+    """Evaluate two embedding models side by side on the same corpus.
+
+    Both models must already have vectors in knowledge_embeddings (see
+    KnowledgeEmbedder.reembed_missing). For every query the top-k chunk ids of
+    each model are compared, and query embedding + search latency is timed.
+
+    Args:
+        queries: Evaluation queries
+        model_a: First embedding model (e.g. "nomic-embed-text")
+        model_b: Second embedding model (e.g. "text-embedding-3-small")
+        limit: Top-k to compare
+        platform: Optional platform filter
+
+    Returns:
+        Dictionary with per-query results and aggregate stats:
+        {"models": {model: {"coverage", "avg_latency_ms"}}, "avg_overlap": float,
+         "queries": [{"query", "overlap", model_a: [titles], model_b: [titles]}]}
+    """
+    db_path = Path(settings.agent_dir) / "data" / "knowledge.db"
+    report: dict[str, Any] = {"models": {}, "queries": [], "avg_overlap": 0.0}
+
+    if not db_path.exists():
+        return report
+
+    with knowledge_reader(db_path) as conn:
+        total_row = conn.execute("SELECT COUNT(*) FROM knowledge_chunks").fetchone()
+        total = total_row[0] if total_row else 0
+        latencies: dict[str, list[float]] = {model_a: [], model_b: []}
+
+        for model in (model_a, model_b):
+            row = conn.execute(
+                "SELECT COUNT(*) FROM knowledge_embeddings WHERE model = ?", [model]
+            ).fetchone()
+            report["models"][model] = {"coverage": (row[0] if row else 0) / total if total else 0.0}
+
+        overlaps = []
+        for query in queries:
+            entry: dict[str, Any] = {"query": query}
+            ids: dict[str, set[int]] = {}
+            for model in (model_a, model_b):
+                started = time.perf_counter()
+                rows = _execute_vector_search(conn, query, platform, limit, model=model)
+                latencies[model].append((time.perf_counter() - started) * 1000)
+                ids[model] = {row[0] for row in rows}
+                entry[model] = [row[1] for row in rows]
+
+            union = ids[model_a] | ids[model_b]
+            entry["overlap"] = len(ids[model_a] & ids[model_b]) / len(union) if union else 0.0
+            overlaps.append(entry["overlap"])
+            report["queries"].append(entry)
+
+        for model, values in latencies.items():
+            report["models"][model]["avg_latency_ms"] = sum(values) / len(values) if values else 0.0
+        report["avg_overlap"] = sum(overlaps) / len(overlaps) if overlaps else 0.0
+        return report
 
 
 def _apply_reranking(query: str, combined: list, limit: int) -> list:
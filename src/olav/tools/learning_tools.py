@@ -15,6 +15,7 @@ from pydantic import BaseModel, Field
 from config.settings import settings
 from olav.core.learning import suggest_solution_filename, update_aliases
 from olav.tools.knowledge_embedder import KnowledgeEmbedder
+from olav.tools.tool_concurrency import write_access
 
 
 class UpdateAliasesInput(BaseModel):
@@ -58,13 +59,14 @@ class UpdateAliasesTool(BaseTool):
     ) -> str:
         """Execute the tool."""
         try:
-            success = update_aliases(
-                alias=alias,
-                actual_value=actual_value,
-                alias_type=alias_type,
-                platform=platform,
-                notes=notes,
-            )
+            with write_access():
+                success = update_aliases(
+                    alias=alias,
+                    actual_value=actual_value,
+                    alias_type=alias_type,
+                    platform=platform,
+                    notes=notes,
+                )
             if success:
                 return f"✅ Alias '{alias}' -> '{actual_value}' saved to knowledge base"
             else:
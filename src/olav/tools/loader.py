@@ -4,6 +4,8 @@ This module implements the 'olav reload' functionality that loads
 CLI commands and API definitions from the imports/ directory into DuckDB.
 """
 
+import hashlib
+import json
 from pathlib import Path
 from typing import Any
 
@@ -47,153 +49,224 @@ class CapabilitiesLoader:
         self.imports_dir = Path(imports_dir)
         self.db = database
 
-    def reload(self, dry_run: bool = False) -> dict[str, int]:
+    def reload(self, dry_run: bool = False, force: bool = False) -> dict[str, int]:
         """Reload capabilities from imports/ directory.
 
+        Source files are hashed first; if none changed since the last load the
+        database is left untouched. Otherwise all files are parsed in memory,
+        diffed against the stored rows by content hash and the inserts/deletes
+        are applied in a single transaction.
+
         Args:
             dry_run: If True, only validate without loading
+            force: If True, re-sync even when source file hashes are unchanged
 
         Returns:
-            Dictionary with counts: {"commands": N, "apis": M, "total": N+M}
+            Dictionary with counts: {"commands": N, "apis": M, "total": N+M,
+            "added": A, "removed": R, "unchanged": 1 if skipped else 0}
         """
         if self.db is None:
             from olav.core.database import get_database
 
             self.db = get_database()
 
-        if not dry_run:
-            self.db.clear_capabilities()
-
-        command_count = self._load_commands(dry_run)
-        api_count = self._load_apis(dry_run)
+        sources = self._scan_sources()
+        source_hashes = {rel: file_hash for rel, (_, _, file_hash) in sources.items()}
+
+        if not dry_run and not force and source_hashes == self.db.get_capability_source_hashes():
+            counts = self.db.count_capabilities()
+            commands, apis = counts.get("command", 0), counts.get("api", 0)
+            return {
+                "commands": commands,
+                "apis": apis,
+                "total": commands + apis,
+                "added": 0,
+                "removed": 0,
+                "unchanged": 1,
+            }
+
+        rows: list[dict[str, Any]] = []
+        for rel, (path, text, _) in sources.items():
+            if rel.startswith("commands/"):
+                rows.extend(self._parse_commands(rel, path, text))
+            else:
+                rows.extend(self._parse_apis(rel, path, text))
+
+        command_count = sum(1 for row in rows if row["type"] == "command")
+        api_count = len(rows) - command_count
+        result = {
+            "commands": command_count,
+            "apis": api_count,
+            "total": command_count + api_count,
+            "added": 0,
+            "removed": 0,
+            "unchanged": 0,
+        }
+        if dry_run:
+            return result
+
+        result.update(self.db.sync_capabilities(rows, source_hashes))
+
+        if result["added"] or result["removed"]:
+            # Keep smart_query's intent index in sync with the new capabilities
+            from olav.tools.command_index import rebuild_command_index
+
+            rebuild_command_index(self.db)
+
+        self._schedule_embedding()
+        return result
+
+    def _schedule_embedding(self) -> None:
+        """Embed new/changed capabilities for semantic search in the background."""
+        from olav.tools.capability_embeddings import start_capability_embedding
+
+        try:
+            start_capability_embedding(self.db)
+        except Exception as e:
+            print(f"Warning: capability embedding not started: {e}")
+
+    def _scan_sources(self) -> dict[str, tuple[Path, str, str]]:
+        """Read and hash imports/commands/*.txt (except blacklist.txt) and imports/apis/*.yaml.
 
-        return {"commands": command_count, "apis": api_count, "total": command_count + api_count}
-
-    def _load_commands(self, dry_run: bool) -> int:
-        """Load CLI commands from imports/commands/*.txt.
+        Returns:
+            Mapping of relative source path -> (path, text, sha256)
+        """
+        sources: dict[str, tuple[Path, str, str]] = {}
+        for subdir, pattern in (("commands", "*.txt"), ("apis", "*.yaml")):
+            directory = self.imports_dir / subdir
+            if not directory.exists():
+                continue
+            for path in sorted(directory.glob(pattern)):
+                # Skip disabled files (starting with _) and the command blacklist,
+                # which is read by the executor, not loaded as a platform
+                if path.name.startswith("_") or path.name == "blacklist.txt":
+                    continue
+                data = path.read_bytes()
+                rel = path.relative_to(self.imports_dir).as_posix()
+                sources[rel] = (
+                    path,
+                    data.decode("utf-8"),
+                    hashlib.sha256(data).hexdigest(),
+                )
+        return sources
+
+    def _parse_commands(self, source_file: str, path: Path, text: str) -> list[dict[str, Any]]:
+        """Parse a command whitelist file into capability rows.
 
         Args:
-            dry_run: If True, only validate
+            source_file: Source path relative to imports/
+            path: Absolute file path (platform is the file stem)
+            text: File content
 
         Returns:
-            Number of commands loaded
+            List of capability rows
         """
-        commands_dir = self.imports_dir / "commands"
-        if not commands_dir.exists():
-            return 0
+        platform = path.stem  # cisco_ios.txt -> cisco_ios
+        rows = []
 
-        count = 0
+        for line in text.strip().split("\n"):
+            line = line.strip()
 
-        for txt_file in commands_dir.glob("*.txt"):
-            # Skip disabled files (starting with _)
-            if txt_file.name.startswith("_"):
+            # Skip empty lines and comments
+            if not line or line.startswith("#"):
                 continue
 
-            platform = txt_file.stem  # cisco_ios.txt -> cisco_ios
-
-            # Read and parse commands
-            lines = txt_file.read_text(encoding="utf-8").strip().split("\n")
-
-            for line in lines:
-                line = line.strip()
-
-                # Skip empty lines and comments
-                if not line or line.startswith("#"):
-                    continue
-
-                # Check if it's a write command
-                is_write = line.startswith("!")
-                command = line[1:] if is_write else line
+            # Check if it's a write command
+            is_write = line.startswith("!")
+            command = line[1:] if is_write else line
 
-                # Remove leading/trailing whitespace
-                command = command.strip()
+            # Remove leading/trailing whitespace
+            command = command.strip()
 
-                if not command:
-                    continue
-
-                if not dry_run:
-                    assert self.db is not None  # For type checker  # noqa: S101
-                    self.db.insert_capability(
-                        cap_type="command",
-                        platform=platform,
-                        name=command,
-                        source_file=str(txt_file.relative_to(self.imports_dir)),
-                        is_write=is_write,
-                    )
+            if not command:
+                continue
 
-                count += 1
+            rows.append(
+                {
+                    "type": "command",
+                    "platform": platform,
+                    "name": command,
+                    "method": None,
+                    "description": None,
+                    "parameters": None,
+                    "is_write": is_write,
+                    "source_file": source_file,
+                }
+            )
 
-        return count
+        return rows
 
-    def _load_apis(self, dry_run: bool) -> int:
-        """Load API definitions from imports/apis/*.yaml.
+    def _parse_apis(self, source_file: str, path: Path, text: str) -> list[dict[str, Any]]:
+        """Parse an OpenAPI spec into capability rows.
 
         Args:
-            dry_run: If True, only validate
+            source_file: Source path relative to imports/
+            path: Absolute file path (platform is the file stem)
+            text: File content
 
         Returns:
-            Number of API endpoints loaded
+            List of capability rows (empty if the spec is invalid)
         """
-        apis_dir = self.imports_dir / "apis"
-        if not apis_dir.exists():
-            return 0
+        platform = path.stem  # netbox.yaml -> netbox
 
-        count = 0
+        try:
+            spec = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            print(f"Error parsing {path}: {e}")
+            return []
 
-        for yaml_file in apis_dir.glob("*.yaml"):
-            # Skip disabled files (starting with _)
-            if yaml_file.name.startswith("_"):
-                continue
+        # Validate OpenAPI format
+        if not isinstance(spec, dict) or "paths" not in spec:
+            print(f"Invalid OpenAPI spec in {path}: missing 'paths'")
+            return []
 
-            platform = yaml_file.stem  # netbox.yaml -> netbox
+        rows = []
 
-            try:
-                spec = yaml.safe_load(yaml_file.read_text(encoding="utf-8"))
-            except yaml.YAMLError as e:
-                print(f"Error parsing {yaml_file}: {e}")
+        # Extract endpoints from paths
+        for api_path, path_spec in spec["paths"].items():
+            if not isinstance(path_spec, dict):
                 continue
 
-            # Validate OpenAPI format
-            if not isinstance(spec, dict) or "paths" not in spec:
-                print(f"Invalid OpenAPI spec in {yaml_file}: missing 'paths'")
-                continue
+            # Parameters shared by all methods of the path
+            path_params = path_spec.get("parameters", [])
 
-            # Extract endpoints from paths
-            for path, path_spec in spec["paths"].items():
-                if not isinstance(path_spec, dict):
+            for method, method_spec in path_spec.items():
+                if method.lower() not in ["get", "post", "put", "patch", "delete"]:
                     continue
 
-                for method, method_spec in path_spec.items():
-                    if method.lower() not in ["get", "post", "put", "patch", "delete"]:
-                        continue
-
-                    if not isinstance(method_spec, dict):
-                        continue
-
-                    # Check for OLAV-specific write flag
-                    is_write = method_spec.get("x-olav-write", False)
-
-                    # Default to write=True for non-GET methods
-                    if not is_write and method.lower() in ["post", "put", "patch", "delete"]:
-                        is_write = True
-
-                    summary = method_spec.get("summary", method_spec.get("description"))
-
-                    if not dry_run:
-                        assert self.db is not None  # For type checker  # noqa: S101
-                        self.db.insert_capability(
-                            cap_type="api",
-                            platform=platform,
-                            name=path,
-                            source_file=str(yaml_file.relative_to(self.imports_dir)),
-                            method=method.upper(),
-                            description=summary,
-                            is_write=is_write,
-                        )
-
-                    count += 1
+                if not isinstance(method_spec, dict):
+                    continue
 
-        return count
+                # Check for OLAV-specific write flag
+                is_write = method_spec.get("x-olav-write", False)
+
+                # Default to write=True for non-GET methods
+                if not is_write and method.lower() in ["post", "put", "patch", "delete"]:
+                    is_write = True
+
+                summary = method_spec.get("summary", method_spec.get("description"))
+
+                # Parameter names are indexed for capability search ($ref entries skipped)
+                param_names = [
+                    param["name"]
+                    for param in [*path_params, *method_spec.get("parameters", [])]
+                    if isinstance(param, dict) and param.get("name")
+                ]
+
+                rows.append(
+                    {
+                        "type": "api",
+                        "platform": platform,
+                        "name": api_path,
+                        "method": method.upper(),
+                        "description": summary,
+                        "parameters": json.dumps(param_names) if param_names else None,
+                        "is_write": bool(is_write),
+                        "source_file": source_file,
+                    }
+                )
+
+        return rows
 
     def validate(self) -> list[str]:
         """Validate all files in imports/ directory.
@@ -246,12 +319,14 @@ class CapabilitiesLoader:
 def reload_capabilities(
     imports_dir: str | Path | None = None,
     dry_run: bool = False,
+    force: bool = False,
 ) -> dict[str, int]:
     """Convenience function to reload capabilities.
 
     Args:
         imports_dir: Path to imports/ directory (defaults to agent_dir/imports)
         dry_run: If True, only validate without loading
+        force: If True, re-sync even when source files are unchanged
 
     Returns:
         Dictionary with counts
@@ -264,7 +339,7 @@ def reload_capabilities(
         imports_dir_obj = Path(imports_dir) if isinstance(imports_dir, str) else imports_dir
 
     loader = CapabilitiesLoader(imports_dir_obj)
-    return loader.reload(dry_run=dry_run)
+    return loader.reload(dry_run=dry_run, force=force)
 
 
 def validate_capabilities(imports_dir: str | Path | None = None) -> list[str]:
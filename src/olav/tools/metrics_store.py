@@ -0,0 +1,507 @@
+"""Time-series metrics extracted from inspection and snapshot outputs.
+
+Numeric values in command outputs (CPU, memory, interface error counters, BGP
+prefix counts, ...) are extracted by ``METRIC_RULES`` - from TextFSM-parsed
+fields where a template exists, else from raw-output regexes - and appended
+to ``metric_samples`` in the snapshot database as (ts, day, device, metric,
+labels, value) rows. Samples arrive in time order, so DuckDB's zone maps on
+``ts``/``day`` act as time partitions for range scans.
+
+Maintenance (at most hourly) keeps storage bounded:
+
+- raw samples older than ``metrics_raw_days`` are downsampled into hourly
+  ``metric_rollups`` (min/max/sum/count/last) and deleted
+- rollups older than ``metrics_retention_days`` are dropped
+
+metric_trend answers "CPU trend on R3 last 7 days" from raw samples and
+rollups combined, without polling the device.
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from langchain_core.tools import tool
+
+from config.settings import settings
+from olav.tools.snapshot import (
+    CollectedOutput,
+    SnapshotStore,
+    first_field,
+    get_snapshot_store,
+    parse_output,
+)
+
+
+@dataclass(frozen=True)
+class MetricRule:
+    """How to extract one metric from the outputs of matching commands.
+
+    Attributes:
+        command: Regex matched (case-insensitive) against the command
+        metric: Metric name
+        fields: Parsed field alternatives holding the value (one sample per row)
+        labels: (label, field alternatives) pairs identifying the row
+        pattern: Raw-output regex used when no parsed field matched; one group
+                 is the value, two groups are (part, whole) of a percentage
+        transform: "" (number), "established" (BGP state -> 1/0), "up" (oper
+                   status -> 1/0), "admin" (admin status -> 1/0)
+    """
+
+    command: str
+    metric: str
+    fields: tuple[str, ...] = ()
+    labels: tuple[tuple[str, tuple[str, ...]], ...] = ()
+    pattern: str = ""
+    transform: str = ""
+
+
+_INTERFACE_LABEL = (("interface", ("interface", "intf", "port")),)
+_PEER_LABEL = (("neighbor", ("bgp_neigh", "bgp_neighbor", "neighbor", "peer_ip", "peer")),)
+
+METRIC_RULES: tuple[MetricRule, ...] = (
+    MetricRule(
+        r"cpu",
+        "cpu_5sec",
+        ("cpu_usage_5_sec", "cpu_5_sec"),
+        pattern=r"five seconds:\s*(\d+)%",
+    ),
+    MetricRule(
+        r"cpu", "cpu_1min", ("cpu_usage_1_min", "cpu_1_min"), pattern=r"one minute:\s*(\d+)%"
+    ),
+    MetricRule(
+        r"cpu", "cpu_5min", ("cpu_usage_5_min", "cpu_5_min"), pattern=r"five minutes:\s*(\d+)%"
+    ),
+    MetricRule(r"cpu", "cpu_usage", pattern=r"CPU [Uu]sage\s*:?\s*(\d+(?:\.\d+)?)%"),
+    MetricRule(
+        r"memory",
+        "memory_used_pct",
+        pattern=r"^Processor\s+\S+\s+(\d+)\s+(\d+)",
+    ),
+    MetricRule(
+        r"memory",
+        "memory_used_pct",
+        pattern=r"Memory (?:Using Percentage Is|[Uu]tilization)\s*:?\s*(\d+(?:\.\d+)?)%",
+    ),
+    # Interface counters ("show interfaces" templates, or the IOS "counters
+    # errors" table); monotonic, see counter_rates
+    MetricRule(r"interface", "if_crc_errors", ("crc", "crc_errors", "fcs_err"), _INTERFACE_LABEL),
+    MetricRule(
+        r"interface",
+        "if_input_errors",
+        ("input_errors", "in_errors", "inerrors", "rcv_err"),
+        _INTERFACE_LABEL,
+    ),
+    MetricRule(
+        r"interface",
+        "if_output_errors",
+        ("output_errors", "out_errors", "outerrors", "xmit_err"),
+        _INTERFACE_LABEL,
+    ),
+    MetricRule(r"interface", "if_input_drops", ("queue_drops", "input_discards"), _INTERFACE_LABEL),
+    MetricRule(
+        r"interface",
+        "if_output_drops",
+        ("queue_output_drops", "output_discards", "outdiscards"),
+        _INTERFACE_LABEL,
+    ),
+    # Interface state (1/0) from brief/status tables
+    MetricRule(
+        r"interface",
+        "if_admin_up",
+        ("status", "phy", "link_status"),
+        _INTERFACE_LABEL,
+        transform="admin",
+    ),
+    MetricRule(
+        r"interface",
+        "if_oper_up",
+        ("proto", "protocol", "protocol_status", "status", "link_status"),
+        _INTERFACE_LABEL,
+        transform="up",
+    ),
+    MetricRule(r"interface", "if_runts", ("runts", "undersize"), _INTERFACE_LABEL),
+    MetricRule(r"interface", "if_giants", ("giants",), _INTERFACE_LABEL),
+    MetricRule(r"interface", "if_input_packets", ("input_packets",), _INTERFACE_LABEL),
+    MetricRule(r"interface", "if_output_packets", ("output_packets",), _INTERFACE_LABEL),
+    MetricRule(
+        r"bgp",
+        "bgp_prefixes_received",
+        ("state_pfxrcd", "state_or_prefixes_received", "prefixes_received"),
+        _PEER_LABEL,
+    ),
+    MetricRule(
+        r"bgp",
+        "bgp_session_up",
+        ("state_pfxrcd", "state_or_prefixes_received", "state", "peer_state"),
+        _PEER_LABEL,
+        transform="established",
+    ),
+)
+
+_SAMPLE_COLUMNS = {
+    "ts": "TIMESTAMP",
+    "day": "DATE",
+    "device": "VARCHAR",
+    "metric": "VARCHAR",
+    "labels": "VARCHAR",
+    "value": "DOUBLE",
+}
+
+# Trend bucket sizes in seconds, smallest first; a trend uses the smallest
+# that keeps the series under _MAX_POINTS points
+_BUCKETS = (300, 900, 3600, 6 * 3600, 86400)
+_MAX_POINTS = 48
+_MAX_SERIES = 20
+_MAINTENANCE_INTERVAL = timedelta(hours=1)
+
+
+def _number(value: Any, transform: str = "") -> float | None:  # noqa: ANN401
+    text = str(value).strip().rstrip("%").replace(",", "")
+    if transform == "established":
+        # BGP summaries show a prefix count when established, else the state
+        return 1.0 if text.isdigit() or text.lower() == "established" else 0.0
+    if transform == "up":
+        return 1.0 if re.match(r"(up|connected|ok)\b", text.lower()) else 0.0
+    if transform == "admin":
+        # "administratively down" (IOS), "*down" (VRP), "disabled" (switch ports)
+        return 0.0 if "admin" in text.lower() or text.startswith("*") or text == "disabled" else 1.0
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def format_labels(labels: dict[str, Any]) -> str:
+    """Canonical "key=value,key=value" form of sample labels."""
+    return ",".join(f"{k}={labels[k]}" for k in sorted(labels))
+
+
+def parse_counter_table(output: str) -> list[dict[str, Any]]:
+    """Rows of column tables headed by "Port" (IOS "show interfaces counters errors").
+
+    There is no TextFSM template for these; the tables (one per group of
+    counters) are merged per port, with headers as lowercase field names
+    ("FCS-Err" -> "fcs_err").
+    """
+    rows: dict[str, dict[str, Any]] = {}
+    columns: list[str] = []
+    for line in (output or "").splitlines():
+        fields = line.split()
+        if not fields:
+            continue
+        if fields[0].lower() == "port":
+            columns = [f.lower().replace("-", "_") for f in fields]
+        elif columns and len(fields) == len(columns) and all(f.isdigit() for f in fields[1:]):
+            rows.setdefault(fields[0], {}).update(zip(columns, fields, strict=True))
+    return list(rows.values())
+
+
+def extract_metrics(
+    command: str, output: str, records: list[dict[str, Any]] | None = None
+) -> list[tuple[str, str, float]]:
+    """Metric samples in one command output.
+
+    Args:
+        command: Command that produced the output
+        output: Raw output
+        records: TextFSM-parsed rows (lowercase field names), if any
+
+    Returns:
+        (metric, labels, value) tuples
+    """
+    if not records and re.search(r"counters", command, re.IGNORECASE):
+        records = parse_counter_table(output)
+    samples: dict[tuple[str, str], float] = {}
+    for rule in METRIC_RULES:
+        if not re.search(rule.command, command, re.IGNORECASE):
+            continue
+        if rule.fields and records:
+            for row in records:
+                raw = first_field(row, rule.fields)
+                value = None if raw is None else _number(raw, rule.transform)
+                if value is None:
+                    continue
+                labels = {
+                    name: first_field(row, names)
+                    for name, names in rule.labels
+                    if first_field(row, names) is not None
+                }
+                samples.setdefault((rule.metric, format_labels(labels)), value)
+        if rule.pattern and (rule.metric, "") not in samples:
+            match = re.search(rule.pattern, output or "", re.MULTILINE)
+            if match:
+                numbers = [float(g) for g in match.groups()]
+                value = numbers[0] if len(numbers) == 1 else 100.0 * numbers[1] / numbers[0]
+                samples[(rule.metric, "")] = round(value, 2)
+    return [(metric, labels, value) for (metric, labels), value in samples.items()]
+
+
+class MetricsStore:
+    """Append-only metric samples with hourly rollups over the snapshot database."""
+
+    def __init__(self, store: SnapshotStore) -> None:
+        self.store = store
+        self._lock = threading.Lock()
+        self._maintained: datetime | None = None
+        spec = ", ".join(f"{name} {kind}" for name, kind in _SAMPLE_COLUMNS.items())
+        store.conn.execute(f"CREATE TABLE IF NOT EXISTS metric_samples ({spec})")
+        store.conn.execute("""
+            CREATE TABLE IF NOT EXISTS metric_rollups (
+                bucket TIMESTAMP,
+                device TEXT,
+                metric TEXT,
+                labels TEXT,
+                min DOUBLE,
+                max DOUBLE,
+                sum DOUBLE,
+                count BIGINT,
+                last DOUBLE
+            )
+        """)
+
+    def append(self, samples: list[tuple[str, str, str, float]], ts: datetime | None = None) -> int:
+        """Append samples taken at one time.
+
+        Args:
+            samples: (device, metric, labels, value) tuples
+            ts: Sample time (default: now)
+
+        Returns:
+            Number of samples written
+        """
+        if not samples:
+            return 0
+        ts = ts or datetime.now()
+        rows = [
+            {
+                "ts": ts.isoformat(sep=" "),
+                "day": ts.date().isoformat(),
+                "device": device,
+                "metric": metric,
+                "labels": labels,
+                "value": value,
+            }
+            for device, metric, labels, value in samples
+        ]
+        with self._lock:
+            self.store.bulk_insert("metric_samples", _SAMPLE_COLUMNS, rows)
+        self.maintain()
+        return len(rows)
+
+    def maintain(self, force: bool = False) -> None:
+        """Downsample old raw samples into hourly rollups and apply retention."""
+        now = datetime.now()
+        if not force and self._maintained and now - self._maintained < _MAINTENANCE_INTERVAL:
+            return
+        conn = self.store.conn
+        with self._lock:
+            self._maintained = now
+            # Whole hours only, so a bucket is never rolled up twice
+            cutoff = (now - timedelta(days=settings.metrics_raw_days)).replace(
+                minute=0, second=0, microsecond=0
+            )
+            conn.execute(
+                "INSERT INTO metric_rollups "
+                "SELECT date_trunc('hour', ts), device, metric, labels, min(value), max(value), "
+                "sum(value), count(*), arg_max(value, ts) FROM metric_samples "
+                "WHERE ts < ? GROUP BY ALL",
+                [cutoff],
+            )
+            conn.execute("DELETE FROM metric_samples WHERE ts < ?", [cutoff])
+            conn.execute(
+                "DELETE FROM metric_rollups WHERE bucket < ?",
+                [now - timedelta(days=settings.metrics_retention_days)],
+            )
+
+    def metrics(self, device: str) -> list[tuple[str, int, datetime, float]]:
+        """Metrics recorded for a device: (metric, series, last time, last value)."""
+        return self.store.conn.execute(
+            "SELECT metric, count(DISTINCT labels), max(ts), arg_max(value, ts) FROM ("
+            "SELECT ts, metric, labels, value FROM metric_samples WHERE device = ? "
+            "UNION ALL SELECT bucket, metric, labels, last FROM metric_rollups WHERE device = ?"
+            ") GROUP BY metric ORDER BY metric",
+            [device, device],
+        ).fetchall()
+
+    def trend(
+        self,
+        device: str,
+        metric: str,
+        since: datetime,
+        labels: str = "",
+    ) -> tuple[int, list[dict[str, Any]]]:
+        """Bucketed series of a metric (or metric prefix) on a device.
+
+        Args:
+            device: Device name
+            metric: Metric name or prefix ("cpu" matches cpu_5sec, cpu_5min, ...)
+            since: Start time
+            labels: Only series whose labels contain this ("interface=Gi0/1")
+
+        Returns:
+            (bucket seconds, rows with metric, labels, bucket, min, max, avg, last, samples)
+        """
+        span = int((datetime.now() - since).total_seconds())
+        bucket = next((b for b in _BUCKETS if span // b <= _MAX_POINTS), _BUCKETS[-1])
+        filters = "device = ? AND (metric = ? OR starts_with(metric, ?)) AND contains(labels, ?)"
+        params = [device, metric, metric, labels]
+        cursor = self.store.conn.execute(
+            "SELECT metric, labels, time_bucket(to_seconds(?::BIGINT), t) AS bucket, "  # noqa: S608
+            "min(mn) AS min, max(mx) AS max, sum(s) / sum(c) AS avg, arg_max(last, t) AS last, "
+            "sum(c) AS samples FROM ("
+            "SELECT ts AS t, metric, labels, value AS mn, value AS mx, value AS s, 1 AS c, "
+            f"value AS last FROM metric_samples WHERE {filters} AND ts >= ? "
+            "UNION ALL SELECT bucket, metric, labels, min, max, sum, count, last "
+            f"FROM metric_rollups WHERE {filters} AND bucket >= ?"
+            ") GROUP BY ALL ORDER BY metric, labels, bucket",
+            [bucket, *params, since, *params, since],
+        )
+        names = [d[0] for d in cursor.description]
+        return bucket, [dict(zip(names, r, strict=True)) for r in cursor.fetchall()]
+
+
+_metrics_store: MetricsStore | None = None
+_metrics_store_lock = threading.Lock()
+
+
+def get_metrics_store() -> MetricsStore:
+    """Get the global metrics store (bound to the global snapshot store)."""
+    global _metrics_store
+    with _metrics_store_lock:
+        store = get_snapshot_store()
+        if _metrics_store is None or _metrics_store.store is not store:
+            _metrics_store = MetricsStore(store)
+        return _metrics_store
+
+
+def record_outputs(outputs: list[CollectedOutput]) -> int:
+    """Extract and store metrics from collected outputs (failures are ignored).
+
+    Returns:
+        Number of samples written
+    """
+    if not settings.metrics_enabled:
+        return 0
+    try:
+        samples = [
+            (o.device, metric, labels, value)
+            for o in outputs
+            if o.success
+            for metric, labels, value in extract_metrics(o.command, o.output, o.records)
+        ]
+        ts = min((o.collected_at for o in outputs), default=None)
+        return get_metrics_store().append(samples, ts)
+    except Exception:
+        return 0
+
+
+def inspection_outputs(results: dict[str, list[dict[str, Any]]]) -> list[CollectedOutput]:
+    """Successful inspection results ({device: [{command, output, success}]}) as outputs.
+
+    Outputs of inventory devices are TextFSM-parsed; others (e.g. a group
+    name) keep platform "unknown" and only raw-output rules apply to them.
+    """
+    from olav.tools.smart_query import get_device_info
+
+    now = datetime.now()
+    outputs = []
+    for device, device_results in results.items():
+        try:
+            info = get_device_info(device)
+        except Exception:
+            info = None
+        platform = info["platform"] if info else "unknown"
+        for result in device_results:
+            command, output = result.get("command", ""), result.get("output") or ""
+            if not result.get("success") or not command:
+                continue
+            records = parse_output(output, platform, command) if info else None
+            outputs.append(
+                CollectedOutput(
+                    device, platform, "", command, now, True, output=output, records=records
+                )
+            )
+    return outputs
+
+
+def record_inspection_metrics(results: dict[str, list[dict[str, Any]]]) -> int:
+    """Store metrics from inspection results ({device: [{command, output, success}]}).
+
+    Devices not in the inventory are skipped; failures never affect the inspection.
+
+    Returns:
+        Number of samples written
+    """
+    if not settings.metrics_enabled:
+        return 0
+    try:
+        outputs = inspection_outputs(results)
+    except Exception:
+        return 0
+    return record_outputs([o for o in outputs if o.platform != "unknown"])
+
+
+@tool
+def metric_trend(device: str, metric: str = "", days: int = 7, labels: str = "") -> str:
+    """Show the trend of a device metric from stored inspection/snapshot samples.
+
+    Answers "CPU trend on R3 over the last 7 days" without polling the device.
+    Samples come from inspections and snapshots; older data is hourly averages.
+
+    Args:
+        device: Device name
+        metric: Metric name or prefix ("cpu", "memory_used_pct", "if_crc_errors",
+                "bgp_prefixes_received"); empty lists the device's metrics
+        days: How far back to look
+        labels: Only series whose labels contain this (e.g. "interface=Gi0/1")
+
+    Returns:
+        Markdown table per series with min/avg/max/last per time bucket
+    """
+    store = get_metrics_store()
+    if not metric:
+        rows = store.metrics(device)
+        if not rows:
+            return f"No metrics recorded for {device}."
+        lines = [f"## Metrics for {device}", "| metric | series | last | at |", "|---|---|---|---|"]
+        lines.extend(
+            f"| {name} | {series} | {value:g} | {ts:%Y-%m-%d %H:%M} |"
+            for name, series, ts, value in rows
+        )
+        return "\n".join(lines)
+
+    since = datetime.now() - timedelta(days=max(days, 1))
+    bucket, rows = store.trend(device, metric, since, labels)
+    if not rows:
+        return f"No samples of '{metric}' on {device} in the last {days} days."
+
+    series: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for row in rows:
+        series.setdefault((row["metric"], row["labels"]), []).append(row)
+    ranked = sorted(series.items(), key=lambda kv: -max(r["max"] for r in kv[1]))
+
+    step = f"{bucket // 3600}h" if bucket >= 3600 else f"{bucket // 60}m"
+    lines = [f"## {metric} on {device}, last {days} days ({step} buckets, {len(series)} series)"]
+    for (name, series_labels), points in ranked[:_MAX_SERIES]:
+        first, last = points[0], points[-1]
+        lines.append(
+            f"\n### {name}{' ' + series_labels if series_labels else ''}: "
+            f"{first['avg']:g} -> {last['last']:g} "
+            f"(min {min(p['min'] for p in points):g}, max {max(p['max'] for p in points):g})"
+        )
+        lines.append("| time | min | avg | max | last |")
+        lines.append("|---|---|---|---|---|")
+        lines.extend(
+            f"| {p['bucket']:%m-%d %H:%M} | {p['min']:g} | {p['avg']:.4g} | {p['max']:g} | "
+            f"{p['last']:g} |"
+            for p in points
+        )
+    if len(ranked) > _MAX_SERIES:
+        lines.append(f"\n{len(ranked) - _MAX_SERIES} more series (filter with labels=...)")
+
+    from olav.tools.artifact_store import offload_if_large
+
+    return offload_if_large("\n".join(lines), {"tool": "metric_trend", "command": metric})
@@ -6,9 +6,12 @@ Includes command whitelist enforcement, audit logging, and TextFSM structured pa
 Refactored: Core classes moved to network_executor.py, parsing to network_parser.py
 """
 
+import asyncio
+
 from langchain_core.tools import tool
 
 # Re-export from refactored modules for backward compatibility
+from olav.tools.artifact_store import offload_if_large
 from olav.tools.network_executor import (
     CommandExecutionResult,
     NetworkExecutor,
@@ -17,6 +20,7 @@ from olav.tools.network_executor import (
     reset_nornir,
 )
 from olav.tools.network_parser import estimate_tokens, execute_with_textfsm
+from olav.tools.tool_concurrency import read_access
 
 # Make exports available at module level
 __all__ = [
@@ -28,6 +32,7 @@ __all__ = [
     "estimate_tokens",
     "execute_with_textfsm",
     "nornir_execute",
+    "anornir_execute",
     "list_devices",
     "get_device_platform",
 ]
@@ -57,14 +62,26 @@ def nornir_execute(device: str, command: str, timeout: int = 30) -> str:
         "Port  Name  Status  Vlan..."
     """
     executor = get_executor()
-    result = executor.execute(device=device, command=command, timeout=timeout)
+    with read_access():
+        result = executor.execute(device=device, command=command, timeout=timeout)
 
     if result.success:
-        return result.output or ""
+        return offload_if_large(
+            result.output or "", {"tool": "nornir_execute", "device": device, "command": command}
+        )
     else:
         return f"Error: {result.error}"
 
 
+async def anornir_execute(device: str, command: str, timeout: int = 30) -> str:  # noqa: ASYNC109
+    """Async nornir_execute (runs on a worker thread; lets parallel tool calls overlap)."""
+    func = nornir_execute.func
+    return await asyncio.to_thread(func, device, command, timeout)  # type: ignore[arg-type]
+
+
+nornir_execute.coroutine = anornir_execute
+
+
 @tool
 def list_devices(
     role: str | None = None,
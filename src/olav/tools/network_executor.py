@@ -17,6 +17,7 @@ from pydantic import BaseModel, Field
 
 from config.settings import settings
 from olav.core.database import get_database
+from olav.tools.tool_concurrency import device_session
 
 # ============================================================================
 # P4: Nornir Connection Pool Singleton
@@ -239,12 +240,13 @@ class NetworkExecutor:
                     duration_ms=0,
                 )
 
-            # Run command
-            result: AggregatedResult = nr_filtered.run(
-                task=netmiko_send_command,
-                command_string=command,
-                read_timeout=timeout,
-            )
+            # Run command (one CLI channel per device; other devices run in parallel)
+            with device_session(device):
+                result: AggregatedResult = nr_filtered.run(
+                    task=netmiko_send_command,
+                    command_string=command,
+                    read_timeout=timeout,
+                )
 
             # Extract result
             host_result: Result = result[device]  # type: ignore[assignment]
@@ -388,15 +390,16 @@ class NetworkExecutor:
         from olav.tools.network_parser import execute_with_textfsm
 
         nr = get_nornir(str(self.nornir_config))
-        return execute_with_textfsm(
-            nr=nr,
-            device=device,
-            command=command,
-            timeout=timeout,
-            db=self.db,
-            blacklist_checker=self._is_blacklisted,
-            platform_detector=self._detect_platform,
-        )
+        with device_session(device):
+            return execute_with_textfsm(
+                nr=nr,
+                device=device,
+                command=command,
+                timeout=timeout,
+                db=self.db,
+                blacklist_checker=self._is_blacklisted,
+                platform_detector=self._detect_platform,
+            )
 
 
 # Global executor instance
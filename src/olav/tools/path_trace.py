@@ -0,0 +1,387 @@
+"""Offline path tracing over stored forwarding state.
+
+Walks a destination hop by hop through the stored state of the fleet instead
+of running traceroute and neighbor checks on every device:
+
+1. Longest-prefix match of the destination on the current device (route
+   index); ECMP routes fan the trace out into parallel branches
+2. Recursive next hops are resolved through the same device's table
+3. The next device is the owner of the next-hop address (local host routes),
+   else the LLDP/CDP neighbor on the egress interface, else unresolved (ARP
+   evidence attached)
+4. On the destination's attached subnet the ARP entry (and the access port
+   from the MAC index) is reported
+
+Every hop carries the evidence it was derived from. Devices without a stored
+routing table are collected live (routes + ARP) once per trace, so live
+commands only run for missing state.
+"""
+
+import ipaddress
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from langchain_core.tools import tool
+
+from olav.tools.endpoint_store import EndpointStore, get_endpoint_store, normalize_interface
+from olav.tools.route_store import RouteStore, get_route_store
+from olav.tools.snapshot import format_age
+from olav.tools.topology import Link, TopologyStore, get_topology_store
+
+# Hop limit per branch and cap on parallel (ECMP) branches
+MAX_HOPS = 32
+MAX_BRANCHES = 16
+# Levels of recursive next-hop resolution (BGP next hop -> IGP next hop)
+_MAX_RECURSION = 3
+_CONNECTED_PROTOCOLS = {"c", "connected", "direct", "l", "local"}
+# Terminal hop states
+_END_STATES = {"arrived", "delivered", "no_route", "no_state", "loop", "unresolved", "max_hops"}
+
+
+@dataclass
+class Hop:
+    """One forwarding decision in a traced path."""
+
+    device: str
+    status: str  # forward or one of _END_STATES
+    prefix: str | None = None
+    protocol: str | None = None
+    next_hop: str | None = None
+    interface: str | None = None
+    next_device: str | None = None
+    evidence: list[str] = field(default_factory=list)
+
+
+@dataclass
+class PathTrace:
+    """Result of tracing a destination from a source device."""
+
+    source: str
+    destination: str
+    paths: list[list[Hop]] = field(default_factory=list)
+    live_devices: list[str] = field(default_factory=list)
+    truncated: bool = False
+    elapsed_ms: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        """Whether every branch ended in an answer (not a gap in stored state)."""
+        return bool(self.paths) and all(
+            p[-1].status in ("arrived", "delivered", "no_route", "loop") for p in self.paths
+        )
+
+    @property
+    def gaps(self) -> list[Hop]:
+        """Last hops of branches that stopped for lack of state."""
+        return [p[-1] for p in self.paths if p[-1].status in ("no_state", "unresolved", "max_hops")]
+
+    def devices(self) -> list[str]:
+        """Devices on the traced paths, in first-seen order."""
+        seen: list[str] = []
+        for path in self.paths:
+            for hop in path:
+                if hop.device not in seen:
+                    seen.append(hop.device)
+        return seen
+
+
+class PathTracer:
+    """Hop-by-hop walk over the route index, ARP/MAC index and topology."""
+
+    def __init__(
+        self,
+        routes: RouteStore,
+        endpoints: EndpointStore,
+        topology: TopologyStore,
+        live: bool = True,
+    ) -> None:
+        self.routes = routes
+        self.endpoints = endpoints
+        self.topology = topology
+        self.live = live
+        self._egress_neighbors: dict[tuple[str, str], Link] = {}
+
+    def resolve_destination(self, destination: str) -> str:
+        """IP address of a destination given as an address or a device name.
+
+        Raises:
+            ValueError: If a device name has no known address
+        """
+        try:
+            return str(ipaddress.ip_address(destination.strip()))
+        except ValueError:
+            pass
+        device = self.topology.resolve(destination)
+        addresses = self.routes.local_addresses(device)
+        if not addresses:
+            raise ValueError(f"No stored address for device '{destination}'") from None
+        return addresses[0][0]
+
+    def trace(self, source: str, destination: str, vrf: str = "") -> PathTrace:
+        """Trace a destination from a source device.
+
+        Args:
+            source: Device name (or one of its addresses)
+            destination: IP address or device name
+            vrf: VRF of the source interface ("" = global table)
+
+        Returns:
+            PathTrace with one hop list per (ECMP) branch
+        """
+        started = time.perf_counter()
+        address = self.resolve_destination(destination)
+        try:
+            owners = self.routes.owners([str(ipaddress.ip_address(source.strip()))])
+            source = next(iter(owners.values()))[0] if owners else source
+        except ValueError:
+            source = self.topology.resolve(source)
+
+        result = PathTrace(source=source, destination=address)
+        dest_owners = self.routes.owners([address]).get(address, [])
+        graph = self.topology.graph()
+        self._egress_neighbors = {
+            (link.device, normalize_interface(link.interface)): link
+            for peers in graph.adjacency.values()
+            for links in peers.values()
+            for link in links
+        }
+
+        active: list[tuple[list[Hop], str]] = [([], source)]
+        tried_live: set[str] = set()
+        for _ in range(MAX_HOPS):
+            if not active:
+                break
+            devices = sorted({device for _, device in active})
+            indexed = self.routes.indexed_devices()
+            missing = [d for d in devices if d not in indexed and d not in tried_live]
+            if missing and self.live:
+                tried_live.update(missing)
+                if self._collect(missing):
+                    result.live_devices.extend(missing)
+                    indexed = self.routes.indexed_devices()
+
+            best: dict[str, list[dict[str, Any]]] = {}
+            for route in self.routes.lookup(address, devices, vrf):
+                best.setdefault(route["device"], []).append(route)
+
+            next_active: list[tuple[list[Hop], str]] = []
+            for path, device in active:
+                for hop in self._hops(
+                    device, address, vrf, best.get(device, []), indexed, dest_owners
+                ):
+                    branch = [*path, hop]
+                    if hop.status != "forward":
+                        result.paths.append(branch)
+                    elif hop.next_device in {h.device for h in branch}:
+                        branch.append(
+                            Hop(hop.next_device, "loop", evidence=["device already on this path"])
+                        )
+                        result.paths.append(branch)
+                    else:
+                        next_active.append((branch, hop.next_device))
+            if len(next_active) > MAX_BRANCHES:
+                result.truncated = True
+                next_active = next_active[:MAX_BRANCHES]
+            active = next_active
+
+        for path, device in active:
+            result.paths.append(
+                [*path, Hop(device, "max_hops", evidence=[f"over {MAX_HOPS} hops"])]
+            )
+        result.elapsed_ms = (time.perf_counter() - started) * 1000
+        return result
+
+    def _collect(self, devices: list[str]) -> bool:
+        """Collect routes and ARP live for devices without stored state."""
+        from olav.tools.snapshot import collect_snapshot
+
+        try:
+            summary = collect_snapshot(",".join(devices), ["routes", "arp"])
+        except Exception:
+            return False
+        return summary.outputs > summary.failed
+
+    def _hops(
+        self,
+        device: str,
+        address: str,
+        vrf: str,
+        routes: list[dict[str, Any]],
+        indexed: dict[str, int],
+        dest_owners: list[str],
+    ) -> list[Hop]:
+        """Forwarding decisions of one device (several for ECMP)."""
+        if device in dest_owners:
+            return [Hop(device, "arrived", evidence=[f"{address} is a local address of {device}"])]
+        if device not in indexed:
+            return [Hop(device, "no_state", evidence=["no stored routing table"])]
+        if not routes:
+            return [Hop(device, "no_route", evidence=[f"no route to {address} (incl. default)"])]
+        return [self._hop(device, address, vrf, route, dest_owners) for route in routes]
+
+    def _hop(
+        self,
+        device: str,
+        address: str,
+        vrf: str,
+        route: dict[str, Any],
+        dest_owners: list[str],
+    ) -> Hop:
+        next_hop = route["next_hop"]
+        interface = route["interface"]
+        hop = Hop(
+            device,
+            "forward",
+            prefix=route["prefix"],
+            protocol=route["protocol"],
+            next_hop=next_hop,
+            interface=interface,
+        )
+        hop.evidence.append(
+            f"route {route['prefix']} via {next_hop or 'connected'}"
+            f"{' ' + interface if interface else ''} ({route['protocol'] or '?'}, "
+            f"{format_age(route['collected_at'])} old)"
+        )
+
+        if normalize_interface(interface or "").startswith("null"):
+            hop.status = "no_route"
+            hop.evidence.append("discarded (null route)")
+            return hop
+        connected = (route["protocol"] or "").lower() in _CONNECTED_PROTOCOLS
+        if connected or not next_hop:
+            return self._deliver(hop, address, dest_owners)
+
+        # Recursive next hop (e.g. BGP): resolve through the same table
+        depth = 0
+        while not interface and depth < _MAX_RECURSION:
+            depth += 1
+            resolving = self.routes.lookup(next_hop, [device], vrf)
+            if not resolving:
+                break
+            via = resolving[0]
+            interface = via["interface"]
+            if via["next_hop"] and (via["protocol"] or "").lower() not in _CONNECTED_PROTOCOLS:
+                next_hop = via["next_hop"]
+            hop.evidence.append(
+                f"next hop resolved via {via['prefix']} -> {via['next_hop'] or interface}"
+            )
+        hop.next_hop, hop.interface = next_hop, interface
+
+        try:
+            next_hop = str(ipaddress.ip_address(next_hop))
+        except ValueError:
+            hop.status = "unresolved"
+            hop.evidence.append(f"next hop '{next_hop}' is not an address")
+            return hop
+        owners = self.routes.owners([next_hop]).get(next_hop, [])
+        peers = [o for o in owners if o != device]
+        if peers:
+            hop.next_device = peers[0]
+            hop.evidence.append(f"next hop {next_hop} is a local address of {peers[0]}")
+            return hop
+
+        link = self._egress_neighbors.get((device, normalize_interface(interface or "")))
+        if link:
+            hop.next_device = link.neighbor
+            hop.evidence.append(
+                f"neighbor on {interface}: {link.neighbor} {link.neighbor_interface or ''}".rstrip()
+            )
+            return hop
+
+        hop.status = "unresolved"
+        hop.evidence.extend(self._arp_evidence(device, next_hop))
+        hop.evidence.append(f"next hop {next_hop} is not a known device address")
+        return hop
+
+    def _deliver(self, hop: Hop, address: str, dest_owners: list[str]) -> Hop:
+        """Final hop on the destination's attached subnet."""
+        peers = [o for o in dest_owners if o != hop.device]
+        if peers:
+            hop.next_device = peers[0]
+            hop.evidence.append(f"{address} is a local address of {peers[0]} (attached subnet)")
+            return hop
+
+        hop.status = "delivered"
+        arp = self._arp_evidence(hop.device, address)
+        hop.evidence.extend(arp or [f"no ARP entry for {address} on {hop.device}"])
+        return hop
+
+    def _arp_evidence(self, device: str, address: str) -> list[str]:
+        evidence = []
+        for entry in self.endpoints.arp_by_ip([address]):
+            if entry["device"] != device:
+                continue
+            evidence.append(f"ARP {address} at {entry['mac']} on {entry['interface'] or '?'}")
+            access = [
+                e for e in self.endpoints.mac_entries([entry["mac"]]) if e["role"] == "access"
+            ]
+            evidence.extend(
+                f"host on {e['device']} {e['port']} (vlan {e['vlan']})" for e in access[:1]
+            )
+        return evidence
+
+
+def get_path_tracer(live: bool = True) -> PathTracer:
+    """Path tracer over the global route, endpoint and topology stores."""
+    return PathTracer(get_route_store(), get_endpoint_store(), get_topology_store(), live)
+
+
+def format_trace(trace: PathTrace) -> str:
+    """Markdown report of a path trace."""
+    lines = [
+        f"## Path trace {trace.source} -> {trace.destination}: {len(trace.paths)} path(s) "
+        f"({trace.elapsed_ms:.0f} ms)"
+    ]
+    for index, path in enumerate(trace.paths, 1):
+        devices = " -> ".join(hop.device for hop in path)
+        lines.append(f"\n### Path {index}: {devices} ({path[-1].status})")
+        lines.append("| hop | device | route | next hop | egress | evidence |")
+        lines.append("|---|---|---|---|---|---|")
+        lines.extend(
+            f"| {n} | {hop.device} | {hop.prefix or ''} | "
+            f"{hop.next_device or hop.next_hop or ''} | {hop.interface or ''} | "
+            f"{'; '.join(hop.evidence)} |"
+            for n, hop in enumerate(path, 1)
+        )
+    if trace.truncated:
+        lines.append(f"\nECMP fan-out truncated to {MAX_BRANCHES} branches.")
+    if trace.live_devices:
+        lines.append(f"\nCollected live (no stored state): {', '.join(trace.live_devices)}")
+    gaps = trace.gaps
+    if gaps:
+        lines.append(
+            "\nGaps (verify live): " + ", ".join(f"{hop.device} ({hop.status})" for hop in gaps)
+        )
+    return "\n".join(lines)
+
+
+@tool
+def trace_path(source: str, destination: str, vrf: str = "", live: bool = True) -> str:
+    """Trace the forwarding path from a device to a destination offline.
+
+    Walks stored routing tables (longest-prefix match), ARP and LLDP/CDP
+    topology hop by hop - including ECMP branches - and reports the path with
+    the evidence for each hop. Much faster than traceroute plus per-device
+    checks; devices without stored routes are collected live only if `live`.
+
+    Args:
+        source: Source device name
+        destination: Destination IP address or device name
+        vrf: VRF of the source ("" = global table)
+        live: Collect routes/ARP live for devices with no stored state
+
+    Returns:
+        Markdown path report with per-hop evidence and any gaps
+    """
+    tracer = get_path_tracer(live)
+    try:
+        trace = tracer.trace(source, destination, vrf)
+    except ValueError as e:
+        return f"Error: {e}"
+
+    from olav.tools.artifact_store import offload_if_large
+
+    return offload_if_large(
+        format_trace(trace), {"tool": "trace_path", "command": f"{source} -> {destination}"}
+    )
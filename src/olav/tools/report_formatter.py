@@ -5,7 +5,10 @@ based on skill frontmatter configuration.
 """
 
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from olav.tools.inspection_criteria import Verdict
 
 # Language strings for multilingual support
 LANG_STRINGS: dict[str, dict[str, str]] = {
@@ -22,6 +25,14 @@ LANG_STRINGS: dict[str, dict[str, str]] = {
         "recommendations": "Recommendations",
         "no_issues": "No issues found",
         "issues_found": "Issues Found",
+        "verdict": "Verdict",
+        "checks": "Acceptance Checks",
+        "level": "Level",
+        "criterion": "Criterion",
+        "evaluated": "Devices Evaluated",
+        "matched": "Devices Matched",
+        "examples": "Examples",
+        "manual_checks": "Not evaluated automatically (review manually)",
     },
     "zh-CN": {
         "title": "巡检报告",
@@ -36,14 +47,27 @@ LANG_STRINGS: dict[str, dict[str, str]] = {
         "recommendations": "建议",
         "no_issues": "未发现问题",
         "issues_found": "发现问题",
+        "verdict": "结论",
+        "checks": "验收检查",
+        "level": "级别",
+        "criterion": "标准",
+        "evaluated": "已评估设备",
+        "matched": "命中设备",
+        "examples": "示例",
+        "manual_checks": "未自动评估 (需人工确认)",
     },
 }
 
+_STATUS_ICONS = {"PASS": "✅", "WARNING": "⚠️", "FAIL": "❌", "N/A": "➖"}
+_MAX_EXAMPLES = 3
+_MAX_FINDINGS = 50
+
 
 def format_inspection_report(
     results: dict[str, list[dict[str, Any]]],
     skill_config: dict[str, Any],
     inspection_type: str = "Network Inspection",
+    verdict: "Verdict | None" = None,
 ) -> str:
     """Generate Markdown report based on skill output configuration.
 
@@ -56,6 +80,8 @@ def format_inspection_report(
                 - output.language: "zh-CN" | "en-US" | "auto"
                 - output.sections: list of sections to include
         inspection_type: Type of inspection (e.g., "L1-L4 Inspection", "Health Check")
+        verdict: Acceptance-criteria verdict (inspection_criteria); adds per-device
+            status, a per-check table and criteria findings to the recommendations
 
     Returns:
         Formatted report string in Markdown format.
@@ -88,11 +114,22 @@ def format_inspection_report(
     lines.append(f"**{strings['time']}**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     lines.append(f"**Type**: {inspection_type}")
     lines.append(f"**{strings['devices']}**: {len(results)}")
+    if verdict is not None:
+        counts = verdict.counts()
+        lines.append(
+            f"**{strings['verdict']}**: "
+            + " / ".join(f"{_STATUS_ICONS[s]} {s} {n}" for s, n in counts.items() if n)
+        )
     lines.append("")
 
     # Summary section
     if "summary" in sections:
-        lines.append(_format_summary(results, strings))
+        lines.append(_format_summary(results, strings, verdict))
+        lines.append("")
+
+    # Acceptance checks section
+    if verdict is not None:
+        lines.append(_format_checks(verdict, strings))
         lines.append("")
 
     # Details section
@@ -102,7 +139,7 @@ def format_inspection_report(
 
     # Recommendations section
     if "recommendations" in sections:
-        lines.append(_format_recommendations(results, strings, lang))
+        lines.append(_format_recommendations(results, strings, lang, verdict))
         lines.append("")
 
     return "\n".join(lines)
@@ -127,12 +164,17 @@ def _resolve_language(language: str) -> str:
     return language
 
 
-def _format_summary(results: dict[str, list[dict[str, Any]]], strings: dict[str, str]) -> str:
+def _format_summary(
+    results: dict[str, list[dict[str, Any]]],
+    strings: dict[str, str],
+    verdict: "Verdict | None" = None,
+) -> str:
     """Format the summary section of the report.
 
     Args:
         results: Inspection results by device
         strings: Localized strings dictionary
+        verdict: Acceptance-criteria verdict, if evaluated
 
     Returns:
         Markdown formatted summary table
@@ -140,8 +182,15 @@ def _format_summary(results: dict[str, list[dict[str, Any]]], strings: dict[str,
     lines = []
     lines.append(f"## {strings['summary']}")
     lines.append("")
-    lines.append(f"| {strings['device']} | {strings['status']} | Success | Errors |")
-    lines.append("|--------|--------|---------|--------|")
+    if verdict is not None:
+        lines.append(
+            f"| {strings['device']} | {strings['status']} | Success | Errors "
+            f"| {strings['verdict']} |"
+        )
+        lines.append("|--------|--------|---------|--------|--------|")
+    else:
+        lines.append(f"| {strings['device']} | {strings['status']} | Success | Errors |")
+        lines.append("|--------|--------|---------|--------|")
 
     total_success = 0
     total_errors = 0
@@ -160,9 +209,11 @@ def _format_summary(results: dict[str, list[dict[str, Any]]], strings: dict[str,
         else:
             status = "❌"
 
-        lines.append(
-            f"| {device} | {status} | {success_count}/{len(device_results)} | {error_count} |"
-        )
+        row = f"| {device} | {status} | {success_count}/{len(device_results)} | {error_count} |"
+        if verdict is not None:
+            device_verdict = verdict.devices.get(device, "N/A")
+            row += f" {_STATUS_ICONS[device_verdict]} {device_verdict} |"
+        lines.append(row)
 
     # Overall status
     overall_status = "✅" if total_errors == 0 else ("⚠️" if total_success > 0 else "❌")
@@ -175,6 +226,55 @@ def _format_summary(results: dict[str, list[dict[str, Any]]], strings: dict[str,
     return "\n".join(lines)
 
 
+def _format_checks(verdict: "Verdict", strings: dict[str, str]) -> str:
+    """Format the per-check status table of an acceptance-criteria verdict.
+
+    Args:
+        verdict: Acceptance-criteria verdict
+        strings: Localized strings dictionary
+
+    Returns:
+        Markdown formatted checks section
+    """
+    lines = []
+    lines.append(f"## {strings['checks']}")
+    lines.append("")
+    lines.append(
+        f"| {strings['level']} | {strings['criterion']} | {strings['status']} "
+        f"| {strings['evaluated']} | {strings['matched']} | {strings['examples']} |"
+    )
+    lines.append("|--------|--------|--------|--------|--------|--------|")
+
+    for outcome in verdict.outcomes:
+        examples = ", ".join(
+            f"{device}{_format_hit(outcome.hits[device][0])}"
+            for device in list(outcome.hits)[:_MAX_EXAMPLES]
+        )
+        lines.append(
+            f"| {outcome.check.level.upper()} | {outcome.check.text} "
+            f"| {_STATUS_ICONS[outcome.status]} {outcome.status} | {len(outcome.evaluated)} "
+            f"| {len(outcome.hits)} | {examples} |"
+        )
+
+    if verdict.manual:
+        lines.append("")
+        lines.append(f"**{strings['manual_checks']}**:")
+        lines.append("")
+        for level, text in verdict.manual:
+            lines.append(f"- {level.upper()}: {text}")
+
+    return "\n".join(lines)
+
+
+def _format_hit(hit: tuple[str, float | None]) -> str:
+    """Format a matched row as " (interface=Gi0/1: 500)"."""
+    labels, value = hit
+    shown = "" if value is None else f"{value:g}"
+    if labels and shown:
+        return f" ({labels}: {shown})"
+    return f" ({labels or shown})" if labels or shown else ""
+
+
 def _format_details(results: dict[str, list[dict[str, Any]]], strings: dict[str, str]) -> str:
     """Format the detailed results section of the report.
 
@@ -221,6 +321,7 @@ def _format_recommendations(
     results: dict[str, list[dict[str, Any]]],
     strings: dict[str, str],
     lang: str,
+    verdict: "Verdict | None" = None,
 ) -> str:
     """Generate recommendations based on inspection results.
 
@@ -228,6 +329,7 @@ def _format_recommendations(
         results: Inspection results by device
         strings: Localized strings dictionary
         lang: Language code for output
+        verdict: Acceptance-criteria verdict; FAIL/WARNING devices become issues
 
     Returns:
         Markdown formatted recommendations section
@@ -246,6 +348,18 @@ def _format_recommendations(
                 error = result.get("error", "Unknown error")
                 issues.append(f"{device}: {cmd} failed - {error}")
 
+    # Failed acceptance criteria, FAIL devices first
+    if verdict is not None:
+        flagged = sorted(
+            (d for d, s in verdict.devices.items() if s in ("FAIL", "WARNING")),
+            key=lambda d: (verdict.devices[d] != "FAIL", d),
+        )
+        for device in flagged[:_MAX_FINDINGS]:
+            reasons = "; ".join(verdict.reasons.get(device, []))
+            issues.append(f"{device} ({verdict.devices[device]}): {reasons}")
+        if len(flagged) > _MAX_FINDINGS:
+            issues.append(f"... {len(flagged) - _MAX_FINDINGS} more devices (see checks table)")
+
     if issues:
         lines.append(f"### {strings['issues_found']}: {len(issues)}")
         lines.append("")
@@ -256,10 +370,16 @@ def _format_recommendations(
         lines.append("")
         lines.append("**Suggested Actions**:")
         lines.append("")
-        lines.append("1. Review failed commands and error messages")
-        lines.append("2. Check device connectivity and credentials")
-        lines.append("3. Verify command syntax for the specific platform")
-        lines.append("4. Re-run inspection after fixing issues")
+        actions = [
+            "Review failed commands and error messages",
+            "Check device connectivity and credentials",
+            "Verify command syntax for the specific platform",
+            "Re-run inspection after fixing issues",
+        ]
+        if verdict is not None and any(s == "FAIL" for s in verdict.devices.values()):
+            actions.insert(0, "Address FAIL devices first; see the skill's troubleshooting steps")
+        for i, action in enumerate(actions, 1):
+            lines.append(f"{i}. {action}")
     else:
         lines.append(f"### {strings['no_issues']}")
         lines.append("")
@@ -269,13 +389,16 @@ def _format_recommendations(
 
 
 def format_json_report(
-    results: dict[str, list[dict[str, Any]]], skill_config: dict[str, Any]
+    results: dict[str, list[dict[str, Any]]],
+    skill_config: dict[str, Any],
+    verdict: "Verdict | None" = None,
 ) -> str:
     """Generate JSON format report.
 
     Args:
         results: Raw inspection results
         skill_config: Skill configuration
+        verdict: Acceptance-criteria verdict, if evaluated
 
     Returns:
         JSON formatted string
@@ -296,6 +419,22 @@ def format_json_report(
             "failed": len(device_results) - success_count,
             "results": device_results,
         }
+        if verdict is not None:
+            report["devices"][device]["verdict"] = verdict.devices.get(device, "N/A")
+            report["devices"][device]["reasons"] = verdict.reasons.get(device, [])
+
+    if verdict is not None:
+        report["checks"] = [
+            {
+                "level": o.check.level,
+                "criterion": o.check.text,
+                "status": o.status,
+                "evaluated": len(o.evaluated),
+                "matched": sorted(o.hits),
+            }
+            for o in verdict.outcomes
+        ]
+        report["manual_checks"] = [{"level": lv, "criterion": t} for lv, t in verdict.manual]
 
     return json.dumps(report, indent=2, ensure_ascii=False)
 
@@ -336,6 +475,7 @@ def format_report(
     results: dict[str, list[dict[str, Any]]],
     skill_config: dict[str, Any],
     inspection_type: str = "Network Inspection",
+    verdict: "Verdict | None" = None,
 ) -> str:
     """Main entry point for report formatting.
 
@@ -345,6 +485,7 @@ def format_report(
         results: Raw inspection results
         skill_config: Skill frontmatter configuration
         inspection_type: Type of inspection being performed
+        verdict: Acceptance-criteria verdict, if evaluated
 
     Returns:
         Formatted report string
@@ -353,8 +494,8 @@ def format_report(
     output_format = output_config.get("format", "markdown")
 
     if output_format == "json":
-        return format_json_report(results, skill_config)
+        return format_json_report(results, skill_config, verdict)
     elif output_format == "table":
         return format_table_report(results, skill_config)
     else:  # markdown (default)
-        return format_inspection_report(results, skill_config, inspection_type)
+        return format_inspection_report(results, skill_config, inspection_type, verdict)
@@ -3,12 +3,69 @@
 Phase 7: Cross-encoder based reranking to improve search result quality.
 Uses cross-encoder models (e.g., jina-reranker or mxbai-rerank) to score
 relevance of search results more accurately than naive ranking.
+
+Cost control:
+- The reranker is constructed once per process and reused
+- Only the first ``reranker_max_candidates`` results are scored, in batches
+- (query, chunk) scores are kept in an LRU cache across searches
+- If scoring the uncached candidates would exceed ``reranker_latency_budget_ms``
+  (estimated from previous batches), the fusion order is returned unchanged.
+  The estimate halves every ``_ESTIMATE_HALF_LIFE_S`` seconds without a new
+  measurement, so one slow batch (e.g. a cold first call) does not keep
+  reranking off for the rest of the process
 """
 
-from typing import Literal
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Literal
 
 from langchain_core.tools import tool
 
+# (reranker, query, chunk key) -> relevance score
+_score_cache: OrderedDict[tuple[str, str, str], float] = OrderedDict()
+_score_cache_lock = threading.Lock()
+
+# Moving average of scoring cost per candidate, used to enforce the latency budget
+# (updated by concurrent searches under _score_cache_lock)
+_stats: dict[str, float] = {
+    "ms_per_pair": 0.0,
+    "scored": 0,
+    "cache_hits": 0,
+    "skipped_budget": 0,
+}
+_ESTIMATE_HALF_LIFE_S = 30.0
+_measured_at = 0.0  # time.monotonic() of the last ms_per_pair update
+
+
+@lru_cache(maxsize=4)
+def _load_reranker(reranker_type: str, top_n: int) -> object | None:
+    """Construct a reranker once per (type, top_n) and reuse it.
+
+    Args:
+        reranker_type: "jina" or "mxbai"
+        top_n: Maximum documents returned per compress_documents() call
+
+    Returns:
+        Reranker instance or None if unavailable
+    """
+    try:
+        if reranker_type == "jina":
+            from langchain_community.document_compressors.jina_reranker import JinaReranker
+
+            return JinaReranker(top_n=top_n)
+        elif reranker_type == "mxbai":
+            from langchain_community.document_compressors.mxbai_rerank import MxbaiRanker
+
+            return MxbaiRanker(top_n=top_n)
+        else:
+            return None
+    except Exception:
+        # Reranker not available, return None
+        return None
+
 
 def _get_reranker() -> object | None:
     """Get cross-encoder reranker instance.
@@ -19,7 +76,7 @@ def _get_reranker() -> object | None:
     - None: Disabled (returns None)
 
     Returns:
-        Reranker instance or None if disabled
+        Cached reranker instance or None if disabled
     """
     from config.settings import settings
 
@@ -28,20 +85,97 @@ def _get_reranker() -> object | None:
     if not reranker_type or reranker_type == "none":
         return None
 
-    try:
-        if reranker_type == "jina":
-            from langchain_community.document_compressors.jina_reranker import JinaReranker
+    return _load_reranker(reranker_type, settings.reranker_batch_size)
+
+
+def _chunk_key(result: tuple) -> str:
+    """Stable cache key for a search result (title + content digest)."""
+    title, content = result[0], result[1]
+    return hashlib.sha1(f"{title}\0{content}".encode(), usedforsecurity=False).hexdigest()
 
-            return JinaReranker()
-        elif reranker_type == "mxbai":
-            from langchain_community.document_compressors.mxbai_rerank import MxbaiRanker
 
-            return MxbaiRanker()
+def _with_default_scores(results: list) -> list[tuple[str, str, str | None, float]]:
+    """Return results as (title, content, platform, score), keeping existing scores."""
+    output = []
+    for result in results:
+        if len(result) == 4:
+            # Already has score (title, content, platform, score)
+            output.append(result)
         else:
-            return None
-    except Exception:
-        # Reranker not available, return None
-        return None
+            # Add dummy score (title, content, platform)
+            title, content, platform = result[:3]
+            output.append((title, content, platform, 0.0))
+    return output
+
+
+def _cache_get(key: tuple[str, str, str]) -> float | None:
+    with _score_cache_lock:
+        score = _score_cache.get(key)
+        if score is not None:
+            _score_cache.move_to_end(key)
+        return score
+
+
+def _cache_put(key: tuple[str, str, str], score: float, max_size: int) -> None:
+    if max_size <= 0:
+        return
+    with _score_cache_lock:
+        _score_cache[key] = score
+        _score_cache.move_to_end(key)
+        while len(_score_cache) > max_size:
+            _score_cache.popitem(last=False)
+
+
+def _count(name: str, amount: int = 1) -> None:
+    with _score_cache_lock:
+        _stats[name] += amount
+
+
+def _estimated_ms_per_pair() -> float:
+    """Scoring cost estimate, decayed by the time since it was last measured."""
+    with _score_cache_lock:
+        age = time.monotonic() - _measured_at
+        return _stats["ms_per_pair"] * 0.5 ** (age / _ESTIMATE_HALF_LIFE_S)
+
+
+def _record_cost(per_pair: float, pairs: int) -> None:
+    """Fold a measured batch into the scoring cost estimate."""
+    global _measured_at
+    estimate = _estimated_ms_per_pair()
+    with _score_cache_lock:
+        _stats["ms_per_pair"] = (
+            per_pair if not _stats["scored"] else 0.7 * estimate + 0.3 * per_pair
+        )
+        _stats["scored"] += pairs
+        _measured_at = time.monotonic()
+
+
+def _score_batch(reranker: object, query: str, batch: list[tuple[str, tuple]]) -> dict[str, float]:
+    """Score one batch of (chunk key, result) pairs with a single reranker call.
+
+    Returns:
+        Mapping of chunk key -> relevance score (missing keys scored 0.0)
+    """
+    from langchain_core.documents import Document
+
+    documents = [
+        Document(
+            page_content=result[1],
+            metadata={"key": key, "title": result[0], "platform": result[2] or "unknown"},
+        )
+        for key, result in batch
+    ]
+
+    reranked = reranker.compress_documents(  # type: ignore[attr-defined]
+        documents=documents,
+        query=query,
+    )
+
+    scores = {key: 0.0 for key, _ in batch}
+    for doc in reranked:
+        # Cross-encoder returns score in metadata
+        scores[doc.metadata["key"]] = float(doc.metadata.get("relevance_score", 0.0))
+    return scores
 
 
 def rerank_search_results(
@@ -52,10 +186,15 @@ def rerank_search_results(
     """Rerank search results using cross-encoder for better relevance.
 
     Phase 7: Improves search result quality by:
-    1. Computing relevance scores using cross-encoder model
+    1. Computing relevance scores using cross-encoder model (batched, cached)
     2. Reordering results by relevance
     3. Optionally filtering low-relevance results
 
+    Only the first ``reranker_max_candidates`` results are reranked; the rest
+    follow in their original order. Pass more than ``top_k`` results (see
+    search_knowledge) so reranking can promote candidates from further down. Reranking is skipped entirely when scoring
+    the uncached candidates is expected to exceed ``reranker_latency_budget_ms``.
+
     Args:
         query: Original search query
         results: List of (title, content, platform) tuples from hybrid search
@@ -63,7 +202,7 @@ def rerank_search_results(
 
     Returns:
         Reranked results with relevance scores: (title, content, platform, score)
-        Falls back to original order if reranker unavailable
+        Falls back to original order if reranker unavailable or over budget
 
     Example:
         >>> results = [
@@ -75,62 +214,87 @@ def rerank_search_results(
         [("BGP Config", "How to configure BGP", "cisco_ios", 0.95),
          ("BGP Theory", "BGP protocol overview", "general", 0.72)]
     """
+    from config.settings import settings
+
     reranker = _get_reranker()
 
     if not reranker or not results:
         # Fall back to original order preserving existing scores
-        output = []
-        for result in results:
-            if len(result) == 4:
-                # Already has score (title, content, platform, score)
-                output.append(result)
-            else:
-                # Add dummy score (title, content, platform)
-                title, content, platform = result[:3]
-                output.append((title, content, platform, 0.0))
-        return output
+        return _with_default_scores(results)[:top_k]
+
+    reranker_type = settings.reranker_model
+    normalized_query = " ".join(query.lower().split())
+    candidates = results[: settings.reranker_max_candidates]
+    remainder = results[settings.reranker_max_candidates :]
+
+    scores: dict[str, float] = {}
+    pending: list[tuple[str, tuple]] = []
+    for result in candidates:
+        key = _chunk_key(result)
+        cached = _cache_get((reranker_type, normalized_query, key))
+        if cached is not None:
+            scores[key] = cached
+            _count("cache_hits")
+        elif key not in scores:
+            pending.append((key, result))
+
+    budget_ms = settings.reranker_latency_budget_ms
+    if pending and _estimated_ms_per_pair() * len(pending) > budget_ms:
+        _count("skipped_budget")
+        return _with_default_scores(results)[:top_k]
 
     try:
-        # Format results as documents for reranker
-        documents = [
-            {
-                "title": title,
-                "content": content,
-                "platform": platform or "unknown",
-            }
-            for title, content, platform in results
-        ]
-
-        # Rerank using cross-encoder
-        reranked = reranker.compress_documents(  # type: ignore[attr-defined]
-            documents=documents,
-            query=query,
-        )
+        started = time.perf_counter()
+        batch_size = settings.reranker_batch_size
+        for i in range(0, len(pending), batch_size):
+            batch = pending[i : i + batch_size]
+            batch_started = time.perf_counter()
+            batch_scores = _score_batch(reranker, query, batch)
+            elapsed_ms = (time.perf_counter() - batch_started) * 1000
+
+            _record_cost(elapsed_ms / len(batch), len(batch))
+
+            for key, score in batch_scores.items():
+                scores[key] = score
+                _cache_put(
+                    (reranker_type, normalized_query, key), score, settings.reranker_cache_size
+                )
+
+            # Scores computed so far stay cached, so a retry gets cheaper
+            if (time.perf_counter() - started) * 1000 > budget_ms and i + batch_size < len(pending):
+                _count("skipped_budget")
+                return _with_default_scores(results)[:top_k]
+    except Exception:
+        # Fall back to original order preserving structure
+        return _with_default_scores(results)[:top_k]
 
-        # Extract scores and reorder
-        scored_results = []
-        for doc in reranked:
-            # Cross-encoder returns score in metadata
-            score = getattr(doc, "metadata", {}).get("relevance_score", 0.0)
-            title = doc.metadata.get("title", "")
-            content = doc.metadata.get("content", "")
-            platform = doc.metadata.get("platform", None)
+    scored_results = [
+        (result[0], result[1], result[2], scores.get(_chunk_key(result), 0.0))
+        for result in candidates
+    ]
+    scored_results.sort(key=lambda r: r[3], reverse=True)
 
-            scored_results.append((title, content, platform, score))
+    # Keep only top-k
+    return (scored_results + _with_default_scores(remainder))[:top_k]
 
-        # Keep only top-k
-        return scored_results[:top_k]
 
-    except Exception:
-        # Fall back to original order preserving structure
-        output = []
-        for result in results:
-            if len(result) == 4:
-                output.append(result)
-            else:
-                title, content, platform = result[:3]
-                output.append((title, content, platform, 0.0))
-        return output
+def get_reranker_stats() -> dict[str, Any]:
+    """Return reranker cost counters (for diagnostics and tuning the budget).
+
+    Returns:
+        Dictionary with ms_per_pair, scored, cache_hits, skipped_budget, cache_size
+    """
+    estimate = _estimated_ms_per_pair()
+    with _score_cache_lock:
+        stats = dict(_stats)
+        cache_size = len(_score_cache)
+    return {**stats, "ms_per_pair": round(estimate, 2), "cache_size": cache_size}
+
+
+def clear_rerank_cache() -> None:
+    """Drop all cached (query, chunk) scores."""
+    with _score_cache_lock:
+        _score_cache.clear()
 
 
 @tool
@@ -154,29 +318,34 @@ def search_with_reranking(
         rerank: Enable reranking (default: True, falls back to no-op if unavailable)
 
     Returns:
-        Search results, reranked by relevance if enabled
+        Search results, knowledge results reranked by relevance if enabled
 
     Example:
         >>> search_with_reranking("configure BGP peering", scope="knowledge")
         "### BGP Peering (cisco_ios) [Score: 0.95]
          BGP peering configuration guide..."
     """
-    from olav.tools.capabilities import search as base_search
+    from olav.tools.capabilities import search_capabilities
+    from olav.tools.knowledge_search import search_knowledge
 
-    # Get base search results (hybrid search)
-    raw_results = base_search(  # type: ignore[misc]
-        query=query,
-        scope=scope,
-        platform=platform,
-        limit=limit,
-    )
+    results = []
+
+    if scope in ("capabilities", "all"):
+        cap_results = search_capabilities.invoke(
+            {"query": query, "type": "all", "platform": platform, "limit": limit}
+        )
+        if "No capabilities found" not in cap_results:
+            results.append("## CLI Commands & APIs\n" + cap_results)
+
+    if scope in ("knowledge", "all"):
+        know_results = search_knowledge(query, platform, limit, rerank=rerank)
+        if know_results:
+            results.append("## Documentation\n" + know_results)
 
-    if not rerank or "No results found" in raw_results:
-        return raw_results
+    if not results:
+        return f"No results found for: {query}"
 
-    # Parse results and rerank
-    # Note: This is simplified - real implementation would parse structured results
-    return raw_results
+    return "\n\n---\n\n".join(results)
 
 
 if __name__ == "__main__":
@@ -190,3 +359,4 @@ if __name__ == "__main__":
     reranked = rerank_search_results("how to configure bgp", results)
     for title, _content, platform, score in reranked:
         print(f"[{score:.2f}] {title} ({platform or 'general'})")
+    print(get_reranker_stats())
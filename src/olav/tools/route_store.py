@@ -0,0 +1,456 @@
+"""Fleet-wide routing table store with longest-prefix-match lookups.
+
+Parsed routing tables (the ``routes`` snapshot type, from take_snapshot
+sweeps or recorded smart_query route queries) are flattened into one
+``route_index`` table in the snapshot database. Every prefix is range-encoded
+as integers - first and last address split into high/low 64-bit halves, so
+IPv4 and IPv6 share the layout - which turns route questions into range
+predicates DuckDB evaluates vectorized over the whole fleet:
+
+- longest-prefix match: routes whose range contains the address/prefix,
+  keeping the longest per device (ECMP next hops all returned)
+- covering / more-specific prefixes, exact prefixes, routes via a next hop
+
+The index is refreshed incrementally: only devices whose newest route
+collection changed since the last lookup are re-encoded.
+"""
+
+import ipaddress
+import threading
+from typing import Any
+
+from langchain_core.tools import tool
+
+from olav.tools.snapshot import SnapshotStore, first_field, get_snapshot_store
+
+ROUTES_TYPE = "routes"
+
+# TextFSM field names per route attribute (templates differ by platform)
+ROUTE_FIELDS: dict[str, tuple[str, ...]] = {
+    "network": ("network", "prefix", "destination", "route"),
+    "length": ("prefix_length", "mask", "prefix_len", "netmask"),
+    "next_hop": ("nexthop_ip", "next_hop", "nexthop", "gateway", "next_hop_ip"),
+    "interface": ("nexthop_if", "interface", "outgoing_interface", "nexthop_interface"),
+    "protocol": ("protocol", "proto"),
+    "vrf": ("vrf", "vpn_instance"),
+    "distance": ("distance", "preference", "pre"),
+    "metric": ("metric", "cost"),
+}
+
+_LOW64 = (1 << 64) - 1
+
+_INDEX_COLUMNS = {
+    "device": "VARCHAR",
+    "vrf": "VARCHAR",
+    "family": "INTEGER",
+    "prefix": "VARCHAR",
+    "prefix_len": "INTEGER",
+    "start_hi": "UBIGINT",
+    "start_lo": "UBIGINT",
+    "end_hi": "UBIGINT",
+    "end_lo": "UBIGINT",
+    "protocol": "VARCHAR",
+    "next_hop": "VARCHAR",
+    "interface": "VARCHAR",
+    "distance": "VARCHAR",
+    "metric": "VARCHAR",
+    "snapshot_id": "VARCHAR",
+    "collected_at": "TIMESTAMP",
+}
+
+# Device-owned addresses (local host routes), a small side index for next-hop
+# and destination ownership lookups
+_ADDRESS_COLUMNS = {
+    "device": "VARCHAR",
+    "address": "VARCHAR",
+    "interface": "VARCHAR",
+    "family": "INTEGER",
+}
+
+_RESULT_COLUMNS = (
+    "device",
+    "vrf",
+    "prefix",
+    "protocol",
+    "next_hop",
+    "interface",
+    "distance",
+    "metric",
+    "collected_at",
+)
+
+
+def encode_prefix(
+    network: str, length: str | int | None = None
+) -> ipaddress.IPv4Network | ipaddress.IPv6Network:
+    """Parse a route's network and length into an ip_network.
+
+    Args:
+        network: "10.1.0.0", "10.1.0.0/16" or "2001:db8::"
+        length: Prefix length ("16") or dotted mask ("255.255.0.0"); ignored
+                if the network already has one
+
+    Returns:
+        Normalized network (host bits cleared)
+
+    Raises:
+        ValueError: If the address can't be parsed
+    """
+    network = network.strip()
+    if "/" not in network and length not in (None, ""):
+        network = f"{network}/{str(length).strip().lstrip('/')}"
+    return ipaddress.ip_network(network, strict=False)
+
+
+def _halves(value: int) -> tuple[int, int]:
+    return value >> 64, value & _LOW64
+
+
+def _local_address(entry: dict[str, Any]) -> dict[str, Any] | None:
+    """The device's own address if a route entry is a local host route.
+
+    Cisco lists interface addresses as "L" /32 routes, Huawei as direct /32
+    routes via 127.0.0.1.
+    """
+    if entry["prefix_len"] != (32 if entry["family"] == 4 else 128):
+        return None
+    local = str(entry["protocol"] or "").lower() in ("l", "local") or entry["next_hop"] in (
+        "127.0.0.1",
+        "::1",
+    )
+    address = entry["prefix"].split("/")[0]
+    if not local or ipaddress.ip_address(address).is_loopback:
+        return None
+    return {
+        "device": entry["device"],
+        "address": address,
+        "interface": entry["interface"],
+        "family": entry["family"],
+    }
+
+
+class RouteStore:
+    """Range-encoded route index over the snapshot database."""
+
+    def __init__(self, store: SnapshotStore) -> None:
+        self.store = store
+        self._lock = threading.Lock()
+        had_addresses = store.conn.execute(
+            "SELECT count(*) FROM information_schema.tables WHERE table_name = 'route_addresses'"
+        ).fetchone()[0]
+        for table, spec in (("route_index", _INDEX_COLUMNS), ("route_addresses", _ADDRESS_COLUMNS)):
+            columns = ", ".join(f"{name} {kind}" for name, kind in spec.items())
+            store.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+        store.conn.execute("""
+            CREATE TABLE IF NOT EXISTS route_index_sources (
+                device TEXT PRIMARY KEY,
+                snapshot_id TEXT,
+                routes INTEGER
+            )
+        """)
+        if not had_addresses:
+            # Index built before the address table existed: re-encode everything
+            store.conn.execute("DELETE FROM route_index_sources")
+
+    def refresh(self) -> int:
+        """Re-encode devices whose newest route collection changed.
+
+        Returns:
+            Number of devices re-indexed
+        """
+        conn = self.store.conn
+        with self._lock:
+            latest = self.store.latest_sources([ROUTES_TYPE])
+            indexed = dict(
+                conn.execute("SELECT device, snapshot_id FROM route_index_sources").fetchall()
+            )
+            stale = [
+                (device, sid) for (device, _), sid in latest.items() if indexed.get(device) != sid
+            ]
+            if not stale:
+                return 0
+
+            devices = [d for d, _ in stale]
+            rows = self.store.rows_for(ROUTES_TYPE, stale)
+            entries = [e for e in (self._encode(r) for r in rows) if e]
+            counts: dict[str, int] = dict.fromkeys(devices, 0)
+            for entry in entries:
+                counts[entry["device"]] += 1
+
+            placeholders = ", ".join("?" for _ in devices)
+            for table in ("route_index", "route_addresses", "route_index_sources"):
+                conn.execute(
+                    f"DELETE FROM {table} WHERE device IN ({placeholders})",  # noqa: S608
+                    devices,
+                )
+            # Clustered by device, then range start, so DuckDB's zone maps skip
+            # row groups for per-device lookups (path tracing walks device by device)
+            entries.sort(key=lambda e: (e["device"], e["family"], e["start_hi"], e["start_lo"]))
+            self.store.bulk_insert("route_index", _INDEX_COLUMNS, entries)
+            self.store.bulk_insert(
+                "route_addresses", _ADDRESS_COLUMNS, [a for a in map(_local_address, entries) if a]
+            )
+            conn.executemany(
+                "INSERT INTO route_index_sources VALUES (?, ?, ?)",
+                [(d, s, counts[d]) for d, s in stale],
+            )
+            return len(stale)
+
+    @staticmethod
+    def _encode(row: dict[str, Any]) -> dict[str, Any] | None:
+        network = first_field(row, ROUTE_FIELDS["network"])
+        if not network:
+            return None
+        try:
+            net = encode_prefix(str(network), first_field(row, ROUTE_FIELDS["length"]))
+        except ValueError:
+            return None
+        start_hi, start_lo = _halves(int(net.network_address))
+        end_hi, end_lo = _halves(int(net.broadcast_address))
+        collected = row.get("collected_at")
+        return {
+            "device": row["device"],
+            "vrf": first_field(row, ROUTE_FIELDS["vrf"]) or "",
+            "family": net.version,
+            "prefix": str(net),
+            "prefix_len": net.prefixlen,
+            "start_hi": start_hi,
+            "start_lo": start_lo,
+            "end_hi": end_hi,
+            "end_lo": end_lo,
+            "protocol": first_field(row, ROUTE_FIELDS["protocol"]),
+            "next_hop": first_field(row, ROUTE_FIELDS["next_hop"]),
+            "interface": first_field(row, ROUTE_FIELDS["interface"]),
+            "distance": first_field(row, ROUTE_FIELDS["distance"]),
+            "metric": first_field(row, ROUTE_FIELDS["metric"]),
+            "snapshot_id": row.get("snapshot_id"),
+            "collected_at": collected.isoformat(sep=" ") if collected else None,
+        }
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def _query(
+        self,
+        condition: str,
+        params: list[Any],
+        family: int,
+        devices: list[str] | None,
+        vrf: str,
+        best_only: bool,
+    ) -> list[dict[str, Any]]:
+        self.refresh()
+        where = [f"family = {family}", condition]
+        args = list(params)
+        if devices:
+            where.append(f"device IN ({', '.join('?' for _ in devices)})")
+            args.extend(devices)
+        if vrf != "*":
+            where.append("vrf = ?")
+            args.append(vrf)
+
+        columns = ", ".join(_RESULT_COLUMNS)
+        sql = f"SELECT {columns}, prefix_len FROM route_index WHERE {' AND '.join(where)}"  # noqa: S608
+        if best_only:
+            sql = (
+                f"SELECT {columns}, prefix_len FROM ({sql}) "  # noqa: S608
+                "QUALIFY prefix_len = max(prefix_len) OVER (PARTITION BY device, vrf)"
+            )
+        cursor = self.store.conn.execute(f"{sql} ORDER BY device, vrf, prefix_len DESC", args)
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, r, strict=True)) for r in cursor.fetchall()]
+
+    def lookup(
+        self, target: str, devices: list[str] | None = None, vrf: str = ""
+    ) -> list[dict[str, Any]]:
+        """Longest-prefix match of an address or prefix on each device.
+
+        Args:
+            target: "10.20.30.5" or "10.20.30.0/24"
+            devices: Restrict to these devices
+            vrf: VRF name ("" = global table, "*" = all VRFs)
+
+        Returns:
+            Best matching routes per device (several rows for ECMP)
+        """
+        return self.covering(target, devices, vrf, best_only=True)
+
+    def covering(
+        self,
+        target: str,
+        devices: list[str] | None = None,
+        vrf: str = "",
+        best_only: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Routes whose prefix contains the target (default route included)."""
+        net = encode_prefix(target)
+        s_hi, s_lo = _halves(int(net.network_address))
+        e_hi, e_lo = _halves(int(net.broadcast_address))
+        condition = (
+            "(start_hi < ? OR (start_hi = ? AND start_lo <= ?)) "
+            "AND (end_hi > ? OR (end_hi = ? AND end_lo >= ?))"
+        )
+        params = [s_hi, s_hi, s_lo, e_hi, e_hi, e_lo]
+        return self._query(condition, params, net.version, devices, vrf, best_only)
+
+    def subnets(
+        self, target: str, devices: list[str] | None = None, vrf: str = ""
+    ) -> list[dict[str, Any]]:
+        """Routes for prefixes inside the target (more-specifics included)."""
+        net = encode_prefix(target)
+        s_hi, s_lo = _halves(int(net.network_address))
+        e_hi, e_lo = _halves(int(net.broadcast_address))
+        condition = (
+            "(start_hi > ? OR (start_hi = ? AND start_lo >= ?)) "
+            "AND (end_hi < ? OR (end_hi = ? AND end_lo <= ?))"
+        )
+        params = [s_hi, s_hi, s_lo, e_hi, e_hi, e_lo]
+        return self._query(condition, params, net.version, devices, vrf, False)
+
+    def exact(
+        self, target: str, devices: list[str] | None = None, vrf: str = ""
+    ) -> list[dict[str, Any]]:
+        """Routes for exactly this prefix."""
+        net = encode_prefix(target)
+        return self._query("prefix = ?", [str(net)], net.version, devices, vrf, False)
+
+    def via_next_hop(
+        self, next_hop: str, devices: list[str] | None = None, vrf: str = "*"
+    ) -> list[dict[str, Any]]:
+        """Routes forwarding to a next-hop address."""
+        address = ipaddress.ip_address(next_hop.strip())
+        return self._query("next_hop = ?", [str(address)], address.version, devices, vrf, False)
+
+    def owners(self, addresses: list[str]) -> dict[str, list[str]]:
+        """Devices owning addresses, from their local host routes.
+
+        Args:
+            addresses: IP addresses
+
+        Returns:
+            {address: [devices]} for the addresses found
+        """
+        self.refresh()
+        normalized = [str(ipaddress.ip_address(a.strip())) for a in addresses]
+        rows = self.store.conn.execute(
+            "SELECT DISTINCT address, device FROM route_addresses "
+            "WHERE list_contains(?::VARCHAR[], address) ORDER BY device",
+            [normalized],
+        ).fetchall()
+        owners: dict[str, list[str]] = {}
+        for address, device in rows:
+            owners.setdefault(address, []).append(device)
+        return owners
+
+    def local_addresses(self, device: str) -> list[tuple[str, str | None]]:
+        """A device's own addresses (loopbacks first) with their interfaces."""
+        self.refresh()
+        rows = self.store.conn.execute(
+            "SELECT address, interface FROM route_addresses WHERE device = ? "
+            "ORDER BY NOT regexp_matches(coalesce(interface, ''), '^(lo|loopback)', 'i'), "
+            "family, address",
+            [device],
+        ).fetchall()
+        return [(address, interface) for address, interface in rows]
+
+    def indexed_devices(self) -> dict[str, int]:
+        """Indexed devices and their route counts."""
+        self.refresh()
+        rows = self.store.conn.execute(
+            "SELECT device, routes FROM route_index_sources ORDER BY device"
+        ).fetchall()
+        return dict(rows)
+
+
+_route_store: RouteStore | None = None
+_route_store_lock = threading.Lock()
+
+
+def get_route_store() -> RouteStore:
+    """Get the global route store (bound to the global snapshot store)."""
+    global _route_store
+    with _route_store_lock:
+        store = get_snapshot_store()
+        if _route_store is None or _route_store.store is not store:
+            _route_store = RouteStore(store)
+        return _route_store
+
+
+@tool
+def route_lookup(
+    target: str,
+    devices: str = "all",
+    mode: str = "lpm",
+    vrf: str = "",
+) -> str:
+    """Look up routes across all devices from stored routing tables.
+
+    Answers "which routers have a route to X and via what next hop" in one
+    call without running show ip route anywhere. Data comes from the latest
+    snapshot/route query per device (refresh with take_snapshot(data_types="routes")).
+
+    Args:
+        target: IP address or prefix ("10.20.30.5", "10.20.30.0/24"); for
+                mode="nexthop" the next-hop address
+        devices: "all", "R1,R2", "role:core", "site:lab" or "group:test"
+        mode: "lpm" (best route per device, default), "covering" (all routes
+              containing target), "subnets" (more-specifics inside target),
+              "exact" (this prefix only), "nexthop" (routes via target)
+        vrf: VRF name ("" = global table, "*" = all VRFs)
+
+    Returns:
+        Markdown table of matching routes per device
+    """
+    device_list = None
+    if devices and devices.lower() != "all":
+        from olav.tools.smart_query import resolve_device_spec
+
+        device_list, _invalid, _desc = resolve_device_spec(devices)
+        if not device_list:
+            return f"Error: No devices found matching '{devices}'"
+
+    store = get_route_store()
+    lookups = {
+        "lpm": store.lookup,
+        "covering": store.covering,
+        "subnets": store.subnets,
+        "exact": store.exact,
+        "nexthop": store.via_next_hop,
+    }
+    if mode not in lookups:
+        return f"Error: Unknown mode '{mode}' (use {', '.join(lookups)})"
+    try:
+        routes = lookups[mode](target, device_list, vrf)
+    except ValueError as e:
+        return f"Error: Invalid address '{target}': {e}"
+
+    indexed = store.indexed_devices()
+    if not indexed:
+        return "No routing tables stored. Collect them with take_snapshot(data_types='routes')."
+    scope = [d for d in (device_list or indexed) if d in indexed]
+
+    lines = [
+        f"## Routes ({mode}) for {target}: {len(routes)} routes on "
+        f"{len({r['device'] for r in routes})} of {len(scope)} devices"
+    ]
+    if routes:
+        lines.append("| device | vrf | prefix | protocol | next hop | interface | collected |")
+        lines.append("|---|---|---|---|---|---|---|")
+        lines.extend(
+            f"| {r['device']} | {r['vrf'] or '-'} | {r['prefix']} | {r['protocol'] or ''} | "
+            f"{r['next_hop'] or ''} | {r['interface'] or ''} | "
+            f"{r['collected_at']:%Y-%m-%d %H:%M} |"
+            for r in routes
+        )
+    if mode == "lpm":
+        missing = sorted(set(scope) - {r["device"] for r in routes})
+        if missing:
+            lines.append(f"\nNo route on: {', '.join(missing)}")
+    unindexed = sorted(set(device_list or []) - set(indexed))
+    if unindexed:
+        lines.append(f"No stored routing table for: {', '.join(unindexed)}")
+
+    from olav.tools.artifact_store import offload_if_large
+
+    return offload_if_large("\n".join(lines), {"tool": "route_lookup", "command": target})
@@ -0,0 +1,743 @@
+"""Scheduled inspections and snapshot collections (``olav scheduler``).
+
+Jobs come from ``schedule_jobs``: a 5-field cron expression plus either
+snapshot data types or an inspection skill, over a device spec::
+
+    "error-counters": {"cron": "*/15 * * * *", "snapshot": "counters"}
+    "core-health": {"cron": "30 2 * * *", "skill": "device-health", "devices": "role:core"}
+
+A run spreads its devices' start times over ``jitter`` seconds (a stable
+offset per device, so each device keeps its own period) and works on at most
+``schedule_max_concurrency`` devices at once across all jobs, and at most
+``schedule_site_concurrency`` per inventory site. Devices whose last good
+result is newer than the job's ``max_age`` are skipped: for snapshot jobs the
+newest successful output of every data type, whoever collected it (sweeps,
+recorded smart_query outputs); for skill jobs the last scheduled run, unless
+its verdict was FAIL or WARNING.
+
+Snapshot runs are stored as one sweep when they complete; skill runs record
+metrics, evaluate the skill's acceptance criteria and save a report to
+``agent_dir/data/reports/scheduled/``. Job and device state (next/last run,
+counts, per-device last success and verdict) is kept in
+``agent_dir/data/scheduler.json``; a restarted scheduler runs a job it
+missed once, then resumes the schedule.
+
+The scheduler and the interactive CLI can run at the same time. DuckDB lets
+one process at a time open a file, so ``olav scheduler`` opens
+capabilities.db (whitelist, audit log) and snapshots.db only around each
+read or write and closes them right after (use_short_lived_connections);
+the CLI closes them before every prompt. Either side waits up to
+``db_lock_timeout`` seconds for the other to finish.
+"""
+
+import bisect
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from config.settings import settings
+
+if TYPE_CHECKING:
+    from olav.tools.inspection_criteria import Verdict
+    from olav.tools.inspection_skill_loader import SkillDefinition
+    from olav.tools.snapshot import CollectedOutput
+
+logger = logging.getLogger(__name__)
+
+_CRON_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+# (name, lowest, highest); weekday 0 and 7 are both Sunday
+_CRON_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 7),
+)
+
+_POLL = 1.0  # Seconds between stop checks while dispatching
+_SAVE_INTERVAL = 10.0  # Minimum seconds between state writes during a run
+
+
+def _cron_field(text: str, name: str, low: int, high: int) -> frozenset[int]:
+    values: set[int] = set()
+    try:
+        for part in text.split(","):
+            body, _, step_text = part.partition("/")
+            step = int(step_text) if step_text else 1
+            if body == "*":
+                start, end = low, high
+            elif "-" in body:
+                start, end = (int(v) for v in body.split("-", 1))
+            else:
+                start = int(body)
+                end = high if step_text else start
+            if step < 1 or not low <= start <= end <= high:
+                raise ValueError
+            values.update(range(start, end + 1, step))
+    except ValueError:
+        raise ValueError(f"Invalid cron {name} field '{text}' ({low}-{high})") from None
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class CronSchedule:
+    """Parsed cron expression (minute hour day-of-month month day-of-week)."""
+
+    expression: str
+    minutes: frozenset[int]
+    hours: frozenset[int]
+    days: frozenset[int]
+    months: frozenset[int]
+    weekdays: frozenset[int]  # 0 = Sunday
+    any_day: bool = True
+    any_weekday: bool = True
+
+    @classmethod
+    def parse(cls, expression: str) -> "CronSchedule":
+        """Parse "*/15 * * * *", "30 2 * * 1-5", "0 8,20 1 * *", "@daily", ...
+
+        Raises:
+            ValueError: Malformed expression
+        """
+        fields = _CRON_ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Invalid cron expression '{expression}' (need 5 fields)")
+        minutes, hours, days, months, weekdays = (
+            _cron_field(text, *spec) for text, spec in zip(fields, _CRON_FIELDS, strict=True)
+        )
+        return cls(
+            expression,
+            minutes,
+            hours,
+            days,
+            months,
+            frozenset(d % 7 for d in weekdays),
+            fields[2].startswith("*"),
+            fields[4].startswith("*"),
+        )
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        # As in cron: with both day fields restricted, either one matches
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First matching minute after ``moment``.
+
+        Raises:
+            ValueError: No match within five years (e.g. "0 0 31 2 *")
+        """
+        current = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = current + timedelta(days=5 * 366)
+        while current < limit:
+            if current.month not in self.months:
+                current = (current.replace(day=1) + timedelta(days=32)).replace(
+                    day=1, hour=0, minute=0
+                )
+            elif not self._day_matches(current):
+                current = current.replace(hour=0, minute=0) + timedelta(days=1)
+            elif current.hour not in self.hours:
+                current = current.replace(minute=0) + timedelta(hours=1)
+            elif current.minute not in self.minutes:
+                current += timedelta(minutes=1)
+            else:
+                return current
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+
+
+@dataclass
+class ScheduledJob:
+    """One entry of ``schedule_jobs``."""
+
+    name: str
+    cron: CronSchedule
+    devices: str = "all"
+    data_types: list[str] = field(default_factory=list)  # Snapshot job
+    skill: str = ""  # Inspection skill id (skill job)
+    params: dict[str, Any] = field(default_factory=dict)
+    max_age: int = 0  # Seconds; 0 = never skip devices
+    jitter: int = 0
+
+
+def load_jobs(config: dict[str, dict[str, Any]] | None = None) -> list[ScheduledJob]:
+    """Parse job definitions (default: settings.schedule_jobs).
+
+    Args:
+        config: Job name -> {"cron", "snapshot" | "skill", "devices", "params",
+            "max_age", "jitter"}
+
+    Returns:
+        Jobs in definition order
+
+    Raises:
+        ValueError: Malformed job
+    """
+    jobs = []
+    for name, spec in (settings.schedule_jobs if config is None else config).items():
+        try:
+            if not isinstance(spec, dict) or not spec.get("cron"):
+                raise ValueError("missing cron")
+            cron = CronSchedule.parse(str(spec["cron"]))
+            snapshot, skill = spec.get("snapshot", ""), spec.get("skill", "")
+            if bool(snapshot) == bool(skill):
+                raise ValueError("set either snapshot or skill")
+            data_types: list[str] = []
+            if snapshot:
+                if snapshot == "all":
+                    data_types = list(settings.snapshot_types)
+                else:
+                    data_types = [t.strip() for t in str(snapshot).split(",") if t.strip()]
+                unknown = [t for t in data_types if t not in settings.snapshot_types]
+                if unknown:
+                    raise ValueError(f"unknown data types: {', '.join(unknown)}")
+            first = cron.next_after(datetime.now())
+            interval = int((cron.next_after(first) - first).total_seconds())
+            jitter = int(spec.get("jitter", settings.schedule_jitter))
+            jobs.append(
+                ScheduledJob(
+                    name,
+                    cron,
+                    str(spec.get("devices", "all")),
+                    data_types,
+                    str(skill),
+                    dict(spec.get("params", {})),
+                    int(spec.get("max_age", interval // 2)),
+                    # Keep a run's spread well inside the interval
+                    max(0, min(jitter, interval // 2)),
+                )
+            )
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Scheduled job '{name}': {e}") from None
+    return jobs
+
+
+def jitter_offset(job: str, device: str, jitter: int) -> int:
+    """Stable start offset of a device within a run of a job (0 .. jitter-1 s)."""
+    if jitter <= 0:
+        return 0
+    digest = hashlib.sha256(f"{job}/{device}".encode()).digest()
+    return int.from_bytes(digest[:4], "big") % jitter
+
+
+class SchedulerState:
+    """Job and device state persisted as JSON."""
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        """Load state (defaults to agent_dir/data/scheduler.json).
+
+        Args:
+            path: State file
+        """
+        if path is None:
+            path = Path(settings.agent_dir) / "data" / "scheduler.json"
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._saved = 0.0
+        self.data: dict[str, dict[str, Any]] = {"jobs": {}, "devices": {}}
+        if self.path.exists():
+            try:
+                loaded = json.loads(self.path.read_text(encoding="utf-8"))
+                self.data.update(
+                    {k: loaded[k] for k in self.data if isinstance(loaded.get(k), dict)}
+                )
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"Ignoring unreadable scheduler state {self.path}: {e}")
+
+    def job(self, name: str) -> dict[str, Any]:
+        """State of a job (copy)."""
+        with self._lock:
+            return dict(self.data["jobs"].get(name, {}))
+
+    def update_job(self, name: str, **values: Any) -> None:  # noqa: ANN401
+        with self._lock:
+            self.data["jobs"].setdefault(name, {}).update(values)
+
+    def device(self, job: str, device: str) -> dict[str, Any]:
+        """State of a device within a job (copy)."""
+        with self._lock:
+            return dict(self.data["devices"].get(job, {}).get(device, {}))
+
+    def update_device(self, job: str, device: str, **values: Any) -> None:  # noqa: ANN401
+        with self._lock:
+            self.data["devices"].setdefault(job, {}).setdefault(device, {}).update(values)
+
+    def save(self, throttle: float = 0.0) -> None:
+        """Write the state atomically.
+
+        Args:
+            throttle: Skip the write if the last one is more recent (seconds)
+        """
+        with self._lock:
+            if throttle and time.monotonic() - self._saved < throttle:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.data, indent=1, default=str), encoding="utf-8")
+            os.replace(tmp, self.path)
+            self._saved = time.monotonic()
+
+
+class _Budget:
+    """Devices in flight: a global limit and a per-site limit, shared by all jobs."""
+
+    def __init__(self, total: int, per_site: int) -> None:
+        self._cond = threading.Condition()
+        self._total = total
+        self._per_site = per_site
+        self._running = 0
+        self._sites: dict[str, int] = {}
+
+    def acquire(self, sites: list[str], timeout: float) -> int | None:
+        """Take a slot for the first of ``sites`` with room.
+
+        Returns:
+            Index into ``sites``, or None if no slot freed up within ``timeout``
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._running < self._total:
+                    for i, site in enumerate(sites):
+                        if self._sites.get(site, 0) < self._per_site:
+                            self._running += 1
+                            self._sites[site] = self._sites.get(site, 0) + 1
+                            return i
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def release(self, site: str) -> None:
+        with self._cond:
+            self._running -= 1
+            self._sites[site] -= 1
+            self._cond.notify_all()
+
+
+@dataclass
+class JobRun:
+    """Outcome of one run of a scheduled job."""
+
+    job: ScheduledJob
+    started: datetime
+    devices: int = 0  # Matched by the device spec
+    fresh: list[str] = field(default_factory=list)  # Skipped: last good result is recent
+    unsupported: list[str] = field(default_factory=list)  # No command for the platform
+    ok: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)  # device -> error
+    pending: int = 0  # Not started (scheduler stopped)
+    error: str = ""
+    duration: float = 0.0
+    snapshot_id: str = ""
+    report: str = ""
+    verdict: dict[str, str] = field(default_factory=dict)  # device -> PASS | WARNING | ...
+    # Per-device work
+    plans: dict[str, tuple[str, list[tuple[str, str]]]] = field(default_factory=dict)
+    timeout: int = 30
+    skill: "SkillDefinition | None" = None
+    params: dict[str, Any] = field(default_factory=dict)
+    outputs: list["CollectedOutput"] = field(default_factory=list)
+    results: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def status(self) -> str:
+        if self.error:
+            return "error"
+        if self.pending:
+            return "stopped"
+        return "failed" if self.failed and not self.ok else "ok"
+
+    def summary(self) -> str:
+        """One-line outcome."""
+        text = (
+            f"{self.job.name}: {self.status} | {self.devices} devices, {len(self.ok)} ok, "
+            f"{len(self.failed)} failed, {len(self.fresh)} fresh"
+        )
+        if self.unsupported:
+            text += f", {len(self.unsupported)} unsupported"
+        if self.pending:
+            text += f", {self.pending} not started"
+        text += f" | {self.duration:.0f}s"
+        if self.error:
+            text += f" | {self.error}"
+        if self.verdict:
+            counts: dict[str, int] = {}
+            for status in self.verdict.values():
+                counts[status] = counts.get(status, 0) + 1
+            text += " | " + ", ".join(f"{s} {n}" for s, n in sorted(counts.items()))
+        if self.snapshot_id:
+            text += f" | {self.snapshot_id}"
+        if self.report:
+            text += f" | {self.report}"
+        return text
+
+
+class Scheduler:
+    """Runs scheduled jobs on their cron schedules."""
+
+    def __init__(self, jobs: list[ScheduledJob], state: SchedulerState | None = None) -> None:
+        """Create a scheduler.
+
+        Args:
+            jobs: Jobs to run (see load_jobs)
+            state: Persisted state (default: agent_dir/data/scheduler.json)
+        """
+        self.jobs = {job.name: job for job in jobs}
+        self.state = state or SchedulerState()
+        self._budget = _Budget(
+            settings.schedule_max_concurrency, settings.schedule_site_concurrency
+        )
+        self._stop = threading.Event()
+        self._threads: dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Schedule loop
+    # ------------------------------------------------------------------
+
+    def next_run(self, job: ScheduledJob, now: datetime) -> datetime:
+        """Persisted next run of a job (a missed one is due now), else from its cron."""
+        saved = self.state.job(job.name)
+        if saved.get("next_run") and saved.get("cron") == job.cron.expression:
+            return datetime.fromisoformat(saved["next_run"])
+        return job.cron.next_after(now)
+
+    def run_forever(self) -> None:
+        """Start jobs when due until stop() is called."""
+        now = datetime.now()
+        due = {name: self.next_run(job, now) for name, job in self.jobs.items()}
+        for name, moment in due.items():
+            logger.info(f"Scheduled job {name}: next run {moment:%Y-%m-%d %H:%M}")
+        while not self._stop.is_set():
+            now = datetime.now()
+            for name, moment in due.items():
+                if moment <= now:
+                    self.start(name)
+                    # A run missed while stopped runs once, not once per slot
+                    due[name] = self.jobs[name].cron.next_after(now)
+                self.state.update_job(
+                    name, cron=self.jobs[name].cron.expression, next_run=due[name].isoformat()
+                )
+            self.state.save()
+            wait = min((m - datetime.now()).total_seconds() for m in due.values()) if due else 60
+            self._stop.wait(min(max(wait, 0.0), 60.0))
+        self.wait()
+
+    def start(self, name: str) -> bool:
+        """Run a job in the background unless its previous run is still going."""
+        job = self.jobs[name]
+        with self._lock:
+            thread = self._threads.get(name)
+            if thread and thread.is_alive():
+                logger.warning(f"Scheduled job {name} is still running; skipping this run")
+                self.state.update_job(name, overlaps=self.state.job(name).get("overlaps", 0) + 1)
+                return False
+            thread = threading.Thread(
+                target=self.run_job, args=(job,), name=f"olav-job-{name}", daemon=True
+            )
+            self._threads[name] = thread
+        thread.start()
+        return True
+
+    def stop(self) -> None:
+        """Stop scheduling; running jobs finish their in-flight devices."""
+        self._stop.set()
+
+    def wait(self) -> None:
+        """Wait for running jobs."""
+        with self._lock:
+            threads = list(self._threads.values())
+        for thread in threads:
+            thread.join()
+
+    # ------------------------------------------------------------------
+    # One run
+    # ------------------------------------------------------------------
+
+    def run_job(self, job: ScheduledJob) -> JobRun:
+        """Run a job now (in the calling thread).
+
+        Returns:
+            JobRun with per-device outcome
+        """
+        from olav.core.database import get_database
+        from olav.tools.snapshot import get_snapshot_store
+
+        run = JobRun(job, datetime.now())
+        logger.info(f"Scheduled job {job.name} started")
+        self.state.update_job(job.name, last_run=run.started.isoformat(), status="running")
+        self.state.save()
+        try:
+            with get_database().hold(), get_snapshot_store().hold():
+                due = self._plan(run)
+            self._dispatch(run, due)
+            with get_snapshot_store().hold():
+                self._finish(run)
+        except Exception as e:
+            logger.error(f"Scheduled job {job.name} failed: {e}")
+            run.error = str(e)
+        finally:
+            run.duration = (datetime.now() - run.started).total_seconds()
+            self.state.update_job(
+                job.name,
+                status=run.status,
+                duration_s=round(run.duration, 1),
+                devices=run.devices,
+                ok=len(run.ok),
+                failed=len(run.failed),
+                fresh=len(run.fresh),
+                error=run.error,
+                snapshot_id=run.snapshot_id,
+                report=run.report,
+            )
+            self.state.save()
+        logger.info(f"Scheduled job {run.summary()}")
+        return run
+
+    def _plan(self, run: JobRun) -> list[tuple[int, str, str]]:
+        """Resolve devices and commands, drop fresh devices.
+
+        Returns:
+            (start offset, device, site) per device to work on, by offset
+        """
+        from olav.tools.smart_query import get_device_info, resolve_device_spec
+        from olav.tools.snapshot import get_snapshot_store, snapshot_command_for
+
+        job = run.job
+        valid, _invalid, _desc = resolve_device_spec(job.devices)
+        if not valid:
+            raise ValueError(f"No devices found matching '{job.devices}'")
+        run.devices = len(valid)
+        cutoff = run.started - timedelta(seconds=job.max_age)
+
+        commands: list[tuple[str, str]] = []
+        last_success: dict[tuple[str, str], datetime] = {}
+        if job.skill:
+            from olav.tools.inspector_agent import skill_commands
+
+            run.skill = self._load_skill(job.skill)
+            run.params = {"device_group": job.devices, **job.params}
+            run.timeout = int(run.params.get("timeout", 30))
+            commands = [("", c) for c in skill_commands(run.skill, run.params)]
+            if not commands:
+                raise ValueError(f"Skill '{job.skill}' has no commands")
+        else:
+            run.timeout = settings.snapshot_command_timeout
+            last_success = get_snapshot_store().last_success(job.data_types)
+
+        resolved: dict[tuple[str, str], str | None] = {}
+        due = []
+        for device in valid:
+            info = get_device_info(device) or {}
+            platform, site = info.get("platform", "unknown"), info.get("site", "unknown")
+            if job.skill:
+                plan = commands
+                last = self.state.device(job.name, device)
+                # Devices that failed the acceptance criteria are re-inspected every run
+                fresh = (
+                    bool(last.get("last_ok"))
+                    and datetime.fromisoformat(last["last_ok"]) >= cutoff
+                    and last.get("verdict") not in ("FAIL", "WARNING")
+                )
+            else:
+                plan = []
+                for data_type in job.data_types:
+                    key = (platform, data_type)
+                    if key not in resolved:
+                        resolved[key] = snapshot_command_for(platform, data_type)
+                    if resolved[key]:
+                        plan.append((data_type, resolved[key]))
+                if not plan:
+                    run.unsupported.append(device)
+                    continue
+                fresh = all(last_success.get((device, t), datetime.min) >= cutoff for t, _ in plan)
+            if job.max_age and fresh:
+                run.fresh.append(device)
+                continue
+            run.plans[device] = (platform, plan)
+            due.append((jitter_offset(job.name, device, job.jitter), device, site))
+        return sorted(due)
+
+    def _load_skill(self, skill_id: str) -> "SkillDefinition":
+        from olav.tools.inspection_skill_loader import InspectionSkillLoader
+
+        loader = InspectionSkillLoader()
+        path = loader.skills_dir / f"{skill_id}.md"
+        skill = loader.load_skill(path) if path.exists() else None
+        if skill is None:
+            raise ValueError(f"Inspection skill '{skill_id}' not found in {loader.skills_dir}")
+        return skill
+
+    def _dispatch(self, run: JobRun, due: list[tuple[int, str, str]]) -> None:
+        """Start each device at its offset, within the global and site budgets."""
+        offsets = [offset for offset, _, _ in due]
+        pending = list(due)
+        started = time.monotonic()
+        with ThreadPoolExecutor(
+            max_workers=settings.schedule_max_concurrency,
+            thread_name_prefix=f"olav-{run.job.name}",
+        ) as pool:
+            while pending and not self._stop.is_set():
+                elapsed = time.monotonic() - started
+                ready = bisect.bisect_right(offsets, elapsed)
+                if not ready:
+                    self._stop.wait(min(offsets[0] - elapsed, _POLL))
+                    continue
+                picked = self._budget.acquire([site for _, _, site in pending[:ready]], _POLL)
+                if picked is None:
+                    continue
+                offsets.pop(picked)
+                _, device, site = pending.pop(picked)
+                pool.submit(self._work, run, device, site)
+            run.pending = len(pending)
+
+    def _work(self, run: JobRun, device: str, site: str) -> None:
+        """Run a device's commands and record the outcome."""
+        from olav.tools.network import get_executor
+        from olav.tools.snapshot import CollectedOutput, parse_output
+
+        platform, plan = run.plans[device]
+        outputs: list[CollectedOutput] = []
+        results: list[dict[str, Any]] = []
+        errors: list[str] = []
+        try:
+            executor = get_executor()
+            for data_type, command in plan:
+                collected_at = datetime.now()
+                result = executor.execute(device=device, command=command, timeout=run.timeout)
+                output = result.output or ""
+                if not result.success:
+                    errors.append(f"{command}: {result.error}")
+                if run.job.skill:
+                    results.append(
+                        {
+                            "command": command,
+                            "success": result.success,
+                            "output": output if result.success else f"Error: {result.error}",
+                        }
+                    )
+                else:
+                    outputs.append(
+                        CollectedOutput(
+                            device,
+                            platform,
+                            data_type,
+                            command,
+                            collected_at,
+                            result.success,
+                            output=output,
+                            error=result.error,
+                            records=parse_output(output, platform, command)
+                            if result.success
+                            else None,
+                        )
+                    )
+        except Exception as e:
+            errors.append(str(e))
+        finally:
+            self._budget.release(site)
+
+        with run.lock:
+            run.outputs.extend(outputs)
+            if results:
+                run.results[device] = results
+            if errors:
+                run.failed[device] = "; ".join(errors)
+            else:
+                run.ok.append(device)
+        if errors:
+            self.state.update_device(run.job.name, device, last_error="; ".join(errors))
+        else:
+            self.state.update_device(
+                run.job.name, device, last_ok=datetime.now().isoformat(), last_error=""
+            )
+        self.state.save(throttle=_SAVE_INTERVAL)
+
+    def _finish(self, run: JobRun) -> None:
+        """Store a snapshot run as one sweep; evaluate and report a skill run."""
+        if run.job.skill:
+            if not run.results or run.skill is None:
+                return
+            from olav.tools.inspection_criteria import evaluate_skill
+            from olav.tools.metrics_store import record_inspection_metrics
+
+            record_inspection_metrics(run.results)
+            verdict = evaluate_skill(run.skill, run.results, run.params)
+            run.verdict = verdict.devices
+            for device, status in verdict.devices.items():
+                self.state.update_device(run.job.name, device, verdict=status)
+            run.report = self._save_report(run, verdict)
+        elif run.outputs:
+            from olav.tools.metrics_store import record_outputs
+            from olav.tools.snapshot import get_snapshot_store
+
+            store = get_snapshot_store()
+            run.snapshot_id = store.begin_snapshot(run.job.devices, run.job.data_types)
+            store.add_outputs(run.snapshot_id, run.outputs)
+            record_outputs(run.outputs)
+            store.finish_snapshot(run.snapshot_id, len(run.ok) + len(run.failed), len(run.failed))
+
+    def _save_report(self, run: JobRun, verdict: "Verdict") -> str:
+        from olav.tools.report_formatter import format_inspection_report
+
+        skill_config = {
+            "output": {
+                "format": "markdown",
+                "language": "auto",
+                "sections": ["summary", "details", "recommendations"],
+            }
+        }
+        content = format_inspection_report(
+            results=run.results,
+            skill_config=skill_config,
+            inspection_type=f"{run.skill.name if run.skill else run.job.skill} ({run.job.name})",
+            verdict=verdict,
+        )
+        path = (
+            Path(settings.agent_dir)
+            / "data"
+            / "reports"
+            / "scheduled"
+            / f"{run.job.name}-{run.started:%Y%m%d-%H%M%S}.md"
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+        return str(path)
+
+
+def format_status(scheduler: Scheduler) -> str:
+    """Markdown table of jobs with their schedule and last run."""
+    if not scheduler.jobs:
+        return "No scheduled jobs (set schedule_jobs)."
+    now = datetime.now()
+    lines = [
+        "| job | cron | target | devices | last run | status | ok | failed | fresh | next run |",
+        "|---" * 10 + "|",
+    ]
+    for name, job in scheduler.jobs.items():
+        state = scheduler.state.job(name)
+        target = ", ".join(job.data_types) if job.data_types else f"skill {job.skill}"
+        last = state.get("last_run", "")[:16].replace("T", " ") or "-"
+        lines.append(
+            f"| {name} | `{job.cron.expression}` | {target} | {job.devices} | {last} | "
+            f"{state.get('status', '-')} | {state.get('ok', '-')} | {state.get('failed', '-')} | "
+            f"{state.get('fresh', '-')} | {scheduler.next_run(job, now):%Y-%m-%d %H:%M} |"
+        )
+    return "\n".join(lines)
@@ -3,51 +3,70 @@
 This module implements P0 optimization: combining multiple tool calls into one
 to reduce LLM decision cycles from 4-5 down to 1-2.
 
-Also implements P2: Command mapping cache to avoid repeated database lookups.
+Also implements P2: Ranked intent-to-command index (see command_index.py).
 Also implements P4: Nornir connection pool singleton.
 Also implements P5: Batch query parallelization using Nornir native parallel execution.
+Outputs can be served from a fresh-enough network snapshot (see snapshot.py).
 """
 
-from functools import lru_cache
+import asyncio
 
 from langchain_core.tools import tool
 
-from olav.core.database import get_database
+from config.settings import settings
+from olav.tools.artifact_store import offload_if_large
+from olav.tools.command_index import get_command_index
 from olav.tools.network import get_nornir
+from olav.tools.snapshot import (
+    clear_snapshot_command_cache,
+    format_age,
+    record_query_outputs,
+    snapshot_output,
+)
+from olav.tools.tool_concurrency import device_sessions, read_access
 
 # ============================================================================
-# P2: Command Mapping Cache
+# P2: Intent -> Command Index
 # ============================================================================
 
 
-@lru_cache(maxsize=50)
 def get_cached_commands(platform: str, intent: str) -> list[str]:
-    """Cache command lookups by platform and intent.
+    """Look up read-only commands for an intent, best first.
+
+    Served from the in-memory intent index built from the capabilities table,
+    so no database query is made per known intent. Natural-language intents the
+    index can't match ("who is connected to port 3") fall back to the ranked
+    keyword + semantic capability search.
 
     Args:
         platform: Device platform (e.g., "cisco_ios", "huawei_vrp")
-        intent: Query intent keyword (e.g., "interface", "bgp", "ospf")
+        intent: Query intent keyword (e.g., "interface", "bgp", "ospf", "接口")
 
     Returns:
-        List of matching command names
+        List of matching command names, ranked by relevance and output size
     """
-    db = get_database()
-    results = db.search_capabilities(
+    commands = get_command_index().lookup(platform, intent, limit=10)
+    if commands:
+        return commands
+
+    from olav.core.database import get_database
+
+    results = get_database().search_capabilities(
         query=intent,
         cap_type="command",
         platform=platform,
         limit=10,
     )
-    return [r["name"] for r in results if not r["is_write"]]
+    return [r["name"].rstrip("*").strip() for r in results if not r["is_write"]]
 
 
 def get_best_command(platform: str, intent: str) -> str | None:
     """Get the best matching command for an intent.
 
-    Priority:
-    1. Exact match with "brief" (more concise output)
-    2. Exact keyword match
-    3. First available command
+    Ranking (see CommandIndex):
+    1. Coverage of the intent's concepts (synonyms and Chinese terms included)
+    2. Specificity - fewer unrelated tokens in the command
+    3. Smaller expected output (audit history, else "brief"/"summary" wording)
 
     Args:
         platform: Device platform
@@ -57,26 +76,6 @@ def get_best_command(platform: str, intent: str) -> str | None:
         Best matching command or None
     """
     commands = get_cached_commands(platform, intent)
-
-    if not commands:
-        return None
-
-    # Prefer "brief" commands for concise output
-    for cmd in commands:
-        if "brief" in cmd.lower():
-            return cmd
-
-    # Prefer commands that start with "show" for Cisco
-    for cmd in commands:
-        if cmd.lower().startswith("show "):
-            return cmd
-
-    # Prefer commands that start with "display" for Huawei
-    for cmd in commands:
-        if cmd.lower().startswith("display "):
-            return cmd
-
-    # Return first available
     return commands[0] if commands else None
 
 
@@ -132,6 +131,7 @@ def smart_query(
     device: str,
     intent: str,
     command: str | None = None,
+    max_age: int | None = None,
 ) -> str:
     """Query network devices with automatic command selection.
 
@@ -156,6 +156,8 @@ def smart_query(
                 - By group: "group:test"
         intent: What you want to query (e.g., "interface", "bgp", "ospf", "route", "mac")
         command: Optional specific command to run (overrides auto-selection)
+        max_age: Accept snapshot output up to this many seconds old instead of
+                 running the command (0 = always live; default from settings)
 
     Returns:
         Command output with device info, or error message
@@ -176,14 +178,35 @@ def smart_query(
         >>> smart_query("all", "version")
         "## Batch Query: version (6 devices)
         [output from all devices]"
+
+        >>> smart_query("all", "version", max_age=3600)
+        "## Batch Query: version (6 devices, 6 from snapshot)
+        [stored outputs from the latest snapshot]"
     """
+    with read_access():
+        return _smart_query(device, intent, command, max_age)
+
+
+async def asmart_query(
+    device: str, intent: str, command: str | None = None, max_age: int | None = None
+) -> str:
+    """Async smart_query (runs on a worker thread; lets parallel tool calls overlap)."""
+    func = smart_query.func
+    return await asyncio.to_thread(func, device, intent, command, max_age)  # type: ignore[arg-type]
+
+
+smart_query.coroutine = asmart_query
+
+
+def _smart_query(device: str, intent: str, command: str | None, max_age: int | None) -> str:
+    """smart_query implementation (single device or batch)."""
     # Check if this is a batch query (multiple devices)
     is_batch = (
         "," in device or device.lower() == "all" or ":" in device  # role:, site:, group: filters
     )
 
     if is_batch:
-        return _batch_query_internal(device, intent, command)
+        return _batch_query_internal(device, intent, command, max_age)
 
     # Single device query
     # Step 1: Get device info
@@ -214,19 +237,39 @@ def smart_query(
                     f"vlan, mac, arp, version, config"
                 )
 
-    # Step 3: Execute command
+    # Step 3: Answer from a fresh-enough snapshot if the caller allows it
+    cached = snapshot_output(device, selected_command, max_age)
+    if cached:
+        output = offload_if_large(
+            cached["output"] or "",
+            {"tool": "smart_query", "device": device, "command": selected_command},
+        )
+        return (
+            f"## {device} ({platform}) - {intent.title()} Query\n"
+            f"**Device**: {hostname} | **Role**: {info['role']} | **Site**: {info['site']}\n"
+            f"**Command**: `{selected_command}` | **Source**: snapshot "
+            f"{cached['snapshot_id']} ({format_age(cached['collected_at'])} old)\n\n"
+            f"```\n{output}\n```"
+        )
+
+    # Step 4: Execute command
     from olav.tools.network import get_executor
 
     executor = get_executor()
     result = executor.execute(device=device, command=selected_command)
 
-    # Step 4: Format output
+    # Step 5: Format output (large outputs go to the artifact store)
     if result.success:
+        record_query_outputs(device, [(device, platform, selected_command, result.output or "")])
+        output = offload_if_large(
+            result.output or "",
+            {"tool": "smart_query", "device": device, "command": selected_command},
+        )
         return (
             f"## {device} ({platform}) - {intent.title()} Query\n"
             f"**Device**: {hostname} | **Role**: {info['role']} | **Site**: {info['site']}\n"
             f"**Command**: `{selected_command}`\n\n"
-            f"```\n{result.output}\n```"
+            f"```\n{output}\n```"
         )
     else:
         return (
@@ -236,18 +279,17 @@ def smart_query(
         )
 
 
-def _batch_query_internal(
-    devices: str,
-    intent: str,
-    command: str | None = None,
-) -> str:
-    """Internal batch query implementation.
+def resolve_device_spec(devices: str) -> tuple[list[str], list[str], str]:
+    """Expand a device specification against the inventory.
 
     Handles: "R1,R2", "all", "role:core", "site:lab", "group:test"
-    """
-    from nornir_netmiko.tasks import netmiko_send_command
 
-    # Get singleton Nornir instance
+    Args:
+        devices: Device specification
+
+    Returns:
+        (valid device names, names not in inventory, filter description)
+    """
     nr = get_nornir()
 
     filter_desc = ""
@@ -286,9 +328,6 @@ def _batch_query_internal(
         # Comma-separated device names
         device_list = [d.strip() for d in devices.split(",")]
 
-    if not device_list:
-        return f"Error: No devices found matching '{devices}'"
-
     # Validate devices exist
     valid_devices = []
     invalid_devices = []
@@ -298,6 +337,29 @@ def _batch_query_internal(
         else:
             invalid_devices.append(device)
 
+    return valid_devices, invalid_devices, filter_desc
+
+
+def _batch_query_internal(
+    devices: str,
+    intent: str,
+    command: str | None = None,
+    max_age: int | None = None,
+) -> str:
+    """Internal batch query implementation.
+
+    Handles: "R1,R2", "all", "role:core", "site:lab", "group:test"
+    """
+    from nornir_netmiko.tasks import netmiko_send_command
+
+    # Get singleton Nornir instance
+    nr = get_nornir()
+
+    valid_devices, invalid_devices, filter_desc = resolve_device_spec(devices)
+
+    if not valid_devices and not invalid_devices:
+        return f"Error: No devices found matching '{devices}'"
+
     if not valid_devices:
         return f"Error: No valid devices found. Invalid: {', '.join(invalid_devices)}"
 
@@ -305,12 +367,14 @@ def _batch_query_internal(
     # Most common case: all same platform, use same command
     platform_commands: dict[str, str] = {}
     device_commands: dict[str, str] = {}
+    platform_of: dict[str, str] = {}
 
     for device in valid_devices:
         info = get_device_info(device)
         if not info:
             continue
         platform = info["platform"]
+        platform_of[device] = platform
 
         if platform not in platform_commands:
             cmd = get_best_command(platform, intent)
@@ -328,28 +392,41 @@ def _batch_query_internal(
             f"Error: No command for intent '{intent}' on devices: {', '.join(devices_without_cmd)}"
         )
 
+    # Devices with a fresh-enough snapshot output are not queried live
+    all_results: dict[str, dict] = {}
+    for device, cmd in device_commands.items():
+        cached = snapshot_output(device, cmd, max_age)
+        if cached:
+            all_results[device] = {
+                "success": True,
+                "output": cached["output"] or "",
+                "command": cmd,
+                "snapshot": f"{cached['snapshot_id']}, {format_age(cached['collected_at'])} old",
+            }
+
     # P5: Use Nornir parallel execution
     # Group devices by command to minimize task variations
     command_devices: dict[str, list[str]] = {}
     for device, cmd in device_commands.items():
+        if device in all_results:
+            continue
         if cmd not in command_devices:
             command_devices[cmd] = []
         command_devices[cmd].append(device)
 
     # Execute in parallel per command group
-    all_results: dict[str, dict] = {}
-
     for command, cmd_devices_list in command_devices.items():
         # Filter Nornir to these devices
         # Use default argument to capture loop variable
         nr_filtered = nr.filter(filter_func=lambda h, devices=cmd_devices_list: h.name in devices)
 
         # Execute command in parallel (Nornir handles threading)
-        agg_result = nr_filtered.run(
-            task=netmiko_send_command,
-            command_string=command,
-            read_timeout=30,
-        )
+        with device_sessions(cmd_devices_list):
+            agg_result = nr_filtered.run(
+                task=netmiko_send_command,
+                command_string=command,
+                read_timeout=30,
+            )
 
         # Collect results
         for device_name, result in agg_result.items():
@@ -367,6 +444,16 @@ def _batch_query_internal(
                     "command": command,
                 }
 
+    # Live outputs of snapshot commands keep the per-device state store current
+    record_query_outputs(
+        devices,
+        [
+            (device, platform_of[device], r["command"], r["output"])
+            for device, r in all_results.items()
+            if r["success"] and "snapshot" not in r
+        ],
+    )
+
     # Format output
     results_formatted = []
     for device in valid_devices:
@@ -377,10 +464,19 @@ def _batch_query_internal(
             result = all_results[device]
             if result["success"]:
                 output = result["output"]
-                # Truncate long output for batch display
-                if len(output) > 500:
+                if settings.artifact_store_enabled:
+                    # Keep a short excerpt; the full output stays reachable by handle
+                    output = offload_if_large(
+                        output,
+                        {"tool": "smart_query", "device": device, "command": result["command"]},
+                        threshold=settings.artifact_batch_threshold_chars,
+                        head=10,
+                    )
+                elif len(output) > 500:
+                    # Truncate long output for batch display
                     output = output[:500] + "\n... (truncated)"
-                results_formatted.append(f"### {device} ({platform})\n```\n{output}\n```\n")
+                source = f" - snapshot {result['snapshot']}" if "snapshot" in result else ""
+                results_formatted.append(f"### {device} ({platform}){source}\n```\n{output}\n```\n")
             else:
                 results_formatted.append(f"### {device}\n❌ Error: {result['error']}\n")
         else:
@@ -393,6 +489,9 @@ def _batch_query_internal(
     header = f"## Batch Query: {intent} ({len(valid_devices)} devices"
     if filter_desc:
         header += f" - {filter_desc}"
+    from_snapshot = sum(1 for r in all_results.values() if "snapshot" in r)
+    if from_snapshot:
+        header += f", {from_snapshot} from snapshot"
     if invalid_devices:
         header += f", {len(invalid_devices)} not found"
     header += ")\n\n"
@@ -406,8 +505,11 @@ def _batch_query_internal(
 
 
 def clear_command_cache() -> None:
-    """Clear the command mapping cache."""
-    get_cached_commands.cache_clear()
+    """Rebuild the intent index from the capabilities table."""
+    from olav.tools.command_index import rebuild_command_index
+
+    rebuild_command_index()
+    clear_snapshot_command_cache()
 
 
 def clear_device_cache() -> None:
@@ -419,6 +521,6 @@ def clear_device_cache() -> None:
 def get_cache_stats() -> dict:
     """Get cache statistics."""
     return {
-        "command_cache": get_cached_commands.cache_info()._asdict(),
+        "command_index": get_command_index().get_stats(),
         "device_cache_size": len(_device_cache),
     }
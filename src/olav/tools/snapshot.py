@@ -0,0 +1,1061 @@
+"""Network state snapshots with offline query answering.
+
+A snapshot sweeps a configurable set of data types (``snapshot_types``:
+version, interfaces, BGP, routes, MAC, ARP, LLDP, CDP, error counters by
+default) across the inventory in one parallel Nornir run - one connection per
+device, its commands sent back to back. Results are stored in
+``agent_dir/data/snapshots.db``:
+
+- ``snapshots``: one row per sweep (scope, data types, timing, status);
+  live smart_query outputs of snapshot commands are recorded as small
+  ``query`` snapshots so the newest state per device stays current
+- ``snapshot_outputs``: raw output per (snapshot, device, data type, command)
+- ``snap_<type>``: TextFSM-parsed rows, one columnar table per data type,
+  tagged with snapshot id, device, platform and collection time. Columns are
+  the template fields and are added as new templates appear.
+
+smart_query answers from the newest matching output when the caller allows a
+staleness bound (``max_age`` / ``snapshot_max_age``), and snapshot_query turns
+fleet questions ("which devices run 15.2") into a table lookup instead of a
+live sweep.
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import uuid
+from contextlib import AbstractContextManager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import duckdb
+from langchain_core.tools import tool
+
+from config.settings import settings
+from olav.core.database import DuckDBFile
+from olav.tools.tool_concurrency import device_sessions, read_access
+
+if TYPE_CHECKING:
+    from nornir.core.task import Task
+
+# Columns every snap_<type> table starts with (parsed fields follow)
+_BASE_COLUMNS = {
+    "snapshot_id": "VARCHAR",
+    "device": "VARCHAR",
+    "platform": "VARCHAR",
+    "collected_at": "TIMESTAMP",
+    "row_num": "INTEGER",
+}
+
+_OUTPUT_COLUMNS = {
+    "snapshot_id": "VARCHAR",
+    "device": "VARCHAR",
+    "platform": "VARCHAR",
+    "data_type": "VARCHAR",
+    "command": "VARCHAR",
+    "collected_at": "TIMESTAMP",
+    "success": "BOOLEAN",
+    "error": "VARCHAR",
+    "output": "VARCHAR",
+    "parsed_rows": "INTEGER",
+}
+
+# Recorded smart_query outputs are kept this long
+_QUERY_SNAPSHOT_DAYS = 7
+
+# "field=value", "field!=value", "field~regex", "field>number", "field<number"
+_FILTER_RE = re.compile(r"^\s*([A-Za-z_][\w]*)\s*(!=|=|~|>|<)\s*(.*?)\s*$")
+
+
+def _identifier(name: str) -> str:
+    """Lowercase SQL-safe identifier for a data type or TextFSM field."""
+    ident = re.sub(r"[^a-z0-9_]+", "_", name.strip().lower()).strip("_")
+    if not ident or ident[0].isdigit():
+        ident = f"f_{ident}"
+    return ident
+
+
+def snapshot_table(data_type: str) -> str:
+    """Name of the parsed-rows table of a data type."""
+    return f"snap_{_identifier(data_type)}"
+
+
+def _field_columns(record: dict[str, Any]) -> dict[str, Any]:
+    """Map a parsed record to column values (lists joined, base names avoided)."""
+    columns: dict[str, Any] = {}
+    for key, value in record.items():
+        column = _identifier(str(key))
+        if column in _BASE_COLUMNS:
+            column = f"f_{column}"
+        if isinstance(value, list | tuple):
+            value = ",".join(str(v) for v in value)
+        columns[column] = None if value is None else str(value)
+    return columns
+
+
+def first_field(row: dict[str, Any], names: tuple[str, ...]) -> Any:  # noqa: ANN401
+    """First non-empty value among alternative field names of a parsed row.
+
+    TextFSM templates name the same attribute differently per platform
+    ("destination_address" vs "mac_address"), so indexes list alternatives.
+    """
+    for name in names:
+        value = row.get(name)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+@dataclass
+class CollectedOutput:
+    """One command result from a snapshot sweep."""
+
+    device: str
+    platform: str
+    data_type: str
+    command: str
+    collected_at: datetime
+    success: bool
+    output: str = ""
+    error: str | None = None
+    records: list[dict[str, Any]] | None = None
+
+
+@dataclass
+class SnapshotSummary:
+    """Outcome of collect_snapshot()."""
+
+    snapshot_id: str
+    devices: int
+    data_types: list[str]
+    outputs: int = 0
+    failed: int = 0
+    parsed_rows: int = 0
+    duration_ms: int = 0
+    skipped: dict[str, list[str]] = field(default_factory=dict)  # device -> data types
+
+
+class SnapshotStore:
+    """DuckDB store for snapshot outputs and per-type parsed tables."""
+
+    def __init__(self, db_path: str | Path | None = None) -> None:
+        """Open (and create) the snapshot database.
+
+        Args:
+            db_path: Database file (defaults to agent_dir/data/snapshots.db)
+        """
+        if db_path is None:
+            db_path = Path(settings.agent_dir) / "data" / "snapshots.db"
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Opened on use and released between CLI queries / scheduler writes
+        self._file = DuckDBFile(self.db_path)
+        self._schema_lock = threading.Lock()
+        self._table_columns: dict[str, set[str]] = {}
+        self._columns_generation = 0
+        with self.hold():
+            self._init_schema()
+
+    @property
+    def conn(self) -> duckdb.DuckDBPyConnection:
+        """Connection for the calling thread (other threads get a cursor)."""
+        return self._file.conn
+
+    def hold(self) -> AbstractContextManager[duckdb.DuckDBPyConnection]:
+        """Keep the database open for a unit of work (see DuckDBFile.hold)."""
+        return self._file.hold()
+
+    def _init_schema(self) -> None:
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                snapshot_id TEXT PRIMARY KEY,
+                started_at TIMESTAMP NOT NULL,
+                completed_at TIMESTAMP,
+                scope TEXT,
+                data_types TEXT,
+                devices INTEGER DEFAULT 0,
+                failed INTEGER DEFAULT 0,
+                status TEXT DEFAULT 'running'
+            )
+        """)
+        # "sweep" (take_snapshot) or "query" (recorded smart_query output)
+        self.conn.execute(
+            "ALTER TABLE snapshots ADD COLUMN IF NOT EXISTS kind TEXT DEFAULT 'sweep'"
+        )
+        columns = ", ".join(f"{name} {kind}" for name, kind in _OUTPUT_COLUMNS.items())
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS snapshot_outputs ({columns})")
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_snapout_lookup
+            ON snapshot_outputs(device, command)
+        """)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def begin_snapshot(self, scope: str, data_types: list[str], kind: str = "sweep") -> str:
+        """Register a new snapshot and return its id."""
+        prefix = "snap" if kind == "sweep" else "qry"
+        snapshot_id = f"{prefix}-{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:4]}"
+        self.conn.execute(
+            "INSERT INTO snapshots (snapshot_id, started_at, scope, data_types, kind) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [snapshot_id, datetime.now(), scope, ",".join(data_types), kind],
+        )
+        return snapshot_id
+
+    def finish_snapshot(self, snapshot_id: str, devices: int, failed: int) -> None:
+        """Mark a snapshot complete and apply retention."""
+        self.conn.execute(
+            "UPDATE snapshots SET completed_at = ?, devices = ?, failed = ?, status = ? "
+            "WHERE snapshot_id = ?",
+            [datetime.now(), devices, failed, "complete", snapshot_id],
+        )
+        self.prune(settings.snapshot_retention)
+
+    def add_outputs(self, snapshot_id: str, outputs: list[CollectedOutput]) -> int:
+        """Store raw outputs and parsed rows of a sweep.
+
+        Args:
+            snapshot_id: Snapshot the outputs belong to
+            outputs: Collected command results
+
+        Returns:
+            Number of parsed rows stored
+        """
+        raw_rows = [
+            {
+                "snapshot_id": snapshot_id,
+                "device": o.device,
+                "platform": o.platform,
+                "data_type": o.data_type,
+                "command": o.command,
+                "collected_at": o.collected_at.isoformat(sep=" "),
+                "success": o.success,
+                "error": o.error,
+                "output": o.output,
+                "parsed_rows": len(o.records) if o.records else 0,
+            }
+            for o in outputs
+        ]
+        self.bulk_insert("snapshot_outputs", _OUTPUT_COLUMNS, raw_rows)
+
+        by_type: dict[str, list[dict[str, Any]]] = {}
+        for o in outputs:
+            for row_num, record in enumerate(o.records or []):
+                by_type.setdefault(o.data_type, []).append(
+                    {
+                        "snapshot_id": snapshot_id,
+                        "device": o.device,
+                        "platform": o.platform,
+                        "collected_at": o.collected_at.isoformat(sep=" "),
+                        "row_num": row_num,
+                        **_field_columns(record),
+                    }
+                )
+
+        total = 0
+        for data_type, rows in by_type.items():
+            table = self._ensure_table(data_type, rows)
+            fields = {c: "VARCHAR" for row in rows for c in row if c not in _BASE_COLUMNS}
+            self.bulk_insert(table, {**_BASE_COLUMNS, **fields}, rows)
+            total += len(rows)
+        return total
+
+    def _ensure_table(self, data_type: str, rows: list[dict[str, Any]]) -> str:
+        """Create snap_<type> or add columns for newly seen fields."""
+        table = snapshot_table(data_type)
+        wanted = dict.fromkeys(c for row in rows for c in row)  # First-seen order
+        with self._schema_lock:
+            existing = self._columns(table)
+            if not existing:
+                columns = ", ".join(f"{name} {kind}" for name, kind in _BASE_COLUMNS.items())
+                self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+                existing.update(_BASE_COLUMNS)
+            for column in (c for c in wanted if c not in existing):
+                self.conn.execute(
+                    f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS "{column}" VARCHAR'
+                )
+                existing.add(column)
+        return table
+
+    def _columns(self, table: str) -> set[str]:
+        """Cached column names of a table (empty set if it doesn't exist)."""
+        conn = self.conn
+        if self._columns_generation != self._file.generation:
+            # Another process may have changed tables while the file was closed
+            self._table_columns.clear()
+            self._columns_generation = self._file.generation
+        if table not in self._table_columns:
+            rows = conn.execute(
+                "SELECT column_name FROM information_schema.columns WHERE table_name = ?",
+                [table],
+            ).fetchall()
+            self._table_columns[table] = {r[0] for r in rows}
+        return self._table_columns[table]
+
+    def bulk_insert(self, table: str, types: dict[str, str], rows: list[dict[str, Any]]) -> None:
+        """Load rows in one statement via newline-delimited JSON.
+
+        Row-by-row inserts are slow in DuckDB; a fleet route sweep is easily a
+        million rows.
+        """
+        if not rows:
+            return
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".json", delete=False, encoding="utf-8"
+        ) as handle:
+            for row in rows:
+                handle.write(json.dumps(row, default=str) + "\n")
+            path = handle.name
+        try:
+            names = ", ".join(f'"{c}"' for c in types)
+            spec = ", ".join(f"'{c}': '{kind}'" for c, kind in types.items())
+            source = path.replace("'", "''")
+            self.conn.execute(
+                f"INSERT INTO {table} ({names}) SELECT {names} FROM read_json("  # noqa: S608
+                f"'{source}', format = 'newline_delimited', columns = {{{spec}}})"
+            )
+        finally:
+            os.unlink(path)
+
+    def prune(self, keep: int) -> None:
+        """Delete all but the newest ``keep`` sweeps, and old query snapshots."""
+        stale = [
+            r[0]
+            for r in self.conn.execute(
+                "SELECT snapshot_id FROM snapshots WHERE kind = 'sweep' "
+                "ORDER BY started_at DESC OFFSET ?",
+                [keep],
+            ).fetchall()
+        ]
+        stale += [
+            r[0]
+            for r in self.conn.execute(
+                "SELECT snapshot_id FROM snapshots WHERE kind = 'query' AND started_at < ?",
+                [datetime.now() - timedelta(days=_QUERY_SNAPSHOT_DAYS)],
+            ).fetchall()
+        ]
+        if not stale:
+            return
+        placeholders = ", ".join("?" for _ in stale)
+        for table in ["snapshots", "snapshot_outputs", *self.data_tables()]:
+            self.conn.execute(
+                f"DELETE FROM {table} WHERE snapshot_id IN ({placeholders})",  # noqa: S608
+                stale,
+            )
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def data_tables(self) -> list[str]:
+        """Names of the per-type parsed tables."""
+        rows = self.conn.execute(
+            "SELECT table_name FROM information_schema.tables "
+            "WHERE table_name LIKE 'snap\\_%' ESCAPE '\\' ORDER BY table_name"
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def list_snapshots(self, limit: int = 10, kind: str | None = "sweep") -> list[dict[str, Any]]:
+        """Newest snapshots first (fleet sweeps only unless ``kind`` is None)."""
+        rows = self.conn.execute(
+            "SELECT snapshot_id, started_at, completed_at, scope, data_types, devices, "
+            "failed, status FROM snapshots WHERE ? IS NULL OR kind = ? "
+            "ORDER BY started_at DESC LIMIT ?",
+            [kind, kind, limit],
+        ).fetchall()
+        keys = (
+            "snapshot_id",
+            "started_at",
+            "completed_at",
+            "scope",
+            "data_types",
+            "devices",
+            "failed",
+            "status",
+        )
+        return [dict(zip(keys, row, strict=True)) for row in rows]
+
+    def latest_output(self, device: str, command: str, max_age: int) -> dict[str, Any] | None:
+        """Newest successful output of a command on a device, if fresh enough.
+
+        Args:
+            device: Inventory device name
+            command: Exact command
+            max_age: Maximum age in seconds
+
+        Returns:
+            Dict with snapshot_id, collected_at and output, or None
+        """
+        cutoff = datetime.now() - timedelta(seconds=max_age)
+        row = self.conn.execute(
+            "SELECT snapshot_id, collected_at, output FROM snapshot_outputs "
+            "WHERE device = ? AND command = ? AND success AND collected_at >= ? "
+            "ORDER BY collected_at DESC, snapshot_id DESC LIMIT 1",
+            [device, command, cutoff],
+        ).fetchone()
+        if row is None:
+            return None
+        return {"snapshot_id": row[0], "collected_at": row[1], "output": row[2]}
+
+    def last_success(self, data_types: list[str]) -> dict[tuple[str, str], datetime]:
+        """Newest successful collection per (device, data type), from any snapshot.
+
+        Args:
+            data_types: Data types to look up
+
+        Returns:
+            {(device, data_type): collected_at}
+        """
+        rows = self.conn.execute(
+            "SELECT device, data_type, max(collected_at) FROM snapshot_outputs "
+            "WHERE success AND list_contains(?::VARCHAR[], data_type) GROUP BY ALL",
+            [data_types],
+        ).fetchall()
+        return {(device, data_type): ts for device, data_type, ts in rows}
+
+    def current_rows_sql(
+        self,
+        data_type: str,
+        snapshot_id: str | None = None,
+        max_age: int | None = None,
+    ) -> tuple[str, list[Any]] | None:
+        """SQL selecting the current parsed rows of a data type.
+
+        "Current" is each device's newest successful collection (so a later
+        partial snapshot of R1 supersedes R1's rows in an older fleet sweep),
+        or exactly one snapshot when ``snapshot_id`` is given. Other engines
+        (diffs, route and MAC indexes) build on this.
+
+        Args:
+            data_type: Snapshot data type (e.g. "version", "routes")
+            snapshot_id: Pin to one snapshot
+            max_age: Ignore collections older than this many seconds
+
+        Returns:
+            (sql, params) or None if nothing was collected for the type
+        """
+        table = snapshot_table(data_type)
+        if not self._columns(table):
+            self._table_columns.pop(table, None)
+            return None
+
+        if snapshot_id:
+            return f"SELECT * FROM {table} WHERE snapshot_id = ?", [snapshot_id]  # noqa: S608
+
+        params: list[Any] = [data_type]
+        age_clause = ""
+        if max_age:
+            age_clause = " AND collected_at >= ?"
+            params.append(datetime.now() - timedelta(seconds=max_age))
+        sql = (
+            f"SELECT t.* FROM {table} t JOIN ("  # noqa: S608
+            "SELECT device, arg_max(snapshot_id, collected_at) AS snapshot_id "
+            "FROM snapshot_outputs WHERE data_type = ? AND success"
+            f"{age_clause} GROUP BY device"
+            ") latest USING (device, snapshot_id)"
+        )
+        return sql, params
+
+    def query_rows(
+        self,
+        data_type: str,
+        devices: list[str] | None = None,
+        filters: list[tuple[str, str, str]] | None = None,
+        columns: list[str] | None = None,
+        snapshot_id: str | None = None,
+        limit: int = 100,
+    ) -> tuple[list[str], list[tuple[Any, ...]], int]:
+        """Query the current parsed rows of a data type.
+
+        Args:
+            data_type: Snapshot data type
+            devices: Restrict to these devices
+            filters: (column, operator, value) with operators = != ~ > <
+            columns: Field columns to return (default: all)
+            snapshot_id: Pin to one snapshot
+            limit: Maximum rows returned
+
+        Returns:
+            (column names, rows, total matching rows)
+
+        Raises:
+            ValueError: Unknown data type or column
+        """
+        base = self.current_rows_sql(data_type, snapshot_id)
+        if base is None:
+            raise ValueError(f"No snapshot data for type '{data_type}'")
+        sql, params = base
+        available = self._columns(snapshot_table(data_type))
+
+        conditions: list[str] = []
+        if devices:
+            conditions.append(f"device IN ({', '.join('?' for _ in devices)})")
+            params.extend(devices)
+        for column, op, value in filters or []:
+            column = _identifier(column)
+            if column not in available:
+                raise ValueError(f"Unknown field '{column}' for '{data_type}'")
+            if op == "~":
+                conditions.append(f"regexp_matches(\"{column}\", ?, 'i')")
+                params.append(value)
+            elif op in (">", "<"):
+                conditions.append(f'TRY_CAST("{column}" AS DOUBLE) {op} ?')
+                params.append(float(value))
+            else:
+                sql_op = "=" if op == "=" else "<>"
+                conditions.append(f'lower(CAST("{column}" AS VARCHAR)) {sql_op} lower(?)')
+                params.append(value)
+
+        if columns:
+            selected = ["device"] + [
+                c for c in (_identifier(c) for c in columns) if c in available and c != "device"
+            ]
+        else:
+            selected = ["device", *self.fields(data_type)]
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        outer = f"FROM ({sql}) current{where}"  # noqa: S608
+        total = self.conn.execute(f"SELECT count(*) {outer}", params).fetchone()[0]  # noqa: S608
+        names = ", ".join(f'"{c}"' for c in selected)
+        rows = self.conn.execute(
+            f"SELECT {names} {outer} ORDER BY device, row_num LIMIT ?",  # noqa: S608
+            [*params, limit],
+        ).fetchall()
+        return selected, rows, total
+
+    def rows_for(self, data_type: str, sources: list[tuple[str, str]]) -> list[dict[str, Any]]:
+        """Parsed rows of specific (device, snapshot_id) collections.
+
+        Args:
+            data_type: Snapshot data type
+            sources: (device, snapshot_id) pairs, e.g. each device's newest collection
+
+        Returns:
+            Rows as column -> value dicts (empty if the type has no parsed table)
+        """
+        table = snapshot_table(data_type)
+        if not sources:
+            return []
+        if not self._columns(table):
+            self._table_columns.pop(table, None)
+            return []
+        cursor = self.conn.execute(
+            f"SELECT t.* FROM {table} t JOIN ("  # noqa: S608
+            "SELECT unnest(?::VARCHAR[]) AS device, unnest(?::VARCHAR[]) AS snapshot_id"
+            ") s USING (device, snapshot_id) ORDER BY device, row_num",
+            [[d for d, _ in sources], [s for _, s in sources]],
+        )
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, r, strict=True)) for r in cursor.fetchall()]
+
+    def latest_sources(self, data_types: list[str]) -> dict[tuple[str, str], str]:
+        """Newest successful collection per (device, data type).
+
+        Returns:
+            {(device, data_type): snapshot_id}
+        """
+        rows = self.conn.execute(
+            "SELECT device, data_type, arg_max(snapshot_id, collected_at) "
+            "FROM snapshot_outputs WHERE success AND list_contains(?::VARCHAR[], data_type) "
+            "GROUP BY device, data_type",
+            [data_types],
+        ).fetchall()
+        return {(device, data_type): sid for device, data_type, sid in rows}
+
+    def fields(self, data_type: str) -> list[str]:
+        """Parsed field columns of a data type, in definition order."""
+        rows = self.conn.execute(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_name = ? ORDER BY ordinal_position",
+            [snapshot_table(data_type)],
+        ).fetchall()
+        return [r[0] for r in rows if r[0] not in _BASE_COLUMNS]
+
+    def export_parquet(self, snapshot_id: str, directory: str | Path) -> list[Path]:
+        """Write one Parquet file per data type for a snapshot.
+
+        Args:
+            snapshot_id: Snapshot to export
+            directory: Target directory
+
+        Returns:
+            Written file paths
+        """
+        target = Path(directory)
+        target.mkdir(parents=True, exist_ok=True)
+        written = []
+        for table in ["snapshot_outputs", *self.data_tables()]:
+            path = target / f"{snapshot_id}-{table}.parquet"
+            escaped = str(path).replace("'", "''")
+            self.conn.execute(
+                f"COPY (SELECT * FROM {table} WHERE snapshot_id = ?) "  # noqa: S608
+                f"TO '{escaped}' (FORMAT PARQUET)",
+                [snapshot_id],
+            )
+            written.append(path)
+        return written
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._file.close()
+
+
+_store: SnapshotStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """Get the global snapshot store (created on first use)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SnapshotStore()
+        return _store
+
+
+def reset_snapshot_store() -> None:
+    """Close and forget the global snapshot store."""
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+        _store = None
+
+
+# ============================================================================
+# Collection
+# ============================================================================
+
+
+def parse_output(output: str, platform: str, command: str) -> list[dict[str, Any]] | None:
+    """TextFSM-parse an output; None if no template matched."""
+    if not settings.execution.use_textfsm:
+        return None
+    try:
+        from netmiko.utilities import get_structured_data
+
+        parsed = get_structured_data(output, platform=platform, command=command)
+    except Exception:
+        return None
+    if isinstance(parsed, list) and all(isinstance(r, dict) for r in parsed):
+        return parsed
+    return None
+
+
+def _spec_for(platform: str, data_type: str) -> str | None:
+    """Intent or command configured for a data type on a platform."""
+    spec = settings.snapshot_types.get(data_type)
+    if isinstance(spec, dict):
+        return spec.get(platform)
+    return spec
+
+
+def _words(text: str) -> set[str]:
+    """Lowercase words of a command or intent, plural "s" dropped."""
+    return {w.removesuffix("s") for w in re.findall(r"[a-z0-9]+", text.lower())}
+
+
+def _resolve_command(platform: str, spec: str) -> str | None:
+    """Whitelisted command for a snapshot type on a platform.
+
+    A command matched from an intent must contain every word of the intent
+    (singular/plural aside), so "lldp neighbors" never falls back to a bare
+    "show lldp".
+
+    Args:
+        platform: Device platform
+        spec: Intent, or a literal "show ..."/"display ..." command
+
+    Returns:
+        Command, or None if none matches or it is not whitelisted
+    """
+    from olav.core.database import get_database
+    from olav.tools.smart_query import get_best_command
+
+    if re.match(r"^(show|display)\s", spec, re.IGNORECASE):
+        command: str | None = spec
+    else:
+        command = get_best_command(platform, spec)
+        if command and not _words(spec) <= _words(command):
+            return None
+    if command and not get_database().is_command_allowed(command, platform):
+        return None
+    return command
+
+
+def _collect_host(
+    task: "Task", plan: dict[str, list[tuple[str, str]]], timeout: int
+) -> list[CollectedOutput]:
+    """Nornir task: run a host's snapshot commands over one Netmiko session."""
+    host = task.host
+    platform = host.platform or "unknown"
+    connection = host.get_connection("netmiko", task.nornir.config)
+    outputs: list[CollectedOutput] = []
+    for data_type, command in plan[host.name]:
+        collected_at = datetime.now()
+        try:
+            output = str(connection.send_command(command, read_timeout=timeout))
+        except Exception as e:
+            outputs.append(
+                CollectedOutput(
+                    host.name, platform, data_type, command, collected_at, False, error=str(e)
+                )
+            )
+            continue
+        outputs.append(
+            CollectedOutput(
+                host.name,
+                platform,
+                data_type,
+                command,
+                collected_at,
+                True,
+                output=output,
+                records=parse_output(output, platform, command),
+            )
+        )
+    return outputs
+
+
+def collect_snapshot(
+    devices: str = "all",
+    data_types: list[str] | None = None,
+) -> SnapshotSummary:
+    """Collect a snapshot across devices in one parallel sweep.
+
+    Args:
+        devices: Device spec as in smart_query ("all", "R1,R2", "role:core", ...)
+        data_types: Subset of settings.snapshot_types (default: all of them)
+
+    Returns:
+        SnapshotSummary
+
+    Raises:
+        ValueError: No devices matched or unknown data type
+    """
+    from olav.tools.metrics_store import record_outputs
+    from olav.tools.network import get_nornir
+    from olav.tools.smart_query import get_device_info, resolve_device_spec
+
+    started = datetime.now()
+    types = settings.snapshot_types
+    selected = data_types or list(types)
+    unknown = [t for t in selected if t not in types]
+    if unknown:
+        raise ValueError(f"Unknown data types: {', '.join(unknown)} (known: {', '.join(types)})")
+
+    valid, _invalid, _desc = resolve_device_spec(devices)
+    if not valid:
+        raise ValueError(f"No devices found matching '{devices}'")
+
+    # Resolve each type's command once per platform
+    plan: dict[str, list[tuple[str, str]]] = {}
+    skipped: dict[str, list[str]] = {}
+    platform_commands: dict[tuple[str, str], str | None] = {}
+    for device in valid:
+        info = get_device_info(device)
+        platform = info["platform"] if info else "unknown"
+        for data_type in selected:
+            key = (platform, data_type)
+            if key not in platform_commands:
+                spec = _spec_for(platform, data_type)
+                platform_commands[key] = _resolve_command(platform, spec) if spec else None
+            command = platform_commands[key]
+            if command:
+                plan.setdefault(device, []).append((data_type, command))
+            else:
+                skipped.setdefault(device, []).append(data_type)
+
+    store = get_snapshot_store()
+    snapshot_id = store.begin_snapshot(devices, selected)
+    summary = SnapshotSummary(snapshot_id, len(valid), selected, skipped=skipped)
+
+    outputs: list[CollectedOutput] = []
+    if plan:
+        nr = get_nornir().filter(filter_func=lambda h: h.name in plan)
+        with device_sessions(plan):
+            results = nr.run(
+                task=_collect_host,
+                plan=plan,
+                timeout=settings.snapshot_command_timeout,
+                name="olav_snapshot",
+            )
+        for device, multi in results.items():
+            if multi.failed:
+                error = str(multi.exception) if multi.exception else "Unknown error"
+                info = get_device_info(device)
+                platform = info["platform"] if info else "unknown"
+                outputs.extend(
+                    CollectedOutput(device, platform, t, c, started, False, error=error)
+                    for t, c in plan[device]
+                )
+            else:
+                outputs.extend(multi[0].result)
+
+    summary.outputs = len(outputs)
+    summary.failed = sum(1 for o in outputs if not o.success)
+    summary.parsed_rows = store.add_outputs(snapshot_id, outputs)
+    record_outputs(outputs)
+    failed_devices = len({o.device for o in outputs if not o.success})
+    store.finish_snapshot(snapshot_id, len(valid), failed_devices)
+    summary.duration_ms = int((datetime.now() - started).total_seconds() * 1000)
+    return summary
+
+
+_command_types: dict[str, dict[str, str]] = {}  # platform -> command -> data type
+_command_types_lock = threading.Lock()
+
+
+def snapshot_type_for(platform: str, command: str) -> str | None:
+    """Snapshot data type a command collects on a platform, if any."""
+    with _command_types_lock:
+        mapping = _command_types.get(platform)
+    if mapping is None:
+        mapping = {}
+        for data_type in settings.snapshot_types:
+            spec = _spec_for(platform, data_type)
+            resolved = _resolve_command(platform, spec) if spec else None
+            if resolved:
+                mapping.setdefault(resolved, data_type)
+        with _command_types_lock:
+            _command_types[platform] = mapping
+    return mapping.get(command.strip())
+
+
+def snapshot_command_for(platform: str, data_type: str) -> str | None:
+    """Command collecting a snapshot data type on a platform, if any."""
+    spec = _spec_for(platform, data_type)
+    return _resolve_command(platform, spec) if spec else None
+
+
+def clear_snapshot_command_cache() -> None:
+    """Forget resolved snapshot commands (after a capability reload)."""
+    with _command_types_lock:
+        _command_types.clear()
+
+
+def record_query_outputs(scope: str, results: list[tuple[str, str, str, str]]) -> None:
+    """Record live outputs of snapshot commands as a ``query`` snapshot.
+
+    Keeps the per-device newest state (route, MAC/ARP and neighbor indexes)
+    current from ordinary smart_query use between sweeps. Outputs of commands
+    that aren't snapshot commands are ignored; failures never affect the query.
+
+    Args:
+        scope: Device spec of the query
+        results: (device, platform, command, output) of successful executions
+    """
+    if not settings.snapshot_record_queries:
+        return
+    try:
+        outputs = []
+        for device, platform, command, output in results:
+            data_type = snapshot_type_for(platform, command)
+            if data_type:
+                outputs.append(
+                    CollectedOutput(
+                        device,
+                        platform,
+                        data_type,
+                        command,
+                        datetime.now(),
+                        True,
+                        output=output,
+                        records=parse_output(output, platform, command),
+                    )
+                )
+        if not outputs:
+            return
+        store = get_snapshot_store()
+        types = sorted({o.data_type for o in outputs})
+        snapshot_id = store.begin_snapshot(scope, types, kind="query")
+        store.add_outputs(snapshot_id, outputs)
+        store.finish_snapshot(snapshot_id, len({o.device for o in outputs}), 0)
+
+        from olav.tools.metrics_store import record_outputs
+
+        record_outputs(outputs)
+    except Exception:
+        return
+
+
+def snapshot_output(device: str, command: str, max_age: int | None = None) -> dict | None:
+    """Snapshot output usable instead of running a command live.
+
+    Args:
+        device: Inventory device name
+        command: Command that would be executed
+        max_age: Staleness bound in seconds (default: settings.snapshot_max_age; 0 = never)
+
+    Returns:
+        Dict with snapshot_id, collected_at and output, or None
+    """
+    max_age = settings.snapshot_max_age if max_age is None else max_age
+    if max_age <= 0:
+        return None
+    try:
+        return get_snapshot_store().latest_output(device, command, max_age)
+    except duckdb.Error:
+        return None
+
+
+def format_age(collected_at: datetime) -> str:
+    """Human-readable age of a collection time ("42s", "12m", "3h")."""
+    seconds = max(0, int((datetime.now() - collected_at).total_seconds()))
+    if seconds < 120:
+        return f"{seconds}s"
+    if seconds < 7200:
+        return f"{seconds // 60}m"
+    return f"{seconds // 3600}h"
+
+
+def parse_filters(where: str) -> list[tuple[str, str, str]]:
+    """Parse "field=value, field~regex" filter expressions.
+
+    Raises:
+        ValueError: If a term is malformed
+    """
+    filters = []
+    for term in (t for t in where.split(",") if t.strip()):
+        match = _FILTER_RE.match(term)
+        if not match:
+            raise ValueError(f"Invalid filter '{term.strip()}' (use field=value, field~regex)")
+        filters.append((match.group(1), match.group(2), match.group(3)))
+    return filters
+
+
+# ============================================================================
+# Tools
+# ============================================================================
+
+
+@tool
+def take_snapshot(devices: str = "all", data_types: str = "") -> str:
+    """Collect a network state snapshot across devices in one parallel sweep.
+
+    Runs the configured snapshot commands (version, interfaces, BGP, routes,
+    MAC, ARP, LLDP) on every matching device and stores raw and parsed
+    results. Afterwards snapshot_query answers fleet questions without
+    touching the devices, and smart_query can reuse the outputs.
+
+    Args:
+        devices: "all", "R1,R2", "role:core", "site:lab" or "group:test"
+        data_types: Comma-separated subset of data types (default: all)
+
+    Returns:
+        Snapshot id and collection summary
+    """
+    types = [t.strip() for t in data_types.split(",") if t.strip()] or None
+    try:
+        with read_access():
+            summary = collect_snapshot(devices, types)
+    except ValueError as e:
+        return f"Error: {e}"
+
+    lines = [
+        f"## Snapshot {summary.snapshot_id}",
+        f"- Devices: {summary.devices} | Data types: {', '.join(summary.data_types)}",
+        f"- Outputs: {summary.outputs} ({summary.failed} failed) | "
+        f"Parsed rows: {summary.parsed_rows} | Duration: {summary.duration_ms / 1000:.1f}s",
+    ]
+    if summary.skipped:
+        skipped = "; ".join(f"{d}: {', '.join(t)}" for d, t in sorted(summary.skipped.items()))
+        lines.append(f"- No command for: {skipped}")
+    return "\n".join(lines)
+
+
+@tool
+def snapshot_query(
+    data_type: str = "",
+    devices: str = "all",
+    where: str = "",
+    columns: str = "",
+    snapshot_id: str = "",
+    limit: int = 100,
+) -> str:
+    """Answer fleet questions from stored snapshots instead of live commands.
+
+    Uses each device's newest collection (or one pinned snapshot). Call with
+    no data_type to list snapshots, data types and their fields.
+
+    Args:
+        data_type: Snapshot data type (e.g. "version", "interfaces", "bgp", "routes")
+        devices: "all", "R1,R2", "role:core", "site:lab" or "group:test"
+        where: Comma-separated filters: field=value, field!=value, field~regex,
+               field>number, field<number (e.g. "version~^15\\.2")
+        columns: Comma-separated fields to return (default: all)
+        snapshot_id: Query one specific snapshot
+        limit: Maximum rows (max 1000)
+
+    Returns:
+        Markdown table of matching rows
+
+    Examples:
+        >>> snapshot_query("version", where="version~^15\\.2", columns="version,hardware")
+        >>> snapshot_query("bgp", where="state_pfxrcd!=Established")
+    """
+    try:
+        store = get_snapshot_store()
+    except duckdb.Error as e:
+        return f"Error: Snapshot store unavailable: {e}"
+
+    if not data_type:
+        snapshots = store.list_snapshots()
+        if not snapshots:
+            return "No snapshots yet. Collect one with take_snapshot."
+        lines = [
+            "## Snapshots",
+            "| id | started | devices | failed | data types |",
+            "|---|---|---|---|---|",
+        ]
+        lines.extend(
+            f"| {s['snapshot_id']} | {s['started_at']:%Y-%m-%d %H:%M} | {s['devices']} | "
+            f"{s['failed']} | {s['data_types']} |"
+            for s in snapshots
+        )
+        lines.append("\n## Fields")
+        for table in store.data_tables():
+            data_type = table.removeprefix("snap_")
+            lines.append(f"- {data_type}: {', '.join(store.fields(data_type))}")
+        return "\n".join(lines)
+
+    device_list = None
+    if devices and devices.lower() != "all":
+        from olav.tools.smart_query import resolve_device_spec
+
+        device_list, _invalid, _desc = resolve_device_spec(devices)
+        if not device_list:
+            return f"Error: No devices found matching '{devices}'"
+
+    try:
+        names, rows, total = store.query_rows(
+            data_type,
+            devices=device_list,
+            filters=parse_filters(where),
+            columns=[c.strip() for c in columns.split(",") if c.strip()] or None,
+            snapshot_id=snapshot_id or None,
+            limit=max(1, min(limit, 1000)),
+        )
+    except ValueError as e:
+        return f"Error: {e}"
+    except duckdb.Error as e:
+        return f"Error: Query failed: {e}"
+
+    if not rows:
+        return f"No {data_type} rows match" + (f" '{where}'" if where else "")
+
+    shown = f"{len(rows)} of {total}" if total > len(rows) else str(total)
+    header = f"## Snapshot {data_type}: {shown} rows"
+    table = [
+        "| " + " | ".join(names) + " |",
+        "|" + "---|" * len(names),
+        *("| " + " | ".join("" if v is None else str(v) for v in row) + " |" for row in rows),
+    ]
+    return header + "\n" + "\n".join(table)
@@ -0,0 +1,409 @@
+"""Snapshot diff engine for change detection.
+
+Compares two snapshots (or a snapshot and a fresh live collection) per data
+type with keyed joins over the parsed snap_<type> tables instead of text
+diffs. Rows are identified by a per-type key (interface, neighbor, prefix,
+MAC + VLAN, ...); multi-row keys such as ECMP routes are folded into sorted
+value sets so a next-hop change reads as one changed row. Each data type is a
+single FULL OUTER JOIN in DuckDB, so a 1,000-device diff costs one query per
+type rather than a loop over devices.
+
+Only devices collected successfully in both snapshots are compared; devices
+present on one side only are reported separately instead of showing every
+row as added or removed. Data types without a TextFSM template fall back to a
+set diff of output lines.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from langchain_core.tools import tool
+
+from olav.tools.snapshot import SnapshotStore, get_snapshot_store, snapshot_table
+
+# Row identity per data type. Each group lists alternative column names
+# (TextFSM templates differ by platform and template version); the first one
+# present is used. Groups after the first are optional (e.g. VRF).
+DIFF_KEYS: dict[str, list[tuple[str, ...]]] = {
+    "version": [],
+    "interfaces": [("interface", "intf", "port", "interface_name")],
+    "bgp": [("bgp_neigh", "bgp_neighbor", "neighbor", "neighbor_ip", "peer"), ("vrf",)],
+    "routes": [
+        ("network", "prefix", "destination"),
+        ("prefix_length", "mask", "prefix_len"),
+        ("vrf",),
+    ],
+    "mac": [("destination_address", "mac_address", "mac"), ("vlan", "vlan_id")],
+    "arp": [("address", "ip_address", "ip"), ("vrf",)],
+    "lldp": [("local_interface", "local_intf", "local_port")],
+}
+
+# Fields that change on every collection and would drown real changes
+VOLATILE_FIELDS = frozenset(
+    {
+        "uptime",
+        "uptime_years",
+        "uptime_weeks",
+        "uptime_days",
+        "uptime_hours",
+        "uptime_minutes",
+        "up_down",
+        "age",
+        "time",
+        "last_input",
+        "last_output",
+        "last_change",
+    }
+)
+
+
+@dataclass
+class TypeDiff:
+    """Differences of one data type between two snapshots."""
+
+    data_type: str
+    keys: list[str]
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+    # (device, key values, change kind, details)
+    rows: list[tuple[str, str, str, str]] = field(default_factory=list)
+    only_in_base: list[str] = field(default_factory=list)
+    only_in_target: list[str] = field(default_factory=list)
+    mode: str = "fields"  # "fields" (parsed rows) or "lines" (raw output)
+
+    @property
+    def total(self) -> int:
+        return self.added + self.removed + self.changed
+
+
+def _resolve_keys(data_type: str, fields: list[str]) -> list[str]:
+    """Key columns for a data type present in its table.
+
+    Unknown types, or tables missing the primary key group, use every
+    non-volatile field, so only additions and removals are reported.
+    """
+    groups = DIFF_KEYS.get(data_type)
+    if groups is not None:
+        keys = []
+        for index, group in enumerate(groups):
+            column = next((c for c in group if c in fields), None)
+            if column:
+                keys.append(column)
+            elif index == 0:
+                break
+        else:
+            return keys
+    return [f for f in fields if f not in VOLATILE_FIELDS]
+
+
+def _devices_sql(data_type: str, snapshot_id: str) -> tuple[str, list[Any]]:
+    """Devices collected successfully for a type in one snapshot."""
+    return (
+        "SELECT DISTINCT device FROM snapshot_outputs "
+        "WHERE snapshot_id = ? AND data_type = ? AND success",
+        [snapshot_id, data_type],
+    )
+
+
+def _device_sides(
+    store: SnapshotStore, data_type: str, base: str, target: str, devices: list[str] | None
+) -> tuple[list[str], list[str]]:
+    """Devices collected on only one side (reported, not diffed)."""
+    base_sql, base_params = _devices_sql(data_type, base)
+    target_sql, target_params = _devices_sql(data_type, target)
+    rows = store.conn.execute(
+        f"SELECT device, 'base' FROM ({base_sql} EXCEPT {target_sql}) "  # noqa: S608
+        f"UNION ALL SELECT device, 'target' FROM ({target_sql} EXCEPT {base_sql}) ORDER BY 1",
+        [*base_params, *target_params, *target_params, *base_params],
+    ).fetchall()
+    wanted = set(devices) if devices else None
+    only_base = [d for d, side in rows if side == "base" and (wanted is None or d in wanted)]
+    only_target = [d for d, side in rows if side == "target" and (wanted is None or d in wanted)]
+    return only_base, only_target
+
+
+def _scope_sql(
+    data_type: str, base: str, target: str, devices: list[str] | None
+) -> tuple[str, list[Any]]:
+    """Devices collected in both snapshots (optionally restricted)."""
+    base_sql, base_params = _devices_sql(data_type, base)
+    target_sql, target_params = _devices_sql(data_type, target)
+    sql = f"SELECT device FROM ({base_sql} INTERSECT {target_sql})"  # noqa: S608
+    params = [*base_params, *target_params]
+    if devices:
+        sql += f" WHERE device IN ({', '.join('?' for _ in devices)})"
+        params.extend(devices)
+    return sql, params
+
+
+def diff_type(
+    store: SnapshotStore,
+    data_type: str,
+    base: str,
+    target: str,
+    devices: list[str] | None = None,
+    limit: int = 200,
+    ignore: set[str] | None = None,
+) -> TypeDiff:
+    """Diff one data type between two snapshots.
+
+    Args:
+        store: Snapshot store
+        data_type: Data type (e.g. "routes")
+        base: Older snapshot id
+        target: Newer snapshot id
+        devices: Restrict to these devices
+        limit: Maximum detail rows returned (counts cover everything)
+        ignore: Extra fields to leave out of the comparison
+
+    Returns:
+        TypeDiff with counts and up to ``limit`` detail rows
+    """
+    only_base, only_target = _device_sides(store, data_type, base, target, devices)
+    scope, scope_params = _scope_sql(data_type, base, target, devices)
+    fields = store.fields(data_type)
+    if not fields:
+        result = _diff_lines(store, data_type, base, target, scope, scope_params, limit)
+        result.only_in_base, result.only_in_target = only_base, only_target
+        return result
+
+    keys = _resolve_keys(data_type, fields)
+    skip = VOLATILE_FIELDS | (ignore or set())
+    values = [f for f in fields if f not in keys and f not in skip]
+
+    table = snapshot_table(data_type)
+    group_cols = ", ".join(["device", *(f'"{k}"' for k in keys)])
+    aggregates = "".join(
+        f', string_agg(DISTINCT "{v}", \'|\' ORDER BY "{v}") AS "{v}"' for v in values
+    )
+
+    def side(alias: str) -> str:
+        return (
+            f"{alias} AS (SELECT {group_cols}{aggregates}, true AS present "  # noqa: S608
+            f"FROM {table} WHERE snapshot_id = ? AND device IN ({scope}) "
+            f"GROUP BY {group_cols})"
+        )
+
+    key_text = " || ' ' || ".join(f"coalesce(\"{k}\", '-')" for k in keys) or "''"
+    changes = ", ".join(
+        f'CASE WHEN a."{v}" IS DISTINCT FROM b."{v}" THEN \'{v}: \' || '
+        f"coalesce(a.\"{v}\", '-') || ' -> ' || coalesce(b.\"{v}\", '-') END"
+        for v in values
+    )
+    differs = " OR ".join(f'a."{v}" IS DISTINCT FROM b."{v}"' for v in values) or "false"
+    details = f"concat_ws('; ', {changes})" if values else "''"
+
+    sql = (
+        f"WITH {side('a')}, {side('b')}, d AS ("  # noqa: S608
+        f"SELECT device, {key_text} AS key_text, "
+        "CASE WHEN a.present IS NULL THEN 'added' "
+        "WHEN b.present IS NULL THEN 'removed' ELSE 'changed' END AS kind, "
+        f"CASE WHEN a.present AND b.present THEN {details} ELSE '' END AS details "
+        f"FROM a FULL OUTER JOIN b USING ({group_cols}) "
+        f"WHERE a.present IS NULL OR b.present IS NULL OR {differs}) "
+    )
+    params = [base, *scope_params, target, *scope_params]
+    count_sql = sql + "SELECT kind, count(*) FROM d GROUP BY kind"  # noqa: S608
+    rows_sql = sql + "SELECT * FROM d ORDER BY device, key_text LIMIT ?"  # noqa: S608
+    counts = dict(store.conn.execute(count_sql, params).fetchall())
+    rows = store.conn.execute(rows_sql, [*params, limit]).fetchall()
+
+    return TypeDiff(
+        data_type=data_type,
+        keys=keys,
+        added=counts.get("added", 0),
+        removed=counts.get("removed", 0),
+        changed=counts.get("changed", 0),
+        rows=[(r[0], r[1], r[2], r[3]) for r in rows],
+        only_in_base=only_base,
+        only_in_target=only_target,
+    )
+
+
+def _diff_lines(
+    store: SnapshotStore,
+    data_type: str,
+    base: str,
+    target: str,
+    scope: str,
+    scope_params: list[Any],
+    limit: int,
+) -> TypeDiff:
+    """Set diff of output lines for data types without parsed rows."""
+
+    def lines(alias: str) -> str:
+        return (
+            f"{alias} AS (SELECT DISTINCT device, trim(line) AS line FROM ("  # noqa: S608
+            "SELECT device, unnest(string_split(output, chr(10))) AS line "
+            "FROM snapshot_outputs WHERE snapshot_id = ? AND data_type = ? "
+            f"AND success AND device IN ({scope})) WHERE trim(line) <> '')"
+        )
+
+    sql = (
+        f"WITH {lines('a')}, {lines('b')}, d AS ("  # noqa: S608
+        "SELECT device, line, 'removed' AS kind FROM (SELECT * FROM a EXCEPT SELECT * FROM b) "
+        "UNION ALL "
+        "SELECT device, line, 'added' AS kind FROM (SELECT * FROM b EXCEPT SELECT * FROM a)) "
+    )
+    params = [base, data_type, *scope_params, target, data_type, *scope_params]
+    count_sql = sql + "SELECT kind, count(*) FROM d GROUP BY kind"  # noqa: S608
+    rows_sql = sql + "SELECT device, line, kind FROM d ORDER BY 1, 3, 2 LIMIT ?"  # noqa: S608
+    counts = dict(store.conn.execute(count_sql, params).fetchall())
+    rows = store.conn.execute(rows_sql, [*params, limit]).fetchall()
+    return TypeDiff(
+        data_type=data_type,
+        keys=["line"],
+        added=counts.get("added", 0),
+        removed=counts.get("removed", 0),
+        rows=[(r[0], r[1], r[2], "") for r in rows],
+        mode="lines",
+    )
+
+
+def _snapshot_types(store: SnapshotStore, snapshot_id: str) -> list[str]:
+    row = store.conn.execute(
+        "SELECT data_types, scope FROM snapshots WHERE snapshot_id = ?", [snapshot_id]
+    ).fetchone()
+    if row is None:
+        raise ValueError(f"Unknown snapshot '{snapshot_id}'")
+    return [t for t in (row[0] or "").split(",") if t]
+
+
+def diff_snapshots(
+    base: str | None = None,
+    target: str | None = None,
+    data_types: list[str] | None = None,
+    devices: str = "all",
+    limit: int = 200,
+    ignore: set[str] | None = None,
+) -> tuple[str, str, list[TypeDiff]]:
+    """Diff two snapshots, or a snapshot against a live collection.
+
+    Args:
+        base: Older snapshot id (default: the one before ``target``)
+        target: Newer snapshot id, or "live" to collect one now (default: newest)
+        data_types: Types to compare (default: those in both snapshots)
+        devices: Device spec as in smart_query to restrict the comparison
+        limit: Detail rows per data type
+        ignore: Extra fields to leave out of the comparison
+
+    Returns:
+        (base id, target id, per-type diffs)
+
+    Raises:
+        ValueError: If the snapshots can't be determined
+    """
+    store = get_snapshot_store()
+    device_list = None
+    if devices and devices.lower() != "all":
+        from olav.tools.smart_query import resolve_device_spec
+
+        device_list, _invalid, _desc = resolve_device_spec(devices)
+        if not device_list:
+            raise ValueError(f"No devices found matching '{devices}'")
+
+    if target == "live":
+        if not base:
+            newest = store.list_snapshots(limit=1)
+            if not newest:
+                raise ValueError("No snapshot to compare live state against")
+            base = newest[0]["snapshot_id"]
+        from olav.tools.snapshot import collect_snapshot
+
+        types = data_types or _snapshot_types(store, base)
+        target = collect_snapshot(devices or "all", types).snapshot_id
+    elif not target or not base:
+        ids = [s["snapshot_id"] for s in store.list_snapshots(limit=50)]
+        if target:
+            if target not in ids:
+                raise ValueError(f"Unknown snapshot '{target}'")
+            older = ids[ids.index(target) + 1 :]
+        else:
+            target, older = (ids[0], ids[1:]) if ids else (None, [])
+        if not target or (not base and not older):
+            raise ValueError("Need two snapshots to diff (collect one with take_snapshot)")
+        base = base or older[0]
+
+    assert base is not None and target is not None  # noqa: S101
+    common = [t for t in _snapshot_types(store, base) if t in _snapshot_types(store, target)]
+    types = [t for t in data_types if t in common] if data_types else common
+    diffs = [diff_type(store, t, base, target, device_list, limit, ignore) for t in types]
+    return base, target, diffs
+
+
+def format_diff(base: str, target: str, diffs: list[TypeDiff]) -> str:
+    """Markdown report of snapshot differences."""
+    lines = [f"## Snapshot diff: {base} -> {target}", ""]
+    lines.append("| data type | added | removed | changed | key |")
+    lines.append("|---|---|---|---|---|")
+    for d in diffs:
+        lines.append(
+            f"| {d.data_type} | {d.added} | {d.removed} | {d.changed} | "
+            f"{'+'.join(d.keys) or 'device'} |"
+        )
+
+    for d in diffs:
+        if not d.total and not d.only_in_base and not d.only_in_target:
+            continue
+        lines.extend(["", f"### {d.data_type}" + (" (output lines)" if d.mode == "lines" else "")])
+        if d.only_in_base:
+            lines.append(f"- Not collected in {target}: {', '.join(d.only_in_base)}")
+        if d.only_in_target:
+            lines.append(f"- Not collected in {base}: {', '.join(d.only_in_target)}")
+        marks = {"added": "+", "removed": "-", "changed": "~"}
+        for device, key, kind, details in d.rows:
+            entry = f"{marks[kind]} {device} {key}".rstrip()
+            lines.append(f"{entry}: {details}" if details else entry)
+        if d.total > len(d.rows):
+            lines.append(f"... {d.total - len(d.rows)} more")
+
+    if all(not d.total for d in diffs):
+        lines.extend(["", "No differences."])
+    return "\n".join(lines)
+
+
+@tool
+def snapshot_diff(
+    base: str = "",
+    target: str = "",
+    data_types: str = "",
+    devices: str = "all",
+    limit: int = 50,
+) -> str:
+    """Compare two network state snapshots (or a snapshot and live state).
+
+    Reports added, removed and changed interfaces, BGP neighbors, routes,
+    MAC/ARP entries and versions per device, matched by key (not text diff).
+    Use for change-window verification: snapshot before, then compare
+    against target="live" afterwards.
+
+    Args:
+        base: Older snapshot id (default: the snapshot before target)
+        target: Newer snapshot id, or "live" to collect current state now
+                (default: newest snapshot)
+        data_types: Comma-separated types to compare (default: all shared types)
+        devices: "all", "R1,R2", "role:core", "site:lab" or "group:test"
+        limit: Detail rows per data type (max 1000)
+
+    Returns:
+        Per-type change counts and the changed rows
+    """
+    from olav.tools.artifact_store import offload_if_large
+    from olav.tools.tool_concurrency import read_access
+
+    types = [t.strip() for t in data_types.split(",") if t.strip()] or None
+    try:
+        with read_access():
+            base_id, target_id, diffs = diff_snapshots(
+                base or None,
+                target or None,
+                types,
+                devices,
+                limit=max(1, min(limit, 1000)),
+            )
+    except ValueError as e:
+        return f"Error: {e}"
+    return offload_if_large(
+        format_diff(base_id, target_id, diffs), {"tool": "snapshot_diff", "command": target_id}
+    )
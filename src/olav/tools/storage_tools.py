@@ -18,6 +18,8 @@ from pathlib import Path
 from langchain_core.tools import tool
 
 from config.settings import settings
+from olav.tools.artifact_store import offload_if_large
+from olav.tools.tool_concurrency import write_access
 
 logger = logging.getLogger(__name__)
 
@@ -165,12 +167,14 @@ def write_file(
     try:
         path = Path(filepath)
 
-        # Create parent directories if needed
-        if create_dirs:
-            path.parent.mkdir(parents=True, exist_ok=True)
+        # Writes run alone, never interleaved with parallel read-only tool calls
+        with write_access():
+            # Create parent directories if needed
+            if create_dirs:
+                path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Write content
-        path.write_text(content, encoding="utf-8")
+            # Write content
+            path.write_text(content, encoding="utf-8")
 
         # Get file size
         size = path.stat().st_size
@@ -216,7 +220,7 @@ def read_file(
             return f"❌ Error: File not found: {filepath}"
 
         content = path.read_text(encoding="utf-8")
-        return content
+        return offload_if_large(content, {"tool": "read_file", "filepath": filepath})
 
     except Exception as e:
         return f"❌ Error reading file: {str(e)}"
@@ -259,8 +263,9 @@ def save_device_config(
 
     try:
         path = Path(filepath)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(full_content, encoding="utf-8")
+        with write_access():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(full_content, encoding="utf-8")
 
         size = path.stat().st_size
         return f"✅ Config saved: {filepath} ({size} bytes)"
@@ -299,8 +304,9 @@ def save_tech_support(
 
     try:
         path = Path(filepath)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(full_content, encoding="utf-8")
+        with write_access():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(full_content, encoding="utf-8")
 
         size = path.stat().st_size
         size_kb = size / 1024
@@ -1,12 +1,23 @@
 """Task delegation tools for OLAV workflows.
 
-Provides tools to delegate tasks to specialized subagents.
+Provides tools to delegate tasks to specialized subagents:
+- delegate_task: one subagent task
+- delegate_tasks: several subagent tasks run concurrently (e.g. micro
+  analysis of each suspect device), with a concurrency cap and per-task
+  timeout, results merged into one report
 """
 
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any
 
+from langchain.tools import BaseTool
 from langchain_core.tools import tool
+from pydantic import BaseModel, Field
 
+from config.settings import settings
 from olav.core.subagent_manager import get_subagent_middleware
 from olav.tools.network import list_devices, nornir_execute
 
@@ -33,6 +44,17 @@ def get_task_middleware() -> Any:
     return _subagent_middleware
 
 
+def _final_content(result: Any) -> str:
+    """Extract the final message content of a subagent run."""
+    if result and "messages" in result and result["messages"]:
+        final_message = result["messages"][-1]
+        if isinstance(final_message, dict):
+            return final_message.get("content", "No content from subagent")
+        return str(getattr(final_message, "content", "")) or "No content from subagent"
+
+    return "Subagent completed but produced no output"
+
+
 @tool
 def delegate_task(
     subagent_type: str,
@@ -73,15 +95,173 @@ def delegate_task(
             # Run subagent
             result = subagent_graph.invoke(initial_state)
 
-            # Extract final message
-            if result and "messages" in result:
-                final_message = result["messages"][-1]
-                return final_message.get("content", "No content from subagent")
-
-            return "Subagent completed but produced no output"
+            return _final_content(result)
 
         else:
             return "Error: Subagent middleware not properly configured"
 
     except Exception as e:
         return f"Error delegating task: {str(e)}"
+
+
+class SubagentTask(BaseModel):
+    """One task of a delegate_tasks batch."""
+
+    subagent_type: str = Field(description='"macro-analyzer" or "micro-analyzer"')
+    task_description: str = Field(description="Detailed description of the task to perform")
+
+
+class DelegateTasksInput(BaseModel):
+    """Input schema for delegate_tasks."""
+
+    tasks: list[SubagentTask] = Field(
+        description="Independent subagent tasks, e.g. one micro-analyzer task per suspect device"
+    )
+    max_concurrency: int | None = Field(
+        default=None,
+        description="Maximum tasks running at once (default: settings.subagent_max_concurrency)",
+    )
+    timeout: int | None = Field(
+        default=None,
+        description="Per-task timeout in seconds (default: settings.subagent_task_timeout)",
+    )
+
+
+async def run_subagent_tasks(
+    tasks: list[dict[str, str]],
+    max_concurrency: int | None = None,
+    timeout: float | None = None,  # noqa: ASYNC109 - per-task limit, not a call timeout
+) -> list[dict[str, Any]]:
+    """Run subagent tasks concurrently with ainvoke.
+
+    Args:
+        tasks: Dicts with subagent_type and task_description
+        max_concurrency: Maximum concurrent subagent runs
+        timeout: Per-task timeout in seconds
+
+    Returns:
+        One dict per task, in input order: subagent_type, task_description,
+        status ("ok" | "error" | "timeout"), output, seconds
+    """
+    middleware = get_task_middleware()
+    subagent_graphs = getattr(middleware, "subagent_graphs", None)
+    if subagent_graphs is None:
+        raise RuntimeError("Subagent middleware not properly configured")
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency or settings.subagent_max_concurrency))
+    timeout = timeout or settings.subagent_task_timeout
+
+    async def _run_one(task: dict[str, str]) -> dict[str, Any]:
+        subagent_type = task.get("subagent_type", "")
+        outcome: dict[str, Any] = {
+            "subagent_type": subagent_type,
+            "task_description": task.get("task_description", ""),
+        }
+        if subagent_type not in subagent_graphs:
+            available = ", ".join(subagent_graphs.keys())
+            return {
+                **outcome,
+                "status": "error",
+                "output": f"Unknown subagent type '{subagent_type}'. Available: {available}",
+                "seconds": 0.0,
+            }
+
+        initial_state = {
+            "messages": [{"role": "user", "content": outcome["task_description"]}],
+            "tool_call_id": None,
+        }
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                result = await asyncio.wait_for(
+                    subagent_graphs[subagent_type].ainvoke(initial_state), timeout
+                )
+                outcome.update(status="ok", output=_final_content(result))
+            except TimeoutError:
+                outcome.update(status="timeout", output=f"Timed out after {timeout:.0f}s")
+            except Exception as e:
+                outcome.update(status="error", output=str(e))
+            outcome["seconds"] = round(time.monotonic() - started, 1)
+        return outcome
+
+    return list(await asyncio.gather(*(_run_one(task) for task in tasks)))
+
+
+def format_subagent_results(results: list[dict[str, Any]]) -> str:
+    """Merge batch results into one report (summary line, then one section per task)."""
+    counts = {status: sum(r["status"] == status for r in results) for status in ("ok", "timeout")}
+    failed = len(results) - counts["ok"] - counts["timeout"]
+    lines = [
+        f"Delegated {len(results)} tasks: {counts['ok']} completed, "
+        f"{counts['timeout']} timed out, {failed} failed"
+    ]
+    for i, result in enumerate(results, 1):
+        marker = {"ok": "✅", "timeout": "⏱️"}.get(result["status"], "❌")
+        lines.append(
+            f"\n## {marker} Task {i} [{result['subagent_type']}] ({result['seconds']}s)\n"
+            f"**Task**: {result['task_description']}\n\n{result['output']}"
+        )
+    return "\n".join(lines)
+
+
+class DelegateTasksTool(BaseTool):
+    """Run several subagent tasks concurrently and merge their results.
+
+    Subagents run with ainvoke under a semaphore (subagent_max_concurrency),
+    each bounded by subagent_task_timeout; a failed or timed-out task is
+    reported in its section without failing the batch.
+    """
+
+    name: str = "delegate_tasks"
+    description: str = (
+        "Delegate several independent tasks to subagents and run them in parallel. "
+        "Use instead of repeated delegate_task calls when analyzing multiple devices or "
+        "segments, e.g. one micro-analyzer task per suspect device. Returns a merged report."
+    )
+    args_schema: type[BaseModel] = DelegateTasksInput  # type: ignore[assignment]
+
+    def _run(
+        self,
+        tasks: list[SubagentTask | dict[str, str]],
+        max_concurrency: int | None = None,
+        timeout: int | None = None,
+    ) -> str:
+        """Run the batch on a private event loop (a worker thread if one is running)."""
+        coro_args = (_task_dicts(tasks), max_concurrency, timeout)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return self._format(lambda: asyncio.run(run_subagent_tasks(*coro_args)))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return self._format(
+                lambda: executor.submit(asyncio.run, run_subagent_tasks(*coro_args)).result()
+            )
+
+    async def _arun(
+        self,
+        tasks: list[SubagentTask | dict[str, str]],
+        max_concurrency: int | None = None,
+        timeout: int | None = None,  # noqa: ASYNC109 - mirrors the tool schema
+    ) -> str:
+        """Run the batch on the caller's event loop."""
+        try:
+            results = await run_subagent_tasks(_task_dicts(tasks), max_concurrency, timeout)
+        except Exception as e:
+            return f"Error delegating tasks: {str(e)}"
+        return format_subagent_results(results)
+
+    @staticmethod
+    def _format(run: Callable[[], list[dict[str, Any]]]) -> str:
+        try:
+            return format_subagent_results(run())
+        except Exception as e:
+            return f"Error delegating tasks: {str(e)}"
+
+
+def _task_dicts(tasks: list[SubagentTask | dict[str, str]]) -> list[dict[str, str]]:
+    return [task.model_dump() if isinstance(task, SubagentTask) else dict(task) for task in tasks]
+
+
+# Create singleton instance
+delegate_tasks = DelegateTasksTool()
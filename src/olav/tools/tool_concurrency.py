@@ -0,0 +1,130 @@
+"""Concurrency guards for tool calls executed in parallel.
+
+When the model emits several tool calls in one message, LangGraph runs them
+concurrently (async tools on the event loop, sync tools on worker threads).
+These guards keep that safe:
+
+- Read/write gate: read-only tools (smart_query, nornir_execute, search, API
+  GETs) share the gate and run side by side; write tools (file saves, alias
+  updates, API writes - all behind HITL approval) take it exclusively, so a
+  write never interleaves with reads issued in the same turn
+- Device sessions: at most ``device_max_sessions`` commands run on one
+  device at a time (a Netmiko session is a single CLI channel); further
+  calls for that device wait, calls for other devices proceed
+"""
+
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager, ExitStack, contextmanager
+
+from config.settings import settings
+
+
+class _ReadWriteGate:
+    """Many readers or one writer; waiting writers block new readers."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+_gate = _ReadWriteGate()
+_gate_state = threading.local()
+
+_device_semaphores: dict[str, threading.BoundedSemaphore] = {}
+_device_lock = threading.Lock()
+
+
+@contextmanager
+def _enter_gate(exclusive: bool) -> Iterator[None]:
+    # Nested tool calls (smart_query -> nornir_execute) reuse the outer hold
+    if getattr(_gate_state, "depth", 0):
+        _gate_state.depth += 1
+        try:
+            yield
+        finally:
+            _gate_state.depth -= 1
+        return
+
+    with _gate.write() if exclusive else _gate.read():
+        _gate_state.depth = 1
+        try:
+            yield
+        finally:
+            _gate_state.depth = 0
+
+
+def read_access() -> AbstractContextManager[None]:
+    """Hold the tool gate for a read-only tool call (shared)."""
+    return _enter_gate(exclusive=False)
+
+
+def write_access() -> AbstractContextManager[None]:
+    """Hold the tool gate for a write tool call (exclusive)."""
+    return _enter_gate(exclusive=True)
+
+
+def _device_semaphore(device: str) -> threading.BoundedSemaphore:
+    with _device_lock:
+        semaphore = _device_semaphores.get(device)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(max(1, settings.device_max_sessions))
+            _device_semaphores[device] = semaphore
+        return semaphore
+
+
+@contextmanager
+def device_session(device: str) -> Iterator[None]:
+    """Limit concurrent commands on one device to ``device_max_sessions``.
+
+    Args:
+        device: Inventory device name
+    """
+    with _device_semaphore(device):
+        yield
+
+
+@contextmanager
+def device_sessions(devices: Iterable[str]) -> Iterator[None]:
+    """Hold a session slot on several devices (for Nornir batch runs).
+
+    Slots are taken in sorted order so overlapping batches cannot deadlock.
+
+    Args:
+        devices: Inventory device names
+    """
+    with ExitStack() as stack:
+        for device in sorted(set(devices)):
+            stack.enter_context(_device_semaphore(device))
+        yield
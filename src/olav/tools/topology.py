@@ -0,0 +1,426 @@
+"""LLDP/CDP topology graph built from collected neighbor data.
+
+Neighbor tables from snapshots (``lldp`` / ``cdp`` data types, or recorded
+smart_query runs) are persisted as interface-level links in the snapshot
+database (``topology_links``) and refreshed incrementally - only devices
+whose newest neighbor collection changed are re-read. An in-memory adjacency
+graph is rebuilt from the links when they change and answers:
+
+- k-hop neighborhoods of a device
+- shortest paths between two devices (all equal-hop paths, with interfaces)
+- blast radius: which devices lose connectivity if a device or link fails
+
+so topology and path analysis take one query instead of walking neighbors
+device by device.
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from langchain_core.tools import tool
+
+from olav.tools.endpoint_store import NEIGHBOR_FIELDS, is_network_neighbor, normalize_interface
+from olav.tools.snapshot import SnapshotStore, first_field, get_snapshot_store
+
+NEIGHBOR_TYPES = ("lldp", "cdp")
+
+# Upper bound on equal-hop paths enumerated between two devices
+MAX_PATHS = 16
+
+_LINK_COLUMNS = {
+    "device": "VARCHAR",
+    "protocol": "VARCHAR",
+    "interface": "VARCHAR",
+    "neighbor": "VARCHAR",
+    "neighbor_interface": "VARCHAR",
+    "capabilities": "VARCHAR",
+    "snapshot_id": "VARCHAR",
+    "collected_at": "TIMESTAMP",
+}
+
+
+@dataclass(frozen=True)
+class Link:
+    """One interface-level adjacency (seen from ``device``)."""
+
+    device: str
+    interface: str
+    neighbor: str
+    neighbor_interface: str
+
+
+@dataclass
+class Topology:
+    """Undirected adjacency graph of devices and their links."""
+
+    adjacency: dict[str, dict[str, list[Link]]] = field(default_factory=dict)
+
+    def add(self, link: Link) -> None:
+        """Add a link in both directions (a link reported by both ends is kept once)."""
+        forward = self.adjacency.setdefault(link.device, {}).setdefault(link.neighbor, [])
+        backward = self.adjacency.setdefault(link.neighbor, {}).setdefault(link.device, [])
+        for existing in forward:
+            same_local = normalize_interface(existing.interface) == normalize_interface(
+                link.interface
+            )
+            if same_local and (
+                not existing.neighbor_interface
+                or not link.neighbor_interface
+                or normalize_interface(existing.neighbor_interface)
+                == normalize_interface(link.neighbor_interface)
+            ):
+                return
+        forward.append(link)
+        backward.append(Link(link.neighbor, link.neighbor_interface, link.device, link.interface))
+
+    def links(self, device: str, neighbor: str) -> list[Link]:
+        """Links between two adjacent devices."""
+        return self.adjacency.get(device, {}).get(neighbor, [])
+
+    def neighbors(self, device: str, hops: int = 1) -> dict[str, int]:
+        """Devices within ``hops`` of a device, with their hop distance."""
+        distances = {device: 0}
+        queue = deque([device])
+        while queue:
+            node = queue.popleft()
+            if distances[node] >= hops:
+                continue
+            for peer in self.adjacency.get(node, {}):
+                if peer not in distances:
+                    distances[peer] = distances[node] + 1
+                    queue.append(peer)
+        distances.pop(device)
+        return distances
+
+    def paths(self, source: str, target: str, limit: int = MAX_PATHS) -> list[list[str]]:
+        """All shortest (fewest-hop) device paths from source to target."""
+        if source not in self.adjacency or target not in self.adjacency:
+            return []
+        parents: dict[str, list[str]] = {source: []}
+        depth = {source: 0}
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            if node == target:
+                continue
+            for peer in self.adjacency[node]:
+                if peer not in depth:
+                    depth[peer] = depth[node] + 1
+                    parents[peer] = [node]
+                    queue.append(peer)
+                elif depth[peer] == depth[node] + 1:
+                    parents[peer].append(node)
+        if target not in depth:
+            return []
+
+        paths: list[list[str]] = []
+        stack: list[list[str]] = [[target]]
+        while stack and len(paths) < limit:
+            partial = stack.pop()
+            if partial[-1] == source:
+                paths.append(partial[::-1])
+                continue
+            stack.extend([*partial, parent] for parent in parents[partial[-1]])
+        return sorted(paths)
+
+    def components(
+        self, removed_device: str | None = None, removed_link: Link | None = None
+    ) -> list[set[str]]:
+        """Connected components, optionally with a device or link taken out."""
+        seen: set[str] = set()
+        result: list[set[str]] = []
+        for start in self.adjacency:
+            if start in seen or start == removed_device:
+                continue
+            component = {start}
+            queue = deque([start])
+            while queue:
+                node = queue.popleft()
+                for peer, links in self.adjacency[node].items():
+                    if peer == removed_device or peer in component:
+                        continue
+                    if removed_link and not self._survives(node, links, removed_link):
+                        continue
+                    component.add(peer)
+                    queue.append(peer)
+            seen |= component
+            result.append(component)
+        return sorted(result, key=len, reverse=True)
+
+    @staticmethod
+    def _survives(node: str, links: list[Link], removed: Link) -> bool:
+        """Whether node keeps a link to its peer once ``removed`` fails."""
+        if {node, links[0].neighbor} != {removed.device, removed.neighbor}:
+            return True
+        key = normalize_interface(removed.interface)
+        for link in links:
+            local = link.interface if node == removed.device else link.neighbor_interface
+            if normalize_interface(local) != key:
+                return True
+        return False
+
+    def blast_radius(
+        self, device: str, interface: str = "", anchor: str = ""
+    ) -> tuple[list[str], str]:
+        """Devices cut off from the network if a device or one of its links fails.
+
+        Args:
+            device: Failing device (or the local end of the failing link)
+            interface: Local interface of the failing link ("" = whole device)
+            anchor: Device that defines "the network" (default: the largest
+                    remaining component)
+
+        Returns:
+            (isolated devices, description of the failure)
+        """
+        removed_link = None
+        if interface:
+            key = normalize_interface(interface)
+            for links in self.adjacency.get(device, {}).values():
+                for link in links:
+                    if normalize_interface(link.interface) == key:
+                        removed_link = link
+            if removed_link is None:
+                raise ValueError(f"No link on {device} {interface}")
+            failure = f"link {device} {interface} <-> {removed_link.neighbor}"
+            components = self.components(removed_link=removed_link)
+        else:
+            failure = f"device {device}"
+            components = self.components(removed_device=device)
+
+        if not components:
+            return [], failure
+        main = next((c for c in components if anchor in c), components[0])
+        isolated = sorted(set().union(*(c for c in components if c is not main)))
+        return isolated, failure
+
+
+class TopologyStore:
+    """Persisted neighbor links and the graph built from them."""
+
+    def __init__(self, store: SnapshotStore) -> None:
+        self.store = store
+        self._lock = threading.Lock()
+        self._graph: Topology | None = None
+        spec = ", ".join(f"{name} {kind}" for name, kind in _LINK_COLUMNS.items())
+        store.conn.execute(f"CREATE TABLE IF NOT EXISTS topology_links ({spec})")
+        store.conn.execute("""
+            CREATE TABLE IF NOT EXISTS topology_sources (
+                device TEXT,
+                data_type TEXT,
+                snapshot_id TEXT,
+                PRIMARY KEY (device, data_type)
+            )
+        """)
+
+    def refresh(self) -> int:
+        """Re-read devices whose newest LLDP/CDP collection changed.
+
+        Returns:
+            Number of (device, protocol) neighbor tables re-read
+        """
+        conn = self.store.conn
+        with self._lock:
+            latest = self.store.latest_sources(list(NEIGHBOR_TYPES))
+            indexed = {
+                (device, data_type): sid
+                for device, data_type, sid in conn.execute(
+                    "SELECT device, data_type, snapshot_id FROM topology_sources"
+                ).fetchall()
+            }
+            stale = sorted(key for key, sid in latest.items() if indexed.get(key) != sid)
+            if not stale:
+                return 0
+
+            links: list[dict[str, Any]] = []
+            for data_type in NEIGHBOR_TYPES:
+                sources = [(d, latest[(d, t)]) for d, t in stale if t == data_type]
+                for row in self.store.rows_for(data_type, sources):
+                    local = first_field(row, NEIGHBOR_FIELDS["local_interface"])
+                    neighbor = first_field(row, NEIGHBOR_FIELDS["neighbor"])
+                    if not local or not neighbor:
+                        continue
+                    links.append(
+                        {
+                            "device": row["device"],
+                            "protocol": data_type,
+                            "interface": str(local).strip(),
+                            "neighbor": str(neighbor).strip(),
+                            "neighbor_interface": first_field(
+                                row, NEIGHBOR_FIELDS["neighbor_interface"]
+                            ),
+                            "capabilities": first_field(row, NEIGHBOR_FIELDS["capabilities"]),
+                            "snapshot_id": row["snapshot_id"],
+                            "collected_at": row["collected_at"].isoformat(sep=" "),
+                        }
+                    )
+
+            conn.executemany("DELETE FROM topology_links WHERE device = ? AND protocol = ?", stale)
+            self.store.bulk_insert("topology_links", _LINK_COLUMNS, links)
+            conn.executemany(
+                "INSERT OR REPLACE INTO topology_sources VALUES (?, ?, ?)",
+                [(d, t, latest[(d, t)]) for d, t in stale],
+            )
+            self._graph = None
+            return len(stale)
+
+    def _resolver(self) -> dict[str, str]:
+        """Map neighbor name spellings to known device names.
+
+        LLDP/CDP report system names ("R2.lab.local", "SW1(FOC1234X)") while
+        the inventory uses short names; unknown neighbors keep their own name.
+        """
+        known = [
+            r[0]
+            for r in self.store.conn.execute(
+                "SELECT DISTINCT device FROM snapshot_outputs"
+            ).fetchall()
+        ]
+        names: dict[str, str] = {}
+        for device in known:
+            names[device.lower()] = device
+            names.setdefault(device.lower().split(".")[0], device)
+        return names
+
+    def resolve(self, name: str, names: dict[str, str] | None = None) -> str:
+        """Known device name for a neighbor/device spelling."""
+        names = names if names is not None else self._resolver()
+        raw = str(name).strip().split("(")[0].strip()
+        return names.get(raw.lower()) or names.get(raw.lower().split(".")[0]) or raw
+
+    def graph(self) -> Topology:
+        """Current topology graph (rebuilt only when links changed)."""
+        self.refresh()
+        with self._lock:
+            if self._graph is None:
+                names = self._resolver()
+                topology = Topology()
+                rows = self.store.conn.execute(
+                    "SELECT device, interface, neighbor, neighbor_interface, capabilities "
+                    "FROM topology_links ORDER BY device, interface"
+                ).fetchall()
+                for device, interface, neighbor, neighbor_interface, capabilities in rows:
+                    peer = self.resolve(neighbor, names)
+                    if peer == device:
+                        continue
+                    # Phones, APs and hosts only appear when they're inventory devices
+                    if peer.lower() not in names and not is_network_neighbor(capabilities):
+                        continue
+                    topology.add(Link(device, interface, peer, neighbor_interface or ""))
+                self._graph = topology
+            return self._graph
+
+
+_topology_store: TopologyStore | None = None
+_topology_store_lock = threading.Lock()
+
+
+def get_topology_store() -> TopologyStore:
+    """Get the global topology store (bound to the global snapshot store)."""
+    global _topology_store
+    with _topology_store_lock:
+        store = get_snapshot_store()
+        if _topology_store is None or _topology_store.store is not store:
+            _topology_store = TopologyStore(store)
+        return _topology_store
+
+
+def _format_hop(topology: Topology, device: str, peer: str) -> str:
+    links = topology.links(device, peer)
+    ports = ", ".join(f"{lk.interface} -> {lk.neighbor_interface or '?'}" for lk in links)
+    return f"{device} [{ports}] {peer}"
+
+
+@tool
+def topology_query(
+    mode: str = "neighbors",
+    device: str = "",
+    target: str = "",
+    hops: int = 1,
+) -> str:
+    """Query the network topology built from collected LLDP/CDP neighbors.
+
+    Answers topology questions in one call instead of running neighbor
+    commands hop by hop. Refresh the data with take_snapshot(data_types="lldp,cdp").
+
+    Args:
+        mode: "neighbors" (devices within `hops` of device), "path" (shortest
+              paths from device to target, with interfaces), "blast" (devices
+              cut off if device - or its link on interface `target` - fails),
+              "summary" (graph size and most connected devices)
+        device: Device name (start point / failing device)
+        target: Destination device for "path"; local interface for "blast"
+                (e.g. "Gi0/1"); empty for a whole-device failure
+        hops: Neighborhood radius for "neighbors"
+
+    Returns:
+        Markdown answer from the topology graph
+    """
+    store = get_topology_store()
+    topology = store.graph()
+    if not topology.adjacency:
+        return "No neighbor data stored. Collect it with take_snapshot(data_types='lldp,cdp')."
+
+    if mode == "summary":
+        links = sum(len(ls) for peers in topology.adjacency.values() for ls in peers.values())
+        degree = sorted(topology.adjacency.items(), key=lambda kv: (-len(kv[1]), kv[0]))
+        lines = [
+            f"## Topology: {len(topology.adjacency)} devices, {links // 2} links",
+            "| device | neighbors |",
+            "|---|---|",
+        ]
+        lines.extend(f"| {name} | {', '.join(sorted(peers))} |" for name, peers in degree[:20])
+        return "\n".join(lines)
+
+    if not device:
+        return f"Error: mode '{mode}' needs a device"
+    device = store.resolve(device)
+    if device not in topology.adjacency:
+        return f"Error: No neighbor data for '{device}'"
+
+    if mode == "neighbors":
+        distances = topology.neighbors(device, max(1, hops))
+        lines = [f"## {len(distances)} devices within {hops} hop(s) of {device}"]
+        lines.append("| device | hops | via |")
+        lines.append("|---|---|---|")
+        for peer, distance in sorted(distances.items(), key=lambda kv: (kv[1], kv[0])):
+            via = (
+                ", ".join(
+                    f"{lk.interface} -> {lk.neighbor_interface or '?'}"
+                    for lk in topology.links(device, peer)
+                )
+                if distance == 1
+                else ""
+            )
+            lines.append(f"| {peer} | {distance} | {via} |")
+        return "\n".join(lines)
+
+    if mode == "path":
+        if not target:
+            return "Error: mode 'path' needs a target device"
+        target = store.resolve(target)
+        paths = topology.paths(device, target)
+        if not paths:
+            return f"No path between {device} and {target} in the collected topology."
+        lines = [
+            f"## {len(paths)} shortest path(s) {device} -> {target} ({len(paths[0]) - 1} hops)"
+        ]
+        for index, path in enumerate(paths, 1):
+            lines.append(f"\n### Path {index}: {' -> '.join(path)}")
+            lines.extend(
+                f"- {_format_hop(topology, a, b)}" for a, b in zip(path, path[1:], strict=False)
+            )
+        return "\n".join(lines)
+
+    if mode == "blast":
+        try:
+            isolated, failure = topology.blast_radius(device, target)
+        except ValueError as e:
+            return f"Error: {e}"
+        if not isolated:
+            return f"## Failure of {failure}\nNo other device loses connectivity (redundant paths)."
+        return f"## Failure of {failure}\n{len(isolated)} device(s) cut off: {', '.join(isolated)}"
+
+    return f"Error: Unknown mode '{mode}' (use neighbors, path, blast, summary)"